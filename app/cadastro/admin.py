@@ -1,6 +1,7 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
-from .models import Funcionario, Instrumento, PontoCalibracao, HistoricoCalibracao, TipoInstrumento, Setor, Laboratorio
+from .models import Funcionario, Instrumento, PontoCalibracao, HistoricoCalibracao, TipoInstrumento, Setor, Laboratorio, ImportacaoArquivo
 
 
 @admin.register(Funcionario)
@@ -58,8 +59,13 @@ class InstrumentoAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('tipo_instrumento').annotate(
+            total_pontos_anotado=Count('pontos_calibracao', distinct=True)
+        )
+
     def total_pontos(self, obj):
-        total = obj.total_pontos_calibracao
+        total = obj.total_pontos_anotado
         if total == 0:
             return format_html('<span style="color: red;">⚠ 0 pontos</span>')
         return format_html(f'<span style="color: green;">{total} ponto(s)</span>')
@@ -165,3 +171,11 @@ class LaboratorioAdmin(admin.ModelAdmin):
     search_fields = ('nome',)
     list_filter = ('ativo',)
     readonly_fields = ('data_cadastro',)
+
+
+@admin.register(ImportacaoArquivo)
+class ImportacaoArquivoAdmin(admin.ModelAdmin):
+    list_display = ('rotina', 'nome_arquivo', 'linhas_aplicadas', 'total_linhas', 'ultima_linha', 'concluido', 'data_atualizacao')
+    list_filter = ('rotina', 'concluido')
+    search_fields = ('nome_arquivo', 'fingerprint')
+    readonly_fields = ('fingerprint', 'data_cadastro', 'data_atualizacao')
@@ -0,0 +1,79 @@
+"""GET condicional (ETag / Last-Modified) para as APIs de dados de referência.
+
+A versão de cada tabela é calculada com um único agregado (quantidade,
+maior id e maior `data_atualizacao`), barato comparado à serialização da
+lista. Quando o navegador já tem a versão atual, a view nem é executada e a
+resposta é um `304 Not Modified` sem corpo.
+"""
+from __future__ import annotations
+
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max, Model
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+# Dado de referência muda raramente, mas uma edição precisa aparecer no próximo
+# carregamento: o navegador guarda a resposta e sempre revalida (custo de um 304).
+REFERENCIA_CACHE_CONTROL = {'private': True, 'no_cache': True}
+
+
+def table_version(model: type[Model]) -> dict:
+    """Quantidade, maior id e última atualização da tabela em uma consulta."""
+    return model.objects.aggregate(total=Count('pk'), maior_id=Max('pk'), ultima=Max('data_atualizacao'))
+
+
+def version_token(model: type[Model], version: dict | None = None) -> str:
+    """Representação textual da versão da tabela, usada em ETags e chaves de cache."""
+    version = table_version(model) if version is None else version
+    ultima = version['ultima'].isoformat() if version['ultima'] else ''
+    return f"{model._meta.label_lower}:{version['total']}:{version['maior_id']}:{ultima}"
+
+
+def _versions(request, models: tuple[type[Model], ...]) -> list[dict]:
+    # etag_func e last_modified_func são chamadas separadamente; calcula uma vez por request.
+    cached = getattr(request, '_versoes_referencia', None)
+    if cached is None:
+        cached = [table_version(model) for model in models]
+        request._versoes_referencia = cached
+    return cached
+
+
+def _with_versions_loaded(view, models):
+    # O condition chama etag/last_modified de forma síncrona; com as versões já
+    # guardadas no request elas não consultam o banco dentro do loop de eventos.
+    async def inner(request, *args, **kwargs):
+        await sync_to_async(_versions)(request, models)
+        return await view(request, *args, **kwargs)
+
+    return inner
+
+
+def reference_data(*models: type[Model]):
+    """Decora uma API de lista de referência com ETag, Last-Modified e Cache-Control.
+
+    A ETag combina a versão das tabelas informadas com a query string, para
+    que filtros como `pmc_categoria` tenham validadores distintos. Aceita
+    views assíncronas: as versões são lidas antes, fora do loop de eventos.
+    """
+
+    def etag(request, *args, **kwargs):
+        parts = [request.path, request.GET.urlencode()]
+        for model, version in zip(models, _versions(request, models)):
+            parts.append(version_token(model, version))
+        return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        datas = [version['ultima'] for version in _versions(request, models) if version['ultima']]
+        return max(datas) if datas else None
+
+    def decorator(view):
+        conditional_view = condition(etag_func=etag, last_modified_func=last_modified)(view)
+        if iscoroutinefunction(view):
+            conditional_view = _with_versions_loaded(conditional_view, models)
+        return wraps(view)(cache_control(**REFERENCIA_CACHE_CONTROL)(conditional_view))
+
+    return decorator
@@ -0,0 +1,291 @@
+"""Validação em lote compartilhada pelas importações CSV (views e rotinas).
+
+Cada importador primeiro converte o arquivo inteiro em registros e depois
+resolve todas as referências (instrumentos, matrículas, pontos) com poucas
+consultas `IN`, acumulando os erros do arquivo todo antes de gravar algo.
+Cargas grandes podem ser divididas por instrumento e aplicadas em paralelo
+(`--workers`), cada processo com a sua própria conexão.
+"""
+from __future__ import annotations
+
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Hashable, Iterable, Sequence, TypeVar
+
+from django.db import connections, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from .models import Funcionario, ImportacaoArquivo, ImportacaoLinha, Instrumento, Laboratorio, PontoCalibracao
+
+T = TypeVar('T')
+LEDGER_CHUNK_SIZE = 500
+
+
+@dataclass
+class ValidationReport:
+    """Acumula os erros encontrados em um arquivo, sempre com o número da linha."""
+
+    errors: list[dict] = field(default_factory=list)
+    _error_lines: set[int] = field(default_factory=set, repr=False)
+
+    def add(self, line: int, message: str) -> None:
+        self.errors.append({'line': line, 'error': message})
+        self._error_lines.add(line)
+
+    def has_error(self, line: int) -> bool:
+        return line in self._error_lines
+
+    @property
+    def error_rows(self) -> int:
+        return len(self._error_lines)
+
+    def __bool__(self) -> bool:
+        return bool(self.errors)
+
+    def lines(self) -> list[str]:
+        """Formata os erros para saída de terminal, ordenados por linha."""
+        return [f"Linha {item['line']}: {item['error']}" for item in sorted(self.errors, key=lambda item: item['line'])]
+
+
+def normalize_lookup(value: str | None) -> str:
+    """Chave usada para comparar códigos/matrículas sem diferenciar maiúsculas."""
+    return (value or '').strip().lower()
+
+
+def check_duplicates(report: ValidationReport, keyed_lines: Iterable[tuple[int, Hashable]], message: str) -> set[int]:
+    """Registra linhas cuja chave já apareceu antes no arquivo e devolve essas linhas."""
+    first_seen: dict[Hashable, int] = {}
+    duplicated: set[int] = set()
+    for line, key in keyed_lines:
+        if key in first_seen:
+            report.add(line, f'{message} (primeira ocorrência na linha {first_seen[key]}).')
+            duplicated.add(line)
+            continue
+        first_seen[key] = line
+    return duplicated
+
+
+def lookup_instrumentos(codigos: Iterable[str]) -> dict[str, Instrumento]:
+    """Resolve códigos de instrumento (case-insensitive) em uma única consulta."""
+    keys = {normalize_lookup(codigo) for codigo in codigos if codigo and codigo.strip()}
+    if not keys:
+        return {}
+    qs = Instrumento.objects.annotate(codigo_lookup=Lower('codigo')).filter(codigo_lookup__in=keys)
+    return {instrumento.codigo_lookup: instrumento for instrumento in qs}
+
+
+def lookup_funcionarios(matriculas: Iterable[str]) -> dict[str, Funcionario]:
+    """Resolve matrículas (case-insensitive) em uma única consulta."""
+    keys = {normalize_lookup(matricula) for matricula in matriculas if matricula and matricula.strip()}
+    if not keys:
+        return {}
+    qs = Funcionario.objects.annotate(matricula_lookup=Lower('matricula')).filter(matricula_lookup__in=keys)
+    return {funcionario.matricula_lookup: funcionario for funcionario in qs}
+
+
+def lookup_laboratorios(nomes: Iterable[str]) -> dict[str, Laboratorio]:
+    """Resolve nomes de laboratório (case-insensitive) em uma única consulta."""
+    keys = {normalize_lookup(nome) for nome in nomes if nome and nome.strip()}
+    if not keys:
+        return {}
+    qs = Laboratorio.objects.annotate(nome_lookup=Lower('nome')).filter(nome_lookup__in=keys)
+    return {laboratorio.nome_lookup: laboratorio for laboratorio in qs}
+
+
+def lookup_pontos(instrumento_ids: Iterable[int]) -> dict[tuple[int, int], PontoCalibracao]:
+    """Carrega os pontos dos instrumentos informados indexados por (instrumento_id, sequencia)."""
+    ids = set(instrumento_ids)
+    if not ids:
+        return {}
+    qs = PontoCalibracao.objects.filter(instrumento_id__in=ids)
+    return {(ponto.instrumento_id, ponto.sequencia): ponto for ponto in qs}
+
+
+# ============================================
+# LEDGER DE IMPORTAÇÃO (idempotência e retomada)
+# ============================================
+
+def file_fingerprint(path: Path) -> str:
+    """Hash SHA-256 do conteúdo do arquivo."""
+    digest = hashlib.sha256()
+    with path.open('rb') as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def row_hash(cells: Sequence[str]) -> str:
+    """Hash do conteúdo de uma linha do CSV, independente do arquivo onde ela aparece."""
+    normalized = '\x1f'.join((cell or '').strip() for cell in cells)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def start_ledger(rotina: str, path: Path, total_linhas: int) -> ImportacaoArquivo:
+    """Registra (ou reabre) o arquivo no ledger, permitindo retomar uma carga interrompida."""
+    arquivo, _ = ImportacaoArquivo.objects.get_or_create(
+        rotina=rotina,
+        fingerprint=file_fingerprint(path),
+        defaults={'nome_arquivo': path.name, 'total_linhas': total_linhas},
+    )
+    return arquivo
+
+
+def apply_with_ledger(
+    arquivo: ImportacaoArquivo,
+    records: Sequence[T],
+    apply: Callable[[T], None],
+    *,
+    line_of: Callable[[T], int],
+    hash_of: Callable[[T], str],
+    on_error: Callable[[T, Exception], None],
+    chunk_size: int = LEDGER_CHUNK_SIZE,
+    track_offset: bool = True,
+) -> tuple[int, int]:
+    """Aplica os registros em lotes transacionais, pulando linhas já gravadas.
+
+    Cada lote faz uma única consulta `IN` no ledger; as linhas aplicadas e o
+    ponto de retomada são gravados na mesma transação do lote, então uma
+    carga interrompida recomeça do último lote confirmado. O ponto de
+    retomada nunca avança além de uma linha que falhou, para que ela seja
+    tentada de novo na próxima execução.
+    Com `track_offset=False` (partições paralelas) o ponto de retomada e o
+    status de conclusão ficam a cargo de quem coordena as partições; a
+    idempotência continua garantida pelos hashes.
+    Retorna (aplicadas, ja_aplicadas).
+    """
+    applied = already = 0
+    offset = arquivo.ultima_linha if track_offset else 0
+    pending = [record for record in records if line_of(record) > offset]
+    already += len(records) - len(pending)
+    failed = False
+
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        hashes = {hash_of(record) for record in chunk}
+        done = set(
+            ImportacaoLinha.objects.filter(rotina=arquivo.rotina, hash_conteudo__in=hashes)
+            .values_list('hash_conteudo', flat=True)
+        )
+        with transaction.atomic():
+            ledger_rows = []
+            for record in chunk:
+                digest = hash_of(record)
+                if digest in done:
+                    already += 1
+                    continue
+                try:
+                    with transaction.atomic():
+                        apply(record)
+                except Exception as exc:  # pylint: disable=broad-except
+                    on_error(record, exc)
+                    if not failed:
+                        failed = True
+                        arquivo.ultima_linha = max(arquivo.ultima_linha, line_of(record) - 1)
+                    continue
+                done.add(digest)
+                ledger_rows.append(
+                    ImportacaoLinha(arquivo=arquivo, rotina=arquivo.rotina, hash_conteudo=digest, linha=line_of(record))
+                )
+            ImportacaoLinha.objects.bulk_create(ledger_rows)
+            applied += len(ledger_rows)
+            if not track_offset:
+                ImportacaoArquivo.objects.filter(pk=arquivo.pk).update(
+                    linhas_aplicadas=F('linhas_aplicadas') + len(ledger_rows),
+                )
+                continue
+            if not failed:
+                arquivo.ultima_linha = max(line_of(record) for record in chunk)
+            ImportacaoArquivo.objects.filter(pk=arquivo.pk).update(
+                ultima_linha=arquivo.ultima_linha,
+                linhas_aplicadas=F('linhas_aplicadas') + len(ledger_rows),
+            )
+
+    if track_offset:
+        ImportacaoArquivo.objects.filter(pk=arquivo.pk).update(concluido=not failed)
+    return applied, already
+
+
+def finish_ledger(arquivo: ImportacaoArquivo, records: Sequence[T], *, line_of: Callable[[T], int], failed: bool) -> None:
+    """Fecha o ledger de uma carga paralela depois que todas as partições terminaram."""
+    updates = {'concluido': not failed}
+    if not failed and records:
+        updates['ultima_linha'] = max(line_of(record) for record in records)
+    ImportacaoArquivo.objects.filter(pk=arquivo.pk).update(**updates)
+
+
+# ============================================
+# CARGA PARALELA POR INSTRUMENTO
+# ============================================
+
+@dataclass
+class PartitionResult:
+    """Resultado de uma partição; somado entre processos ao final da carga."""
+
+    applied: int = 0
+    already: int = 0
+    failures: list[str] = field(default_factory=list)
+
+    def merge(self, other: PartitionResult) -> PartitionResult:
+        return PartitionResult(
+            applied=self.applied + other.applied,
+            already=self.already + other.already,
+            failures=self.failures + other.failures,
+        )
+
+
+def partition_records(records: Sequence[T], key_of: Callable[[T], Hashable], partitions: int) -> list[list[T]]:
+    """Divide os registros em até `partitions` grupos sem separar uma mesma chave.
+
+    Todos os eventos de um instrumento caem na mesma partição e mantêm a
+    ordem do arquivo; os grupos maiores são distribuídos primeiro para
+    equilibrar o volume entre os processos.
+    """
+    groups: dict[Hashable, list[T]] = {}
+    for record in records:
+        groups.setdefault(key_of(record), []).append(record)
+
+    buckets: list[list[T]] = [[] for _ in range(max(1, min(partitions, len(groups))))]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(buckets, key=len).extend(group)
+    return [bucket for bucket in buckets if bucket]
+
+
+def _close_inherited_connections() -> None:
+    # Cada processo abre a sua própria conexão; nunca reaproveita o socket do pai.
+    connections.close_all()
+
+
+def _close_connections_and_pools() -> None:
+    # close_all() só devolve a conexão ao pool psycopg, que os filhos herdariam
+    # com os sockets abertos do pai; fechar o pool faz cada filho criar o seu.
+    connections.close_all()
+    for connection in connections.all():
+        close_pool = getattr(connection, 'close_pool', None)
+        if close_pool is not None:
+            close_pool()
+
+
+def run_partitioned(
+    worker: Callable[[list[T]], PartitionResult],
+    partitions: Sequence[list[T]],
+    workers: int,
+) -> PartitionResult:
+    """Executa `worker` para cada partição em um pool de processos e junta os resultados.
+
+    `worker` precisa ser uma função de módulo (ou `functools.partial` dela)
+    para poder ser enviada aos processos filhos.
+    """
+    if workers <= 1 or len(partitions) <= 1:
+        results = [worker(partition) for partition in partitions]
+    else:
+        _close_connections_and_pools()
+        with ProcessPoolExecutor(max_workers=min(workers, len(partitions)), initializer=_close_inherited_connections) as pool:
+            results = list(pool.map(worker, partitions))
+
+    merged = PartitionResult()
+    for result in results:
+        merged = merged.merge(result)
+    return merged
@@ -0,0 +1,52 @@
+# Generated by Django 6.0.1 on 2026-10-19 04:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0017_alter_instrumento_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportacaoArquivo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rotina', models.CharField(max_length=100, verbose_name='Rotina')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='Hash do Arquivo')),
+                ('nome_arquivo', models.CharField(blank=True, max_length=255, verbose_name='Nome do Arquivo')),
+                ('total_linhas', models.PositiveIntegerField(default=0, verbose_name='Total de Linhas')),
+                ('linhas_aplicadas', models.PositiveIntegerField(default=0, verbose_name='Linhas Aplicadas')),
+                ('ultima_linha', models.PositiveIntegerField(default=0, help_text='Linha do CSV ao final do último lote gravado (ponto de retomada)', verbose_name='Última Linha Confirmada')),
+                ('concluido', models.BooleanField(default=False, verbose_name='Concluído')),
+                ('data_cadastro', models.DateTimeField(auto_now_add=True, verbose_name='Data de Cadastro')),
+                ('data_atualizacao', models.DateTimeField(auto_now=True, verbose_name='Data de Atualização')),
+            ],
+            options={
+                'verbose_name': 'Arquivo Importado',
+                'verbose_name_plural': 'Arquivos Importados',
+                'ordering': ['-data_cadastro'],
+                'unique_together': {('rotina', 'fingerprint')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportacaoLinha',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rotina', models.CharField(max_length=100, verbose_name='Rotina')),
+                ('hash_conteudo', models.CharField(max_length=64, verbose_name='Hash da Linha')),
+                ('linha', models.PositiveIntegerField(verbose_name='Linha no Arquivo')),
+                ('data_aplicacao', models.DateTimeField(auto_now_add=True, verbose_name='Data de Aplicação')),
+                ('arquivo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='linhas', to='cadastro.importacaoarquivo', verbose_name='Arquivo')),
+            ],
+            options={
+                'verbose_name': 'Linha Importada',
+                'verbose_name_plural': 'Linhas Importadas',
+                'ordering': ['arquivo', 'linha'],
+                'unique_together': {('rotina', 'hash_conteudo')},
+            },
+        ),
+    ]
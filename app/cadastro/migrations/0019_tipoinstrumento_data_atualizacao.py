@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 04:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0018_importacaoarquivo_importacaolinha'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tipoinstrumento',
+            name='data_atualizacao',
+            field=models.DateTimeField(auto_now=True, verbose_name='Data de Atualização'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-19 04:54
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def normalizar_busca(value):
+    sem_acento = unicodedata.normalize('NFKD', value or '').encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sem_acento.lower().split())
+
+
+def preencher_nome_busca(apps, schema_editor):
+    Funcionario = apps.get_model('cadastro', 'Funcionario')
+    funcionarios = list(Funcionario.objects.only('id', 'nome'))
+    for funcionario in funcionarios:
+        funcionario.nome_busca = normalizar_busca(funcionario.nome)
+    Funcionario.objects.bulk_update(funcionarios, ['nome_busca'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0019_tipoinstrumento_data_atualizacao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='funcionario',
+            name='nome_busca',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200, verbose_name='Nome para Busca'),
+        ),
+        migrations.RunPython(preencher_nome_busca, migrations.RunPython.noop),
+    ]
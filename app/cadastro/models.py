@@ -1,13 +1,23 @@
+import unicodedata
+
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
 
+def normalizar_busca(value):
+    """Minúsculas, sem acentos e com espaços simples: forma usada nas buscas por prefixo."""
+    sem_acento = unicodedata.normalize('NFKD', value or '').encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sem_acento.lower().split())
+
+
 class Funcionario(models.Model):
     """Modelo para cadastro de funcionários"""
     
     matricula = models.CharField('Matrícula', max_length=20, unique=True)
     nome = models.CharField('Nome Completo', max_length=200)
+    # Mantido em save(); cargas em lote (bulk_create/bulk_update) preenchem explicitamente
+    nome_busca = models.CharField('Nome para Busca', max_length=200, blank=True, db_index=True, editable=False)
     email = models.EmailField('E-mail', blank=True, null=True)
     cargo = models.CharField('Cargo', max_length=100, blank=True)
     setor = models.ForeignKey(
@@ -32,12 +42,20 @@ class Funcionario(models.Model):
     def __str__(self):
         return f"{self.matricula} - {self.nome}"
 
+    def save(self, *args, **kwargs):
+        self.nome_busca = normalizar_busca(self.nome)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'nome' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'nome_busca'}
+        super().save(*args, **kwargs)
+
 
 class TipoInstrumento(models.Model):
     """Tipos de instrumento cadastravel (ex: trena, paquímetro, micrômetro)"""
     descricao = models.CharField('Descrição', max_length=100, unique=True)
     ativo = models.BooleanField('Ativo', default=True)
     documento_qualidade = models.CharField('Documento de Qualidade', max_length=100, blank=True)
+    data_atualizacao = models.DateTimeField('Data de Atualização', auto_now=True)
 
     class Meta:
         verbose_name = 'Tipo de Instrumento'
@@ -317,3 +335,54 @@ class HistoricoCalibracao(models.Model):
         super().save(*args, **kwargs)
 
 
+
+
+class ImportacaoArquivo(models.Model):
+    """Arquivo CSV processado por uma rotina de importação (identificado pelo hash do conteúdo)."""
+
+    rotina = models.CharField('Rotina', max_length=100)
+    fingerprint = models.CharField('Hash do Arquivo', max_length=64)
+    nome_arquivo = models.CharField('Nome do Arquivo', max_length=255, blank=True)
+    total_linhas = models.PositiveIntegerField('Total de Linhas', default=0)
+    linhas_aplicadas = models.PositiveIntegerField('Linhas Aplicadas', default=0)
+    ultima_linha = models.PositiveIntegerField(
+        'Última Linha Confirmada',
+        default=0,
+        help_text='Linha do CSV ao final do último lote gravado (ponto de retomada)'
+    )
+    concluido = models.BooleanField('Concluído', default=False)
+    data_cadastro = models.DateTimeField('Data de Cadastro', auto_now_add=True)
+    data_atualizacao = models.DateTimeField('Data de Atualização', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Arquivo Importado'
+        verbose_name_plural = 'Arquivos Importados'
+        ordering = ['-data_cadastro']
+        unique_together = [['rotina', 'fingerprint']]
+
+    def __str__(self):
+        return f"{self.rotina} - {self.nome_arquivo or self.fingerprint[:12]}"
+
+
+class ImportacaoLinha(models.Model):
+    """Linha já aplicada por uma rotina de importação, identificada pelo hash do seu conteúdo."""
+
+    arquivo = models.ForeignKey(
+        ImportacaoArquivo,
+        on_delete=models.CASCADE,
+        verbose_name='Arquivo',
+        related_name='linhas'
+    )
+    rotina = models.CharField('Rotina', max_length=100)
+    hash_conteudo = models.CharField('Hash da Linha', max_length=64)
+    linha = models.PositiveIntegerField('Linha no Arquivo')
+    data_aplicacao = models.DateTimeField('Data de Aplicação', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Linha Importada'
+        verbose_name_plural = 'Linhas Importadas'
+        ordering = ['arquivo', 'linha']
+        unique_together = [['rotina', 'hash_conteudo']]
+
+    def __str__(self):
+        return f"{self.rotina} - linha {self.linha}"
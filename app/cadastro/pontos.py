@@ -0,0 +1,67 @@
+"""Pontos de calibração com a última análise, para um ou vários instrumentos.
+
+A consulta junta cada ponto às suas análises (`StatusPontoCalibracao`) e
+mantém só a mais recente com `DISTINCT ON` no PostgreSQL; em bancos sem
+`DISTINCT ON` usa `ROW_NUMBER()`. Em ambos os casos é uma única consulta,
+independente da quantidade de instrumentos.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import PontoCalibracao
+
+ULTIMA_ANALISE_CAMPOS = {
+    'ultima_data_analise': 'status_pontos__data_criacao',
+    'ultima_incerteza': 'status_pontos__incerteza',
+    'ultima_tendencia': 'status_pontos__tendencia',
+    'ultima_resultado': 'status_pontos__resultado',
+}
+LOTE_MAX_INSTRUMENTOS = 200
+
+
+def pontos_com_ultima_analise(instrumento_ids: Iterable[int], only_ativo: bool = False) -> list[PontoCalibracao]:
+    """Pontos dos instrumentos anotados com os campos da última análise, ordenados por instrumento e sequência."""
+    ids = set(instrumento_ids)
+    if not ids:
+        return []
+
+    pontos = PontoCalibracao.objects.filter(instrumento_id__in=ids)
+    if only_ativo:
+        pontos = pontos.filter(ativo=True)
+    pontos = pontos.annotate(**{nome: F(caminho) for nome, caminho in ULTIMA_ANALISE_CAMPOS.items()})
+    mais_recente = (F('status_pontos__data_criacao').desc(nulls_last=True), F('status_pontos__id').desc(nulls_last=True))
+
+    if connection.features.can_distinct_on_fields:
+        pontos = pontos.order_by('instrumento_id', 'sequencia', 'id', *mais_recente).distinct('instrumento_id', 'sequencia', 'id')
+    else:
+        pontos = pontos.annotate(
+            posicao=Window(RowNumber(), partition_by=[F('id')], order_by=list(mais_recente))
+        ).filter(posicao=1).order_by('instrumento_id', 'sequencia', 'id')
+    return list(pontos)
+
+
+def serialize_ponto(p: PontoCalibracao) -> dict:
+    """Formato usado pelas APIs de pontos (individual, lote e dossiê)."""
+    return {
+        'id': p.id,
+        'sequencia': p.sequencia,
+        'descricao': p.descricao,
+        'valor_nominal': f"{str(p.valor_maximo)} - {str(p.valor_minimo)}",
+        'valor_nominal_maximo': p.valor_maximo,
+        'valor_nominal_minimo': p.valor_minimo,
+        'unidade': p.unidade,
+        'unidade_display': p.get_unidade_display(),
+        'tolerancia_mais': str(p.tolerancia_mais) if p.tolerancia_mais else '',
+        'tolerancia_menos': str(p.tolerancia_menos) if p.tolerancia_menos else '',
+        'observacoes': p.observacoes,
+        'ativo': p.ativo,
+        'ultima_data_analise': p.ultima_data_analise.isoformat() if getattr(p, 'ultima_data_analise', None) else None,
+        'ultima_incerteza': str(p.ultima_incerteza) if getattr(p, 'ultima_incerteza', None) is not None else None,
+        'ultima_tendencia': p.ultima_tendencia or '',
+        'ultima_resultado': p.ultima_resultado or None,
+    }
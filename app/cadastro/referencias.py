@@ -0,0 +1,87 @@
+"""Listas de referência (tipos, setores, laboratórios, funcionários) compartilhadas pelas telas.
+
+As listas ficam no cache em dois níveis (`calimag.cache.TwoTierCache`): um
+LRU por processo, que responde sem ir ao banco, e o cache compartilhado do
+Django sob uma chave com a versão das tabelas (`condicional.version_token`).
+A versão é reconferida no máximo a cada `REFERENCIA_CACHE_LOCAL_TTL`
+segundos; os sinais de `signals.py` descartam as entradas locais assim que
+uma alteração é confirmada. Outros processos enxergam a mudança ao
+reconferir a versão, então nenhuma lista antiga sobrevive a esse intervalo.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Callable, Iterable, Sequence, TypeVar
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Model
+
+from calimag.cache import TwoTierCache
+from calimag.replica import banco_de_leitura
+
+from .condicional import version_token
+from .models import Funcionario, Laboratorio, Setor, TipoInstrumento
+
+T = TypeVar('T')
+
+
+def _versao(models: Iterable[type[Model]]) -> str:
+    versao = '|'.join(version_token(model) for model in models)
+    return hashlib.sha1(versao.encode('utf-8')).hexdigest()
+
+
+referencias_cache = TwoTierCache(
+    _versao,
+    prefix='referencia',
+    maxsize=settings.REFERENCIA_CACHE_LOCAL_MAXSIZE,
+    local_ttl=settings.REFERENCIA_CACHE_LOCAL_TTL,
+    timeout=settings.REFERENCIA_CACHE_TIMEOUT,
+)
+
+
+def cached_reference(nome: str, models: Sequence[type[Model]], builder: Callable[[], T]) -> T:
+    """Devolve `builder()` do cache enquanto as tabelas em `models` não mudarem.
+
+    O valor é compartilhado entre requisições: quem chama não deve alterá-lo.
+    Réplica e primário têm entradas separadas: a réplica atrasada não pode
+    devolver uma lista antiga a quem acabou de gravar e lê do primário.
+    """
+    return referencias_cache.get_or_set(f'{nome}@{banco_de_leitura()}', models, builder)
+
+
+def invalidar_referencias(*models: type[Model]) -> None:
+    """Descarta as listas que dependem de `models` quando a transação atual confirmar.
+
+    Sinais já chamam isto; use em cargas em massa (`bulk_create`, `update`).
+    """
+    transaction.on_commit(lambda: referencias_cache.invalidate(*models))
+
+
+def tipos_instrumento_ativos() -> list[dict]:
+    return cached_reference('tipos_instrumento', (TipoInstrumento,), lambda: [
+        {'id': t.id, 'descricao': t.descricao, 'documento_qualidade': t.documento_qualidade}
+        for t in TipoInstrumento.objects.filter(ativo=True).order_by('descricao')
+    ])
+
+
+def setores_ativos() -> list[dict]:
+    return cached_reference('setores', (Setor,), lambda: [
+        {'id': s.id, 'nome': s.nome}
+        for s in Setor.objects.filter(ativo=True).order_by('nome')
+    ])
+
+
+def laboratorios_ativos() -> list[dict]:
+    return cached_reference('laboratorios', (Laboratorio,), lambda: [
+        {'id': l.id, 'nome': l.nome}
+        for l in Laboratorio.objects.filter(ativo=True).order_by('nome')
+    ])
+
+
+def funcionarios_compactos() -> list[list]:
+    """Funcionários ativos como [id, matricula, nome], sem chaves repetidas por item."""
+    return cached_reference('funcionarios_compactos', (Funcionario,), lambda: [
+        list(row)
+        for row in Funcionario.objects.filter(ativo=True).order_by('nome').values_list('id', 'matricula', 'nome')
+    ])
@@ -0,0 +1,61 @@
+"""Resposta JSON das APIs com serialização rápida.
+
+Usa `orjson` (datetime, date e UUID nativos em C; `Decimal` e o resto via
+`default`). Sem `orjson` instalado cai no `json` da biblioteca padrão com o
+mesmo formato de saída, então o contrato das APIs não depende do encoder.
+As views podem entregar `datetime`/`Decimal` direto no dict, sem chamar
+`.isoformat()`/`str()` linha a linha.
+"""
+from __future__ import annotations
+
+import datetime
+import json
+from decimal import Decimal
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from calimag.instrumentacao import medir_serializacao
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+
+class _StdlibEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder corta microssegundos; mantém o formato de `isoformat()` e do orjson.
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+_django_default = _StdlibEncoder().default
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return str(obj)
+    # timedelta, UUID subclasses, textos lazy etc.: mesmas regras do DjangoJSONEncoder.
+    return _django_default(obj)
+
+
+def dumps(data: Any) -> bytes:
+    """Serializa `data` em JSON (bytes UTF-8)."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, cls=_StdlibEncoder).encode('utf-8')
+
+
+class FastJsonResponse(HttpResponse):
+    """Substituto do `JsonResponse` do Django que serializa com `dumps`."""
+
+    def __init__(self, data: Any, safe: bool = True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError('In order to allow non-dict objects to be serialized set the safe parameter to False.')
+        kwargs.setdefault('content_type', 'application/json')
+        with medir_serializacao():
+            content = dumps(data)
+        super().__init__(content=content, **kwargs)
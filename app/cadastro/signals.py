@@ -1,7 +1,8 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.core.exceptions import ValidationError
-from .models import Instrumento
+from .models import Funcionario, Instrumento, Laboratorio, Setor, TipoInstrumento
+from .referencias import invalidar_referencias
 
 
 @receiver(pre_save, sender=Instrumento)
@@ -12,3 +13,13 @@ def validar_instrumento_antes_salvar(sender, instance, **kwargs):
     """
     if instance.pk:  # Só valida em updates
         instance.clean()
+
+
+@receiver([post_save, post_delete], sender=TipoInstrumento)
+@receiver([post_save, post_delete], sender=Setor)
+@receiver([post_save, post_delete], sender=Laboratorio)
+@receiver([post_save, post_delete], sender=Funcionario)
+@receiver([post_save, post_delete], sender=Instrumento)
+def invalidar_cache_referencia(sender, **kwargs):
+    """Descarta as listas de referência em cache que dependem do model alterado."""
+    invalidar_referencias(sender)
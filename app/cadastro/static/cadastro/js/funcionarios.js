@@ -0,0 +1,251 @@
+window.funcCurrentPage = window.funcCurrentPage ?? 1;
+window.funcSearchTimeout = window.funcSearchTimeout ?? null;
+
+document.addEventListener('DOMContentLoaded', function() {
+    if (typeof window.loadFuncionarios === 'function') window.loadFuncionarios();
+    if (typeof window.loadSetoresForSelect === 'function') window.loadSetoresForSelect();
+});
+
+window.loadSetoresForSelect = async function() {
+    try {
+        const resp = await fetch('/cadastro/api/setores/');
+        const data = await resp.json();
+        const sel = document.getElementById('setor');
+        sel.innerHTML = '<option value="">-- Selecione --</option>';
+        (data.setores || []).forEach(s => {
+            const opt = document.createElement('option');
+            opt.value = s.id;
+            opt.textContent = s.nome;
+            sel.appendChild(opt);
+        });
+    } catch (e) {
+        showToast('Erro ao carregar setores', 'error');
+    }
+}
+
+window.loadFuncionarios = async function(page = 1) {
+    window.funcCurrentPage = page;
+    const search = document.getElementById('searchInput').value;
+    try {
+        showFuncionariosTableLoading();
+        const resp = await fetch(`/cadastro/api/funcionarios/lista/?page=${page}&search=${encodeURIComponent(search)}`);
+        const data = await resp.json();
+        renderTable(data.funcionarios);
+        renderPagination(data.pagination);
+    } catch (e) {
+        showToast('Erro ao carregar funcionários', 'error');
+    }
+}
+
+function showFuncionariosTableLoading() {
+    const tbody = document.getElementById('funcionariosTable');
+    if (!tbody) return;
+    tbody.innerHTML = `
+        <tr>
+            <td colspan="8" class="px-6 py-8 text-center">
+                <div class="flex flex-col items-center gap-3 text-gray-500">
+                    <svg class="h-6 w-6 animate-spin text-indigo-600" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" aria-hidden="true">
+                        <circle class="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" stroke-width="4"></circle>
+                        <path class="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8v4a4 4 0 00-4 4H4z"></path>
+                    </svg>
+                    <span class="text-sm">Carregando funcionários...</span>
+                </div>
+            </td>
+        </tr>`;
+}
+
+function renderTable(funcionarios) {
+    const tbody = document.getElementById('funcionariosTable');
+    if (!funcionarios || funcionarios.length === 0) {
+        tbody.innerHTML = `
+            <tr>
+                <td colspan="8" class="px-6 py-4 text-center text-gray-500">Nenhum funcionário encontrado</td>
+            </tr>
+        `;
+        return;
+    }
+
+    tbody.innerHTML = funcionarios.map(f => {
+        const status = f.ativo ? '<span class="px-2 py-1 text-xs rounded-full bg-green-100 text-green-800">Ativo</span>' : '<span class="px-2 py-1 text-xs rounded-full bg-gray-100 text-gray-800">Inativo</span>';
+        return `
+            <tr class="hover:bg-gray-50">
+                <td class="px-6 py-4 whitespace-nowrap font-medium text-gray-900">${f.matricula}</td>
+                <td class="px-6 py-4">${f.nome}</td>
+                <td class="px-6 py-4">${f.cargo || '-'}</td>
+                <td class="px-6 py-4">${f.setor || '-'}</td>
+                <td class="px-6 py-4">${f.telefone || '-'}</td>
+                <td class="px-6 py-4">${f.data_admissao || '-'}</td>
+                <td class="px-6 py-4">${status}</td>
+                <td class="px-6 py-4 text-right">
+                    <button onclick='openEditModal(${JSON.stringify(f)})' class="text-blue-600 hover:text-blue-900 mr-3">Editar</button>
+                </td>
+            </tr>
+        `;
+    }).join('');
+}
+
+function renderPagination(pagination) {
+    document.getElementById('paginationInfo').textContent = `página ${pagination.page} de ${pagination.pages} (${pagination.total} registros)`;
+    const buttons = document.getElementById('paginationButtons');
+    let html = '';
+    if (pagination.has_previous) html += `<button onclick="loadFuncionarios(${pagination.page - 1})" class="px-3 py-1 border rounded hover:bg-gray-100">Anterior</button>`;
+    if (pagination.has_next) html += `<button onclick="loadFuncionarios(${pagination.page + 1})" class="px-3 py-1 border rounded hover:bg-gray-100">Próximo</button>`;
+    buttons.innerHTML = html;
+}
+
+function renderCsvErrors(errors = []) {
+    const box = document.getElementById('funcCsvErrors');
+    if (!box) return;
+    if (!errors.length) {
+        box.textContent = '';
+        box.classList.add('hidden');
+        return;
+    }
+    const preview = errors.slice(0, 5).map(err => `Linha ${err.line}: ${err.error}`).join(' | ');
+    const suffix = errors.length > 5 ? ' ...' : '';
+    box.textContent = `${errors.length} linha(s) ignoradas. ${preview}${suffix}`;
+    box.classList.remove('hidden');
+}
+
+async function uploadFuncionariosCsv() {
+    const input = document.getElementById('funcCsvInput');
+    if (!input || !input.files.length) {
+        showToast('Selecione um arquivo CSV para importar.', 'error');
+        return;
+    }
+    const formData = new FormData();
+    formData.append('file', input.files[0]);
+
+    try {
+        const resp = await fetch('/cadastro/api/funcionarios/import/', {
+            method: 'POST',
+            headers: { 'X-CSRFToken': csrfToken },
+            body: formData,
+        });
+        const result = await resp.json();
+        if (resp.ok && result.success) {
+            renderCsvErrors(result.errors || []);
+            const stats = result.stats || {};
+            const summary = `Importação concluída (${stats.created || 0} novo(s), ${stats.updated || 0} atualizado(s))`;
+            showToast(result.message || summary, 'success');
+            loadFuncionarios(1);
+        } else {
+            renderCsvErrors(result.errors || []);
+            showToast(result.message || 'Erro ao importar funcionários.', 'error');
+        }
+    } catch (err) {
+        renderCsvErrors([{ line: '-', error: 'Falha inesperada durante o envio.' }]);
+        showToast('Erro ao importar funcionários.', 'error');
+    } finally {
+        input.value = '';
+    }
+}
+
+function searchFuncionarios() {
+    clearTimeout(searchTimeout);
+    searchTimeout = setTimeout(() => loadFuncionarios(1), 500);
+}
+
+function openCreateModal() {
+    document.getElementById('modalTitle').textContent = 'Novo Funcionário';
+    document.getElementById('funcForm').reset();
+    document.getElementById('funcId').value = '';
+    document.getElementById('ativo').checked = true;
+    document.getElementById('funcModal').classList.remove('hidden');
+}
+
+function openEditModal(func) {
+    document.getElementById('modalTitle').textContent = 'Editar Funcionário';
+    document.getElementById('funcId').value = func.id;
+    document.getElementById('matricula').value = func.matricula;
+    document.getElementById('nome').value = func.nome;
+    document.getElementById('email').value = func.email || '';
+    document.getElementById('cargo').value = func.cargo || '';
+    document.getElementById('setor').value = func.setor_id || '';
+    document.getElementById('telefone').value = func.telefone || '';
+    document.getElementById('data_admissao').value = func.data_admissao || '';
+    document.getElementById('ativo').checked = func.ativo;
+    document.getElementById('funcModal').classList.remove('hidden');
+}
+
+function closeModal() { document.getElementById('funcModal').classList.add('hidden'); }
+function openDeleteModal(id) { document.getElementById('deleteFuncId').value = id; document.getElementById('deleteModal').classList.remove('hidden'); }
+function closeDeleteModal() { document.getElementById('deleteModal').classList.add('hidden'); }
+
+// Submit form
+document.getElementById('funcForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    const submitBtn = e.submitter || document.getElementById('btnSaveFunc');
+    const originalText = submitBtn ? submitBtn.textContent : '';
+    const id = document.getElementById('funcId').value;
+    const isEdit = id !== '';
+    const payload = {
+        matricula: document.getElementById('matricula').value,
+        nome: document.getElementById('nome').value,
+        email: document.getElementById('email').value,
+        cargo: document.getElementById('cargo').value,
+        setor: document.getElementById('setor').value,
+        telefone: document.getElementById('telefone').value,
+        data_admissao: document.getElementById('data_admissao').value || null,
+        ativo: document.getElementById('ativo').checked,
+    };
+
+    if (submitBtn) {
+        submitBtn.disabled = true;
+        submitBtn.classList.add('opacity-70');
+        submitBtn.textContent = 'Salvando...';
+    }
+
+    try {
+        const url = isEdit ? `/cadastro/api/funcionarios/${id}/update/` : '/cadastro/api/funcionarios/create/';
+        const resp = await fetch(url, {
+            method: isEdit ? 'PUT' : 'POST',
+            headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken },
+            body: JSON.stringify(payload)
+        });
+        const result = await resp.json();
+        if (result.success) {
+            showToast(result.message, 'success');
+            closeModal();
+            loadFuncionarios(window.funcCurrentPage);
+        } else {
+            showToast(result.message || 'Erro', 'error');
+        }
+    } catch (err) {
+        showToast('Erro ao salvar funcionário', 'error');
+    } finally {
+        if (submitBtn) {
+            submitBtn.disabled = false;
+            submitBtn.classList.remove('opacity-70');
+            submitBtn.textContent = originalText || 'Salvar';
+        }
+    }
+});
+
+// Delete
+async function confirmDelete() {
+    const id = document.getElementById('deleteFuncId').value;
+    try {
+        const resp = await fetch(`/cadastro/api/funcionarios/${id}/delete/`, { method: 'DELETE', headers: { 'X-CSRFToken': csrfToken } });
+        const result = await resp.json();
+        if (result.success) {
+            showToast(result.message, 'success');
+            closeDeleteModal();
+            loadFuncionarios(window.funcCurrentPage);
+        } else {
+            showToast(result.message || 'Erro', 'error');
+        }
+    } catch (err) {
+        showToast('Erro ao excluir funcionário', 'error');
+    }
+}
+
+// Toast
+function showToast(message, type = 'success') {
+    const toast = document.getElementById('toast');
+    const toastMessage = document.getElementById('toastMessage');
+    toastMessage.textContent = message;
+    toast.className = `fixed top-4 right-4 z-50 px-6 py-4 rounded-lg shadow-lg text-white ${type === 'success' ? 'bg-green-500' : 'bg-red-500'}`;
+    toast.classList.remove('hidden');
+    setTimeout(() => toast.classList.add('hidden'), 3000);
+}
@@ -0,0 +1,989 @@
+window.instCurrentPage = window.instCurrentPage ?? 1;
+window.instSearchTimeout = window.instSearchTimeout ?? null;
+
+// Load instrumentos on page load
+document.addEventListener('DOMContentLoaded', function() {
+    if (typeof window.loadInstrumentos === 'function') window.loadInstrumentos();
+    if (typeof window.loadTiposInstrumento === 'function') window.loadTiposInstrumento();
+    if (typeof window.setupInstrumentoFilters === 'function') window.setupInstrumentoFilters();
+});
+
+// Load Instrumentos
+window.loadInstrumentos = async function(page = 1) {
+    window.instCurrentPage = page;
+    const query = buildInstrumentosQuery(page);
+    
+    try {
+        showInstrumentosTableLoading();
+        const response = await fetch(`/cadastro/api/instrumentos/?${query}`);
+        const data = await response.json();
+        
+        renderTable(data.instrumentos);
+        renderPagination(data.pagination);
+    } catch (error) {
+        showToast('Erro ao carregar instrumentos', 'error');
+    }
+}
+
+function showInstrumentosTableLoading() {
+    const tbody = document.getElementById('instrumentosTable');
+    if (!tbody) return;
+    tbody.innerHTML = `
+        <tr>
+            <td colspan="8" class="px-6 py-8 text-center">
+                <div class="flex flex-col items-center gap-3 text-gray-500">
+                    <svg class="h-6 w-6 animate-spin text-indigo-600" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" aria-hidden="true">
+                        <circle class="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" stroke-width="4"></circle>
+                        <path class="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8v4a4 4 0 00-4 4H4z"></path>
+                    </svg>
+                    <span class="text-sm">Carregando instrumentos...</span>
+                </div>
+            </td>
+        </tr>`;
+}
+
+// Load tipos de instrumento
+async function loadTiposInstrumento() {
+    try {
+        const resp = await fetch('/cadastro/api/tipos_instrumento/');
+        const data = await resp.json();
+        const modalSelect = document.getElementById('tipo_instrumento_id');
+        if (modalSelect) {
+            modalSelect.innerHTML = '<option value="">Selecione...</option>';
+            data.tipos.forEach(t => {
+                modalSelect.innerHTML += `<option value="${t.id}">${t.descricao}</option>`;
+            });
+        }
+        const filterSelect = document.getElementById('filterTipo');
+        if (filterSelect) {
+            const currentValue = filterSelect.value;
+            filterSelect.innerHTML = '<option value="">Todos</option>';
+            data.tipos.forEach(t => {
+                filterSelect.innerHTML += `<option value="${t.id}">${t.descricao}</option>`;
+            });
+            if (currentValue) {
+                filterSelect.value = currentValue;
+            }
+        }
+    } catch (e) {
+        console.error('Erro ao carregar tipos de instrumento:', e);
+    }
+}
+
+function buildInstrumentosQuery(page) {
+    const params = new URLSearchParams();
+    params.append('page', page);
+    const searchInput = document.getElementById('searchInput');
+    const search = searchInput ? searchInput.value.trim() : '';
+    if (search) params.append('search', search);
+
+    const codigoInput = document.getElementById('filterCodigo');
+    if (codigoInput && codigoInput.value.trim()) {
+        params.append('codigo', codigoInput.value.trim());
+    }
+
+    const tipoSelect = document.getElementById('filterTipo');
+    if (tipoSelect && tipoSelect.value) {
+        params.append('tipo_id', tipoSelect.value);
+    }
+
+    const statusSelect = document.getElementById('filterStatus');
+    if (statusSelect && statusSelect.value) {
+        params.append('status', statusSelect.value);
+    }
+
+    const controladoSelect = document.getElementById('filterControlado');
+    if (controladoSelect && controladoSelect.value) {
+        params.append('controlado', controladoSelect.value);
+    }
+
+    const finalidadeSelect = document.getElementById('filterFinalidade');
+    if (finalidadeSelect && finalidadeSelect.value) {
+        params.append('finalidade', finalidadeSelect.value);
+    }
+
+    const disponivelEntregaSelect = document.getElementById('filterDisponivelEntrega');
+    if (disponivelEntregaSelect && disponivelEntregaSelect.value) {
+        params.append('disponivel_entrega', disponivelEntregaSelect.value);
+    }
+
+    return params.toString();
+}
+
+function escapeHtml(value) {
+    return String(value ?? '')
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
+async function fetchAllInstrumentosForExport() {
+    const params = new URLSearchParams(buildInstrumentosQuery(1));
+    params.set('page', '1');
+    params.set('per_page', '200');
+
+    const firstResponse = await fetch(`/cadastro/api/instrumentos/?${params.toString()}`);
+    if (!firstResponse.ok) {
+        throw new Error('Falha ao carregar instrumentos para exportaÃ§Ã£o');
+    }
+
+    const firstData = await firstResponse.json();
+    const items = [...(firstData.instrumentos || [])];
+    const totalPages = Number(firstData.pagination?.pages || 1);
+
+    for (let page = 2; page <= totalPages; page += 1) {
+        params.set('page', String(page));
+        const response = await fetch(`/cadastro/api/instrumentos/?${params.toString()}`);
+        if (!response.ok) {
+            throw new Error('Falha ao carregar todas as pÃ¡ginas para exportaÃ§Ã£o');
+        }
+        const data = await response.json();
+        items.push(...(data.instrumentos || []));
+    }
+
+    return items;
+}
+
+function csvEscape(value) {
+    const normalized = String(value ?? '').replace(/"/g, '""');
+    return `"${normalized}"`;
+}
+
+function buildInstrumentosCsv(instrumentos) {
+    const headers = ['Codigo', 'Descricao', 'Tipo', 'Finalidade', 'Controlado', 'Pontos', 'Status'];
+    const rows = instrumentos.map(inst => ([
+        inst.codigo,
+        inst.descricao || '-',
+        inst.tipo || '-',
+        inst.finalidade_display || inst.finalidade || '-',
+        inst.controlado ? 'Sim' : 'Nao',
+        inst.total_pontos ?? 0,
+        inst.status || '-',
+    ].map(csvEscape).join(';')));
+
+    return [headers.map(csvEscape).join(';'), ...rows].join('\r\n');
+}
+
+async function exportInstrumentosCsv() {
+    const button = document.getElementById('exportCsvBtn');
+    const originalContent = button ? button.innerHTML : '';
+
+    try {
+        if (button) {
+            button.disabled = true;
+            button.classList.add('opacity-60', 'cursor-not-allowed');
+        }
+
+        const instrumentos = await fetchAllInstrumentosForExport();
+        const csvContent = buildInstrumentosCsv(instrumentos);
+        const blob = new Blob(["\uFEFF" + csvContent], { type: 'text/csv;charset=utf-8;' });
+        const url = URL.createObjectURL(blob);
+        const link = document.createElement('a');
+        const dateStamp = new Date().toISOString().slice(0, 10);
+
+        link.href = url;
+        link.download = `instrumentos-${dateStamp}.csv`;
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+        URL.revokeObjectURL(url);
+    } catch (error) {
+        showToast(error.message || 'Erro ao exportar CSV', 'error');
+    } finally {
+        if (button) {
+            button.disabled = false;
+            button.classList.remove('opacity-60', 'cursor-not-allowed');
+            button.innerHTML = originalContent;
+        }
+    }
+}
+
+function buildInstrumentosPdfHtml(instrumentos) {
+    const generatedAt = new Date().toLocaleString('pt-BR');
+    const rows = instrumentos.map(inst => `
+        <tr>
+            <td>${escapeHtml(inst.codigo)}</td>
+            <td>${escapeHtml(inst.descricao || '-')}</td>
+            <td>${escapeHtml(inst.tipo || '-')}</td>
+            <td>${escapeHtml(inst.finalidade_display || inst.finalidade || '-')}</td>
+            <td>${inst.controlado ? 'Sim' : 'NÃ£o'}</td>
+            <td>${escapeHtml(inst.total_pontos ?? 0)}</td>
+            <td>${escapeHtml(inst.status || '-')}</td>
+        </tr>
+    `).join('');
+
+    return `
+        <!DOCTYPE html>
+        <html lang="pt-BR">
+        <head>
+            <meta charset="utf-8">
+            <title>Instrumentos - ExportaÃ§Ã£o PDF</title>
+            <style>
+                @page { size: A4 landscape; margin: 12mm; }
+                body { font-family: Arial, sans-serif; color: #111827; margin: 0; }
+                .header { display: flex; justify-content: space-between; align-items: flex-end; margin-bottom: 16px; }
+                .title { font-size: 20px; font-weight: 700; margin: 0; }
+                .subtitle { font-size: 12px; color: #4b5563; margin-top: 4px; }
+                .meta { font-size: 12px; color: #374151; text-align: right; }
+                table { width: 100%; border-collapse: collapse; table-layout: fixed; }
+                th, td { border: 1px solid #d1d5db; padding: 8px; font-size: 11px; vertical-align: top; word-break: break-word; }
+                th { background: #f3f4f6; text-align: left; }
+                tbody tr:nth-child(even) { background: #f9fafb; }
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <div>
+                    <h1 class="title">Instrumentos de CalibraÃ§Ã£o</h1>
+                    <div class="subtitle">ExportaÃ§Ã£o da listagem com os filtros atuais</div>
+                </div>
+                <div class="meta">
+                    <div>Gerado em: ${escapeHtml(generatedAt)}</div>
+                    <div>Total: ${escapeHtml(instrumentos.length)} registro(s)</div>
+                </div>
+            </div>
+            <table>
+                <thead>
+                    <tr>
+                        <th>CÃ³digo</th>
+                        <th>DescriÃ§Ã£o</th>
+                        <th>Tipo</th>
+                        <th>Finalidade</th>
+                        <th>Controlado</th>
+                        <th>Pontos</th>
+                        <th>Status</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    ${rows || '<tr><td colspan="7">Nenhum instrumento encontrado.</td></tr>'}
+                </tbody>
+            </table>
+        </body>
+        </html>
+    `;
+}
+
+async function exportInstrumentosPdf() {
+    const button = document.getElementById('exportPdfBtn');
+    const originalContent = button ? button.innerHTML : '';
+
+    try {
+        if (button) {
+            button.disabled = true;
+            button.classList.add('opacity-60', 'cursor-not-allowed');
+        }
+
+        const instrumentos = await fetchAllInstrumentosForExport();
+        const printWindow = window.open('', '_blank', 'width=1200,height=800');
+
+        if (!printWindow) {
+            throw new Error('NÃ£o foi possÃ­vel abrir a janela de exportaÃ§Ã£o');
+        }
+
+        printWindow.document.open();
+        printWindow.document.write(buildInstrumentosPdfHtml(instrumentos));
+        printWindow.document.close();
+        printWindow.focus();
+        printWindow.onload = () => {
+            printWindow.print();
+        };
+    } catch (error) {
+        showToast(error.message || 'Erro ao exportar PDF', 'error');
+    } finally {
+        if (button) {
+            button.disabled = false;
+            button.classList.remove('opacity-60', 'cursor-not-allowed');
+            button.innerHTML = originalContent;
+        }
+    }
+}
+
+function setupInstrumentoFilters() {
+    const form = document.getElementById('instrumentoFilterForm');
+    if (form) {
+        form.addEventListener('submit', (event) => {
+            event.preventDefault();
+            loadInstrumentos(1);
+        });
+    }
+
+    const clearBtn = document.getElementById('clearFilterBtn');
+    if (clearBtn && form) {
+        clearBtn.addEventListener('click', () => {
+            form.reset();
+            loadInstrumentos(1);
+        });
+    }
+}
+
+// Load Setores
+// Render Table
+function renderTable(instrumentos) {
+    const tbody = document.getElementById('instrumentosTable');
+    
+    if (instrumentos.length === 0) {
+        tbody.innerHTML = `
+            <tr>
+                <td colspan="8" class="px-6 py-4 text-center text-gray-500">
+                    Nenhum instrumento encontrado
+                </td>
+            </tr>
+        `;
+        return;
+    }
+    
+    tbody.innerHTML = instrumentos.map(inst => {
+        const statusColors = {
+            'ativo': 'green',
+            'inativo': 'gray',
+            'manutencao': 'yellow',
+            'descartado': 'red'
+        };
+        const color = statusColors[inst.status_value] || 'gray';
+        const controladoBadge = inst.controlado
+            ? '<span class="px-2 py-1 text-xs rounded-full bg-emerald-100 text-emerald-800">Sim</span>'
+            : '<span class="px-2 py-1 text-xs rounded-full bg-gray-100 text-gray-700">Não</span>';
+        
+        return `
+            <tr class="hover:bg-gray-50">
+                <td class="px-6 py-4 whitespace-nowrap">
+                    <span class="font-medium text-gray-900">${inst.codigo}</span>
+                </td>
+                <td class="px-6 py-4">
+                    <div class="text-sm text-gray-900">${inst.descricao}</div>
+                    ${inst.fabricante ? `<div class="text-xs text-gray-500">${inst.fabricante} ${inst.modelo || ''}</div>` : ''}
+                </td>
+                <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
+                    ${inst.tipo}
+                </td>
+                <td class="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
+                    ${inst.finalidade_display || inst.finalidade || '-'}
+                </td>
+                <td class="px-6 py-4 whitespace-nowrap">
+                    ${controladoBadge}
+                </td>
+                <td class="px-6 py-4 whitespace-nowrap">
+                    <span class="px-2 py-1 text-xs rounded-full ${inst.total_pontos > 0 ? 'bg-green-100 text-green-800' : 'bg-red-100 text-red-800'}">
+                        ${inst.total_pontos} ponto(s)
+                    </span>
+                </td>
+                <td class="px-6 py-4 whitespace-nowrap">
+                    <span class="px-2 py-1 text-xs rounded-full bg-${color}-100 text-${color}-800">
+                        ${inst.status}
+                    </span>
+                </td>
+                <td class="px-6 py-4 whitespace-nowrap text-right text-sm font-medium">
+                    <button onclick="openPontosModal(${inst.id}, '${inst.codigo}')" class="text-purple-600 hover:text-purple-900 mr-3" title="Gerenciar Pontos">
+                        Pontos
+                    </button>
+                    <button onclick='openEditModal(${JSON.stringify(inst)})' class="text-blue-600 hover:text-blue-900 mr-3">
+                        Editar
+                    </button>
+                </td>
+            </tr>
+        `;
+    }).join('');
+}
+
+// Render Pagination
+function renderPagination(pagination) {
+    document.getElementById('paginationInfo').textContent = 
+        `página ${pagination.page} de ${pagination.pages} (${pagination.total} registros)`;
+    
+    const buttons = document.getElementById('paginationButtons');
+    let html = '';
+    
+    if (pagination.has_previous) {
+        html += `<button onclick="loadInstrumentos(${pagination.page - 1})" class="px-3 py-1 border rounded hover:bg-gray-100">Anterior</button>`;
+    }
+    
+    if (pagination.has_next) {
+        html += `<button onclick="loadInstrumentos(${pagination.page + 1})" class="px-3 py-1 border rounded hover:bg-gray-100">Próximo</button>`;
+    }
+    
+    buttons.innerHTML = html;
+}
+
+// Search
+function searchInstrumentos() {
+    clearTimeout(searchTimeout);
+    searchTimeout = setTimeout(() => {
+        loadInstrumentos(1);
+    }, 500);
+}
+
+// Load Funcionarios
+async function loadFuncionarios() {
+    try {
+        const response = await fetch('/cadastro/api/funcionarios/');
+        const data = await response.json();
+        
+        const select = document.getElementById('responsavel_id');
+        select.innerHTML = '<option value="">Selecione...</option>';
+        data.funcionarios.forEach(func => {
+            select.innerHTML += `<option value="${func.id}">${func.matricula} - ${func.nome}</option>`;
+        });
+    } catch (error) {
+        console.error('Erro ao carregar funcionários:', error);
+    }
+}
+
+// Modal Functions
+function openCreateModal() {
+    document.getElementById('modalTitle').textContent = 'Novo Instrumento';
+    document.getElementById('instrumentoForm').reset();
+    document.getElementById('instrumentoId').value = '';
+    document.getElementById('instrumento_controlado').checked = true;
+    document.getElementById('instrumentoModal').classList.remove('hidden');
+    document.getElementById('periodicidade').value = 365;
+}
+
+function openEditModal(instrumento) {
+    document.getElementById('modalTitle').textContent = 'Editar Instrumento';
+    document.getElementById('instrumentoId').value = instrumento.id;
+    document.getElementById('codigo').value = instrumento.codigo;
+    document.getElementById('descricao').value = instrumento.descricao;
+    document.getElementById('tipo_instrumento_id').value = instrumento.tipo_value || '';
+    document.getElementById('fabricante').value = instrumento.fabricante || '';
+    document.getElementById('modelo').value = instrumento.modelo || '';
+    document.getElementById('instrumento_controlado').checked = instrumento.controlado || false;
+    document.getElementById('status').value = instrumento.status_value;
+    document.getElementById('data_aquisicao').value = instrumento.data_aquisicao || '';
+    document.getElementById('observacoes').value = instrumento.observacoes || '';
+    document.getElementById('instrumentoModal').classList.remove('hidden');
+    document.getElementById('periodicidade').value = instrumento.periodicidade || '';
+}
+
+function closeModal() {
+    document.getElementById('instrumentoModal').classList.add('hidden');
+}
+
+function openDeleteModal(id) {
+    document.getElementById('deleteInstrumentoId').value = id;
+    document.getElementById('deleteModal').classList.remove('hidden');
+}
+
+function closeDeleteModal() {
+    document.getElementById('deleteModal').classList.add('hidden');
+}
+
+// Form Submit
+document.getElementById('instrumentoForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    
+    const id = document.getElementById('instrumentoId').value;
+    const isEdit = id !== '';
+    
+    const data = {
+        codigo: document.getElementById('codigo').value,
+        descricao: document.getElementById('descricao').value,
+        tipo_instrumento_id: document.getElementById('tipo_instrumento_id').value || null,
+        instrumento_controlado: document.getElementById('instrumento_controlado').checked,
+        fabricante: document.getElementById('fabricante').value,
+        modelo: document.getElementById('modelo').value,
+        status: document.getElementById('status').value,
+        data_aquisicao: document.getElementById('data_aquisicao').value || null,
+        observacoes: document.getElementById('observacoes').value,
+    };
+    
+    const submitBtn = document.getElementById('instrumentoSubmitBtn');
+    const originalText = submitBtn ? submitBtn.textContent : '';
+    if (submitBtn) {
+        submitBtn.disabled = true;
+        submitBtn.classList.add('opacity-70');
+        submitBtn.textContent = 'Salvando...';
+    }
+
+    try {
+        const url = isEdit 
+            ? `/cadastro/api/instrumentos/${id}/update/`
+            : '/cadastro/api/instrumentos/create/';
+        
+        const response = await fetch(url, {
+            method: isEdit ? 'PUT' : 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken
+            },
+            body: JSON.stringify(data)
+        });
+        
+        const result = await response.json();
+        
+        if (result.success) {
+            showToast(result.message, 'success');
+            closeModal();
+            loadInstrumentos(window.instCurrentPage);
+        } else {
+            showToast(result.message, 'error');
+        }
+    } catch (error) {
+        showToast('Erro ao salvar instrumento', 'error');
+    } finally {
+        if (submitBtn) {
+            submitBtn.disabled = false;
+            submitBtn.classList.remove('opacity-70');
+            submitBtn.textContent = originalText || 'Salvar';
+        }
+    }
+});
+
+// Delete Confirmation
+async function confirmDelete() {
+    const id = document.getElementById('deleteInstrumentoId').value;
+    
+    try {
+        const response = await fetch(`/cadastro/api/instrumentos/${id}/delete/`, {
+            method: 'DELETE',
+            headers: {
+                'X-CSRFToken': csrfToken
+            }
+        });
+        
+        const result = await response.json();
+        
+        if (result.success) {
+            showToast(result.message, 'success');
+            closeDeleteModal();
+            loadInstrumentos(window.instCurrentPage);
+        } else {
+            showToast(result.message, 'error');
+        }
+    } catch (error) {
+        showToast('Erro ao excluir instrumento', 'error');
+    }
+}
+
+// Toast Notification (z-index elevado para sobrepor modais)
+function showToast(message, type = 'success') {
+    const toast = document.getElementById('toast');
+    const toastMessage = document.getElementById('toastMessage');
+    
+    toastMessage.textContent = message;
+    toast.className = `fixed top-4 right-4 z-[120000] px-6 py-4 rounded-lg shadow-lg text-white ${
+        type === 'success' ? 'bg-green-500' : 'bg-red-500'
+    }`;
+    toast.style.zIndex = '120000';
+    toast.classList.remove('hidden');
+    
+    setTimeout(() => {
+        toast.classList.add('hidden');
+    }, 3000);
+}
+
+// ============================================
+// PONTOS DE CALIBRAÇÃO
+// ============================================
+
+// Open Pontos Modal
+async function openPontosModal(instrumentoId, codigo) {
+    document.getElementById('pontoInstrumentoId').value = instrumentoId;
+    document.getElementById('pontosModalTitle').textContent = `Pontos de Calibração - ${codigo}`;
+    document.getElementById('pontosModal').classList.remove('hidden');
+    await loadPontos(instrumentoId);
+}
+
+function closePontosModal() {
+    document.getElementById('pontosModal').classList.add('hidden');
+    loadInstrumentos(window.instCurrentPage); // Recarregar para atualizar contagem de pontos
+}
+
+// Load Pontos
+async function loadPontos(instrumentoId) {
+    try {
+        const response = await fetch(`/cadastro/api/instrumentos/${instrumentoId}/pontos/`);
+        const data = await response.json();
+        renderPontosTable(data.pontos);
+    } catch (error) {
+        showToast('Erro ao carregar pontos', 'error');
+    }
+}
+
+// Render Pontos Table
+function renderPontosTable(pontos) {
+    const tbody = document.getElementById('pontosTable');
+    
+        if (pontos.length === 0) {
+        tbody.innerHTML = `
+            <tr>
+                <td colspan="11" class="px-4 py-4 text-center text-yellow-600 bg-yellow-50">
+                    <div class="flex items-center justify-center space-x-2">
+                        <svg class="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 9v2m0 4h.01m-6.938 4h13.856c1.54 0 2.502-1.667 1.732-3L13.732 4c-.77-1.333-2.694-1.333-3.464 0L3.34 16c-.77 1.333.192 3 1.732 3z"/>
+                        </svg>
+                        <span>RN001: Instrumento deve ter pelo menos 1 ponto de calibração!</span>
+                    </div>
+                </td>
+            </tr>
+        `;
+        return;
+    }
+    
+    tbody.innerHTML = pontos.map(p => {
+        const tolerancias = [];
+        if (p.tolerancia_mais) tolerancias.push(`+${p.tolerancia_mais}`);
+        if (p.tolerancia_menos) tolerancias.push(`-${p.tolerancia_menos}`);
+        const tolText = tolerancias.length > 0 ? tolerancias.join(' / ') : '-';
+        let valorText = '-';
+        if (p.valor_minimo && p.valor_maximo) valorText = `${p.valor_minimo} - ${p.valor_maximo}`;
+        else if (p.valor_nominal) valorText = p.valor_nominal;
+        return `
+            <tr class="hover:bg-gray-50">
+                <td class="px-4 py-3 whitespace-nowrap">
+                    <span class="px-2 py-1 bg-blue-100 text-blue-800 rounded-full text-xs font-medium">${p.sequencia}</span>
+                </td>
+                <td class="px-4 py-3">
+                    <div class="text-sm text-gray-900">${p.descricao}</div>
+                </td>
+                <td class="px-4 py-3 whitespace-nowrap">
+                    <span class="font-medium text-gray-900">${valorText} ${p.unidade}</span>
+                </td>
+                <td class="px-4 py-3 whitespace-nowrap text-sm text-gray-500">
+                    ${tolText}
+                </td>
+                <td class="px-4 py-3 text-center">
+                    <span class="px-2 py-1 text-xs rounded-full ${p.ativo ? 'bg-green-100 text-green-800' : 'bg-gray-100 text-gray-800'}">
+                        ${p.ativo ? 'Ativo' : 'Inativo'}
+                    </span>
+                </td>
+                <td class="px-4 py-3 whitespace-nowrap text-right text-sm font-medium">
+                    <button onclick='openEditPontoModal(${JSON.stringify(p)})' class="text-blue-600 hover:text-blue-900 mr-3">
+                        Editar
+                    </button>
+                </td>
+            </tr>
+        `;
+    }).join('');
+}
+
+// Open Ponto Form Modal (Create)
+function openPontoFormModal() {
+    document.getElementById('pontoFormTitle').textContent = 'Novo Ponto de Calibração';
+    document.getElementById('pontoForm').reset();
+    document.getElementById('pontoId').value = '';
+    document.getElementById('ponto_ativo').checked = true;
+    document.getElementById('pontoFormModal').classList.remove('hidden');
+}
+
+// Open Edit Ponto Modal
+function openEditPontoModal(ponto) {
+
+    console.log("pontos: ", ponto);
+
+    document.getElementById('pontoFormTitle').textContent = 'Editar Ponto de Calibração';
+    document.getElementById('pontoId').value = ponto.id;
+    document.getElementById('ponto_sequencia').value = ponto.sequencia;
+    document.getElementById('ponto_descricao').value = ponto.descricao;
+    document.getElementById('ponto_valor_minimo').value = ponto.valor_nominal_minimo || '';
+    document.getElementById('ponto_valor_maximo').value = ponto.valor_nominal_maximo || '';
+    document.getElementById('ponto_unidade').value = ponto.unidade;
+    document.getElementById('ponto_tolerancia_mais').value = ponto.tolerancia_mais || '';
+    document.getElementById('ponto_tolerancia_menos').value = ponto.tolerancia_menos || '';
+    document.getElementById('ponto_observacoes').value = ponto.observacoes || '';
+    document.getElementById('ponto_ativo').checked = ponto.ativo;
+    document.getElementById('pontoFormModal').classList.remove('hidden');
+}
+
+function closePontoFormModal() {
+    document.getElementById('pontoFormModal').classList.add('hidden');
+}
+
+// Ponto Form Submit
+document.getElementById('pontoForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+    
+    const id = document.getElementById('pontoId').value;
+    const isEdit = id !== '';
+    const instrumentoId = document.getElementById('pontoInstrumentoId').value;
+    
+    const data = {
+        sequencia: parseInt(document.getElementById('ponto_sequencia').value),
+        descricao: document.getElementById('ponto_descricao').value,
+        valor_nominal: document.getElementById('ponto_valor_nominal') ? document.getElementById('ponto_valor_nominal').value : null,
+        valor_minimo: document.getElementById('ponto_valor_minimo').value || null,
+        valor_maximo: document.getElementById('ponto_valor_maximo').value || null,
+        unidade: document.getElementById('ponto_unidade').value,
+        tolerancia_mais: document.getElementById('ponto_tolerancia_mais').value || null,
+        tolerancia_menos: document.getElementById('ponto_tolerancia_menos').value || null,
+        observacoes: document.getElementById('ponto_observacoes').value,
+        ativo: document.getElementById('ponto_ativo').checked,
+    };
+    
+    const submitBtn = document.getElementById('pontoSubmitBtn');
+    const originalText = submitBtn ? submitBtn.textContent : '';
+    if (submitBtn) {
+        submitBtn.disabled = true;
+        submitBtn.classList.add('opacity-70');
+        submitBtn.textContent = 'Salvando...';
+    }
+
+    try {
+        const url = isEdit 
+            ? `/cadastro/api/pontos/${id}/update/`
+            : `/cadastro/api/instrumentos/${instrumentoId}/pontos/create/`;
+        
+        const response = await fetch(url, {
+            method: isEdit ? 'PUT' : 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken
+            },
+            body: JSON.stringify(data)
+        });
+        
+        const result = await response.json();
+        
+        if (result.success) {
+            showToast(result.message, 'success');
+            closePontoFormModal();
+            loadPontos(instrumentoId);
+        } else {
+            showToast(result.message, 'error');
+        }
+    } catch (error) {
+        showToast('Erro ao salvar ponto', 'error');
+    } finally {
+        if (submitBtn) {
+            submitBtn.disabled = false;
+            submitBtn.classList.remove('opacity-70');
+            submitBtn.textContent = originalText || 'Salvar';
+        }
+    }
+});
+
+// Delete Ponto Modal
+function openDeletePontoModal(id) {
+    document.getElementById('deletePontoId').value = id;
+    document.getElementById('deletePontoModal').classList.remove('hidden');
+}
+
+function closeDeletePontoModal() {
+    document.getElementById('deletePontoModal').classList.add('hidden');
+}
+
+// Confirm Delete Ponto
+async function confirmDeletePonto() {
+    const id = document.getElementById('deletePontoId').value;
+    const instrumentoId = document.getElementById('pontoInstrumentoId').value;
+    const submitBtn = document.getElementById('deletePontoSubmitBtn');
+    const originalText = submitBtn ? submitBtn.textContent : '';
+    if (submitBtn) {
+        submitBtn.disabled = true;
+        submitBtn.classList.add('opacity-70');
+        submitBtn.textContent = 'Excluindo...';
+    }
+    
+    try {
+        const response = await fetch(`/cadastro/api/pontos/${id}/delete/`, {
+            method: 'DELETE',
+            headers: {
+                'X-CSRFToken': csrfToken
+            }
+        });
+        
+        const result = await response.json();
+        
+        if (result.success) {
+            showToast(result.message, 'success');
+            closeDeletePontoModal();
+            loadPontos(instrumentoId);
+        } else {
+            showToast(result.message, 'error');
+        }
+    } catch (error) {
+        showToast('Erro ao excluir ponto', 'error');
+    } finally {
+        if (submitBtn) {
+            submitBtn.disabled = false;
+            submitBtn.classList.remove('opacity-70');
+            submitBtn.textContent = originalText || 'Excluir';
+        }
+    }
+}
+
+// ============================================
+// DESIGNAR INSTRUMENTO (UI + ASSINATURA)
+// ============================================
+
+// temp storage for chosen assignments
+var designItems = [];
+
+function openDesignationModal() {
+    // load selects
+    loadDesignFuncionarios();
+    loadDesignInstrumentos();
+    document.getElementById('designationModal').classList.remove('hidden');
+}
+
+function closeDesignationModal() {
+    document.getElementById('designationModal').classList.add('hidden');
+}
+
+async function loadDesignFuncionarios() {
+    try {
+        const resp = await fetch('/cadastro/api/funcionarios/');
+        const data = await resp.json();
+        const sel = document.getElementById('design_funcionario');
+        sel.innerHTML = '<option value="">Selecione funcionário...</option>';
+        data.funcionarios.forEach(f => {
+            sel.innerHTML += `<option value="${f.id}">${f.matricula} - ${f.nome}</option>`;
+        });
+    } catch (e) { console.error(e); }
+}
+
+async function loadDesignInstrumentos() {
+    try {
+        const resp = await fetch('/cadastro/api/instrumentos/?per_page=1000');
+        const data = await resp.json();
+        const sel = document.getElementById('design_instrumento');
+        sel.innerHTML = '<option value="">Selecione instrumento...</option>';
+        (data.instrumentos || []).forEach(i => {
+            sel.innerHTML += `<option value="${i.id}">${i.codigo} - ${i.descricao}</option>`;
+        });
+    } catch (e) { console.error(e); }
+}
+
+function addDesignItem() {
+    const funcId = document.getElementById('design_funcionario').value;
+    const instId = document.getElementById('design_instrumento').value;
+    if (!funcId || !instId) { showToast('Selecione funcionário e instrumento', 'error'); return; }
+    // avoid duplicates of same instrument
+    if (designItems.find(it => it.instrumento_id == instId)) { showToast('Instrumento já adicionado', 'error'); return; }
+    const funcText = document.getElementById('design_funcionario').selectedOptions[0].text;
+    const instText = document.getElementById('design_instrumento').selectedOptions[0].text;
+    designItems.push({ funcionario_id: funcId, instrumento_id: instId, funcionario_label: funcText, instrumento_label: instText });
+    renderDesignTable();
+}
+
+function renderDesignTable() {
+    const tbody = document.getElementById('designTableBody');
+    if (!designItems.length) {
+        tbody.innerHTML = '<tr><td colspan="4" class="px-4 py-3 text-center text-gray-500">Nenhum item adicionado.</td></tr>';
+        return;
+    }
+    tbody.innerHTML = designItems.map((it, idx) => `
+        <tr class="hover:bg-gray-50">
+            <td class="px-4 py-2 text-sm">${it.funcionario_label}</td>
+            <td class="px-4 py-2 text-sm">${it.instrumento_label}</td>
+            <td class="px-4 py-2 text-sm">${it.observacoes || ''}</td>
+            <td class="px-4 py-2 text-right text-sm"><button onclick="removeDesignItem(${idx})" class="text-red-600">Remover</button></td>
+        </tr>
+    `).join('');
+}
+
+function removeDesignItem(index) {
+    designItems.splice(index, 1);
+    renderDesignTable();
+}
+
+function openSignatureModal() {
+    if (!designItems.length) { showToast('Adicione ao menos um item para assinar', 'error'); return; }
+    document.getElementById('signatureModal').classList.remove('hidden');
+    setupSignatureCanvas();
+}
+
+function closeSignatureModal() {
+    document.getElementById('signatureModal').classList.add('hidden');
+}
+
+// signature canvas - use window to avoid redeclaration on HTMX swaps
+window.sigCanvas = window.sigCanvas || null;
+window.sigCtx = window.sigCtx || null;
+window.sigDrawing = window.sigDrawing || false;
+window.sigPointerId = window.sigPointerId || null;
+
+function getSignaturePoint(event) {
+    const rect = window.sigCanvas.getBoundingClientRect();
+    const scaleX = window.sigCanvas.width / rect.width;
+    const scaleY = window.sigCanvas.height / rect.height;
+    return {
+        x: (event.clientX - rect.left) * scaleX,
+        y: (event.clientY - rect.top) * scaleY
+    };
+}
+
+function setupSignatureCanvas() {
+    window.sigCanvas = document.getElementById('signatureCanvas');
+    window.sigCtx = window.sigCanvas.getContext('2d');
+    window.sigCanvas.width = window.sigCanvas.clientWidth;
+    window.sigCanvas.height = 200;
+    window.sigCtx.fillStyle = '#fff';
+    window.sigCtx.fillRect(0,0,window.sigCanvas.width,window.sigCanvas.height);
+    window.sigCtx.strokeStyle = '#000';
+    window.sigCtx.lineWidth = 2;
+    window.sigCtx.lineCap = 'round';
+    window.sigCtx.lineJoin = 'round';
+
+    window.sigCanvas.onpointerdown = (e) => {
+        e.preventDefault();
+        const point = getSignaturePoint(e);
+        window.sigDrawing = true;
+        window.sigPointerId = e.pointerId;
+        if (window.sigCanvas.setPointerCapture) {
+            window.sigCanvas.setPointerCapture(e.pointerId);
+        }
+        window.sigCtx.beginPath();
+        window.sigCtx.moveTo(point.x, point.y);
+    };
+    window.sigCanvas.onpointermove = (e) => {
+        if (!window.sigDrawing || (window.sigPointerId !== null && e.pointerId !== window.sigPointerId)) return;
+        e.preventDefault();
+        const point = getSignaturePoint(e);
+        window.sigCtx.lineTo(point.x, point.y);
+        window.sigCtx.stroke();
+    };
+    window.sigCanvas.onpointerup = (e) => {
+        if (window.sigPointerId !== null && e.pointerId !== window.sigPointerId) return;
+        window.sigDrawing = false;
+        window.sigPointerId = null;
+    };
+    window.sigCanvas.onpointercancel = () => {
+        window.sigDrawing = false;
+        window.sigPointerId = null;
+    };
+    window.sigCanvas.onpointerleave = () => {
+        window.sigDrawing = false;
+        window.sigPointerId = null;
+    };
+}
+
+function clearSignature() { if (window.sigCtx) { window.sigCtx.clearRect(0,0,window.sigCanvas.width,window.sigCanvas.height); window.sigCtx.fillStyle='#fff'; window.sigCtx.fillRect(0,0,window.sigCanvas.width,window.sigCanvas.height); } }
+
+async function submitDesignWithSignature() {
+    // get dataURL
+    const dataUrl = window.sigCanvas.toDataURL('image/png');
+    const promises = designItems.map(item => {
+        return fetch('/instrumentos/api/designar/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken
+            },
+            body: JSON.stringify({
+                funcionario_id: item.funcionario_id,
+                instrumento_id: item.instrumento_id,
+                observacoes: item.observacoes || '',
+                assinatura: dataUrl
+            })
+        }).then(r => r.json());
+    });
+
+    try {
+        const results = await Promise.all(promises);
+        const errors = results.filter(r => !r.success);
+        if (errors.length) {
+            showToast('Algumas designações falharam', 'error');
+        } else {
+            showToast('Designações realizadas com sucesso', 'success');
+            designItems = [];
+            renderDesignTable();
+            closeSignatureModal();
+            closeDesignationModal();
+            loadInstrumentos(window.instCurrentPage);
+        }
+    } catch (e) {
+        showToast('Erro ao enviar designações', 'error');
+    }
+}
@@ -0,0 +1,105 @@
+function getCSRF() {
+  const name = 'csrftoken';
+  const cookies = document.cookie.split(';').map(c=>c.trim());
+  for (const c of cookies) {
+    if (c.startsWith(name + '=')) return decodeURIComponent(c.split('=')[1]);
+  }
+  return '';
+}
+
+window.labsCache = window.labsCache || [];
+window.loadLabs = async function(){
+  const res = await fetch('/cadastro/api/laboratorios/');
+  const data = await res.json();
+  window.labsCache = data.laboratorios || [];
+  renderLabs(window.labsCache);
+}
+
+function renderLabs(labs){
+  const body = document.getElementById('labsBody');
+  body.innerHTML = '';
+  labs.forEach((l, idx)=>{
+    const tr = document.createElement('tr');
+    tr.innerHTML = `
+      <td class="px-6 py-4">${idx+1}</td>
+      <td class="px-6 py-4">${l.nome}</td>
+      <td class="px-6 py-4">Sim</td>
+      <td class="px-6 py-4 text-right">
+        <button data-id="${l.id}" class="editBtn text-blue-600 mr-3">Editar</button>
+      </td>
+    `;
+    body.appendChild(tr);
+  });
+
+  document.querySelectorAll('.editBtn').forEach(b=>b.addEventListener('click', (e)=>{
+    const id = e.currentTarget.dataset.id;
+    const lab = window.labsCache.find(x=>String(x.id)===String(id));
+    openModal('Editar Laboratório', lab.nome, true, id);
+  }));
+
+  document.querySelectorAll('.delBtn').forEach(b=>b.addEventListener('click', async (e)=>{
+    const id = e.currentTarget.dataset.id;
+    if (!confirm('Confirmar exclusão?')) return;
+    const res = await fetch(`/cadastro/api/laboratorios/${id}/delete/`, {method: 'DELETE', headers: {'X-CSRFToken': getCSRF()}});
+    const j = await res.json();
+    if (j.success) loadLabs(); else showToast(j.message || 'Erro');
+  }));
+}
+
+function searchLabs(){
+  const q = document.getElementById('searchInput').value.trim().toLowerCase();
+  if (!q) return renderLabs(window.labsCache);
+  renderLabs(window.labsCache.filter(l=>l.nome.toLowerCase().includes(q)));
+}
+
+function openModal(title='', nome='', ativo=true, id=null){
+  document.getElementById('modalTitle').innerText = title;
+  document.getElementById('nome').value = nome || '';
+  document.getElementById('ativo').checked = !!ativo;
+  document.getElementById('editingId').value = id || '';
+  document.getElementById('modal').classList.remove('hidden');
+}
+
+function closeModal(){ document.getElementById('modal').classList.add('hidden'); }
+
+document.getElementById('btnNovo').addEventListener('click', ()=>openModal('Novo Laboratório','',true,null));
+document.getElementById('btnCancel').addEventListener('click', closeModal);
+
+document.getElementById('btnSave').addEventListener('click', async ()=>{
+  const nome = document.getElementById('nome').value.trim();
+  const ativo = document.getElementById('ativo').checked;
+  if (!nome){ showToast('Nome obrigatório'); return; }
+  const id = document.getElementById('editingId').value;
+  const csrftoken = getCSRF();
+  const btn = document.getElementById('btnSave');
+  const originalText = btn ? btn.textContent : '';
+  if (btn) {
+    btn.disabled = true;
+    btn.classList.add('opacity-70');
+    btn.textContent = 'Salvando...';
+  }
+  if (id){
+    const res = await fetch(`/cadastro/api/laboratorios/${id}/update/`, {method:'PUT', headers:{'Content-Type':'application/json','X-CSRFToken':csrftoken}, body: JSON.stringify({nome, ativo})});
+    const j = await res.json();
+    if (j.success){ closeModal(); loadLabs(); showToast('Atualizado'); } else showToast(j.message||'Erro');
+  } else {
+    const res = await fetch('/cadastro/api/laboratorios/create/', {method:'POST', headers:{'Content-Type':'application/json','X-CSRFToken':csrftoken}, body: JSON.stringify({nome, ativo})});
+    const j = await res.json();
+    if (j.success){ closeModal(); loadLabs(); showToast('Criado'); } else showToast(j.message||'Erro');
+  }
+  if (btn) {
+    btn.disabled = false;
+    btn.classList.remove('opacity-70');
+    btn.textContent = originalText || 'Salvar';
+  }
+});
+
+function showToast(msg){
+  const t = document.getElementById('toast');
+  document.getElementById('toastMessage').innerText = msg;
+  t.classList.remove('hidden');
+  t.classList.add('block');
+  setTimeout(()=>{ t.classList.add('hidden'); t.classList.remove('block'); }, 3000);
+}
+
+window.addEventListener('DOMContentLoaded', ()=>{ window.loadLabs(); });
@@ -0,0 +1,108 @@
+function getCSRF() {
+  const name = 'csrftoken';
+  const cookies = document.cookie.split(';').map(c=>c.trim());
+  for (const c of cookies) {
+    if (c.startsWith(name + '=')) return decodeURIComponent(c.split('=')[1]);
+  }
+  return '';
+}
+
+var setoresCache = [];
+
+window.loadSetores = async function(){
+  const res = await fetch('/cadastro/api/setores/');
+  const data = await res.json();
+  setoresCache = data.setores || [];
+  renderSetores(setoresCache);
+}
+
+function renderSetores(setores){
+  const body = document.getElementById('setoresBody');
+  body.innerHTML = '';
+  setores.forEach((s, idx) => {
+    const tr = document.createElement('tr');
+    tr.innerHTML = `
+      <td class="px-6 py-4">${idx+1}</td>
+      <td class="px-6 py-4">${s.nome}</td>
+      <td class="px-6 py-4">Sim</td>
+      <td class="px-6 py-4 text-right">
+        <button data-id="${s.id}" class="editBtn text-blue-600 mr-3">Editar</button>
+      </td>
+    `;
+    body.appendChild(tr);
+  });
+
+  document.querySelectorAll('.editBtn').forEach(b=>b.addEventListener('click', (e)=>{
+    const id = e.currentTarget.dataset.id;
+    const setor = setoresCache.find(x=>String(x.id)===String(id));
+    openModal('Editar Setor', setor.nome, setor.descricao || '', setor.ativo, id);
+  }));
+
+  document.querySelectorAll('.delBtn').forEach(b=>b.addEventListener('click', async (e)=>{
+    const id = e.currentTarget.dataset.id;
+    if (!confirm('Confirmar exclusão?')) return;
+    const res = await fetch(`/cadastro/api/setores/${id}/delete/`, {method: 'DELETE', headers: {'X-CSRFToken': getCSRF()}});
+    const j = await res.json();
+    if (j.success) loadSetores(); else showToast(j.message || 'Erro');
+  }));
+}
+
+function searchSetores(){
+  const q = document.getElementById('searchInput').value.trim().toLowerCase();
+  if (!q) return renderSetores(setoresCache);
+  renderSetores(setoresCache.filter(s=>s.nome.toLowerCase().includes(q)));
+}
+
+function openModal(title='', nome='', descricao='', ativo=true, id=null){
+  document.getElementById('modalTitle').innerText = title;
+  document.getElementById('nome').value = nome || '';
+  document.getElementById('descricao').value = descricao || '';
+  document.getElementById('ativo').checked = !!ativo;
+  document.getElementById('editingId').value = id || '';
+  document.getElementById('modal').classList.remove('hidden');
+}
+
+function closeModal(){ document.getElementById('modal').classList.add('hidden'); }
+
+document.getElementById('btnNovo').addEventListener('click', ()=>openModal('Novo Setor','', '', true, null));
+document.getElementById('btnCancel').addEventListener('click', closeModal);
+
+document.getElementById('btnSave').addEventListener('click', async ()=>{
+  const nome = document.getElementById('nome').value.trim();
+  const descricao = document.getElementById('descricao').value.trim();
+  const ativo = document.getElementById('ativo').checked;
+  if (!nome){ showToast('Nome obrigatório'); return; }
+  const id = document.getElementById('editingId').value;
+  const csrftoken = getCSRF();
+  const btn = document.getElementById('btnSave');
+  const originalText = btn ? btn.textContent : '';
+  if (btn) {
+    btn.disabled = true;
+    btn.classList.add('opacity-70');
+    btn.textContent = 'Salvando...';
+  }
+  if (id){
+    const res = await fetch(`/cadastro/api/setores/${id}/update/`, {method:'PUT', headers:{'Content-Type':'application/json','X-CSRFToken':csrftoken}, body: JSON.stringify({nome, descricao, ativo})});
+    const j = await res.json();
+    if (j.success){ closeModal(); loadSetores(); showToast('Atualizado'); } else showToast(j.message||'Erro');
+  } else {
+    const res = await fetch('/cadastro/api/setores/create/', {method:'POST', headers:{'Content-Type':'application/json','X-CSRFToken':csrftoken}, body: JSON.stringify({nome, descricao, ativo})});
+    const j = await res.json();
+    if (j.success){ closeModal(); loadSetores(); showToast('Criado'); } else showToast(j.message||'Erro');
+  }
+  if (btn) {
+    btn.disabled = false;
+    btn.classList.remove('opacity-70');
+    btn.textContent = originalText || 'Salvar';
+  }
+});
+
+function showToast(msg){
+  const t = document.getElementById('toast');
+  document.getElementById('toastMessage').innerText = msg;
+  t.classList.remove('hidden');
+  t.classList.add('block');
+  setTimeout(()=>{ t.classList.add('hidden'); t.classList.remove('block'); }, 3000);
+}
+
+window.addEventListener('DOMContentLoaded', ()=>{ window.loadSetores(); });
@@ -0,0 +1,116 @@
+function getCSRF() {
+  const name = 'csrftoken';
+  const cookies = document.cookie.split(';').map(c=>c.trim());
+  for (const c of cookies) {
+    if (c.startsWith(name + '=')) return decodeURIComponent(c.split('=')[1]);
+  }
+  return '';
+}
+
+window.tiposCache = window.tiposCache || [];
+window.loadTipos = async function() {
+  const res = await fetch('/cadastro/api/tipos_instrumento/');
+  const data = await res.json();
+  window.tiposCache = data.tipos || [];
+  renderTipos(window.tiposCache);
+}
+
+function renderTipos(tipos) {
+  const body = document.getElementById('tiposBody');
+  body.innerHTML = '';
+  tipos.forEach((t, idx) => {
+    const tr = document.createElement('tr');
+    tr.innerHTML = `
+      <td class="px-6 py-4">${idx+1}</td>
+      <td class="px-6 py-4">${t.descricao}</td>
+      <td class="px-6 py-4">${t.documento_qualidade}</td>
+      <td class="px-6 py-4">Sim</td>
+      <td class="px-6 py-4 text-right">
+        <button data-id="${t.id}" class="editBtn text-blue-600 mr-3">Editar</button>
+      </td>
+    `;
+    body.appendChild(tr);
+  });
+
+  document.querySelectorAll('.editBtn').forEach(b=>b.addEventListener('click', (e)=>{
+    const id = e.currentTarget.dataset.id;
+    const tipo = window.tiposCache.find(x=>String(x.id)===String(id));
+    openModal('Editar Tipo', tipo.descricao, tipo.documento_qualidade, true, id);
+  }));
+
+  document.querySelectorAll('.delBtn').forEach(b=>b.addEventListener('click', async (e)=>{
+    const id = e.currentTarget.dataset.id;
+    if (!confirm('Confirmar exclusão?')) return;
+    const res = await fetch(`/cadastro/api/tipos_instrumento/${id}/delete/`, {method: 'DELETE', headers: {'X-CSRFToken': getCSRF()}});
+    const j = await res.json();
+    if (j.success) loadTipos(); else showToast(j.message || 'Erro');
+  }));
+}
+
+function searchTipos(){
+  const q = document.getElementById('searchInput').value.trim().toLowerCase();
+  if (!q) return renderTipos(window.tiposCache);
+  renderTipos(window.tiposCache.filter(t=>t.descricao.toLowerCase().includes(q)));
+}
+
+function openModal(title='', descricao='', documento_qualidade='', ativo=true, id=null){
+  document.getElementById('modalTitle').innerText = title;
+  document.getElementById('descricao').value = descricao || '';
+  document.getElementById('documento_qualidade').value = documento_qualidade || '';
+  document.getElementById('ativo').checked = !!ativo;
+  document.getElementById('editingId').value = id || '';
+  document.getElementById('modal').classList.remove('hidden');
+}
+
+function closeModal(){
+  document.getElementById('modal').classList.add('hidden');
+}
+
+document.getElementById('btnNovo').addEventListener('click', ()=>openModal('Novo Tipo','', '', true, null));
+document.getElementById('btnCancel').addEventListener('click', closeModal);
+
+document.getElementById('btnSave').addEventListener('click', async ()=>{
+  const descricao = document.getElementById('descricao').value.trim();
+  const ativo = document.getElementById('ativo').checked;
+  const documento_qualidade = document.getElementById('documento_qualidade').value.trim();
+
+  if (!descricao){ showToast('Descrição obrigatória'); return; }
+  const id = document.getElementById('editingId').value;
+  const csrftoken = getCSRF();
+
+  const btn = document.getElementById('btnSave');
+  const originalText = btn ? btn.textContent : '';
+  if (btn) {
+    btn.disabled = true;
+    btn.classList.add('opacity-70');
+    btn.textContent = 'Salvando...';
+  }
+
+  try {
+    if (id){
+      const res = await fetch(`/cadastro/api/tipos_instrumento/${id}/update/`, {method:'PUT', headers:{'Content-Type':'application/json','X-CSRFToken':csrftoken}, body: JSON.stringify({descricao, ativo, documento_qualidade})});
+      const j = await res.json();
+      if (j.success){ closeModal(); loadTipos(); showToast('Atualizado'); } else showToast(j.message||'Erro');
+    } else {
+      const res = await fetch('/cadastro/api/tipos_instrumento/create/', {method:'POST', headers:{'Content-Type':'application/json','X-CSRFToken':csrftoken}, body: JSON.stringify({descricao, ativo, documento_qualidade})});
+      const j = await res.json();
+      if (j.success){ closeModal(); loadTipos(); showToast('Criado'); } else showToast(j.message||'Erro');
+    }
+  } finally {
+    if (btn) {
+      btn.disabled = false;
+      btn.classList.remove('opacity-70');
+      btn.textContent = originalText || 'Salvar';
+    }
+  }
+});
+
+function showToast(msg){
+  const t = document.getElementById('toast');
+  document.getElementById('toastMessage').innerText = msg;
+  t.classList.remove('hidden');
+  t.classList.add('block');
+  setTimeout(()=>{ t.classList.add('hidden'); t.classList.remove('block'); }, 3000);
+}
+
+window.addEventListener('DOMContentLoaded', ()=>{ window.loadTipos(); });
@@ -1,3 +1,292 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.usuarios.testing import UsuarioLogadoMixin
+from .importacao import ValidationReport, apply_with_ledger, partition_records, row_hash
+from .models import Funcionario, ImportacaoArquivo, ImportacaoLinha, Instrumento, PontoCalibracao, Setor, TipoInstrumento
+
+
+class ImportacaoDryRunTest(UsuarioLogadoMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        Instrumento.objects.create(codigo='PAQ-001')
+        Funcionario.objects.create(matricula='2000', nome='Maria')
+
+    def test_import_entregas_dry_run_reporta_arquivo_inteiro(self):
+        """Valida o arquivo todo em poucas consultas e não grava nada"""
+        csv_content = (
+            'instrumento,matricula,data\n'
+            'PAQ-001,2000,2025-01-10\n'
+            'paq-001,2000,2025-01-11\n'
+            'XYZ-999,9999,2025-01-12\n'
+            'PAQ-001,,2025-01-12\n'
+        ).encode('utf-8')
+        upload = SimpleUploadedFile('entregas.csv', csv_content, content_type='text/csv')
+
+        with self.assertNumQueries(4):  # sessão, usuário, instrumentos, funcionários
+            response = self.client.post(
+                reverse('instrumento:import_entregas_csv'),
+                {'file': upload, 'dry_run': '1'},
+            )
+
+        data = response.json()
+        self.assertTrue(data['dry_run'])
+        self.assertEqual(data['stats']['valid'], 1)
+        self.assertEqual(data['stats']['error_rows'], 3)
+        self.assertEqual([e['line'] for e in data['errors']], [3, 4, 4, 5])
+        self.assertFalse(Instrumento.objects.get(codigo='PAQ-001').posses.exists())
+
+    def test_funcionarios_import_dry_run_nao_grava(self):
+        """Dry-run de funcionários calcula novos/atualizados sem gravar"""
+        csv_content = 'matricula;nome\n2000;Maria Souza\n3000;Joao\n3000;Joao\n'.encode('utf-8')
+        upload = SimpleUploadedFile('funcionarios.csv', csv_content, content_type='text/csv')
+
+        response = self.client.post(reverse('cadastro:funcionarios_import'), {'file': upload, 'dry_run': 'true'})
+
+        data = response.json()
+        self.assertEqual(data['stats']['created'], 1)
+        self.assertEqual(data['stats']['updated'], 1)
+        self.assertEqual(data['stats']['error_rows'], 1)
+        self.assertEqual(Funcionario.objects.get(matricula='2000').nome, 'Maria')
+        self.assertFalse(Funcionario.objects.filter(matricula='3000').exists())
+
+    def test_funcionarios_import_atualiza_matricula_sem_diferenciar_maiusculas(self):
+        """A matrícula existente é encontrada com a mesma regra da checagem de duplicidade"""
+        Funcionario.objects.create(matricula='AB10', nome='Ana')
+        upload = SimpleUploadedFile('funcionarios.csv', 'matricula;nome\nab10;Ana Lima\n'.encode('utf-8'), content_type='text/csv')
+
+        data = self.client.post(reverse('cadastro:funcionarios_import'), {'file': upload}).json()
+
+        self.assertEqual((data['stats']['created'], data['stats']['updated']), (0, 1))
+        self.assertEqual(Funcionario.objects.get(matricula='AB10').nome, 'Ana Lima')
+        self.assertEqual(Funcionario.objects.count(), 2)
+
+    def test_linhas_sem_data_repetidas_sao_duplicadas(self):
+        """A duplicidade compara a data do arquivo, não a hora da importação"""
+        from rotinas import import_lab_receipts
+
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = Path(pasta, 'recebimentos.csv')
+            caminho.write_text('codigo,data_recebimento\nPAQ-001,\npaq-001,\n', encoding='utf-8')
+            report = ValidationReport()
+            records = import_lab_receipts.parse_csv(caminho, None, report)
+            import_lab_receipts.validate_records(records, report)
+
+        self.assertEqual(report.lines(), ['Linha 3: recebimento repetido para o mesmo instrumento e data (primeira ocorrência na linha 2).'])
+
+
+class ImportacaoLedgerTest(TestCase):
+    def test_reaplicacao_pula_linhas_ja_gravadas(self):
+        """Linhas já registradas no ledger não são reaplicadas e a falha não avança a retomada"""
+        arquivo = ImportacaoArquivo.objects.create(rotina='teste', fingerprint='a' * 64, nome_arquivo='x.csv')
+        records = [(2, 'A'), (3, 'B'), (4, 'C')]
+        aplicados = []
+
+        def apply(record):
+            if record[1] == 'C':
+                raise ValueError('falha')
+            aplicados.append(record[1])
+
+        kwargs = {
+            'line_of': lambda record: record[0],
+            'hash_of': lambda record: row_hash([record[1]]),
+            'on_error': lambda record, exc: None,
+            'chunk_size': 2,
+        }
+        self.assertEqual(apply_with_ledger(arquivo, records, apply, **kwargs), (2, 0))
+        arquivo.refresh_from_db()
+        self.assertEqual(arquivo.ultima_linha, 3)
+        self.assertFalse(arquivo.concluido)
+
+        arquivo.ultima_linha = 0
+        self.assertEqual(apply_with_ledger(arquivo, records, apply, **kwargs), (0, 2))
+        self.assertEqual(aplicados, ['A', 'B'])
+        self.assertEqual(ImportacaoLinha.objects.filter(rotina='teste').count(), 2)
+
+    def test_linhas_sem_data_valem_por_arquivo(self):
+        """Linha sem data em outro arquivo é um recebimento novo; no mesmo arquivo, é retomada"""
+        from rotinas import import_lab_receipts
+        from app.instrumento.models import StatusInstrumento
+
+        instrumento = Instrumento.objects.create(codigo='PAQ-001')
+        Instrumento.objects.create(codigo='PAQ-002')
+        with tempfile.TemporaryDirectory() as pasta:
+            primeiro = Path(pasta, 'recebimentos_1.csv')
+            primeiro.write_text('codigo,data_recebimento\nPAQ-001,\n', encoding='utf-8')
+            segundo = Path(pasta, 'recebimentos_2.csv')
+            segundo.write_text('codigo,data_recebimento\nPAQ-001,\nPAQ-002,10/01/2025\n', encoding='utf-8')
+            for caminho in (primeiro, segundo, primeiro):
+                with mock.patch('sys.argv', ['import_lab_receipts.py', str(caminho)]), redirect_stdout(io.StringIO()):
+                    import_lab_receipts.main()
+
+        self.assertEqual(StatusInstrumento.objects.filter(instrumento=instrumento).count(), 2)
+        self.assertEqual(ImportacaoLinha.objects.filter(rotina=import_lab_receipts.ROTINA).count(), 3)
+
+
+class ParticionamentoTest(SimpleTestCase):
+    def test_particoes_preservam_ordem_por_instrumento(self):
+        """Eventos de um instrumento ficam juntos e na ordem do arquivo"""
+        records = [(1, 'A'), (2, 'B'), (3, 'A'), (4, 'C'), (5, 'B'), (6, 'A')]
+
+        partitions = partition_records(records, lambda record: record[1], 2)
+
+        self.assertEqual(len(partitions), 2)
+        self.assertEqual(sorted(line for partition in partitions for line, _ in partition), [1, 2, 3, 4, 5, 6])
+        for partition in partitions:
+            for codigo in {codigo for _, codigo in partition}:
+                linhas = [line for line, item in partition if item == codigo]
+                self.assertEqual(linhas, sorted(linhas))
+                self.assertFalse(any(codigo in {c for _, c in other} for other in partitions if other is not partition))
+
+
+class ReferenciaCondicionalTest(UsuarioLogadoMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        Setor.objects.create(nome='Qualidade')
+
+    def test_setores_api_responde_304_ate_a_tabela_mudar(self):
+        """Revalidação com a ETag atual não executa a view; uma alteração gera nova versão"""
+        url = reverse('cadastro:setores_api')
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(3):  # sessão, usuário, versão da tabela
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b'')
+
+        Setor.objects.create(nome='Produção')
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(len(fresh.json()['setores']), 2)
+
+    def test_bootstrap_pmc_reflete_alteracao_do_cadastro(self):
+        """Bootstrap junta as listas em uma resposta e a lista em cache muda com a tabela"""
+        url = reverse('instrumento:pmc_bootstrap')
+        data = self.client.get(url, {'pmc_categoria': 'instrumentos'}).json()
+        self.assertEqual({'tipos', 'setores', 'laboratorios', 'descricoes', 'indicadores'}, set(data))
+        self.assertEqual([s['nome'] for s in data['setores']], ['Qualidade'])
+
+        Setor.objects.create(nome='Almoxarifado')
+        data = self.client.get(url, {'pmc_categoria': 'instrumentos'}).json()
+        self.assertEqual([s['nome'] for s in data['setores']], ['Almoxarifado', 'Qualidade'])
+
+
+class FuncionarioBuscaTest(UsuarioLogadoMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.qualidade = Setor.objects.create(nome='Qualidade')
+        Funcionario.objects.create(matricula='12', nome='Zélia Prado', setor=self.qualidade)
+        Funcionario.objects.create(matricula='123', nome='João Silva')
+        Funcionario.objects.create(matricula='900', nome='Joana 12', setor=self.qualidade)
+        Funcionario.objects.create(matricula='901', nome='Joaquim', ativo=False)
+
+    def test_busca_prioriza_matricula_exata_e_ignora_acentos(self):
+        """Matrícula exata primeiro, prefixo de nome sem acento e filtro por setor"""
+        url = reverse('cadastro:funcionarios_busca_api')
+
+        data = self.client.get(url, {'q': '12'}).json()
+        self.assertEqual([f['matricula'] for f in data['funcionarios']], ['12', '123'])
+
+        data = self.client.get(url, {'q': 'joa'}).json()
+        self.assertEqual([f['nome'] for f in data['funcionarios']], ['Joana 12', 'João Silva'])
+
+        data = self.client.get(url, {'q': 'jo', 'setor': self.qualidade.id, 'limit': 1}).json()
+        self.assertEqual([f['matricula'] for f in data['funcionarios']], ['900'])
+
+
+class ListagemOrcamentoConsultasTest(UsuarioLogadoMixin, TestCase):
+    """O número de consultas de uma página não pode crescer com o tamanho da página."""
+
+    def setUp(self):
+        super().setUp()
+        tipo = TipoInstrumento.objects.create(descricao='Paquímetro')
+        setor = Setor.objects.create(nome='Qualidade')
+        for idx in range(12):
+            instrumento = Instrumento.objects.create(codigo=f'PAQ-{idx:03d}', tipo_instrumento=tipo)
+            for sequencia in (1, 2):
+                PontoCalibracao.objects.create(instrumento=instrumento, sequencia=sequencia, valor_nominal=10, unidade='mm')
+            Funcionario.objects.create(matricula=f'{2000 + idx}', nome=f'Funcionario {idx}', setor=setor)
+
+    def _count_queries(self, url, per_page):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {'per_page': per_page})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.json()
+
+    def test_instrumentos_api_consultas_fixas(self):
+        url = reverse('cadastro:instrumentos_api')
+        small, _ = self._count_queries(url, 2)
+        large, data = self._count_queries(url, 12)
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 4)  # sessão, usuário, count, página
+        self.assertEqual({item['total_pontos'] for item in data['instrumentos']}, {2})
+
+    def test_funcionarios_lista_api_consultas_fixas(self):
+        url = reverse('cadastro:funcionarios_lista_api')
+        small, _ = self._count_queries(url, 2)
+        large, data = self._count_queries(url, 12)
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 4)
+        self.assertEqual({item['setor'] for item in data['funcionarios']}, {'Qualidade'})
+
+
+class PontosLoteTest(UsuarioLogadoMixin, TestCase):
+    def setUp(self):
+        from app.instrumento.models import StatusPontoCalibracao
+
+        super().setUp()
+        self.instrumentos = []
+        for idx in range(3):
+            instrumento = Instrumento.objects.create(codigo=f'MIC-{idx}')
+            self.instrumentos.append(instrumento)
+            for sequencia in (2, 1):
+                ponto = PontoCalibracao.objects.create(instrumento=instrumento, sequencia=sequencia, valor_nominal=5, unidade='mm')
+                StatusPontoCalibracao.objects.create(ponto_calibracao=ponto, resultado='reprovado')
+                StatusPontoCalibracao.objects.create(ponto_calibracao=ponto, resultado='aprovado')
+        PontoCalibracao.objects.create(instrumento=self.instrumentos[0], sequencia=3, valor_nominal=5, unidade='mm')
+
+    def test_lote_agrupa_pontos_com_ultima_analise_em_uma_consulta(self):
+        ids = ','.join(str(instrumento.id) for instrumento in self.instrumentos)
+        with self.assertNumQueries(3):  # sessão, usuário, pontos + últimas análises
+            response = self.client.get(reverse('cadastro:pontos_calibracao_lote_api'), {'ids': ids})
+
+        grupos = response.json()['instrumentos']
+        primeiro = grupos[str(self.instrumentos[0].id)]
+        self.assertEqual([p['sequencia'] for p in primeiro], [1, 2, 3])
+        self.assertEqual([p['ultima_resultado'] for p in primeiro], ['aprovado', 'aprovado', None])
+        self.assertEqual({len(pontos) for pontos in grupos.values()}, {2, 3})
+
+    def test_lote_rejeita_ids_invalidos(self):
+        response = self.client.get(reverse('cadastro:pontos_calibracao_lote_api'), {'ids': '1,abc'})
+        self.assertEqual(response.status_code, 400)
+
+
+class FastJsonResponseTest(SimpleTestCase):
+    def test_mesmo_formato_com_e_sem_orjson(self):
+        from datetime import datetime, timezone as dt_timezone
+        from decimal import Decimal
+        from unittest import mock
+
+        from . import respostas
+
+        data = {'data': datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=dt_timezone.utc), 'incerteza': Decimal('0.0012'), 7: 'chave'}
+        esperado = {'data': '2026-01-02T03:04:05.123456+00:00', 'incerteza': '0.0012', '7': 'chave'}
+
+        self.assertEqual(json.loads(respostas.FastJsonResponse(data).content), esperado)
+        with mock.patch.object(respostas, 'orjson', None):
+            self.assertEqual(json.loads(respostas.dumps(data)), esperado)
+        with self.assertRaises(TypeError):
+            respostas.FastJsonResponse([1, 2])
@@ -14,6 +14,7 @@ urlpatterns = [
     # Pontos de Calibração
     path('api/instrumentos/<int:instrumento_id>/pontos/', views.pontos_calibracao_api, name='pontos_calibracao_api'),
     path('api/instrumentos/<int:instrumento_id>/pontos/only-ativo/', views.pontos_calibracao_api_only_ativo, name='pontos_calibracao_api_only_ativo'),
+    path('api/pontos/lote/', views.pontos_calibracao_lote_api, name='pontos_calibracao_lote_api'),
     path('api/instrumentos/<int:instrumento_id>/pontos/create/', views.ponto_calibracao_create, name='ponto_calibracao_create'),
     path('api/pontos/<int:pk>/update/', views.ponto_calibracao_update, name='ponto_calibracao_update'),
     path('api/pontos/<int:pk>/delete/', views.ponto_calibracao_delete, name='ponto_calibracao_delete'),
@@ -39,6 +40,8 @@ urlpatterns = [
         
     # Funcionários API
     path('api/funcionarios/', views.funcionarios_api, name='funcionarios_api'),
+    path('api/funcionarios/busca/', views.funcionarios_busca_api, name='funcionarios_busca_api'),
+    path('api/funcionarios/compacto/', views.funcionarios_compacto_api, name='funcionarios_compacto_api'),
     path('funcionarios/', views.funcionarios_list, name='funcionarios_list'),
     path('api/funcionarios/lista/', views.funcionarios_lista_api, name='funcionarios_lista_api'),
     path('api/funcionarios/import/', views.funcionarios_import, name='funcionarios_import'),
@@ -1,11 +1,19 @@
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.core.paginator import Paginator
-from django.db.models import Q, OuterRef, Subquery, Exists
+from django.db.models import Q, OuterRef, Exists, Case, When, Value, IntegerField, Count
 from django.core.exceptions import ValidationError
-from .models import Instrumento, Funcionario, PontoCalibracao, TipoInstrumento, Setor
+from django.db import transaction
+from django.utils import timezone
+from asgiref.sync import sync_to_async
+from calimag.replica import ler_da_replica
+from .condicional import reference_data
+from .importacao import ValidationReport, check_duplicates, lookup_funcionarios, normalize_lookup
+from .pontos import LOTE_MAX_INSTRUMENTOS, pontos_com_ultima_analise, serialize_ponto
+from .referencias import funcionarios_compactos, invalidar_referencias, laboratorios_ativos, setores_ativos, tipos_instrumento_ativos
+from .respostas import FastJsonResponse
+from .models import Instrumento, Funcionario, PontoCalibracao, TipoInstrumento, Setor, Laboratorio, normalizar_busca
 import csv
 import io
 import json
@@ -32,6 +40,7 @@ def instrumentos_list(request):
 
 @login_required
 @require_http_methods(["GET"])
+@ler_da_replica
 def instrumentos_api(request):
     """API para listar instrumentos com paginação e busca"""
     search = request.GET.get('search', '')
@@ -50,7 +59,9 @@ def instrumentos_api(request):
     except (TypeError, ValueError):
         per_page = 10
 
-    instrumentos = Instrumento.objects.select_related('tipo_instrumento').all()
+    instrumentos = Instrumento.objects.select_related('tipo_instrumento').annotate(
+        total_pontos=Count('pontos_calibracao', distinct=True)
+    )
 
     if search:
         instrumentos = instrumentos.filter(
@@ -123,7 +134,7 @@ def instrumentos_api(request):
             'status': i.get_status_display() if hasattr(i, 'get_status_display') else '',
             'status_value': getattr(i, 'status', None),
             'observacoes': i.observacoes,
-            'total_pontos': getattr(i, 'total_pontos_calibracao', None),
+            'total_pontos': i.total_pontos,
             'data_aquisicao': i.data_aquisicao.strftime('%Y-%m-%d') if getattr(i, 'data_aquisicao', None) else '',
             'periodicidade': i.periodicidade_calibracao,
             'finalidade': i.finalidade,
@@ -141,7 +152,7 @@ def instrumentos_api(request):
         }
     }
 
-    return JsonResponse(data)
+    return FastJsonResponse(data)
 
 
 @login_required
@@ -167,7 +178,7 @@ def instrumento_create(request):
             data_aquisicao=data.get('data_aquisicao') or None,
         )
 
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'message': 'Instrumento cadastrado com sucesso!',
             'instrumento': {
@@ -177,7 +188,7 @@ def instrumento_create(request):
             }
         })
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'message': f'Erro ao cadastrar instrumento: {str(e)}'
         }, status=400)
@@ -185,19 +196,14 @@ def instrumento_create(request):
 
 @login_required
 @require_http_methods(["GET"])
-def tipos_instrumento_api(request):
+@ler_da_replica
+@reference_data(TipoInstrumento)
+async def tipos_instrumento_api(request):
     """API para listar tipos de instrumento ativos"""
     try:
-        tipos = TipoInstrumento.objects.filter(ativo=True).order_by('descricao')
-        data = {
-            'tipos': [
-                {'id': t.id, 'descricao': t.descricao, 'documento_qualidade': t.documento_qualidade}
-                for t in tipos
-            ]
-        }
-        return JsonResponse(data)
+        return FastJsonResponse({'tipos': await sync_to_async(tipos_instrumento_ativos)()})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 @login_required
@@ -216,9 +222,9 @@ def tipos_instrumento_create(request):
             ativo=data.get('ativo', True),
             documento_qualidade=data.get('documento_qualidade', '').strip()
         )
-        return JsonResponse({'success': True, 'message': 'Tipo criado', 'tipo': {'id': tipo.id, 'descricao': tipo.descricao}})
+        return FastJsonResponse({'success': True, 'message': 'Tipo criado', 'tipo': {'id': tipo.id, 'descricao': tipo.descricao}})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 @login_required
@@ -231,9 +237,9 @@ def tipos_instrumento_update(request, pk):
         tipo.ativo = data.get('ativo', tipo.ativo)
         tipo.documento_qualidade = data.get('documento_qualidade', tipo.documento_qualidade).strip()
         tipo.save()
-        return JsonResponse({'success': True, 'message': 'Tipo atualizado'})
+        return FastJsonResponse({'success': True, 'message': 'Tipo atualizado'})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 @login_required
@@ -242,9 +248,9 @@ def tipos_instrumento_delete(request, pk):
     try:
         tipo = get_object_or_404(TipoInstrumento, pk=pk)
         tipo.delete()
-        return JsonResponse({'success': True, 'message': 'Tipo deletado'})
+        return FastJsonResponse({'success': True, 'message': 'Tipo deletado'})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 # ================================
@@ -254,32 +260,26 @@ def tipos_instrumento_delete(request, pk):
 
 @login_required
 @require_http_methods(["GET"])
-def laboratorios_api(request):
+@ler_da_replica
+@reference_data(Laboratorio)
+async def laboratorios_api(request):
     """API para listar laboratórios ativos"""
     try:
-        from .models import Laboratorio
-        labs = Laboratorio.objects.filter(ativo=True).order_by('nome')
-        data = {
-            'laboratorios': [
-                {'id': l.id, 'nome': l.nome}
-                for l in labs
-            ]
-        }
-        return JsonResponse(data)
+        return FastJsonResponse({'laboratorios': await sync_to_async(laboratorios_ativos)()})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 @login_required
 @require_http_methods(["GET"])
-def setores_api(request):
+@ler_da_replica
+@reference_data(Setor)
+async def setores_api(request):
     """API para listar setores ativos"""
     try:
-        setores = Setor.objects.filter(ativo=True).order_by('nome')
-        data = {'setores': [{'id': s.id, 'nome': s.nome} for s in setores]}
-        return JsonResponse(data)
+        return FastJsonResponse({'setores': await sync_to_async(setores_ativos)()})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 @login_required
@@ -298,9 +298,9 @@ def setores_create(request):
             descricao=data.get('descricao', '').strip(),
             ativo=data.get('ativo', True)
         )
-        return JsonResponse({'success': True, 'message': 'Setor criado', 'setor': {'id': setor.id, 'nome': setor.nome}})
+        return FastJsonResponse({'success': True, 'message': 'Setor criado', 'setor': {'id': setor.id, 'nome': setor.nome}})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 @login_required
@@ -313,9 +313,9 @@ def setores_update(request, pk):
         setor.descricao = data.get('descricao', setor.descricao)
         setor.ativo = data.get('ativo', setor.ativo)
         setor.save()
-        return JsonResponse({'success': True, 'message': 'Setor atualizado'})
+        return FastJsonResponse({'success': True, 'message': 'Setor atualizado'})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 @login_required
@@ -325,9 +325,9 @@ def setores_delete(request, pk):
         setor = get_object_or_404(Setor, pk=pk)
         nome = setor.nome
         setor.delete()
-        return JsonResponse({'success': True, 'message': f'Setor {nome} deletado com sucesso!'})
+        return FastJsonResponse({'success': True, 'message': f'Setor {nome} deletado com sucesso!'})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 @login_required
@@ -346,9 +346,9 @@ def laboratorios_create(request):
             nome=data.get('nome', '').strip(),
             ativo=data.get('ativo', True)
         )
-        return JsonResponse({'success': True, 'message': 'Laboratório criado', 'laboratorio': {'id': lab.id, 'nome': lab.nome}})
+        return FastJsonResponse({'success': True, 'message': 'Laboratório criado', 'laboratorio': {'id': lab.id, 'nome': lab.nome}})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 @login_required
@@ -361,9 +361,9 @@ def laboratorios_update(request, pk):
         lab.nome = data.get('nome', lab.nome).strip()
         lab.ativo = data.get('ativo', lab.ativo)
         lab.save()
-        return JsonResponse({'success': True, 'message': 'Laboratório atualizado'})
+        return FastJsonResponse({'success': True, 'message': 'Laboratório atualizado'})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 @login_required
@@ -374,9 +374,9 @@ def laboratorios_delete(request, pk):
         lab = get_object_or_404(Laboratorio, pk=pk)
         nome = lab.nome
         lab.delete()
-        return JsonResponse({'success': True, 'message': f'Laboratório {nome} deletado com sucesso!'})
+        return FastJsonResponse({'success': True, 'message': f'Laboratório {nome} deletado com sucesso!'})
     except Exception as e:
-        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 
 @login_required
@@ -415,12 +415,12 @@ def instrumento_update(request, pk):
             instrumento.responsavel = None
         instrumento.save()
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'message': 'Instrumento atualizado com sucesso!'
         })
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'message': f'Erro ao atualizar instrumento: {str(e)}'
         }, status=400)
@@ -435,12 +435,12 @@ def instrumento_delete(request, pk):
         codigo = instrumento.codigo
         instrumento.delete()
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'message': f'Instrumento {codigo} deletado com sucesso!'
         })
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'message': f'Erro ao deletar instrumento: {str(e)}'
         }, status=400)
@@ -448,20 +448,83 @@ def instrumento_delete(request, pk):
 
 @login_required
 @require_http_methods(["GET"])
-def funcionarios_api(request):
+@ler_da_replica
+@reference_data(Funcionario)
+async def funcionarios_api(request):
     """API para listar funcionários ativos"""
-    funcionarios = list(
+    funcionarios = [
+        funcionario async for funcionario in
         Funcionario.objects
         .filter(ativo=True)
         .order_by('nome')
         .values('id', 'matricula', 'nome', 'cargo')
-    )
+    ]
     
     data = {
         'funcionarios': funcionarios
     }
     
-    return JsonResponse(data)
+    return FastJsonResponse(data)
+
+
+FUNCIONARIOS_BUSCA_LIMITE = 20
+FUNCIONARIOS_BUSCA_LIMITE_MAX = 50
+
+
+@login_required
+@require_http_methods(["GET"])
+@ler_da_replica
+async def funcionarios_busca_api(request):
+    """Typeahead de funcionários ativos por prefixo de matrícula ou nome.
+
+    Usa os índices de `matricula` e `nome_busca`; a matrícula exata vem
+    primeiro, depois prefixos de matrícula e por fim nomes em ordem alfabética.
+    """
+    termo = (request.GET.get('q') or '').strip()
+    if not termo:
+        return FastJsonResponse({'funcionarios': []})
+
+    try:
+        limite = int(request.GET.get('limit', FUNCIONARIOS_BUSCA_LIMITE))
+    except (TypeError, ValueError):
+        limite = FUNCIONARIOS_BUSCA_LIMITE
+    limite = max(1, min(limite, FUNCIONARIOS_BUSCA_LIMITE_MAX))
+
+    funcionarios = Funcionario.objects.filter(ativo=True).filter(
+        Q(matricula__startswith=termo) | Q(nome_busca__startswith=normalizar_busca(termo))
+    )
+    setor_id = (request.GET.get('setor') or '').strip()
+    if setor_id.isdigit():
+        funcionarios = funcionarios.filter(setor_id=int(setor_id))
+
+    funcionarios = funcionarios.annotate(
+        relevancia=Case(
+            When(matricula=termo, then=Value(0)),
+            When(matricula__startswith=termo, then=Value(1)),
+            default=Value(2),
+            output_field=IntegerField(),
+        )
+    ).order_by('relevancia', 'nome_busca', 'matricula')
+
+    return FastJsonResponse({
+        'funcionarios': [f async for f in funcionarios.values('id', 'matricula', 'nome', 'cargo')[:limite]]
+    })
+
+
+@login_required
+@require_http_methods(["GET"])
+@ler_da_replica
+@reference_data(Funcionario)
+async def funcionarios_compacto_api(request):
+    """Lista completa de funcionários ativos em formato compacto, para clientes offline.
+
+    Cada funcionário é um array na ordem de `campos`; a lista fica em cache
+    pela versão da tabela e responde 304 quando o cliente já a possui.
+    """
+    return FastJsonResponse({
+        'campos': ['id', 'matricula', 'nome'],
+        'funcionarios': await sync_to_async(funcionarios_compactos)(),
+    })
 
 
 @login_required
@@ -472,13 +535,14 @@ def funcionarios_list(request):
 
 @login_required
 @require_http_methods(["GET"])
+@ler_da_replica
 def funcionarios_lista_api(request):
     """API para listar funcionários com paginação e busca"""
     search = request.GET.get('search', '')
     page = request.GET.get('page', 1)
     per_page = request.GET.get('per_page', 10)
     
-    funcionarios = Funcionario.objects.all()
+    funcionarios = Funcionario.objects.select_related('setor')
     if search:
         funcionarios = funcionarios.filter(
             Q(matricula__icontains=search) |
@@ -499,8 +563,8 @@ def funcionarios_lista_api(request):
                 'nome': f.nome,
                 'email': f.email,
                 'cargo': f.cargo,
-                'setor': f.setor.nome if getattr(f, 'setor', None) else '',
-                'setor_id': f.setor.id if getattr(f, 'setor', None) else None,
+                'setor': f.setor.nome if f.setor else '',
+                'setor_id': f.setor_id,
                 'telefone': f.telefone,
                 'ativo': f.ativo,
                 'data_admissao': f.data_admissao.isoformat() if f.data_admissao else None,
@@ -516,7 +580,7 @@ def funcionarios_lista_api(request):
         }
     }
 
-    return JsonResponse(data)
+    return FastJsonResponse(data)
 
 
 @login_required
@@ -525,15 +589,15 @@ def funcionarios_import(request):
     """Importa funcionários via arquivo CSV contendo matrícula e nome."""
     upload = request.FILES.get('file')
     if not upload:
-        return JsonResponse({'success': False, 'message': 'Envie um arquivo CSV no campo "file".'}, status=400)
+        return FastJsonResponse({'success': False, 'message': 'Envie um arquivo CSV no campo "file".'}, status=400)
 
     try:
         raw_bytes = upload.read()
     except Exception:
-        return JsonResponse({'success': False, 'message': 'Não foi possível ler o arquivo enviado.'}, status=400)
+        return FastJsonResponse({'success': False, 'message': 'Não foi possível ler o arquivo enviado.'}, status=400)
 
     if not raw_bytes:
-        return JsonResponse({'success': False, 'message': 'O arquivo enviado está vazio.'}, status=400)
+        return FastJsonResponse({'success': False, 'message': 'O arquivo enviado está vazio.'}, status=400)
 
     decoded = None
     for encoding in ('utf-8-sig', 'utf-8', 'latin-1'):
@@ -543,7 +607,7 @@ def funcionarios_import(request):
         except UnicodeDecodeError:
             continue
     if decoded is None:
-        return JsonResponse({'success': False, 'message': 'Não foi possível decodificar o arquivo. Utilize UTF-8 ou Latin-1.'}, status=400)
+        return FastJsonResponse({'success': False, 'message': 'Não foi possível decodificar o arquivo. Utilize UTF-8 ou Latin-1.'}, status=400)
 
     sample_line = ''
     for line in decoded.splitlines():
@@ -564,7 +628,7 @@ def funcionarios_import(request):
         break
 
     if header_row is None:
-        return JsonResponse({'success': False, 'message': 'Nenhuma linha válida encontrada no arquivo.'}, status=400)
+        return FastJsonResponse({'success': False, 'message': 'Nenhuma linha válida encontrada no arquivo.'}, status=400)
 
     normalized_header = [cell.strip().lower() for cell in header_row]
     has_header = 'matricula' in normalized_header and 'nome' in normalized_header
@@ -574,51 +638,81 @@ def funcionarios_import(request):
         idx_nome = normalized_header.index('nome')
     else:
         if len(header_row) < 2:
-            return JsonResponse({'success': False, 'message': 'Cada linha deve conter, ao menos, matrícula e nome.'}, status=400)
+            return FastJsonResponse({'success': False, 'message': 'Cada linha deve conter, ao menos, matrícula e nome.'}, status=400)
         idx_matricula = 0
         idx_nome = 1
 
+    dry_run = (request.POST.get('dry_run') or request.GET.get('dry_run') or '').lower() in {'1', 'true', 'sim', 'yes'}
     stats = {'processed': 0, 'created': 0, 'updated': 0, 'unchanged': 0, 'error_rows': 0}
-    errors = []
-    seen_in_file = set()
+    report = ValidationReport()
+    entries = []
 
-    def process_row(row, line_number):
+    def parse_row(row, line_number):
         matricula = row[idx_matricula].strip() if len(row) > idx_matricula else ''
         nome = row[idx_nome].strip() if len(row) > idx_nome else ''
         if not matricula or not nome:
-            errors.append({'line': line_number, 'error': 'Linha sem matrícula e/ou nome.'})
-            stats['error_rows'] += 1
+            report.add(line_number, 'Linha sem matrícula e/ou nome.')
             return
-        key = matricula.lower()
-        if key in seen_in_file:
-            errors.append({'line': line_number, 'error': 'Matrícula duplicada no arquivo.'})
-            stats['error_rows'] += 1
+        if len(matricula) > Funcionario._meta.get_field('matricula').max_length:
+            report.add(line_number, f'Matrícula "{matricula}" excede o tamanho máximo.')
             return
-        seen_in_file.add(key)
+        entries.append((line_number, matricula, nome))
+
+    if not has_header:
+        parse_row(header_row, header_line)
 
+    for row in reader:
+        if not row or not any((cell or '').strip() for cell in row):
+            continue
+        parse_row(row, reader.line_num)
+
+    duplicated = check_duplicates(
+        report,
+        ((line_number, normalize_lookup(matricula)) for line_number, matricula, _ in entries),
+        'Matrícula duplicada no arquivo',
+    )
+    entries = [entry for entry in entries if entry[0] not in duplicated]
+    # uma única consulta resolve todas as matrículas do arquivo, sem diferenciar maiúsculas como a checagem acima
+    existing = lookup_funcionarios(matricula for _, matricula, _ in entries)
+
+    to_create = []
+    to_update = []
+    for _, matricula, nome in entries:
         stats['processed'] += 1
-        funcionario, created = Funcionario.objects.get_or_create(
-            matricula=matricula,
-            defaults={'nome': nome, 'ativo': True}
-        )
-        if created:
+        funcionario = existing.get(normalize_lookup(matricula))
+        if funcionario is None:
+            to_create.append(Funcionario(matricula=matricula, nome=nome, nome_busca=normalizar_busca(nome), ativo=True))
             stats['created'] += 1
-            return
-
-        if funcionario.nome != nome:
+        elif funcionario.nome != nome:
             funcionario.nome = nome
-            funcionario.save(update_fields=['nome'])
+            funcionario.nome_busca = normalizar_busca(nome)
+            to_update.append(funcionario)
             stats['updated'] += 1
         else:
             stats['unchanged'] += 1
+    stats['error_rows'] = report.error_rows
 
-    if not has_header:
-        process_row(header_row, header_line)
+    if dry_run:
+        return FastJsonResponse({
+            'success': True,
+            'dry_run': True,
+            'message': (
+                f"Validação concluída ({stats['processed']} linha(s) válidas, "
+                f"{stats['error_rows']} linha(s) com erro). Nada foi gravado."
+            ),
+            'stats': stats,
+            'errors': sorted(report.errors, key=lambda item: item['line']),
+        })
 
-    for row in reader:
-        if not row or not any((cell or '').strip() for cell in row):
-            continue
-        process_row(row, reader.line_num)
+    with transaction.atomic():
+        Funcionario.objects.bulk_create(to_create)
+        # bulk_update não aplica auto_now; a data alimenta o ETag de funcionarios_api
+        agora = timezone.now()
+        for funcionario in to_update:
+            funcionario.data_atualizacao = agora
+        Funcionario.objects.bulk_update(to_update, ['nome', 'nome_busca', 'data_atualizacao'])
+        # bulk_create/bulk_update não disparam sinais
+        invalidar_referencias(Funcionario)
 
     message_bits = [
         f"Carga processada ({stats['processed']} linha(s) válidas)",
@@ -628,11 +722,11 @@ def funcionarios_import(request):
     if stats['error_rows']:
         message_bits.append(f"{stats['error_rows']} linha(s) ignoradas")
 
-    return JsonResponse({
+    return FastJsonResponse({
         'success': True,
         'message': ', '.join(message_bits) + '.',
         'stats': stats,
-        'errors': errors,
+        'errors': sorted(report.errors, key=lambda item: item['line']),
     })
 
 
@@ -661,7 +755,7 @@ def funcionario_create(request):
             data_admissao=data.get('data_admissao') or None,
         )
 
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'message': 'Funcionário cadastrado com sucesso!',
             'funcionario': {
@@ -671,7 +765,7 @@ def funcionario_create(request):
             }
         })
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'message': f'Erro ao cadastrar funcionário: {str(e)}'
         }, status=400)
@@ -707,12 +801,12 @@ def funcionario_update(request, pk):
 
         funcionario.save()
 
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'message': 'Funcionário atualizado com sucesso!'
         })
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'message': f'Erro ao atualizar funcionário: {str(e)}'
         }, status=400)
@@ -726,12 +820,12 @@ def funcionario_delete(request, pk):
         funcionario = get_object_or_404(Funcionario, pk=pk)
         matricula = funcionario.matricula
         funcionario.delete()
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'message': f'Funcionário {matricula} deletado com sucesso!'
         })
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'message': f'Erro ao deletar funcionário: {str(e)}'
         }, status=400)
@@ -743,106 +837,64 @@ def funcionario_delete(request, pk):
 
 @login_required
 @require_http_methods(["GET"])
+@ler_da_replica
 def pontos_calibracao_api(request, instrumento_id):
     """API para listar pontos de calibração de um instrumento"""
     try:
         instrumento = get_object_or_404(Instrumento, pk=instrumento_id)
-        # Anotar cada ponto com os campos da última análise (se houver)
-        from app.instrumento.models import StatusPontoCalibracao
-        latest_status = StatusPontoCalibracao.objects.filter(ponto_calibracao=OuterRef('pk')).order_by('-data_criacao')
-
-        pontos = PontoCalibracao.objects.filter(
-            instrumento=instrumento,
-        ).annotate(
-            ultima_data_analise=Subquery(latest_status.values('data_criacao')[:1]),
-            ultima_incerteza=Subquery(latest_status.values('incerteza')[:1]),
-            ultima_tendencia=Subquery(latest_status.values('tendencia')[:1]),
-            ultima_resultado=Subquery(latest_status.values('resultado')[:1]),
-        ).order_by('sequencia')
-        
-        data = {
-            'pontos': [
-                {
-                    'id': p.id,
-                    'sequencia': p.sequencia,
-                    'descricao': p.descricao,
-                    'valor_nominal': f"{str(p.valor_maximo)} - {str(p.valor_minimo)}",
-                    'valor_nominal_maximo':p.valor_maximo,
-                    'valor_nominal_minimo':p.valor_minimo,
-                    'unidade': p.unidade,
-                    'unidade_display': p.get_unidade_display(),
-                    'tolerancia_mais': str(p.tolerancia_mais) if p.tolerancia_mais else '',
-                    'tolerancia_menos': str(p.tolerancia_menos) if p.tolerancia_menos else '',
-                    'observacoes': p.observacoes,
-                    'ativo': p.ativo,
-                    'ultima_data_analise': p.ultima_data_analise.isoformat() if getattr(p, 'ultima_data_analise', None) else None,
-                    'ultima_incerteza': str(p.ultima_incerteza) if getattr(p, 'ultima_incerteza', None) is not None else None,
-                    'ultima_tendencia': p.ultima_tendencia or '',
-                    'ultima_resultado': p.ultima_resultado or None,
-                }
-                for p in pontos
-            ]
-        }
-        
-        return JsonResponse(data)
+        pontos = pontos_com_ultima_analise([instrumento.id])
+        return FastJsonResponse({'pontos': [serialize_ponto(p) for p in pontos]})
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'message': f'Erro ao carregar pontos: {str(e)}'
         }, status=400)
 
 @login_required
 @require_http_methods(["GET"])
+@ler_da_replica
 def pontos_calibracao_api_only_ativo(request, instrumento_id):
     """API para listar pontos de calibração de um instrumento"""
     try:
         instrumento = get_object_or_404(Instrumento, pk=instrumento_id)
-        # Anotar cada ponto com os campos da última análise (se houver)
-        from app.instrumento.models import StatusPontoCalibracao
-        latest_status = StatusPontoCalibracao.objects.filter(ponto_calibracao=OuterRef('pk')).order_by('-data_criacao')
-
-        pontos = PontoCalibracao.objects.filter(
-            instrumento=instrumento,
-            ativo=True,
-        ).annotate(
-            ultima_data_analise=Subquery(latest_status.values('data_criacao')[:1]),
-            ultima_incerteza=Subquery(latest_status.values('incerteza')[:1]),
-            ultima_tendencia=Subquery(latest_status.values('tendencia')[:1]),
-            ultima_resultado=Subquery(latest_status.values('resultado')[:1]),
-        ).order_by('sequencia')
-        
-        data = {
-            'pontos': [
-                {
-                    'id': p.id,
-                    'sequencia': p.sequencia,
-                    'descricao': p.descricao,
-                    'valor_nominal_minimo': p.valor_minimo,
-                    'valor_nominal_maximo': p.valor_maximo,
-                    'valor_nominal': f"{str(p.valor_maximo)} - {str(p.valor_minimo)}",
-                    'unidade': p.unidade,
-                    'unidade_display': p.get_unidade_display(),
-                    'tolerancia_mais': str(p.tolerancia_mais) if p.tolerancia_mais else '',
-                    'tolerancia_menos': str(p.tolerancia_menos) if p.tolerancia_menos else '',
-                    'observacoes': p.observacoes,
-                    'ativo': p.ativo,
-                    'ultima_data_analise': p.ultima_data_analise.isoformat() if getattr(p, 'ultima_data_analise', None) else None,
-                    'ultima_incerteza': str(p.ultima_incerteza) if getattr(p, 'ultima_incerteza', None) is not None else None,
-                    'ultima_tendencia': p.ultima_tendencia or '',
-                    'ultima_resultado': p.ultima_resultado or None,
-                }
-                for p in pontos
-            ]
-        }
-        
-        return JsonResponse(data)
+        pontos = pontos_com_ultima_analise([instrumento.id], only_ativo=True)
+        return FastJsonResponse({'pontos': [serialize_ponto(p) for p in pontos]})
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'message': f'Erro ao carregar pontos: {str(e)}'
         }, status=400)
 
 
+@login_required
+@require_http_methods(["GET"])
+@ler_da_replica
+def pontos_calibracao_lote_api(request):
+    """API para listar pontos (com a última análise) de vários instrumentos de uma vez.
+
+    Recebe `ids=1,2,3` (ou `ids` repetido) e `only_ativo=1` opcional; devolve
+    os pontos agrupados por instrumento em uma única consulta.
+    """
+    raw_ids = [part for value in request.GET.getlist('ids') for part in value.split(',') if part.strip()]
+    try:
+        ids = list(dict.fromkeys(int(part) for part in raw_ids))
+    except ValueError:
+        return FastJsonResponse({'success': False, 'message': 'Parâmetro ids deve conter apenas números.'}, status=400)
+    if not ids:
+        return FastJsonResponse({'success': False, 'message': 'Informe ao menos um instrumento em ids.'}, status=400)
+    if len(ids) > LOTE_MAX_INSTRUMENTOS:
+        return FastJsonResponse({
+            'success': False,
+            'message': f'Máximo de {LOTE_MAX_INSTRUMENTOS} instrumentos por requisição.'
+        }, status=400)
+
+    only_ativo = (request.GET.get('only_ativo') or '').lower() in {'1', 'true', 'sim'}
+    agrupados = {str(instrumento_id): [] for instrumento_id in ids}
+    for ponto in pontos_com_ultima_analise(ids, only_ativo=only_ativo):
+        agrupados[str(ponto.instrumento_id)].append(serialize_ponto(ponto))
+    return FastJsonResponse({'instrumentos': agrupados})
+
+
 
 @login_required
 @require_http_methods(["POST"])
@@ -876,14 +928,14 @@ def ponto_calibracao_create(request, instrumento_id):
         try:
             ponto.clean()
         except ValidationError as e:
-            return JsonResponse({
+            return FastJsonResponse({
                 'success': False,
                 'message': str(e.message_dict if hasattr(e, 'message_dict') else e)
             }, status=400)
         
         ponto.save()
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'message': 'Ponto de calibração cadastrado com sucesso!',
             'ponto': {
@@ -892,7 +944,7 @@ def ponto_calibracao_create(request, instrumento_id):
             }
         })
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'message': f'Erro ao cadastrar ponto: {str(e)}'
         }, status=400)
@@ -921,19 +973,19 @@ def ponto_calibracao_update(request, pk):
         try:
             ponto.clean()
         except ValidationError as e:
-            return JsonResponse({
+            return FastJsonResponse({
                 'success': False,
                 'message': str(e.message_dict if hasattr(e, 'message_dict') else e)
             }, status=400)
         
         ponto.save()
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'message': 'Ponto de calibração atualizado com sucesso!'
         })
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'message': f'Erro ao atualizar ponto: {str(e)}'
         }, status=400)
@@ -953,7 +1005,7 @@ def ponto_calibracao_delete(request, pk):
         # Validar se é o último ponto (RN001)
         total_pontos = instrumento.pontos_calibracao.count()
         if total_pontos <= 1:
-            return JsonResponse({
+            return FastJsonResponse({
                 'success': False,
                 'message': 'Não é possível excluir o último ponto de calibração. O instrumento deve ter pelo menos 1 ponto.'
             }, status=400)
@@ -961,12 +1013,12 @@ def ponto_calibracao_delete(request, pk):
         sequencia = ponto.sequencia
         ponto.delete()
         
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'message': f'Ponto {sequencia} deletado com sucesso!'
         })
     except Exception as e:
-        return JsonResponse({
+        return FastJsonResponse({
             'success': False,
             'message': f'Erro ao deletar ponto: {str(e)}'
         }, status=400)
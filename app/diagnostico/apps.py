@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class DiagnosticoConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'app.diagnostico'
+    verbose_name = 'Diagnóstico'
+
+    def ready(self):
+        # Opt-in: sem limite configurado nenhuma conexão recebe o wrapper.
+        if settings.CONSULTAS_LENTAS_MS > 0:
+            from django.db.backends.signals import connection_created
+
+            from .registro import instalar
+
+            connection_created.connect(instalar, dispatch_uid='diagnostico_consultas_lentas')
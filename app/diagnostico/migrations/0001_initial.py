@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsultaLenta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Data')),
+                ('duracao_ms', models.FloatField(verbose_name='Duração (ms)')),
+                ('banco', models.CharField(max_length=50, verbose_name='Banco')),
+                ('rota', models.CharField(blank=True, max_length=200, verbose_name='Rota')),
+                ('sql', models.TextField(verbose_name='SQL')),
+                ('parametros', models.TextField(blank=True, verbose_name='Parâmetros')),
+                ('plano', models.TextField(blank=True, verbose_name='Plano (EXPLAIN ANALYZE)')),
+                ('erro_plano', models.TextField(blank=True, verbose_name='Erro no EXPLAIN')),
+            ],
+            options={
+                'verbose_name': 'Consulta Lenta',
+                'verbose_name_plural': 'Consultas Lentas',
+                'ordering': ['-id'],
+            },
+        ),
+    ]
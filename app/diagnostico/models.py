@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class ConsultaLenta(models.Model):
+    """Consulta SQL acima de `CONSULTAS_LENTAS_MS`, com o plano de execução quando houver.
+
+    A tabela é limitada a `CONSULTAS_LENTAS_MAX` linhas; as mais antigas são
+    descartadas a cada gravação.
+    """
+    data = models.DateTimeField('Data', auto_now_add=True, db_index=True)
+    duracao_ms = models.FloatField('Duração (ms)')
+    banco = models.CharField('Banco', max_length=50)
+    rota = models.CharField('Rota', max_length=200, blank=True)
+    sql = models.TextField('SQL')
+    parametros = models.TextField('Parâmetros', blank=True)
+    plano = models.TextField('Plano (EXPLAIN ANALYZE)', blank=True)
+    erro_plano = models.TextField('Erro no EXPLAIN', blank=True)
+
+    class Meta:
+        verbose_name = 'Consulta Lenta'
+        verbose_name_plural = 'Consultas Lentas'
+        ordering = ['-id']
+
+    def __str__(self):
+        return f"{self.duracao_ms:.0f} ms em {self.rota or 'sem rota'}"
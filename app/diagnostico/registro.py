@@ -0,0 +1,165 @@
+"""Gravação das consultas lentas, com `EXPLAIN (ANALYZE, BUFFERS)` fora da requisição.
+
+O wrapper só mede a consulta; acima de `CONSULTAS_LENTAS_MS` ele entrega
+SQL, parâmetros e rota a uma thread própria, que roda o EXPLAIN numa
+transação somente leitura, desfeita no fim e limitada por
+`CONSULTAS_LENTAS_EXPLAIN_TIMEOUT_MS`, e grava o resultado. Toda ocorrência
+é gravada; ANALYZE executa a consulta de novo, então só `SELECT ... FROM`
+sem `FOR UPDATE/SHARE` é explicado, e o mesmo SQL no máximo uma vez por
+`CONSULTAS_LENTAS_INTERVALO` segundos em cada processo. Com a fila cheia a
+consulta é descartada: o diagnóstico nunca pode atrasar o atendimento.
+
+Consultas às tabelas de sessão e autenticação guardam só o SQL: os
+parâmetros trariam chaves de sessão e hashes de senha, e o plano mostra os
+mesmos valores nos filtros, então elas também não são explicadas.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+
+from calimag.instrumentacao import rota_atual
+
+logger = logging.getLogger(__name__)
+
+PARAMETROS_MAX_CARACTERES = 5000
+FILA_MAX = 20
+TABELAS_SENSIVEIS = ('django_session', 'usuarios_usuario', 'auth_')  # prefixos dos nomes
+
+_EXPLICAVEL = re.compile(r'^\s*SELECT\b(?=.*\bFROM\b)', re.IGNORECASE | re.DOTALL)
+_TRAVA = re.compile(r'\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE|KEY\s+SHARE)\b', re.IGNORECASE)
+
+# As consultas da própria gravação (EXPLAIN, INSERT, poda) não são registradas.
+_ignorar: ContextVar[bool] = ContextVar('diagnostico_ignorar', default=False)
+
+_trava = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_pendentes = 0
+_ultimas: dict[str, float] = {}
+
+
+def explicavel(sql: str) -> bool:
+    return bool(_EXPLICAVEL.match(sql)) and not _TRAVA.search(sql)
+
+
+def sensivel(sql: str) -> bool:
+    return any(f'"{prefixo}' in sql for prefixo in TABELAS_SENSIVEIS)
+
+
+def registrar_consulta(execute, sql, params, many, context):
+    if _ignorar.get():
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        if duracao_ms >= settings.CONSULTAS_LENTAS_MS and not many:
+            _agendar(context['connection'].alias, sql, params, duracao_ms, rota_atual())
+
+
+def instalar(connection, **kwargs) -> None:
+    if registrar_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(registrar_consulta)
+
+
+def _agendar(alias, sql, params, duracao_ms, rota) -> None:
+    global _pendentes
+    if sensivel(sql):
+        params = None
+        explicar = False
+    else:
+        explicar = explicavel(sql)
+    agora = time.monotonic()
+    with _trava:
+        if _pendentes >= FILA_MAX:
+            return
+        if explicar:
+            explicar = agora - _ultimas.get(sql, float('-inf')) >= settings.CONSULTAS_LENTAS_INTERVALO
+        if explicar:
+            _ultimas[sql] = agora
+            if len(_ultimas) > 1000:
+                limite = agora - settings.CONSULTAS_LENTAS_INTERVALO
+                for chave in [chave for chave, quando in _ultimas.items() if quando < limite]:
+                    del _ultimas[chave]
+        _pendentes += 1
+    _submeter(processar, alias, sql, params, duracao_ms, rota, explicar)
+
+
+def _submeter(func, *args) -> None:
+    global _executor
+    with _trava:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='consultas-lentas')
+    _executor.submit(_na_thread, func, *args)
+
+
+def _na_thread(func, *args) -> None:
+    try:
+        func(*args)
+    finally:
+        # Sem requisição para fechá-las, as conexões da thread ficariam presas (e fora do pool).
+        connections.close_all()
+
+
+def _parametros(params) -> str:
+    if params is None:
+        return ''
+    texto = json.dumps(params if isinstance(params, dict) else list(params), default=str, ensure_ascii=False)
+    return texto[:PARAMETROS_MAX_CARACTERES]
+
+
+def _explicar(alias: str, sql: str, params) -> str:
+    conexao = connections[alias]
+    with transaction.atomic(using=alias):
+        with conexao.cursor() as cursor:
+            cursor.execute('SET TRANSACTION READ ONLY')
+            cursor.execute(
+                "SELECT set_config('statement_timeout', %s, true)", [str(int(settings.CONSULTAS_LENTAS_EXPLAIN_TIMEOUT_MS))]
+            )
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {sql}', params)
+            plano = '\n'.join(linha[0] for linha in cursor.fetchall())
+        transaction.set_rollback(True, using=alias)
+    return plano
+
+
+def processar(alias, sql, params, duracao_ms, rota, explicar=True) -> None:
+    """Roda o EXPLAIN (PostgreSQL, quando pedido) e grava a consulta, descartando as mais antigas."""
+    from .models import ConsultaLenta
+
+    global _pendentes
+    token = _ignorar.set(True)
+    try:
+        plano = erro = ''
+        if explicar and connections[alias].vendor == 'postgresql' and explicavel(sql):
+            try:
+                plano = _explicar(alias, sql, params)
+            except DatabaseError as exc:
+                erro = str(exc)
+        ConsultaLenta.objects.create(
+            duracao_ms=round(duracao_ms, 2),
+            banco=alias,
+            rota=rota or '',
+            sql=sql,
+            parametros=_parametros(params),
+            plano=plano,
+            erro_plano=erro,
+        )
+        maximo = settings.CONSULTAS_LENTAS_MAX
+        corte = list(ConsultaLenta.objects.order_by('-id').values_list('id', flat=True)[maximo:maximo + 1])
+        if corte:
+            ConsultaLenta.objects.filter(id__lte=corte[0]).delete()
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('Falha ao registrar consulta lenta.')
+    finally:
+        _ignorar.reset(token)
+        with _trava:
+            _pendentes -= 1
@@ -0,0 +1,93 @@
+from unittest import mock
+
+from django.conf import settings
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from app.cadastro.models import Setor
+from app.usuarios.models import Usuario
+
+from . import registro
+from .models import ConsultaLenta
+
+
+class ExplicavelTest(SimpleTestCase):
+    def test_so_selects_sem_trava(self):
+        self.assertTrue(registro.explicavel('SELECT "id" FROM "cadastro_setor" WHERE "id" = %s'))
+        self.assertFalse(registro.explicavel('SELECT "id" FROM "cadastro_setor" FOR UPDATE'))
+        self.assertFalse(registro.explicavel('SELECT pg_advisory_xact_lock(%s)'))
+        self.assertFalse(registro.explicavel('UPDATE "cadastro_setor" SET "nome" = %s'))
+
+    def test_tabelas_de_sessao_e_autenticacao_sao_sensiveis(self):
+        self.assertTrue(registro.sensivel('SELECT "django_session"."session_data" FROM "django_session" WHERE 1'))
+        self.assertTrue(registro.sensivel('UPDATE "usuarios_usuario" SET "password" = %s'))
+        self.assertTrue(registro.sensivel('SELECT 1 FROM "auth_permission"'))
+        self.assertFalse(registro.sensivel('SELECT "id" FROM "cadastro_setor"'))
+
+    @override_settings(CONSULTAS_LENTAS_INTERVALO=300)
+    def test_toda_ocorrencia_e_gravada_e_so_o_explain_e_espacado(self):
+        sql = 'SELECT "id" FROM "cadastro_setor" WHERE "id" = %s'
+        with mock.patch.object(registro, '_submeter') as submeter, mock.patch.dict(registro._ultimas, clear=True):
+            registro._agendar('default', sql, [1], 10.0, None)
+            registro._agendar('default', sql, [2], 10.0, None)
+            registro._agendar('default', 'SELECT 1 FROM "django_session" WHERE "session_key" = %s', ['chave'], 10.0, None)
+        registro._pendentes -= submeter.call_count
+
+        chamadas = [chamada.args for chamada in submeter.call_args_list]
+        self.assertEqual([(args[3], args[-1]) for args in chamadas], [([1], True), ([2], False), (None, False)])
+
+
+@override_settings(CONSULTAS_LENTAS_MS=0, CONSULTAS_LENTAS_INTERVALO=0, CONSULTAS_LENTAS_MAX=3)
+class ConsultaLentaTest(TestCase):
+    def setUp(self):
+        self.user = Usuario.objects.create_user(matricula='1000', nome='Operador', password='senha123')
+        Setor.objects.create(nome='Qualidade')
+
+    def _com_registro(self):
+        # Limite zero: toda consulta da requisição é "lenta"; a gravação roda na hora, sem thread.
+        wrapper = connection.execute_wrapper(registro.registrar_consulta)
+        sincrono = mock.patch.object(registro, '_submeter', side_effect=lambda func, *args: func(*args))
+        return wrapper, sincrono
+
+    def test_registra_sql_parametros_e_rota_mantendo_o_limite(self):
+        self.client.force_login(self.user)
+        wrapper, sincrono = self._com_registro()
+        with wrapper, sincrono:
+            self.client.get(reverse('cadastro:setores_api'))
+
+        consultas = list(ConsultaLenta.objects.all())
+        self.assertEqual(len(consultas), 3)
+        self.assertTrue(all(consulta.rota == 'cadastro:setores_api' for consulta in consultas))
+        # sqlite nos testes: sem EXPLAIN ANALYZE, mas a consulta fica registrada
+        self.assertTrue(all(consulta.plano == '' for consulta in consultas))
+        self.assertFalse(any('diagnostico_consultalenta' in consulta.sql for consulta in consultas))
+
+    @override_settings(CONSULTAS_LENTAS_MAX=50)
+    def test_sessao_e_usuario_sem_parametros(self):
+        wrapper, sincrono = self._com_registro()
+        with wrapper, sincrono:
+            self.client.force_login(self.user)
+            self.client.get(reverse('cadastro:setores_api'))
+
+        sensiveis = [consulta for consulta in ConsultaLenta.objects.all() if registro.sensivel(consulta.sql)]
+        self.assertTrue(any('django_session' in consulta.sql for consulta in sensiveis))
+        self.assertTrue(all(consulta.parametros == '' for consulta in sensiveis))
+        self.assertTrue(ConsultaLenta.objects.filter(sql__contains='cadastro_setor').exclude(parametros='').exists())
+
+    # A página estende o base.html; sem collectstatic não há manifesto dos estáticos.
+    @override_settings(STORAGES={
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    })
+    def test_tela_somente_equipe(self):
+        url = reverse('diagnostico:consultas_lentas')
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        ConsultaLenta.objects.create(duracao_ms=1234.5, banco='default', rota='instrumento:instrumentos_status_api',
+                                     sql='SELECT 1 FROM x', plano='Seq Scan on x')
+        self.client.force_login(Usuario.objects.create_superuser(matricula='1001', nome='Admin', password='senha123'))
+        response = self.client.get(url, {'rota': 'instrumento:instrumentos_status_api'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Seq Scan on x')
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import render
+from django.views.decorators.http import require_GET
+
+from .models import ConsultaLenta
+
+CONSULTAS_POR_PAGINA = 100
+
+
+@login_required
+@require_GET
+def consultas_lentas(request):
+    """Consultas lentas mais recentes com o plano de execução, apenas para a equipe (`is_staff`)."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    consultas = ConsultaLenta.objects.all()
+    rota = (request.GET.get('rota') or '').strip()
+    if rota:
+        consultas = consultas.filter(rota=rota)
+    return render(request, 'diagnostico/consultas_lentas.html', {
+        'consultas': consultas[:CONSULTAS_POR_PAGINA],
+        'rotas': ConsultaLenta.objects.order_by('rota').values_list('rota', flat=True).distinct(),
+        'rota': rota,
+        'limite_ms': settings.CONSULTAS_LENTAS_MS,
+    })
@@ -0,0 +1,99 @@
+"""Sequência de alterações dos instrumentos, base do feed incremental da PMC.
+
+Toda escrita do ciclo de vida (status, posse, certificado, pontos e
+análises) registra o instrumento em `AlteracaoInstrumento` depois do commit.
+No PostgreSQL a gravação pega um advisory lock de transação, então as
+linhas são confirmadas na ordem da sequência e um cliente que leu até `seq`
+nunca perde uma alteração confirmada depois com número menor. Na mesma
+transação um `NOTIFY` avisa os processos ASGI, que repassam o evento aos
+navegadores conectados (ver `eventos.py`).
+
+A tabela é podada por `rotinas/podar_alteracoes.py`; um cliente cuja marca
+ficou antes da primeira `seq` retida recebe `reset` no feed.
+"""
+import json
+from datetime import timedelta
+from functools import partial
+
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import AlteracaoInstrumento
+
+ALTERACOES_LIMITE = 500
+ALTERACOES_CANAL = 'calimag_instrumentos'
+ALTERACOES_RETENCAO_DIAS = 7
+NOTIFICACAO_MAX_IDS = 200  # o payload do NOTIFY tem limite de 8000 bytes
+_ALTERACOES_LOCK = 0x63616C69  # chave do pg_advisory_xact_lock
+
+
+def _gravar(instrumento_ids):
+	with transaction.atomic():
+		postgresql = connection.vendor == 'postgresql'
+		if postgresql:
+			with connection.cursor() as cursor:
+				cursor.execute('SELECT pg_advisory_xact_lock(%s)', [_ALTERACOES_LOCK])
+		linhas = AlteracaoInstrumento.objects.bulk_create(
+			[AlteracaoInstrumento(instrumento_id=instrumento_id) for instrumento_id in instrumento_ids]
+		)
+		if postgresql:
+			# Sem ids o aviso só pede que os clientes ressincronizem pelo feed.
+			aviso = {
+				'seq': max(linha.seq for linha in linhas),
+				'ids': instrumento_ids if len(instrumento_ids) <= NOTIFICACAO_MAX_IDS else None,
+			}
+			with connection.cursor() as cursor:
+				cursor.execute('SELECT pg_notify(%s, %s)', [ALTERACOES_CANAL, json.dumps(aviso)])
+
+
+def registrar_alteracao(instrumento_ids):
+	"""Marca os instrumentos como alterados quando a transação atual confirmar.
+
+	Para escritas em massa (`bulk_create`, `update`) que não disparam sinais.
+	"""
+	ids = sorted({int(instrumento_id) for instrumento_id in instrumento_ids if instrumento_id})
+	if ids:
+		transaction.on_commit(partial(_gravar, ids))
+
+
+def seq_atual():
+	return AlteracaoInstrumento.objects.aggregate(seq=Max('seq'))['seq'] or 0
+
+
+async def aseq_atual():
+	return (await AlteracaoInstrumento.objects.aaggregate(seq=Max('seq')))['seq'] or 0
+
+
+async def aseq_retidas():
+	"""(primeira, última) `seq` ainda guardadas; (0, 0) com a tabela vazia."""
+	seqs = await AlteracaoInstrumento.objects.aaggregate(primeira=Min('seq'), ultima=Max('seq'))
+	return seqs['primeira'] or 0, seqs['ultima'] or 0
+
+
+def podar_alteracoes(dias=ALTERACOES_RETENCAO_DIAS):
+	"""Apaga as alterações com mais de `dias`, sempre mantendo a última (que define o `sync_seq`)."""
+	ultima = seq_atual()
+	limite = timezone.now() - timedelta(days=dias)
+	apagadas, _ = AlteracaoInstrumento.objects.filter(data__lt=limite, seq__lt=ultima).delete()
+	return apagadas
+
+
+def _alteracoes_no_intervalo(desde, ate):
+	return (
+		AlteracaoInstrumento.objects
+		.filter(seq__gt=desde, seq__lte=ate)
+		.order_by()
+		.values('instrumento_id')
+		.annotate(ultima=Max('seq'))
+		.values_list('instrumento_id', 'ultima')
+	)
+
+
+def alterados_desde(desde, ate):
+	"""Instrumentos alterados no intervalo (desde, ate], com a maior `seq` de cada um."""
+	return dict(_alteracoes_no_intervalo(desde, ate))
+
+
+async def aalterados_desde(desde, ate):
+	return {instrumento_id: ultima async for instrumento_id, ultima in _alteracoes_no_intervalo(desde, ate)}
@@ -5,3 +5,6 @@ class InstrumentoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.instrumento'
     verbose_name = 'Instrumentos (App)'
+
+    def ready(self):
+        import app.instrumento.signals  # noqa
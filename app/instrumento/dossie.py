@@ -0,0 +1,131 @@
+"""Dossiê de auditoria de um instrumento em um número fixo de consultas.
+
+Reúne o que o operador hoje abre em telas separadas (detalhe, histórico,
+pontos, último responsável e certificados). Cada relação é carregada com
+`select_related`/`prefetch_related` limitados, então o custo não cresce com
+o histórico do instrumento: 1 consulta do instrumento e tipo, 1 por
+`Prefetch` (status atual, posse ativa, posses recentes e suas assinaturas),
+1 dos certificados e 1 dos pontos com a última análise.
+"""
+from django.db.models import Prefetch
+
+from app.cadastro.models import Instrumento
+from app.cadastro.pontos import pontos_com_ultima_analise, serialize_ponto
+
+from .models import AssinaturaFuncionarioInstrumento, CertificadoCalibracao, FuncionarioInstrumento, StatusInstrumento
+
+DOSSIE_POSSES_LIMITE = 10
+DOSSIE_CERTIFICADOS_LIMITE = 5
+
+
+def _iso(value):
+	return value.isoformat() if value else None
+
+
+def _funcionario(funcionario):
+	if funcionario is None:
+		return None
+	return {
+		'id': funcionario.id,
+		'matricula': funcionario.matricula,
+		'nome': funcionario.nome,
+		'setor': funcionario.setor.nome if funcionario.setor_id else None,
+	}
+
+
+def _assinatura(assinatura):
+	# A imagem é servida pela URL do storage; o cliente exibe em tamanho reduzido.
+	return {
+		'id': assinatura.id,
+		'data_assinatura': _iso(assinatura.data_assinatura),
+		'url': assinatura.imagem.url if assinatura.imagem else None,
+	}
+
+
+def _posse(posse, com_assinaturas=False):
+	data = {
+		'id': posse.id,
+		'funcionario': _funcionario(posse.funcionario),
+		'data_inicio': _iso(posse.data_inicio),
+		'data_fim': _iso(posse.data_fim),
+		'ativo': posse.ativo,
+		'observacoes': posse.observacoes,
+	}
+	if com_assinaturas:
+		data['assinaturas'] = [_assinatura(assinatura) for assinatura in posse.assinaturas.all()]
+	return data
+
+
+def carregar_dossie(instrumento_id):
+	"""Monta o dossiê do instrumento; retorna None se ele não existir."""
+	posses = FuncionarioInstrumento.objects.select_related('funcionario__setor').order_by('-data_inicio', '-id')
+	instrumento = (
+		Instrumento.objects
+		.select_related('tipo_instrumento')
+		.prefetch_related(
+			Prefetch(
+				'status_historico',
+				queryset=StatusInstrumento.objects.select_related('funcionario__setor').order_by('-data_entrega', '-id')[:1],
+				to_attr='status_atual',
+			),
+			Prefetch('posses', queryset=posses.filter(ativo=True)[:1], to_attr='posse_ativa'),
+			Prefetch(
+				'posses',
+				queryset=posses.prefetch_related(
+					Prefetch('assinaturas', queryset=AssinaturaFuncionarioInstrumento.objects.order_by('-data_assinatura'))
+				)[:DOSSIE_POSSES_LIMITE],
+				to_attr='posses_recentes',
+			),
+		)
+		.filter(pk=instrumento_id)
+		.first()
+	)
+	if instrumento is None:
+		return None
+
+	certificados = (
+		CertificadoCalibracao.objects
+		.filter(status__instrumento_id=instrumento.id)
+		.select_related('status')
+		.order_by('-data_criacao', '-id')[:DOSSIE_CERTIFICADOS_LIMITE]
+	)
+	status = instrumento.status_atual[0] if instrumento.status_atual else None
+	tipo = instrumento.tipo_instrumento
+
+	return {
+		'instrumento': {
+			'id': instrumento.id,
+			'codigo': instrumento.codigo,
+			'descricao': instrumento.descricao or '',
+			'fabricante': instrumento.fabricante,
+			'modelo': instrumento.modelo,
+			'status': instrumento.status,
+			'status_display': instrumento.get_status_display(),
+			'finalidade': instrumento.finalidade,
+			'instrumento_controlado': instrumento.instrumento_controlado,
+			'periodicidade_calibracao': instrumento.periodicidade_calibracao,
+			'data_aquisicao': _iso(instrumento.data_aquisicao),
+		},
+		'tipo': {'id': tipo.id, 'descricao': tipo.descricao, 'documento_qualidade': tipo.documento_qualidade} if tipo else None,
+		'estado_atual': {
+			'status_id': status.id,
+			'tipo_status': status.tipo_status or '',
+			'funcionario': _funcionario(status.funcionario),
+			'data_entrega': _iso(status.data_entrega),
+			'data_recebimento': _iso(status.data_recebimento),
+			'data_devolucao': _iso(status.data_devolucao),
+		} if status else None,
+		'posse_ativa': _posse(instrumento.posse_ativa[0]) if instrumento.posse_ativa else None,
+		'posses_recentes': [_posse(posse, com_assinaturas=True) for posse in instrumento.posses_recentes],
+		'pontos': [serialize_ponto(ponto) for ponto in pontos_com_ultima_analise([instrumento.id])],
+		'certificados': [
+			{
+				'id': certificado.id,
+				'link': certificado.link,
+				'data_criacao': _iso(certificado.data_criacao),
+				'status_id': certificado.status_id,
+				'tipo_status': certificado.status.tipo_status or '',
+			}
+			for certificado in certificados
+		],
+	}
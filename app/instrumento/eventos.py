@@ -0,0 +1,150 @@
+"""Eventos ao vivo do ciclo de vida (SSE), alimentados por `LISTEN/NOTIFY`.
+
+Cada processo ASGI mantém um único `LISTEN` no PostgreSQL, aberto enquanto
+houver navegador conectado, e repassa cada aviso a todas as conexões SSE do
+processo. O aviso traz só a `seq` e os ids alterados (ver `alteracoes.py`);
+o estado compacto (situação, status da calibração e validade) é consultado
+uma vez por aviso, não uma vez por cliente.
+"""
+import asyncio
+import json
+import logging
+from contextvars import Context
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connections
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.http import QueryDict
+
+from app.cadastro.respostas import dumps
+
+from .alteracoes import ALTERACOES_CANAL
+
+logger = logging.getLogger(__name__)
+
+EVENTO_CAMPOS = ['id', 'codigo', 'status', 'calibration_status', 'valid_until']
+SSE_HEARTBEAT = 25  # segundos; mantém proxies sem fechar a conexão ociosa
+SSE_RETRY_MS = 5000
+OUVINTE_VERIFICACAO = 30  # sem clientes, o LISTEN fecha em até esse tempo
+OUVINTE_RECONEXAO = 5
+FILA_MAX = 100
+
+
+def eventos_da_notificacao(payload):
+	"""Converte o aviso do NOTIFY no evento compacto enviado aos navegadores."""
+	from .views import _instrumentos_status_queryset, _status_items
+
+	aviso = json.loads(payload)
+	ids = aviso.get('ids')
+	if not ids:
+		return {'seq': aviso['seq'], 'reset': True}
+	try:
+		qs, _ = _instrumentos_status_queryset(QueryDict(), EVENTO_CAMPOS, ordenar_por_validade=False)
+		instrumentos = _status_items(qs.filter(id__in=ids).order_by('id'), EVENTO_CAMPOS)
+	finally:
+		close_old_connections()
+	presentes = {item['id'] for item in instrumentos}
+	# Alterados que não estão mais ativos (ou foram excluídos) saem da PMC.
+	return {'seq': aviso['seq'], 'instrumentos': instrumentos, 'removidos': sorted(set(ids) - presentes)}
+
+
+def _conectar():
+	# Conexão própria, fora do pool e em autocommit: LISTEN só vale depois do commit.
+	wrapper = connections['default']
+	conexao = wrapper.Database.connect(**wrapper.get_connection_params())
+	conexao.autocommit = True
+	with conexao.cursor() as cursor:
+		cursor.execute(f'LISTEN {ALTERACOES_CANAL}')
+	return conexao
+
+
+def _notificacoes(conexao):
+	if is_psycopg3:
+		return [notify.payload for notify in conexao.notifies(timeout=0)]
+	conexao.poll()
+	payloads = [notify.payload for notify in conexao.notifies]
+	conexao.notifies.clear()
+	return payloads
+
+
+class _Ouvinte:
+	"""Um LISTEN por processo, repassado às filas de todas as conexões SSE abertas nele."""
+
+	def __init__(self):
+		self.filas = set()
+		self.tarefa = None
+
+	def inscrever(self):
+		fila = asyncio.Queue(maxsize=FILA_MAX)
+		self.filas.add(fila)
+		if self.tarefa is None or self.tarefa.done():
+			# Contexto vazio: a tarefa sobrevive à requisição que a iniciou e não deve
+			# herdar a medição, a rota ou a réplica dela.
+			self.tarefa = asyncio.get_running_loop().create_task(self._escutar(), context=Context())
+		return fila
+
+	def cancelar(self, fila):
+		self.filas.discard(fila)
+
+	def publicar(self, evento):
+		for fila in list(self.filas):
+			try:
+				fila.put_nowait(evento)
+			except asyncio.QueueFull:
+				# Cliente atrasado: descarta o acúmulo e pede ressincronização pelo feed.
+				while not fila.empty():
+					fila.get_nowait()
+				fila.put_nowait({'seq': evento['seq'], 'reset': True})
+
+	async def _escutar(self):
+		loop = asyncio.get_running_loop()
+		ultima_seq = 0
+		reconectando = False
+		while self.filas:
+			conexao = None
+			try:
+				conexao = await asyncio.to_thread(_conectar)
+				if reconectando:
+					# Avisos perdidos enquanto a conexão esteve fora: os clientes conferem o feed.
+					self.publicar({'seq': ultima_seq, 'reset': True})
+				pronto = asyncio.Event()
+				loop.add_reader(conexao.fileno(), pronto.set)
+				try:
+					while self.filas:
+						try:
+							await asyncio.wait_for(pronto.wait(), timeout=OUVINTE_VERIFICACAO)
+						except TimeoutError:
+							continue
+						pronto.clear()
+						for payload in _notificacoes(conexao):
+							evento = await sync_to_async(eventos_da_notificacao)(payload)
+							ultima_seq = max(ultima_seq, evento['seq'])
+							self.publicar(evento)
+				finally:
+					loop.remove_reader(conexao.fileno())
+			except Exception:  # pylint: disable=broad-except
+				logger.exception('Falha no LISTEN de alterações de instrumentos; reconectando.')
+				reconectando = True
+				await asyncio.sleep(OUVINTE_RECONEXAO)
+			finally:
+				if conexao is not None:
+					conexao.close()
+
+
+ouvinte = _Ouvinte()
+
+
+async def stream_eventos():
+	"""Gera o fluxo SSE de uma conexão até o navegador desconectar."""
+	fila = ouvinte.inscrever()
+	try:
+		yield f'retry: {SSE_RETRY_MS}\n\n'
+		while True:
+			try:
+				evento = await asyncio.wait_for(fila.get(), timeout=SSE_HEARTBEAT)
+			except TimeoutError:
+				yield ': ping\n\n'
+				continue
+			yield f"id: {evento['seq']}\nevent: instrumentos\ndata: {dumps(evento).decode('utf-8')}\n\n"
+	finally:
+		ouvinte.cancelar(fila)
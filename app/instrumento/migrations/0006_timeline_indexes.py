@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-19 04:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0020_funcionario_nome_busca'),
+        ('instrumento', '0005_remove_certificadocalibracao_certeza_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='funcionarioinstrumento',
+            index=models.Index(fields=['instrumento', '-data_inicio'], name='posse_instrumento_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='statusinstrumento',
+            index=models.Index(fields=['instrumento', '-data_entrega'], name='status_instrumento_data_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-19 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instrumento', '0006_timeline_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlteracaoInstrumento',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('instrumento_id', models.BigIntegerField(verbose_name='Instrumento')),
+                ('data', models.DateTimeField(auto_now_add=True, verbose_name='Data')),
+            ],
+            options={
+                'verbose_name': 'Alteração de Instrumento',
+                'verbose_name_plural': 'Alterações de Instrumentos',
+                'ordering': ['seq'],
+            },
+        ),
+    ]
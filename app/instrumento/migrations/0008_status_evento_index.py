@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-19 05:45
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cadastro', '0020_funcionario_nome_busca'),
+        ('instrumento', '0007_alteracaoinstrumento'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='statusinstrumento',
+            index=models.Index(models.F('instrumento'), models.OrderBy(django.db.models.functions.comparison.Greatest(django.db.models.functions.comparison.Coalesce('data_recebimento', 'data_entrega'), django.db.models.functions.comparison.Coalesce('data_devolucao', django.db.models.functions.comparison.Coalesce('data_recebimento', 'data_entrega')), output_field=models.DateTimeField()), descending=True), name='status_instrumento_evento_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Coalesce, Greatest
 from django.utils import timezone
 
 from app.cadastro.models import Funcionario, Instrumento, PontoCalibracao
@@ -29,6 +31,7 @@ class FuncionarioInstrumento(models.Model):
         ordering = ['-data_inicio']
         indexes = [
             models.Index(fields=['funcionario', 'instrumento']),
+            models.Index(fields=['instrumento', '-data_inicio'], name='posse_instrumento_data_idx'),
         ]
 
     def __str__(self):
@@ -56,6 +59,12 @@ class AssinaturaFuncionarioInstrumento(models.Model):
         return f"Assinatura {self.posse.funcionario} - {self.data_assinatura.strftime('%Y-%m-%d %H:%M')}"
 
 
+def data_evento_status():
+    """Data do status no histórico: recebimento (ou entrega), ou a devolução se for posterior."""
+    data = Coalesce('data_recebimento', 'data_entrega')
+    return Greatest(data, Coalesce('data_devolucao', data), output_field=models.DateTimeField())
+
+
 class StatusInstrumento(models.Model):
     """Estado atual do instrumento: registra entrega e devolução.
 
@@ -99,6 +108,9 @@ class StatusInstrumento(models.Model):
         ordering = ['-data_entrega']
         indexes = [
             models.Index(fields=['instrumento', 'funcionario']),
+            models.Index(fields=['instrumento', '-data_entrega'], name='status_instrumento_data_idx'),
+            # Ordem do ramo de status da linha do tempo (ver timeline.py).
+            models.Index(F('instrumento'), data_evento_status().desc(), name='status_instrumento_evento_idx'),
         ]
 
     def __str__(self):
@@ -178,3 +190,23 @@ class StatusPontoCalibracao(models.Model):
     def __str__(self):
         return f"{self.ponto_calibracao} - {self.resultado or 'Sem resultado'}"
 
+
+
+class AlteracaoInstrumento(models.Model):
+    """Registro de que o estado de um instrumento mudou (sincronização incremental da PMC).
+
+    `seq` cresce monotonicamente; o cliente guarda o último valor visto e pede
+    só o que veio depois. Não há FK para o instrumento, para que a exclusão
+    também apareça no feed.
+    """
+    seq = models.BigAutoField(primary_key=True)
+    instrumento_id = models.BigIntegerField('Instrumento')
+    data = models.DateTimeField('Data', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Alteração de Instrumento'
+        verbose_name_plural = 'Alterações de Instrumentos'
+        ordering = ['seq']
+
+    def __str__(self):
+        return f"#{self.seq} instrumento {self.instrumento_id}"
@@ -0,0 +1,44 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app.cadastro.models import Instrumento, PontoCalibracao
+
+from .alteracoes import registrar_alteracao
+from .models import CertificadoCalibracao, FuncionarioInstrumento, StatusInstrumento, StatusPontoCalibracao
+
+
+def _instrumento_do_ponto(ponto_id):
+	return PontoCalibracao.objects.filter(pk=ponto_id).values_list('instrumento_id', flat=True).first()
+
+
+def _instrumento_do_status(status_id):
+	return StatusInstrumento.objects.filter(pk=status_id).values_list('instrumento_id', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Instrumento)
+def alteracao_instrumento(sender, instance, **kwargs):
+	registrar_alteracao([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=StatusInstrumento)
+@receiver([post_save, post_delete], sender=FuncionarioInstrumento)
+@receiver([post_save, post_delete], sender=PontoCalibracao)
+def alteracao_ciclo_de_vida(sender, instance, **kwargs):
+	registrar_alteracao([instance.instrumento_id])
+
+
+@receiver([post_save, post_delete], sender=CertificadoCalibracao)
+def alteracao_certificado(sender, instance, **kwargs):
+	# Usa a relação já carregada quando existir; numa exclusão em cascata o status pode não existir mais.
+	if CertificadoCalibracao.status.is_cached(instance):
+		registrar_alteracao([instance.status.instrumento_id])
+	else:
+		registrar_alteracao([_instrumento_do_status(instance.status_id)])
+
+
+@receiver([post_save, post_delete], sender=StatusPontoCalibracao)
+def alteracao_analise_ponto(sender, instance, **kwargs):
+	if StatusPontoCalibracao.ponto_calibracao.is_cached(instance):
+		registrar_alteracao([instance.ponto_calibracao.instrumento_id])
+	else:
+		registrar_alteracao([_instrumento_do_ponto(instance.ponto_calibracao_id)])
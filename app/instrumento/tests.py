@@ -0,0 +1,226 @@
+import asyncio
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app.cadastro.models import Funcionario, Instrumento, PontoCalibracao, Setor, TipoInstrumento
+from app.usuarios.testing import UsuarioLogadoMixin
+from calimag.instrumentacao import Medicao, _medicao
+from calimag.replica import _usar_replica
+
+from .alteracoes import podar_alteracoes
+from .eventos import _Ouvinte, eventos_da_notificacao
+from .models import (
+    AlteracaoInstrumento,
+    AssinaturaFuncionarioInstrumento,
+    CertificadoCalibracao,
+    FuncionarioInstrumento,
+    StatusInstrumento,
+    StatusPontoCalibracao,
+)
+from .views import STATUS_CAMPOS, _apply_pmc_categoria_filter, _status_campos
+
+
+class TimelineInstrumentoTest(UsuarioLogadoMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.instrumento = Instrumento.objects.create(codigo='PAQ-1')
+        funcionario = Funcionario.objects.create(matricula='2000', nome='Ana')
+        base = timezone.now() - timedelta(days=30)
+        for dia in range(4):
+            status = StatusInstrumento.objects.create(
+                instrumento=self.instrumento, tipo_status=f'Envio {dia}', data_entrega=base + timedelta(days=dia)
+            )
+            # Mesma data do status: o desempate é pelo tipo e pelo id.
+            FuncionarioInstrumento.objects.create(
+                instrumento=self.instrumento, funcionario=funcionario, data_inicio=base + timedelta(days=dia)
+            )
+        CertificadoCalibracao.objects.create(status=status, link='https://exemplo/cert.pdf')
+        ponto = PontoCalibracao.objects.create(instrumento=self.instrumento, sequencia=1, valor_nominal=5, unidade='mm')
+        StatusPontoCalibracao.objects.create(ponto_calibracao=ponto, resultado='aprovado')
+
+    def _pagina(self, cursor=None):
+        params = {'limit': 3}
+        if cursor:
+            params['cursor'] = cursor
+        response = self.client.get(reverse('instrumento:timeline_instrumento', args=[self.instrumento.id]), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor_percorre_todas_as_fontes_sem_repetir(self):
+        eventos, cursor, paginas = [], None, 0
+        while True:
+            pagina = self._pagina(cursor)
+            eventos.extend(pagina['eventos'])
+            paginas += 1
+            cursor = pagina['next_cursor']
+            if not cursor:
+                break
+
+        self.assertEqual(paginas, 4)
+        self.assertEqual(len(eventos), 10)
+        self.assertEqual(len({(e['tipo'], e['id']) for e in eventos}), 10)
+        self.assertEqual({e['tipo'] for e in eventos}, {'status', 'posse', 'certificado', 'analise'})
+        chaves = [(e['data'], e['tipo'], e['id']) for e in eventos]
+        self.assertEqual(chaves, sorted(chaves, reverse=True))
+
+    def test_cursor_invalido(self):
+        response = self.client.get(
+            reverse('instrumento:timeline_instrumento', args=[self.instrumento.id]), {'cursor': 'nao-e-cursor'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class DossieInstrumentoTest(UsuarioLogadoMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.setor = Setor.objects.create(nome='Qualidade')
+        self.tipo = TipoInstrumento.objects.create(descricao='Paquímetro')
+
+    def _instrumento(self, codigo, eventos):
+        instrumento = Instrumento.objects.create(codigo=codigo, tipo_instrumento=self.tipo)
+        for idx in range(eventos):
+            funcionario = Funcionario.objects.create(matricula=f'{codigo}-{idx}', nome=f'Func {idx}', setor=self.setor)
+            posse = FuncionarioInstrumento.objects.create(funcionario=funcionario, instrumento=instrumento, ativo=idx == eventos - 1)
+            AssinaturaFuncionarioInstrumento.objects.create(posse=posse, imagem=f'assinaturas/{codigo}-{idx}.png')
+            status = StatusInstrumento.objects.create(instrumento=instrumento, funcionario=funcionario, tipo_status=f'Entregue {idx}')
+            CertificadoCalibracao.objects.create(status=status, link=f'https://exemplo/{codigo}/{idx}.pdf')
+            ponto = PontoCalibracao.objects.create(instrumento=instrumento, sequencia=idx + 1, valor_nominal=5, unidade='mm')
+            StatusPontoCalibracao.objects.create(ponto_calibracao=ponto, resultado='aprovado')
+        return instrumento
+
+    def _consultas(self, instrumento):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('instrumento:dossie_instrumento', args=[instrumento.id]))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.json()
+
+    def test_numero_de_consultas_nao_cresce_com_o_historico(self):
+        pequeno, _ = self._consultas(self._instrumento('PAQ-1', 1))
+        grande, dossie = self._consultas(self._instrumento('PAQ-2', 8))
+
+        self.assertEqual(pequeno, grande)
+        self.assertLessEqual(grande, 9)
+        self.assertEqual(dossie['tipo']['descricao'], 'Paquímetro')
+        self.assertEqual(dossie['posse_ativa']['funcionario']['matricula'], 'PAQ-2-7')
+        self.assertEqual(dossie['posse_ativa']['funcionario']['setor'], 'Qualidade')
+        self.assertEqual(len(dossie['pontos']), 8)
+        self.assertEqual(len(dossie['certificados']), 5)
+        self.assertTrue(all(len(posse['assinaturas']) == 1 for posse in dossie['posses_recentes']))
+
+    def test_instrumento_inexistente(self):
+        response = self.client.get(reverse('instrumento:dossie_instrumento', args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+
+class StatusCamposTest(UsuarioLogadoMixin, TestCase):
+    def test_fields_seleciona_campos_e_rejeita_desconhecidos(self):
+        self.assertEqual(_status_campos('valid_until, codigo'), ['id', 'codigo', 'valid_until'])
+        self.assertEqual(_status_campos(''), list(STATUS_CAMPOS))
+
+        response = self.client.get(reverse('instrumento:instrumentos_status_api'), {'fields': 'codigo,senha'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('senha', response.json()['message'])
+
+
+class AlteracoesFeedTest(UsuarioLogadoMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ativo = Instrumento.objects.create(codigo='PAQ-1')
+            self.desativado = Instrumento.objects.create(codigo='PAQ-2')
+            PontoCalibracao.objects.create(instrumento=self.desativado, sequencia=1, valor_nominal=5, unidade='mm')
+
+    def _feed(self, desde):
+        response = self.client.get(
+            reverse('instrumento:instrumentos_alteracoes_api'), {'desde': desde, 'fields': 'codigo,status'}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_feed_devolve_alterados_e_removidos_desde_a_marca(self):
+        marca = self._feed(0)['sync_seq']
+        self.assertEqual(self._feed(marca)['instrumentos'], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            StatusInstrumento.objects.create(instrumento=self.ativo, tipo_status='Enviado ao laboratório')
+            self.desativado.status = 'inativo'
+            self.desativado.save()
+
+        feed = self._feed(marca)
+        self.assertFalse(feed['reset'])
+        self.assertGreater(feed['sync_seq'], marca)
+        self.assertEqual(feed['instrumentos'], [{'id': self.ativo.id, 'codigo': 'PAQ-1', 'status': 'Enviado ao laboratório'}])
+        self.assertEqual(feed['removidos'], [self.desativado.id])
+        self.assertEqual(self._feed(feed['sync_seq'])['instrumentos'], [])
+
+    def test_marca_fora_das_alteracoes_retidas_pede_reset(self):
+        marca = self._feed(0)['sync_seq']
+        self.assertTrue(self._feed(marca + 1)['reset'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            StatusInstrumento.objects.create(instrumento=self.ativo, tipo_status='Enviado ao laboratório')
+        AlteracaoInstrumento.objects.update(data=timezone.now() - timedelta(days=30))
+        self.assertGreater(podar_alteracoes(7), 0)
+        self.assertEqual(AlteracaoInstrumento.objects.count(), 1)
+
+        self.assertTrue(self._feed(0)['reset'])
+        feed = self._feed(marca)
+        self.assertFalse(feed['reset'])
+        self.assertEqual([item['id'] for item in feed['instrumentos']], [self.ativo.id])
+
+    def test_desde_invalido(self):
+        response = self.client.get(reverse('instrumento:instrumentos_alteracoes_api'), {'desde': 'ontem'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_eventos_sem_asgi_respondem_sem_conteudo(self):
+        response = self.client.get(reverse('instrumento:eventos_instrumentos'))
+        self.assertEqual(response.status_code, 204)
+
+    def test_aviso_sem_ids_pede_reset(self):
+        self.assertEqual(eventos_da_notificacao(json.dumps({'seq': 42, 'ids': None})), {'seq': 42, 'reset': True})
+
+
+class OuvinteContextoTest(SimpleTestCase):
+    def test_escuta_nao_herda_contexto_da_requisicao(self):
+        vistos = {}
+
+        async def escutar(ouvinte):
+            vistos['medicao'] = _medicao.get()
+            vistos['replica'] = _usar_replica.get()
+
+        async def requisicao():
+            _medicao.set(Medicao(top_sql=0))
+            _usar_replica.set(True)
+            ouvinte = _Ouvinte()
+            ouvinte.inscrever()
+            await ouvinte.tarefa
+
+        with mock.patch.object(_Ouvinte, '_escutar', escutar):
+            asyncio.run(requisicao())
+        self.assertEqual(vistos, {'medicao': None, 'replica': False})
+
+
+class PmcCategoriaFiltroTest(TestCase):
+    def test_categorias_por_id_de_tipo(self):
+        solda = TipoInstrumento.objects.create(descricao='Máquina de solda digital')
+        gabarito = TipoInstrumento.objects.create(descricao='Gabarito')
+        paquimetro = TipoInstrumento.objects.create(descricao='Paquímetro')
+        Instrumento.objects.create(codigo='MS-1', tipo_instrumento=solda)
+        Instrumento.objects.create(codigo='GB-1', tipo_instrumento=gabarito)
+        Instrumento.objects.create(codigo='PQ-1', tipo_instrumento=paquimetro)
+        Instrumento.objects.create(codigo='SEM-TIPO')
+
+        def codigos(categoria):
+            qs = _apply_pmc_categoria_filter(Instrumento.objects.all(), categoria)
+            return sorted(qs.values_list('codigo', flat=True))
+
+        self.assertEqual(codigos('maquinas_solda'), ['MS-1'])
+        self.assertEqual(codigos('gabaritos'), ['GB-1'])
+        self.assertEqual(codigos('instrumentos'), ['PQ-1', 'SEM-TIPO'])
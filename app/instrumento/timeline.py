@@ -0,0 +1,134 @@
+"""Linha do tempo unificada de um instrumento.
+
+Junta status, posses, certificados e análises de pontos em um único
+`UNION ALL`, ordenado por (data, tipo, id) decrescente. A paginação é por
+cursor: o cliente devolve a chave do último evento recebido e cada ramo do
+UNION já filtra o que vem depois dela, sem OFFSET.
+"""
+import base64
+import datetime
+
+from django.db import connection
+from django.db.models import BigIntegerField, CharField, F, Q, TextField, Value
+from django.db.models.functions import Cast, Coalesce, Concat
+from django.utils.dateparse import parse_datetime
+
+from .models import CertificadoCalibracao, FuncionarioInstrumento, StatusInstrumento, StatusPontoCalibracao, data_evento_status
+
+TIMELINE_LIMITE = 50
+TIMELINE_LIMITE_MAX = 200
+TIMELINE_CAMPOS = ('tipo', 'evento_id', 'data', 'titulo', 'detalhe')
+
+
+class CursorInvalido(ValueError):
+	pass
+
+
+def encode_cursor(evento):
+	raw = f"{evento['data'].isoformat()}|{evento['tipo']}|{evento['evento_id']}"
+	return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+	try:
+		data_raw, tipo, evento_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+		data = parse_datetime(data_raw)
+		if data is None:
+			raise ValueError(data_raw)
+		return data, tipo, int(evento_id)
+	except (ValueError, UnicodeError) as exc:
+		raise CursorInvalido('Cursor inválido.') from exc
+
+
+def _shape(queryset, tipo, data, titulo, detalhe):
+	return queryset.annotate(
+		tipo=Value(tipo, output_field=CharField()),
+		evento_id=Cast('id', BigIntegerField()),
+		data=data,
+		titulo=Cast(titulo, TextField()),
+		detalhe=Cast(detalhe, TextField()),
+	)
+
+
+def _after_cursor(queryset, tipo, cursor):
+	"""Eventos deste ramo estritamente depois do cursor na ordem (data, tipo, id) decrescente."""
+	if cursor is None:
+		return queryset
+	data, cursor_tipo, cursor_id = cursor
+	if tipo < cursor_tipo:
+		return queryset.filter(data__lte=data)
+	if tipo > cursor_tipo:
+		return queryset.filter(data__lt=data)
+	return queryset.filter(Q(data__lt=data) | Q(data=data, evento_id__lt=cursor_id))
+
+
+def _branches(instrumento_id):
+	# Mesma expressão do índice status_instrumento_evento_idx, para o ramo sair ordenado do índice.
+	yield 'status', _shape(
+		StatusInstrumento.objects.filter(instrumento_id=instrumento_id),
+		'status',
+		data_evento_status(),
+		Coalesce('tipo_status', Value('')),
+		F('observacoes'),
+	)
+	yield 'posse', _shape(
+		FuncionarioInstrumento.objects.filter(instrumento_id=instrumento_id),
+		'posse',
+		F('data_inicio'),
+		Concat(Value('Posse de '), 'funcionario__matricula', Value(' - '), 'funcionario__nome', output_field=TextField()),
+		F('observacoes'),
+	)
+	yield 'certificado', _shape(
+		CertificadoCalibracao.objects.filter(status__instrumento_id=instrumento_id),
+		'certificado',
+		F('data_criacao'),
+		Value('Certificado de calibração'),
+		F('link'),
+	)
+	yield 'analise', _shape(
+		StatusPontoCalibracao.objects.filter(ponto_calibracao__instrumento_id=instrumento_id),
+		'analise',
+		F('data_criacao'),
+		Concat(
+			Value('Análise do ponto '),
+			Cast('ponto_calibracao__sequencia', TextField()),
+			Value(': '),
+			Coalesce('resultado', Value('sem resultado')),
+			output_field=TextField(),
+		),
+		F('tendencia'),
+	)
+
+
+def timeline_instrumento(instrumento_id, cursor=None, limite=TIMELINE_LIMITE):
+	"""Devolve (eventos, proximo_cursor) da linha do tempo do instrumento."""
+	decoded = decode_cursor(cursor) if cursor else None
+	ordem = ('-data', '-tipo', '-evento_id')
+	# No PostgreSQL cada ramo já corta em limite+1; onde o banco não aceita
+	# ORDER BY/LIMIT dentro de um UNION o corte acontece só no resultado final.
+	limita_ramos = connection.features.supports_slicing_ordering_in_compound
+
+	ramos = []
+	for tipo, queryset in _branches(instrumento_id):
+		queryset = _after_cursor(queryset, tipo, decoded).values(*TIMELINE_CAMPOS)
+		if limita_ramos:
+			queryset = queryset.order_by(*ordem)[:limite + 1]
+		else:
+			queryset = queryset.order_by()
+		ramos.append(queryset)
+
+	primeiro, *demais = ramos
+	eventos = list(primeiro.union(*demais, all=True).order_by(*ordem)[:limite + 1])
+	proximo = encode_cursor(eventos[limite - 1]) if len(eventos) > limite else None
+	return eventos[:limite], proximo
+
+
+def serialize_evento(evento):
+	data = evento['data']
+	return {
+		'tipo': evento['tipo'],
+		'id': evento['evento_id'],
+		'data': data.isoformat() if isinstance(data, datetime.datetime) else data,
+		'titulo': evento['titulo'] or '',
+		'detalhe': evento['detalhe'] or '',
+	}
@@ -11,12 +11,17 @@ urlpatterns = [
 	path('api/devolver/', views.devolver_instrumento, name='devolver_instrumento'),
 	path('api/entregas/', views.entregas_api, name='entregas_api'),
 	path('api/historico/<int:instrumento_id>/', views.historico_instrumento, name='historico_instrumento'),
+	path('api/timeline/<int:instrumento_id>/', views.timeline_instrumento_api, name='timeline_instrumento'),
+	path('api/dossie/<int:instrumento_id>/', views.dossie_instrumento_api, name='dossie_instrumento'),
 	path('api/ultimo-responsavel/<int:instrumento_id>/', views.ultimo_responsavel_pre_envio, name='ultimo_responsavel_pre_envio'),
 	path('api/enviar/', views.enviar_para_calibracao, name='enviar_para_calibracao'),
 	path('api/receber/', views.receber_da_calibracao, name='receber_da_calibracao'),
 	path('api/status-ponto/', views.registrar_status_ponto, name='registrar_status_ponto'),
 	path('api/descricoes/', views.instrumentos_descricoes_api, name='instrumentos_descricoes_api'),
 	path('api/status/', views.instrumentos_status_api, name='instrumentos_status_api'),
+	path('api/status/alteracoes/', views.instrumentos_alteracoes_api, name='instrumentos_alteracoes_api'),
+	path('api/eventos/', views.eventos_instrumentos_stream, name='eventos_instrumentos'),
 	path('api/indicadores/', views.indicadores_dashboard, name='indicadores_dashboard'),
+	path('api/bootstrap/', views.pmc_bootstrap_api, name='pmc_bootstrap'),
 	path('api/disponiveis/', views.instrumentos_disponiveis, name='instrumentos_disponiveis'),
 ]
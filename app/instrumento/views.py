@@ -1,15 +1,17 @@
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.core.files.base import ContentFile
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime, parse_date
-from django.core.paginator import Paginator
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import AsyncPaginator, Paginator
 from django.db.models import OuterRef, Subquery, Exists, Count, Q, ExpressionWrapper, F, DateTimeField, DurationField, Value
 from django.db.models.functions import Coalesce
 from django.views.decorators.http import require_GET
+from django.http import HttpResponse, StreamingHttpResponse
 from django.db import transaction
+from asgiref.sync import sync_to_async
 from django.utils import timezone
 
 import base64
@@ -20,8 +22,17 @@ import json
 import math
 from datetime import timedelta
 
-from app.cadastro.models import Instrumento, Funcionario, PontoCalibracao
+from app.cadastro.condicional import reference_data
+from calimag.replica import ler_da_replica
+from app.cadastro.referencias import cached_reference, laboratorios_ativos, setores_ativos, tipos_instrumento_ativos
+from app.cadastro.respostas import FastJsonResponse
+from app.cadastro.importacao import ValidationReport, check_duplicates, lookup_funcionarios, lookup_instrumentos, normalize_lookup
+from app.cadastro.models import Instrumento, Funcionario, PontoCalibracao, TipoInstrumento
 from .models import FuncionarioInstrumento, AssinaturaFuncionarioInstrumento, StatusInstrumento, CertificadoCalibracao, StatusPontoCalibracao
+from .alteracoes import ALTERACOES_LIMITE, aalterados_desde, aseq_atual, aseq_retidas
+from .dossie import carregar_dossie
+from .eventos import stream_eventos
+from .timeline import TIMELINE_LIMITE, TIMELINE_LIMITE_MAX, CursorInvalido, serialize_evento, timeline_instrumento
 from app.cadastro.models import Laboratorio
 
 PMC_MAQUINAS_SOLDA_TIPOS = (
@@ -72,93 +83,126 @@ def _parse_csv_datetime(raw_value):
 	return dt
 
 
+def _tipos_pmc():
+	"""Ids dos tipos de máquina de solda e de gabarito, da lista de referência em cache."""
+	def build():
+		maquinas = {tipo.lower() for tipo in PMC_MAQUINAS_SOLDA_TIPOS}
+		tipos = {'maquinas_solda': [], 'gabaritos': []}
+		for tipo_id, descricao in TipoInstrumento.objects.order_by('id').values_list('id', 'descricao'):
+			descricao = (descricao or '').lower()
+			if descricao in maquinas:
+				tipos['maquinas_solda'].append(tipo_id)
+			elif descricao == PMC_GABARITO_TIPO:
+				tipos['gabaritos'].append(tipo_id)
+		return tipos
+
+	return cached_reference('tipos_pmc', (TipoInstrumento,), build)
+
+
 def _apply_pmc_categoria_filter(queryset, categoria):
-	"""Aplica filtro de categoria do menu PMC sobre tipo_instrumento.descricao."""
+	"""Aplica filtro de categoria do menu PMC sobre o tipo de instrumento.
+
+	Os tipos de cada categoria vêm do cache de referência, então o filtro é um
+	`tipo_instrumento_id IN (...)` sem join com a tabela de tipos.
+	"""
 	pmccat = (categoria or '').strip().lower()
 	if not pmccat:
 		return queryset
 
-	maquinas_q = Q()
-	for tipo in PMC_MAQUINAS_SOLDA_TIPOS:
-		maquinas_q |= Q(tipo_instrumento__descricao__iexact=tipo)
-	gabarito_q = Q(tipo_instrumento__descricao__iexact=PMC_GABARITO_TIPO)
-
+	tipos = _tipos_pmc()
 	if pmccat in {'maquinas_solda', 'maquinas-de-solda', 'solda'}:
-		return queryset.filter(maquinas_q)
+		return queryset.filter(tipo_instrumento_id__in=tipos['maquinas_solda'])
 	if pmccat in {'gabaritos', 'gabarito'}:
-		return queryset.filter(gabarito_q)
+		return queryset.filter(tipo_instrumento_id__in=tipos['gabaritos'])
 	if pmccat in {'instrumentos', 'instrumento'}:
-		return queryset.exclude(maquinas_q | gabarito_q)
+		return queryset.exclude(tipo_instrumento_id__in=tipos['maquinas_solda'] + tipos['gabaritos'])
 	return queryset
 
 
 @login_required
 @require_GET
-def instrumentos_descricoes_api(request):
+@ler_da_replica
+@reference_data(Instrumento, TipoInstrumento)
+async def instrumentos_descricoes_api(request):
 	"""Retorna descricoes distintas para o filtro de informacao adicional do PMC."""
-	qs = Instrumento.objects.filter(status='ativo').exclude(descricao__isnull=True).exclude(descricao__exact='')
-	qs = _apply_pmc_categoria_filter(qs, request.GET.get('pmc_categoria'))
-	descricoes = list(qs.order_by('descricao').values_list('descricao', flat=True).distinct())
-	return JsonResponse({'descricoes': descricoes})
+	return FastJsonResponse({'descricoes': await sync_to_async(_descricoes_pmc)(request.GET.get('pmc_categoria'))})
 
 
-@login_required
-@require_GET
-def instrumentos_status_api(request):
+def _descricoes_pmc(categoria):
+	"""Descrições distintas dos instrumentos ativos da categoria, em cache pela versão das tabelas."""
+	def build():
+		qs = Instrumento.objects.filter(status='ativo').exclude(descricao__isnull=True).exclude(descricao__exact='')
+		qs = _apply_pmc_categoria_filter(qs, categoria)
+		return list(qs.order_by('descricao').values_list('descricao', flat=True).distinct())
 
-	qs = (
-		Instrumento.objects
-		.filter(status='ativo')
-		.select_related('tipo_instrumento')
-	)
-	qs = _apply_pmc_categoria_filter(qs, request.GET.get('pmc_categoria'))
+	chave = f"descricoes:{(categoria or '').strip().lower()}"
+	return cached_reference(chave, (Instrumento, TipoInstrumento), build)
 
-	# =========================
-	# Filtros simples (DB)
-	# =========================
-	search = (request.GET.get('search') or '').strip()
-	if search:
-		qs = qs.filter(Q(codigo__icontains=search) | Q(descricao__icontains=search))
 
-	info_adic_search = (request.GET.get('info_adic') or '').strip()
-	if info_adic_search:
-		qs = qs.filter(descricao__icontains=info_adic_search)
+def _status_valid_until(inst):
+	if not inst.last_recebimento_data:
+		return None
+	return inst.last_recebimento_data + timedelta(days=inst.periodicidade_calibracao)
 
-	func_search = (request.GET.get('funcionario') or '').strip()
-	if func_search:
-		func_subquery = StatusInstrumento.objects.filter(
-			instrumento=OuterRef('pk')
-		).filter(
-			Q(funcionario__nome__icontains=func_search) |
-			Q(funcionario__matricula__icontains=func_search)
-		)
-		qs = qs.filter(Exists(func_subquery))
 
-	setor_search = (request.GET.get('setor') or '').strip()
+def _status_calibracao(inst, today):
+	valid_until = _status_valid_until(inst)
+	if valid_until and valid_until.date() >= today:
+		return 'a_calibrar' if (valid_until.date() - today).days <= 15 else 'em_dia'
+	if valid_until:
+		return 'atrasado'
+	return 'sem_analise'
 
-	tipo_id = request.GET.get('tipo_id')
-	if tipo_id and tipo_id.isdigit():
-		qs = qs.filter(tipo_instrumento_id=int(tipo_id))
 
-	tipo_text = (request.GET.get('tipo') or '').strip()
-	if tipo_text:
-		qs = qs.filter(tipo_instrumento__descricao__icontains=tipo_text)
+def _status_pontos_ok(inst):
+	# REGRA CORRETA DOS PONTOS: sem pontos ativos não há pendência.
+	if inst.total_pontos == 0:
+		return True
+	return (inst.pontos_analisados_count or 0) >= inst.total_pontos
 
-	instrumento_controlado = (request.GET.get('instrumento_controlado') or '').lower()
-	if instrumento_controlado in {'1', 'true', 'sim', 'yes'}:
-		qs = qs.filter(instrumento_controlado=True)
-	elif instrumento_controlado in {'0', 'false', 'nao', 'no'}:
-		qs = qs.filter(instrumento_controlado=False)
 
-	ids_param = request.GET.get('instrumento_id') or request.GET.get('instrumentos')
-	if ids_param:
-		ids = [int(i) for i in ids_param.split(',') if i.strip().isdigit()]
-		if ids:
-			qs = qs.filter(id__in=ids)
+STATUS_OBJ_ANOTACOES = (
+	'status_tipo', 'status_funcionario', 'status_funcionario_id', 'status_funcionario_setor',
+	'status_entrega', 'status_devolucao', 'status_recebimento',
+)
 
-	# =========================
-	# Subqueries
-	# =========================
+# Campo de saída -> (anotações que ele exige, valor da linha).
+STATUS_CAMPOS = {
+	'id': ((), lambda inst, today: inst.id),
+	'codigo': ((), lambda inst, today: inst.codigo),
+	'descricao': ((), lambda inst, today: inst.descricao),
+	'tipo': ((), lambda inst, today: inst.tipo_instrumento.descricao if inst.tipo_instrumento else ''),
+	'instrumento_controlado': ((), lambda inst, today: inst.instrumento_controlado),
+	'total_pontos': (('total_pontos',), lambda inst, today: inst.total_pontos),
+	'data_ultimo_envio': (('last_envio_data',), lambda inst, today: inst.last_envio_data),
+	'primeiro_envio': (('last_envio_data',), lambda inst, today: inst.last_envio_data is None),
+	'status': (('status_tipo',), lambda inst, today: inst.status_tipo),
+	'pontos_ultima_calibracao_analisados': (('total_pontos', 'pontos_analisados_count'), lambda inst, today: _status_pontos_ok(inst)),
+	'valid_until': (('last_recebimento_data',), lambda inst, today: _status_valid_until(inst)),
+	'ultima_calibracao': (('last_recebimento_data',), lambda inst, today: inst.last_recebimento_data),
+	'calibration_status': (('last_recebimento_data',), _status_calibracao),
+	'ultimo_certificado': (('ultimo_certificado_link',), lambda inst, today: inst.ultimo_certificado_link),
+	'periodicidade_calibracao': ((), lambda inst, today: inst.periodicidade_calibracao),
+	'status_obj': (STATUS_OBJ_ANOTACOES, lambda inst, today: {
+		'funcionario': inst.status_funcionario,
+		'funcionario_id': inst.status_funcionario_id,
+		'funcionario_setor': inst.status_funcionario_setor,
+		'data_entrega': inst.status_entrega,
+		'data_devolucao': inst.status_devolucao,
+		'data_recebimento': inst.status_recebimento,
+		'tipo_status': inst.status_tipo,
+	}),
+}
+
+# Anotações que referenciam outras e precisam ser aplicadas depois delas.
+STATUS_ANOTACAO_DEPENDENCIAS = {
+	'valid_until': ('last_recebimento_data',),
+	'pontos_analisados_count': ('last_envio_data',),
+}
+
+
+def _status_anotacoes():
+	"""Expressões da listagem de status, na ordem em que podem ser aplicadas."""
 	latest_status = StatusInstrumento.objects.filter(
 		instrumento=OuterRef('pk')
 	).order_by('-data_entrega')
@@ -178,40 +222,31 @@ def instrumentos_status_api(request):
 		status__instrumento=OuterRef('pk')
 	).order_by('-data_criacao')
 
-	qs = qs.annotate(
-		status_tipo=Subquery(latest_status.values('tipo_status')[:1]),
-		status_funcionario=Subquery(latest_status.values('funcionario__nome')[:1]),
-		status_funcionario_id=Subquery(latest_status.values('funcionario_id')[:1]),
-		status_funcionario_setor=Subquery(latest_status.values('funcionario__setor__nome')[:1]),
-		status_entrega=Subquery(latest_status.values('data_entrega')[:1]),
-		status_devolucao=Subquery(latest_status.values('data_devolucao')[:1]),
-		status_recebimento=Subquery(latest_status.values('data_recebimento')[:1]),
-
-		last_envio_data=Subquery(last_envio.values('data_entrega')[:1]),
-		last_recebimento_data=Subquery(
-			last_recebimento.values('data_recebimento')[:1]
-		),
-
-		ultimo_certificado_link=Subquery(latest_cert.values('link')[:1]),
-
-		total_pontos=Count(
+	fallback_date = timezone.make_aware(datetime.datetime(1900, 1, 1))
+	return {
+		'status_tipo': Subquery(latest_status.values('tipo_status')[:1]),
+		'status_funcionario': Subquery(latest_status.values('funcionario__nome')[:1]),
+		'status_funcionario_id': Subquery(latest_status.values('funcionario_id')[:1]),
+		'status_funcionario_setor': Subquery(latest_status.values('funcionario__setor__nome')[:1]),
+		'status_entrega': Subquery(latest_status.values('data_entrega')[:1]),
+		'status_devolucao': Subquery(latest_status.values('data_devolucao')[:1]),
+		'status_recebimento': Subquery(latest_status.values('data_recebimento')[:1]),
+		'last_envio_data': Subquery(last_envio.values('data_entrega')[:1]),
+		'last_recebimento_data': Subquery(last_recebimento.values('data_recebimento')[:1]),
+		'ultimo_certificado_link': Subquery(latest_cert.values('link')[:1]),
+		'total_pontos': Count(
 			'pontos_calibracao',
 			filter=Q(pontos_calibracao__ativo=True),
 			distinct=True
 		),
-
-		valid_until=ExpressionWrapper(
+		'valid_until': ExpressionWrapper(
 			F('last_recebimento_data') + ExpressionWrapper(
 				F('periodicidade_calibracao') * Value(datetime.timedelta(days=1)),
 				output_field=DurationField()
 			),
 			output_field=DateTimeField()
 		),
-	)
-
-	fallback_date = timezone.make_aware(datetime.datetime(1900, 1, 1))
-	qs = qs.annotate(
-		pontos_analisados_count=Count(
+		'pontos_analisados_count': Count(
 			'pontos_calibracao__status_pontos',
 			filter=Q(
 				pontos_calibracao__status_pontos__data_criacao__gte=Coalesce(
@@ -220,8 +255,112 @@ def instrumentos_status_api(request):
 				)
 			),
 			distinct=True
+		),
+	}
+
+
+def _status_campos(raw):
+	"""Campos pedidos em `fields=` (o id sempre vem); sem o parâmetro, todos."""
+	if not raw:
+		return list(STATUS_CAMPOS)
+	pedidos = {campo.strip() for campo in raw.split(',') if campo.strip()}
+	invalidos = sorted(pedidos - set(STATUS_CAMPOS))
+	if invalidos:
+		raise ValueError(f"Campos inválidos: {', '.join(invalidos)}. Disponíveis: {', '.join(STATUS_CAMPOS)}.")
+	pedidos.add('id')
+	return [campo for campo in STATUS_CAMPOS if campo in pedidos]
+
+
+@login_required
+@require_GET
+@ler_da_replica
+async def instrumentos_status_api(request):
+	try:
+		campos = _status_campos(request.GET.get('fields'))
+	except ValueError as exc:
+		return FastJsonResponse({'success': False, 'message': str(exc)}, status=400)
+	return FastJsonResponse(await instrumentos_status_payload(request, campos))
+
+
+def _instrumentos_status_queryset(params, campos, ordenar_por_validade=True):
+	"""Instrumentos filtrados pelos parâmetros da listagem de status; devolve (qs, anotações aplicadas).
+
+	Só entram no SQL as anotações exigidas pelos `campos` de saída, pelos
+	filtros informados e pela ordenação da página (validade).
+	"""
+	qs = Instrumento.objects.filter(status='ativo')
+	if 'tipo' in campos:
+		qs = qs.select_related('tipo_instrumento')
+	qs = _apply_pmc_categoria_filter(qs, params.get('pmc_categoria'))
+
+	# =========================
+	# Filtros simples (DB)
+	# =========================
+	search = (params.get('search') or '').strip()
+	if search:
+		qs = qs.filter(Q(codigo__icontains=search) | Q(descricao__icontains=search))
+
+	info_adic_search = (params.get('info_adic') or '').strip()
+	if info_adic_search:
+		qs = qs.filter(descricao__icontains=info_adic_search)
+
+	func_search = (params.get('funcionario') or '').strip()
+	if func_search:
+		func_subquery = StatusInstrumento.objects.filter(
+			instrumento=OuterRef('pk')
+		).filter(
+			Q(funcionario__nome__icontains=func_search) |
+			Q(funcionario__matricula__icontains=func_search)
 		)
-	)
+		qs = qs.filter(Exists(func_subquery))
+
+	setor_search = (params.get('setor') or '').strip()
+
+	tipo_id = params.get('tipo_id')
+	if tipo_id and tipo_id.isdigit():
+		qs = qs.filter(tipo_instrumento_id=int(tipo_id))
+
+	tipo_text = (params.get('tipo') or '').strip()
+	if tipo_text:
+		qs = qs.filter(tipo_instrumento__descricao__icontains=tipo_text)
+
+	instrumento_controlado = (params.get('instrumento_controlado') or '').lower()
+	if instrumento_controlado in {'1', 'true', 'sim', 'yes'}:
+		qs = qs.filter(instrumento_controlado=True)
+	elif instrumento_controlado in {'0', 'false', 'nao', 'no'}:
+		qs = qs.filter(instrumento_controlado=False)
+
+	ids_param = params.get('instrumento_id') or params.get('instrumentos')
+	if ids_param:
+		ids = [int(i) for i in ids_param.split(',') if i.strip().isdigit()]
+		if ids:
+			qs = qs.filter(id__in=ids)
+
+	situacao = (params.get('situacao') or '').strip().lower()
+	status_calibracao = (params.get('status_calibracao') or '').strip().lower()
+	pendencias_pontos = (params.get('pendencias_pontos') or '').strip().lower()
+	validade_inicio = params.get('validade_inicio')
+	validade_fim = params.get('validade_fim')
+
+	# =========================
+	# Anotações (só as necessárias)
+	# =========================
+	necessarias = {'valid_until'} if ordenar_por_validade else set()
+	for campo in campos:
+		necessarias.update(STATUS_CAMPOS[campo][0])
+	if setor_search:
+		necessarias.update(('status_tipo', 'status_devolucao', 'status_funcionario_setor'))
+	if situacao:
+		necessarias.update(('status_tipo', 'status_devolucao', 'status_recebimento'))
+	if pendencias_pontos in {'1', 'true', 'sim', 'yes'}:
+		necessarias.update(('total_pontos', 'pontos_analisados_count'))
+	if status_calibracao or validade_inicio or validade_fim:
+		necessarias.add('valid_until')
+	for nome in list(necessarias):
+		necessarias.update(STATUS_ANOTACAO_DEPENDENCIAS.get(nome, ()))
+	for nome, expressao in _status_anotacoes().items():
+		if nome in necessarias:
+			qs = qs.annotate(**{nome: expressao})
 
 	if setor_search:
 		qs = qs.filter(
@@ -230,7 +369,6 @@ def instrumentos_status_api(request):
 			status_funcionario_setor__icontains=setor_search
 		)
 
-	situacao = (request.GET.get('situacao') or '').strip().lower()
 	if situacao:
 		if situacao in {'entregue', 'entregue_ao_funcionario', 'entregue_funcionario'}:
 			qs = qs.filter(
@@ -247,7 +385,6 @@ def instrumentos_status_api(request):
 				status_tipo__istartswith='Recebido do laborat'
 			)
 
-	status_calibracao = (request.GET.get('status_calibracao') or '').strip().lower()
 	if status_calibracao:
 		today = timezone.now().date()
 		if status_calibracao == 'em_dia':
@@ -262,16 +399,12 @@ def instrumentos_status_api(request):
 		elif status_calibracao == 'sem_analise':
 			qs = qs.filter(valid_until__isnull=True)
 
-	pendencias_pontos = (request.GET.get('pendencias_pontos') or '').strip().lower()
 	if pendencias_pontos in {'1', 'true', 'sim', 'yes'}:
 		qs = qs.filter(
 			total_pontos__gt=0,
 			pontos_analisados_count__lt=F('total_pontos')
 		)
 
-	validade_inicio = request.GET.get('validade_inicio')
-	validade_fim = request.GET.get('validade_fim')
-
 	if validade_inicio:
 		start_date = parse_date(validade_inicio)
 		if start_date:
@@ -282,110 +415,137 @@ def instrumentos_status_api(request):
 		if end_date:
 			qs = qs.filter(valid_until__date__lte=end_date)
 
-	# =========================
-	# Paginação
-	# =========================
-	page = int(request.GET.get('page', 1) or 1)
-	per_page = max(1, min(int(request.GET.get('per_page', 15) or 15), 200))
+	return qs, necessarias
 
-	paginator = Paginator(qs.order_by(F('valid_until').asc(nulls_last=True), 'codigo'), per_page)
-	page_obj = paginator.get_page(page)
 
+def _status_items(instrumentos, campos):
 	today = timezone.now().date()
+	valores = [(campo, STATUS_CAMPOS[campo][1]) for campo in campos]
+	return [{campo: valor(inst, today) for campo, valor in valores} for inst in instrumentos]
 
-	items = []
-	pending_analysis_count = 0
-
-	for inst in page_obj.object_list:
-
-		# =========================
-		# REGRA CORRETA DOS PONTOS
-		# =========================
-		if inst.total_pontos == 0:
-			pontos_ok = True
-		else:
-			pontos_ok = (inst.pontos_analisados_count or 0) >= inst.total_pontos
 
-		if not pontos_ok:
-			pending_analysis_count += 1
+async def instrumentos_status_payload(request, campos=None):
+	"""Monta a página da listagem de status (também usada pelo benchmark de serialização).
 
-		last_recebimento = inst.last_recebimento_data
-		valid_until = (
-			last_recebimento + timedelta(days=inst.periodicidade_calibracao)
-			if last_recebimento else None
-		)
+	`sync_seq` é lido antes da consulta: é o ponto de partida do feed de
+	alterações para quem mantém a página aberta.
+	"""
+	campos = campos or list(STATUS_CAMPOS)
+	sync_seq = await aseq_atual()
+	# O filtro de categoria do PMC consulta o cache de referência, que pode ir ao banco.
+	qs, necessarias = await sync_to_async(_instrumentos_status_queryset)(request.GET, campos)
 
-		if valid_until and valid_until.date() >= today:
-			days_to_expire = (valid_until.date() - today).days
-			if days_to_expire <= 15:
-				calibration_status = 'a_calibrar'
-			else:
-				calibration_status = 'em_dia'
-		elif valid_until:
-			calibration_status = 'atrasado'
-		else:
-			calibration_status = 'sem_analise'
+	# =========================
+	# Paginação
+	# =========================
+	page = int(request.GET.get('page', 1) or 1)
+	per_page = max(1, min(int(request.GET.get('per_page', 15) or 15), 200))
 
-		items.append({
-			'id': inst.id,
-			'codigo': inst.codigo,
-			'descricao': inst.descricao,
-			'tipo': inst.tipo_instrumento.descricao if inst.tipo_instrumento else '',
-			'instrumento_controlado': inst.instrumento_controlado,
-			'total_pontos': inst.total_pontos,
-			'data_ultimo_envio': inst.last_envio_data.isoformat() if inst.last_envio_data else None,
-			'primeiro_envio': inst.last_envio_data is None,
-			'status': inst.status_tipo,
-			'pontos_ultima_calibracao_analisados': pontos_ok,
-			'valid_until': valid_until.isoformat() if valid_until else None,
-			'ultima_calibracao': last_recebimento.isoformat() if last_recebimento else None,
-			'calibration_status': calibration_status,
-			'ultimo_certificado': inst.ultimo_certificado_link,
-			'periodicidade_calibracao': inst.periodicidade_calibracao,
-			'status_obj': {
-				'funcionario': inst.status_funcionario,
-				'funcionario_id': inst.status_funcionario_id,
-				'funcionario_setor': inst.status_funcionario_setor,
-				'data_entrega': inst.status_entrega.isoformat() if inst.status_entrega else None,
-				'data_devolucao': inst.status_devolucao.isoformat() if inst.status_devolucao else None,
-				'data_recebimento': inst.status_recebimento.isoformat() if inst.status_recebimento else None,
-				'tipo_status': inst.status_tipo,
-			}
-		})
+	paginator = AsyncPaginator(qs.order_by(F('valid_until').asc(nulls_last=True), 'codigo'), per_page)
+	page_obj = await paginator.aget_page(page)
+	instrumentos = await page_obj.aget_object_list()
 
-	return JsonResponse({
-		'instrumentos': items,
-		'pending_analysis': {
-			'has_pending': pending_analysis_count > 0,
-			'count': pending_analysis_count,
-		},
+	payload = {
+		'instrumentos': _status_items(instrumentos, campos),
+		'sync_seq': sync_seq,
 		'pagination': {
 			'page': page_obj.number,
-			'pages': paginator.num_pages,
-			'total': paginator.count,
-			'has_next': page_obj.has_next(),
-			'has_previous': page_obj.has_previous(),
+			'pages': await paginator.anum_pages(),
+			'total': await paginator.acount(),
+			'has_next': await page_obj.ahas_next(),
+			'has_previous': await page_obj.ahas_previous(),
 			'per_page': per_page,
 		}
+	}
+	if {'total_pontos', 'pontos_analisados_count'} <= necessarias:
+		pending_analysis_count = sum(1 for inst in instrumentos if not _status_pontos_ok(inst))
+		payload['pending_analysis'] = {
+			'has_pending': pending_analysis_count > 0,
+			'count': pending_analysis_count,
+		}
+	return payload
+
+
+@login_required
+@require_GET
+async def instrumentos_alteracoes_api(request):
+	"""Feed incremental da listagem de status: o que mudou desde `desde` (um `sync_seq`).
+
+	Aceita os mesmos filtros e `fields` de `instrumentos_status_api`. Devolve
+	o estado atual dos instrumentos alterados que ainda atendem aos filtros e,
+	em `removidos`, os alterados que saíram do conjunto (ou foram excluídos).
+	Com alterações demais, ou com uma marca que o feed não cobre mais (já
+	podada ou de outro banco), o cliente recebe `reset` e recarrega a página.
+	"""
+	try:
+		desde = int(request.GET.get('desde', ''))
+	except ValueError:
+		return FastJsonResponse({'success': False, 'message': 'Parâmetro desde inválido.'}, status=400)
+	try:
+		campos = _status_campos(request.GET.get('fields'))
+	except ValueError as exc:
+		return FastJsonResponse({'success': False, 'message': str(exc)}, status=400)
+
+	primeira, atual = await aseq_retidas()
+	data_referencia = timezone.now().date()
+	if desde > atual or desde < primeira - 1:
+		return FastJsonResponse({'reset': True, 'sync_seq': atual, 'data_referencia': data_referencia})
+	alterados = await aalterados_desde(desde, atual) if desde < atual else {}
+	if len(alterados) > ALTERACOES_LIMITE:
+		return FastJsonResponse({'reset': True, 'sync_seq': atual, 'data_referencia': data_referencia})
+
+	instrumentos = []
+	if alterados:
+		qs, _ = await sync_to_async(_instrumentos_status_queryset)(request.GET, campos, ordenar_por_validade=False)
+		instrumentos = _status_items([inst async for inst in qs.filter(id__in=alterados).order_by('id')], campos)
+	presentes = {item['id'] for item in instrumentos}
+	return FastJsonResponse({
+		'reset': False,
+		'sync_seq': atual,
+		# A situação da calibração muda com a data; ao virar o dia o cliente recarrega.
+		'data_referencia': data_referencia,
+		'instrumentos': instrumentos,
+		'removidos': sorted(set(alterados) - presentes),
 	})
 
 
 @login_required
 @require_GET
-def indicadores_dashboard(request):
+async def eventos_instrumentos_stream(request):
+	"""Eventos ao vivo (SSE) das alterações de instrumentos, para a home.
+
+	Só funciona servido por ASGI: sob WSGI cada conexão prenderia um worker,
+	então a resposta é 204 (o `EventSource` desiste) e o cliente segue com o
+	polling de `instrumentos_alteracoes_api`.
+	"""
+	if not isinstance(request, ASGIRequest):
+		return HttpResponse(status=204)
+	response = StreamingHttpResponse(stream_eventos(), content_type='text/event-stream')
+	response['Cache-Control'] = 'no-cache'
+	response['X-Accel-Buffering'] = 'no'
+	return response
+
+
+@login_required
+@require_GET
+@ler_da_replica
+async def indicadores_dashboard(request):
 	"""Retorna agregados para cards de indicadores da home.
 	Apenas instrumentos com instrumento_controlado=True entram nos cálculos.
 	"""
+	# Vários agregados em sequência: uma única ida à thread do banco para todos.
+	return FastJsonResponse(await sync_to_async(_indicadores_pmc)(request.GET.get('pmc_categoria')))
+
+
+def _indicadores_pmc(categoria):
+	"""Calcula os contadores dos cards da home para a categoria do PMC."""
 
 	# ===== INSTRUMENTOS ATIVOS E CONTROLADOS =====
 	active_instrumentos = Instrumento.objects.filter(
 		status='ativo',
 		instrumento_controlado=True
 	)
-	active_instrumentos = _apply_pmc_categoria_filter(
-		active_instrumentos,
-		request.GET.get('pmc_categoria')
-	)
+	active_instrumentos = _apply_pmc_categoria_filter(active_instrumentos, categoria)
 
 	latest_status_qs = StatusInstrumento.objects.filter(
 		instrumento=OuterRef('pk')
@@ -470,12 +630,34 @@ def indicadores_dashboard(request):
 			if last_analysis is None:
 				pendentes_pontos += 1
 
-	return JsonResponse({
+	return {
 		'pontos_pendentes': pendentes_pontos,
 		'instrumentos_operacao': instrumentos_operacao,
 		'instrumentos_calibracao': instrumentos_calibracao,
 		'instrumentos_atraso': instrumentos_atraso,
-	})
+	}
+
+
+@login_required
+@require_GET
+@ler_da_replica
+async def pmc_bootstrap_api(request):
+	"""Dados iniciais da home do PMC em uma única requisição.
+
+	As listas de referência vêm do cache versionado por tabela; apenas os
+	indicadores são calculados a cada chamada.
+	"""
+	return FastJsonResponse(await sync_to_async(_bootstrap_pmc)(request.GET.get('pmc_categoria')))
+
+
+def _bootstrap_pmc(categoria):
+	return {
+		'tipos': tipos_instrumento_ativos(),
+		'setores': setores_ativos(),
+		'laboratorios': laboratorios_ativos(),
+		'descricoes': _descricoes_pmc(categoria),
+		'indicadores': _indicadores_pmc(categoria),
+	}
 
 
 @login_required
@@ -533,7 +715,7 @@ def instrumentos_disponiveis(request):
 		for inst in page_obj.object_list
 	]
 
-	return JsonResponse({
+	return FastJsonResponse({
 		'instrumentos': data,
 		'pagination': {
 			'page': page_obj.number,
@@ -548,6 +730,7 @@ def instrumentos_disponiveis(request):
 
 @login_required
 @require_GET
+@ler_da_replica
 def historico_instrumento(request, instrumento_id):
 	"""Retorna o histórico de status do instrumento."""
 	instrumento = get_object_or_404(Instrumento, pk=instrumento_id)
@@ -563,7 +746,42 @@ def historico_instrumento(request, instrumento_id):
 			'data': data.isoformat() if data else None,
 			'descricao': status.tipo_status or ''
 		})
-	return JsonResponse({'instrumento_id': instrumento.id, 'historico': historico})
+	return FastJsonResponse({'instrumento_id': instrumento.id, 'historico': historico})
+
+
+@login_required
+@require_GET
+@ler_da_replica
+def timeline_instrumento_api(request, instrumento_id):
+	"""Linha do tempo paginada (status, posses, certificados e análises) do instrumento."""
+	instrumento = get_object_or_404(Instrumento, pk=instrumento_id)
+	try:
+		limite = int(request.GET.get('limit', TIMELINE_LIMITE))
+	except (TypeError, ValueError):
+		limite = TIMELINE_LIMITE
+	limite = max(1, min(limite, TIMELINE_LIMITE_MAX))
+
+	try:
+		eventos, proximo = timeline_instrumento(instrumento.id, request.GET.get('cursor'), limite)
+	except CursorInvalido as exc:
+		return FastJsonResponse({'success': False, 'message': str(exc)}, status=400)
+
+	return FastJsonResponse({
+		'instrumento_id': instrumento.id,
+		'eventos': [serialize_evento(evento) for evento in eventos],
+		'next_cursor': proximo,
+	})
+
+
+@login_required
+@require_GET
+@ler_da_replica
+def dossie_instrumento_api(request, instrumento_id):
+	"""Dossiê de auditoria: instrumento, tipo, estado atual, posse ativa, pontos, certificados e assinaturas."""
+	dossie = carregar_dossie(instrumento_id)
+	if dossie is None:
+		return FastJsonResponse({'success': False, 'message': 'Instrumento não encontrado.'}, status=404)
+	return FastJsonResponse({'success': True, **dossie})
 
 
 @login_required
@@ -576,7 +794,7 @@ def ultimo_responsavel_pre_envio(request, instrumento_id):
 		tipo_status__istartswith='Enviado ao laboratório'
 	).order_by('-data_entrega').first()
 	if not last_envio:
-		return JsonResponse({'success': True, 'responsavel': None})
+		return FastJsonResponse({'success': True, 'responsavel': None})
 
 	posse_qs = FuncionarioInstrumento.objects.filter(
 		instrumento=instrumento,
@@ -587,7 +805,7 @@ def ultimo_responsavel_pre_envio(request, instrumento_id):
 	if not posse:
 		posse = posse_qs.filter(data_fim__lte=last_envio.data_entrega).order_by('-data_fim').first()
 	if not posse:
-		return JsonResponse({'success': True, 'responsavel': None})
+		return FastJsonResponse({'success': True, 'responsavel': None})
 
 	resp_data = {
 		'funcionario_id': posse.funcionario.id,
@@ -599,10 +817,11 @@ def ultimo_responsavel_pre_envio(request, instrumento_id):
 		'data_inicio': posse.data_inicio.isoformat() if posse.data_inicio else None,
 		'data_fim': posse.data_fim.isoformat() if posse.data_fim else None,
 	}
-	return JsonResponse({'success': True, 'responsavel': resp_data})
+	return FastJsonResponse({'success': True, 'responsavel': resp_data})
 
 @login_required
 @require_GET
+@ler_da_replica
 def entregas_api(request):
 	"""Retorna lista paginada de entregas com filtros opcionais."""
 	entregas = FuncionarioInstrumento.objects.select_related('funcionario', 'instrumento').order_by('-data_inicio')
@@ -651,7 +870,7 @@ def entregas_api(request):
 			'observacoes': e.observacoes or '',
 		})
 
-	return JsonResponse({
+	return FastJsonResponse({
 		'entregas': data,
 		'pagination': {
 			'page': page_obj.number,
@@ -670,15 +889,15 @@ def import_entregas_csv(request):
 	"""Importa entregas históricas via CSV (instrumento x matrícula)."""
 	upload = request.FILES.get('file')
 	if not upload:
-		return JsonResponse({'success': False, 'message': 'Envie um arquivo CSV no campo "file".'}, status=400)
+		return FastJsonResponse({'success': False, 'message': 'Envie um arquivo CSV no campo "file".'}, status=400)
 
 	try:
 		raw_bytes = upload.read()
 	except Exception:
-		return JsonResponse({'success': False, 'message': 'Não foi possível ler o arquivo enviado.'}, status=400)
+		return FastJsonResponse({'success': False, 'message': 'Não foi possível ler o arquivo enviado.'}, status=400)
 
 	if not raw_bytes:
-		return JsonResponse({'success': False, 'message': 'O arquivo enviado está vazio.'}, status=400)
+		return FastJsonResponse({'success': False, 'message': 'O arquivo enviado está vazio.'}, status=400)
 
 	decoded = None
 	for encoding in ('utf-8-sig', 'utf-8', 'latin-1'):
@@ -688,7 +907,7 @@ def import_entregas_csv(request):
 		except UnicodeDecodeError:
 			continue
 	if decoded is None:
-		return JsonResponse({'success': False, 'message': 'Não foi possível decodificar o arquivo. Utilize UTF-8 ou Latin-1.'}, status=400)
+		return FastJsonResponse({'success': False, 'message': 'Não foi possível decodificar o arquivo. Utilize UTF-8 ou Latin-1.'}, status=400)
 
 	lines = decoded.splitlines()
 	sample_line = next((line for line in lines if line.strip()), '')
@@ -705,7 +924,7 @@ def import_entregas_csv(request):
 		break
 
 	if header_row is None:
-		return JsonResponse({'success': False, 'message': 'Nenhuma linha válida encontrada no arquivo.'}, status=400)
+		return FastJsonResponse({'success': False, 'message': 'Nenhuma linha válida encontrada no arquivo.'}, status=400)
 
 	normalized_header = [cell.strip().lower() for cell in header_row]
 	instrument_aliases = {'instrumento', 'codigo', 'instrumento_codigo', 'codigo_instrumento'}
@@ -726,56 +945,91 @@ def import_entregas_csv(request):
 		data_idx = next((idx for idx, name in enumerate(normalized_header) if name in data_aliases), None)
 		obs_idx = next((idx for idx, name in enumerate(normalized_header) if name in obs_aliases), None)
 		if instrument_idx is None or matricula_idx is None:
-			return JsonResponse({'success': False, 'message': 'Cabeçalho deve conter as colunas "instrumento" e "matricula".'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'Cabeçalho deve conter as colunas "instrumento" e "matricula".'}, status=400)
 	else:
 		if len(header_row) < 2:
-			return JsonResponse({'success': False, 'message': 'Cada linha deve conter, ao menos, instrumento e matrícula.'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'Cada linha deve conter, ao menos, instrumento e matrícula.'}, status=400)
 		instrument_idx = 0
 		matricula_idx = 1
 		data_idx = 2 if len(header_row) > 2 else None
 		obs_idx = 3 if len(header_row) > 3 else None
 
-	stats = {'processed': 0, 'success': 0, 'error_rows': 0}
-	errors = []
-	seen_codes = set()
+	dry_run = (request.POST.get('dry_run') or request.GET.get('dry_run') or '').lower() in {'1', 'true', 'sim', 'yes'}
+	report = ValidationReport()
+	entries = []
 
-	def register_row(row, line_number):
+	def parse_row(row, line_number):
 		instrument_value = row[instrument_idx].strip() if len(row) > instrument_idx else ''
 		matricula_value = row[matricula_idx].strip() if len(row) > matricula_idx else ''
 		if not instrument_value or not matricula_value:
-			errors.append({'line': line_number, 'error': 'Linha sem instrumento e/ou matrícula.'})
-			stats['error_rows'] += 1
+			report.add(line_number, 'Linha sem instrumento e/ou matrícula.')
 			return
-		code_key = instrument_value.lower()
-		if code_key in seen_codes:
-			errors.append({'line': line_number, 'error': 'Instrumento duplicado no arquivo.'})
-			stats['error_rows'] += 1
+		raw_date = row[data_idx].strip() if data_idx is not None and len(row) > data_idx else ''
+		timestamp = _parse_csv_datetime(raw_date)
+		if raw_date and timestamp is None:
+			report.add(line_number, f'Data "{raw_date}" inválida.')
 			return
-		seen_codes.add(code_key)
+		entries.append({
+			'line': line_number,
+			'instrumento': instrument_value,
+			'matricula': matricula_value,
+			'observacoes': row[obs_idx].strip() if obs_idx is not None and len(row) > obs_idx else '',
+			'timestamp': timestamp,
+		})
 
-		instrumento = Instrumento.objects.filter(codigo__iexact=instrument_value).first()
-		if not instrumento:
-			errors.append({'line': line_number, 'error': f'Instrumento "{instrument_value}" não encontrado.'})
-			stats['error_rows'] += 1
-			return
-		funcionario = Funcionario.objects.filter(matricula__iexact=matricula_value).first()
-		if not funcionario:
-			errors.append({'line': line_number, 'error': f'Funcionário com matrícula "{matricula_value}" não encontrado.'})
-			stats['error_rows'] += 1
-			return
+	processed = 0
+	if not has_header:
+		processed += 1
+		parse_row(header_row, header_line)
 
-		obs_value = row[obs_idx].strip() if obs_idx is not None and len(row) > obs_idx else ''
-		timestamp = None
-		if data_idx is not None and len(row) > data_idx:
-			timestamp = _parse_csv_datetime(row[data_idx])
-		if timestamp is None:
-			timestamp = timezone.now()
+	for row in reader:
+		if not row or not any((cell or '').strip() for cell in row):
+			continue
+		processed += 1
+		parse_row(row, reader.line_num)
+
+	# validação do arquivo inteiro: duplicidades e referências resolvidas com uma consulta por tabela
+	check_duplicates(
+		report,
+		((entry['line'], normalize_lookup(entry['instrumento'])) for entry in entries),
+		'Instrumento duplicado no arquivo',
+	)
+	instrumentos = lookup_instrumentos(entry['instrumento'] for entry in entries)
+	funcionarios = lookup_funcionarios(entry['matricula'] for entry in entries)
+	for entry in entries:
+		if report.has_error(entry['line']):
+			continue
+		entry['instrumento_obj'] = instrumentos.get(normalize_lookup(entry['instrumento']))
+		entry['funcionario_obj'] = funcionarios.get(normalize_lookup(entry['matricula']))
+		if entry['instrumento_obj'] is None:
+			report.add(entry['line'], f'Instrumento "{entry["instrumento"]}" não encontrado.')
+		if entry['funcionario_obj'] is None:
+			report.add(entry['line'], f'Funcionário com matrícula "{entry["matricula"]}" não encontrado.')
+
+	valid_entries = [entry for entry in entries if not report.has_error(entry['line'])]
+	stats = {'processed': processed, 'success': 0, 'error_rows': report.error_rows}
+
+	if dry_run:
+		stats['valid'] = len(valid_entries)
+		summary = f"Validação concluída ({len(valid_entries)} linha(s) válidas, {report.error_rows} linha(s) com erro). Nada foi gravado."
+		return FastJsonResponse({
+			'success': True,
+			'dry_run': True,
+			'message': summary,
+			'stats': stats,
+			'errors': sorted(report.errors, key=lambda item: item['line']),
+		})
 
+	for entry in valid_entries:
+		instrumento = entry['instrumento_obj']
+		funcionario = entry['funcionario_obj']
+		obs_value = entry['observacoes']
+		timestamp = entry['timestamp'] or timezone.now()
 		try:
 			with transaction.atomic():
 				FuncionarioInstrumento.objects.filter(instrumento=instrumento, ativo=True).update(ativo=False, data_fim=timestamp)
 				StatusInstrumento.objects.filter(instrumento=instrumento, data_devolucao__isnull=True).update(data_devolucao=timestamp)
-				posse = FuncionarioInstrumento.objects.create(
+				FuncionarioInstrumento.objects.create(
 					funcionario=funcionario,
 					instrumento=instrumento,
 					data_inicio=timestamp,
@@ -795,25 +1049,15 @@ def import_entregas_csv(request):
 				)
 			stats['success'] += 1
 		except Exception as exc:
-			errors.append({'line': line_number, 'error': f'Falha ao registrar entrega: {str(exc)}'})
-			stats['error_rows'] += 1
-
-	if not has_header:
-		stats['processed'] += 1
-		register_row(header_row, header_line)
-
-	for row in reader:
-		if not row or not any((cell or '').strip() for cell in row):
-			continue
-		stats['processed'] += 1
-		register_row(row, reader.line_num)
+			report.add(entry['line'], f'Falha ao registrar entrega: {str(exc)}')
+	stats['error_rows'] = report.error_rows
 
 	summary = f"Importação concluída ({stats['success']} entrega(s) registradas, {stats['error_rows']} linha(s) com erro)."
-	return JsonResponse({
+	return FastJsonResponse({
 		'success': True,
 		'message': summary,
 		'stats': stats,
-		'errors': errors,
+		'errors': sorted(report.errors, key=lambda item: item['line']),
 	})
 
 
@@ -840,10 +1084,10 @@ def designar_instrumento(request):
 			data = json.loads(request.body)
 		except json.JSONDecodeError:
 			body_preview = request.body[:1000].decode('utf-8', errors='replace')
-			return JsonResponse({'success': False, 'message': 'JSON inválido no corpo da requisição', 'body_preview': body_preview}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'JSON inválido no corpo da requisição', 'body_preview': body_preview}, status=400)
 
 		if not data.get('funcionario_id') or not data.get('instrumento_id'):
-			return JsonResponse({'success': False, 'message': 'Campos `funcionario_id` e `instrumento_id` são obrigatórios'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'Campos `funcionario_id` e `instrumento_id` são obrigatórios'}, status=400)
 
 		funcionario = get_object_or_404(Funcionario, pk=data.get('funcionario_id'))
 		instrumento = get_object_or_404(Instrumento, pk=data.get('instrumento_id'))
@@ -854,10 +1098,10 @@ def designar_instrumento(request):
 		if open_status and open_status.tipo_status:
 			# enviado ao laboratório e ainda não recebido
 			if open_status.tipo_status.startswith('Enviado ao laboratório') and not open_status.data_recebimento:
-				return JsonResponse({'success': False, 'message': 'Instrumento indisponível: enviado ao laboratório.'}, status=400)
+				return FastJsonResponse({'success': False, 'message': 'Instrumento indisponível: enviado ao laboratório.'}, status=400)
 			# entregue a funcionário e ainda não devolvido
 			if open_status.tipo_status.startswith('Entregue ao funcionário') and not open_status.data_devolucao:
-				return JsonResponse({'success': False, 'message': 'Instrumento indisponível: já designado para funcionário.'}, status=400)
+				return FastJsonResponse({'success': False, 'message': 'Instrumento indisponível: já designado para funcionário.'}, status=400)
 
 		data_inicio = data.get('data_inicio') or timezone.now()
 		data_fim = data.get('data_fim') or None
@@ -914,9 +1158,9 @@ def designar_instrumento(request):
 				# não bloquear criação da posse por falha na assinatura
 				pass
 
-		return JsonResponse({'success': True, 'message': 'Instrumento designado com sucesso', 'posse_id': posse.id})
+		return FastJsonResponse({'success': True, 'message': 'Instrumento designado com sucesso', 'posse_id': posse.id})
 	except Exception as e:
-		return JsonResponse({'success': False, 'message': str(e)}, status=400)
+		return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 @login_required
 @require_http_methods(["POST"])
@@ -927,12 +1171,12 @@ def devolver_instrumento(request):
 			data = json.loads(request.body)
 		except json.JSONDecodeError:
 			body_preview = request.body[:1000].decode('utf-8', errors='replace')
-			return JsonResponse({'success': False, 'message': 'JSON inválido no corpo da requisição', 'body_preview': body_preview}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'JSON inválido no corpo da requisição', 'body_preview': body_preview}, status=400)
 
 		funcionario_id = data.get('funcionario_id')
 		instrumento_id = data.get('instrumento_id')
 		if not funcionario_id or not instrumento_id:
-			return JsonResponse({'success': False, 'message': 'Campos `funcionario_id` e `instrumento_id` são obrigatórios'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'Campos `funcionario_id` e `instrumento_id` são obrigatórios'}, status=400)
 
 		funcionario = get_object_or_404(Funcionario, pk=funcionario_id)
 		instrumento = get_object_or_404(Instrumento, pk=instrumento_id)
@@ -956,9 +1200,9 @@ def devolver_instrumento(request):
 		if not posse:
 			posse = FuncionarioInstrumento.objects.filter(instrumento=instrumento, ativo=True).order_by('-data_inicio').first()
 		if not posse:
-			return JsonResponse({'success': False, 'message': 'Nenhuma posse ativa encontrada para este instrumento'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'Nenhuma posse ativa encontrada para este instrumento'}, status=400)
 		if posse.funcionario_id != funcionario.id:
-			return JsonResponse({'success': False, 'message': 'Instrumento não está vinculado ao funcionário informado'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'Instrumento não está vinculado ao funcionário informado'}, status=400)
 
 		observacoes = (data.get('observacoes') or '').strip()
 		posse.data_fim = devolucao_dt
@@ -984,9 +1228,9 @@ def devolver_instrumento(request):
 			tipo_status=f'Devolvido pelo funcionário {funcionario.nome}'
 		)
 
-		return JsonResponse({'success': True, 'message': 'Devolução registrada com sucesso', 'posse_id': posse.id, 'status_id': status.id})
+		return FastJsonResponse({'success': True, 'message': 'Devolução registrada com sucesso', 'posse_id': posse.id, 'status_id': status.id})
 	except Exception as e:
-		return JsonResponse({'success': False, 'message': str(e)}, status=400)
+		return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 @login_required
 @require_http_methods(["POST"])
@@ -1004,11 +1248,11 @@ def enviar_para_calibracao(request):
 		try:
 			data = json.loads(request.body)
 		except json.JSONDecodeError:
-			return JsonResponse({'success': False, 'message': 'JSON invÃ¡lido'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'JSON invÃ¡lido'}, status=400)
 
 		instrumento_id = data.get('instrumento_id')
 		if not instrumento_id:
-			return JsonResponse({'success': False, 'message': 'instrumento_id obrigatório'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'instrumento_id obrigatório'}, status=400)
 
 		instrumento = get_object_or_404(Instrumento, pk=instrumento_id)
 
@@ -1070,11 +1314,11 @@ def enviar_para_calibracao(request):
 				tipo_status=f'Enviado ao laboratório {lab_name}'
 			)
 		except Exception as e:
-			return JsonResponse({'success': False, 'message': f'Erro ao criar status: {str(e)}'}, status=500)
+			return FastJsonResponse({'success': False, 'message': f'Erro ao criar status: {str(e)}'}, status=500)
 
-		return JsonResponse({'success': True, 'message': f'Instrumento enviado ao laboratório {lab_name}'})
+		return FastJsonResponse({'success': True, 'message': f'Instrumento enviado ao laboratório {lab_name}'})
 	except Exception as e:
-		return JsonResponse({'success': False, 'message': str(e)}, status=400)
+		return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 @login_required
 @require_http_methods(["POST"])
@@ -1100,11 +1344,11 @@ def receber_da_calibracao(request):
 		try:
 			data = json.loads(request.body)
 		except json.JSONDecodeError:
-			return JsonResponse({'success': False, 'message': 'JSON invÃ¡lido'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'JSON invÃ¡lido'}, status=400)
 
 		instrumento_id = data.get('instrumento_id')
 		if not instrumento_id:
-			return JsonResponse({'success': False, 'message': 'instrumento_id obrigatÃ³rio'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'instrumento_id obrigatÃ³rio'}, status=400)
 
 		instrumento = get_object_or_404(Instrumento, pk=instrumento_id)
 
@@ -1180,24 +1424,24 @@ def receber_da_calibracao(request):
 				tipo_status=f'Recebido do laboratório {lab_name}'
 			)
 		except Exception as e:
-			return JsonResponse({'success': False, 'message': f'Erro ao criar status de recebimento: {str(e)}'}, status=500)
+			return FastJsonResponse({'success': False, 'message': f'Erro ao criar status de recebimento: {str(e)}'}, status=500)
 
 		# criar certificado vinculado
 		try:
 			link = data.get('link')
 			if not link:
-				return JsonResponse({'success': False, 'message': 'Campo `link` do certificado Ã© obrigatÃ³rio'}, status=400)
+				return FastJsonResponse({'success': False, 'message': 'Campo `link` do certificado Ã© obrigatÃ³rio'}, status=400)
 
 			cert = CertificadoCalibracao.objects.create(
 				status=recv_status,
 				link=link,
 			)
 		except Exception as e:
-			return JsonResponse({'success': False, 'message': f'Erro ao criar certificado: {str(e)}'}, status=500)
+			return FastJsonResponse({'success': False, 'message': f'Erro ao criar certificado: {str(e)}'}, status=500)
 
-		return JsonResponse({'success': True, 'message': 'Instrumento recebido e certificado anexado', 'certificado_id': cert.id, 'status_id': recv_status.id})
+		return FastJsonResponse({'success': True, 'message': 'Instrumento recebido e certificado anexado', 'certificado_id': cert.id, 'status_id': recv_status.id})
 	except Exception as e:
-		return JsonResponse({'success': False, 'message': str(e)}, status=400)
+		return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
 
 @login_required
 @require_http_methods(["POST"])
@@ -1221,11 +1465,11 @@ def registrar_status_ponto(request):
 		try:
 			data = json.loads(request.body)
 		except json.JSONDecodeError:
-			return JsonResponse({'success': False, 'message': 'JSON invÃ¡lido'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'JSON invÃ¡lido'}, status=400)
 
 		ponto_id = data.get('ponto_id') or data.get('ponto')
 		if not ponto_id:
-			return JsonResponse({'success': False, 'message': 'ponto_id Ã© obrigatÃ³rio'}, status=400)
+			return FastJsonResponse({'success': False, 'message': 'ponto_id Ã© obrigatÃ³rio'}, status=400)
 
 		ponto = get_object_or_404(PontoCalibracao, pk=ponto_id)
 		instrumento = ponto.instrumento
@@ -1270,6 +1514,6 @@ def registrar_status_ponto(request):
 
 		status_ponto = StatusPontoCalibracao.objects.create(**status_kwargs)
 
-		return JsonResponse({'success': True, 'message': 'Status do ponto registrado', 'status_ponto_id': status_ponto.id})
+		return FastJsonResponse({'success': True, 'message': 'Status do ponto registrado', 'status_ponto_id': status_ponto.id})
 	except Exception as e:
-		return JsonResponse({'success': False, 'message': str(e)}, status=400)
+		return FastJsonResponse({'success': False, 'message': str(e)}, status=400)
@@ -0,0 +1,41 @@
+"""Backend de autenticação com o usuário da sessão em cache.
+
+Toda requisição autenticada busca o `Usuario` da sessão; as telas disparam
+muitas chamadas pequenas às APIs, então o usuário fica alguns segundos
+(`AUTH_USUARIO_CACHE_TIMEOUT`) no cache compartilhado. `signals.py` descarta
+a entrada quando o usuário é salvo (troca de senha, `is_active`) ou sai.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+
+def usuario_cache_key(user_id):
+    return f'auth:usuario:{user_id}'
+
+
+class CachedModelBackend(ModelBackend):
+    """`ModelBackend` que lê o usuário da sessão do cache antes de ir ao banco.
+
+    A conferência do hash de sessão continua a cargo do Django; como o
+    usuário em cache traz a senha, uma troca de senha ainda encerra as outras
+    sessões assim que a entrada é descartada.
+    """
+
+    def get_user(self, user_id):
+        key = usuario_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USUARIO_CACHE_TIMEOUT)
+        return user
+
+    async def aget_user(self, user_id):
+        key = usuario_cache_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is not None:
+                await cache.aset(key, user, settings.AUTH_USUARIO_CACHE_TIMEOUT)
+        return user
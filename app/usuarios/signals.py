@@ -0,0 +1,24 @@
+from functools import partial
+
+from django.contrib.auth.signals import user_logged_out
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import usuario_cache_key
+from .models import Usuario
+
+
+@receiver([post_save, post_delete], sender=Usuario)
+def invalidar_usuario_em_cache(sender, instance, **kwargs):
+    key = usuario_cache_key(instance.pk)
+    cache.delete(key)
+    # De novo após o commit: até lá outra requisição pode ter recolocado a versão antiga.
+    transaction.on_commit(partial(cache.delete, key))
+
+
+@receiver(user_logged_out)
+def invalidar_usuario_no_logout(sender, user, **kwargs):
+    if user is not None:
+        cache.delete(usuario_cache_key(user.pk))
@@ -0,0 +1,221 @@
+(function () {
+    const links = document.querySelectorAll('.sidebar-link');
+    const collapseBtn = document.getElementById('sidebarCollapseBtn');
+    const hamburgerBtn = document.getElementById('sidebarHamburger');
+
+    const ACTIVE_KEY = 'calimag.sidebar.active.href';
+    const COLLAPSE_KEY = 'calimag.sidebar.collapsed';
+
+    function setSidebarCollapsed(collapsed) {
+        document.body.classList.toggle('sidebar-collapsed', collapsed);
+        localStorage.setItem(COLLAPSE_KEY, collapsed ? '1' : '0');
+    }
+
+    setSidebarCollapsed(localStorage.getItem(COLLAPSE_KEY) === '1');
+
+    function toggleSidebar() {
+        const collapsed = document.body.classList.contains('sidebar-collapsed');
+        setSidebarCollapsed(!collapsed);
+    }
+
+    if (collapseBtn) collapseBtn.addEventListener('click', toggleSidebar);
+    if (hamburgerBtn) hamburgerBtn.addEventListener('click', toggleSidebar);
+
+    // Active link
+    function markActiveLink(pathname) {
+        const normalizedPath = (pathname || '/').replace(/\/$/, '') || '/';
+        links.forEach(link => {
+            link.classList.remove('bg-blue-50', 'text-blue-700', 'font-semibold');
+            const href = link.getAttribute('href').replace(/\/$/, '') || '/';
+            if (href === normalizedPath) {
+                link.classList.add('bg-blue-50', 'text-blue-700', 'font-semibold');
+                localStorage.setItem(ACTIVE_KEY, href);
+            }
+        });
+    }
+
+    markActiveLink(window.location.pathname.replace(/\/$/, ''));
+
+    const saved = localStorage.getItem(ACTIVE_KEY);
+    if (saved) {
+        markActiveLink(saved);
+    }
+
+    document.body.addEventListener('htmx:afterSwap', (event) => {
+        if (!event.detail || !event.detail.target || event.detail.target.id !== 'appContent') return;
+        markActiveLink(window.location.pathname.replace(/\/$/, ''));
+    });
+})();
+
+// Inicializa Choices com configuração padrão mais estrita para todos os selects marcados
+const DEFAULT_CHOICES_OPTIONS = {
+    searchEnabled: true,
+    shouldSort: false,
+    // Busca menos permissiva: apenas correspondências muito próximas
+    fuseOptions: {
+        threshold: 0.0,
+        ignoreLocation: true,
+        distance: 0,
+    }
+};
+
+function initChoicesForAll(selector = '[data-choices]') {
+    const nodes = document.querySelectorAll(selector);
+    nodes.forEach(el => {
+        if (el.dataset.choicesInitialized === '1') return;
+        // eslint-disable-next-line no-new
+        new Choices(el, DEFAULT_CHOICES_OPTIONS);
+        el.dataset.choicesInitialized = '1';
+    });
+}
+
+function runPageInits() {
+    console.log('[runPageInits] Iniciando...');
+    const content = document.getElementById('appContent');
+    if (!content) {
+        console.warn('[runPageInits] #appContent não encontrado!');
+        return;
+    }
+
+    const hasHomeTable = content.querySelector('#homeInstrumentosTable');
+    const hasEntregasTable = content.querySelector('#entregasBody');
+    const hasLabsTable = content.querySelector('#labsBody');
+    const hasTiposTable = content.querySelector('#tiposBody');
+    const hasInstrumentosTable = content.querySelector('#instrumentosTable');
+    const hasFuncionariosTable = content.querySelector('#funcionariosTable');
+    const hasSetoresTable = content.querySelector('#setoresBody');
+
+    console.log('[runPageInits] Tabelas encontradas:', {
+        hasHomeTable: !!hasHomeTable,
+        hasEntregasTable: !!hasEntregasTable,
+        hasLabsTable: !!hasLabsTable,
+        hasTiposTable: !!hasTiposTable,
+        hasInstrumentosTable: !!hasInstrumentosTable,
+        hasFuncionariosTable: !!hasFuncionariosTable,
+        hasSetoresTable: !!hasSetoresTable
+    });
+
+    let currentPage = null;
+    if (hasHomeTable) currentPage = 'home';
+    else if (hasEntregasTable) currentPage = 'entregas';
+    else if (hasLabsTable) currentPage = 'labs';
+    else if (hasTiposTable) currentPage = 'tipos';
+    else if (hasInstrumentosTable) currentPage = 'instrumentos';
+    else if (hasFuncionariosTable) currentPage = 'funcionarios';
+    else if (hasSetoresTable) currentPage = 'setores';
+
+    console.log('[runPageInits] Página detectada:', currentPage);
+
+    // Skip if the same page was already initialized (prevents double initialization on DOMContentLoaded + htmx:afterSwap)
+    // But always allow re-initialization when navigating between different pages
+    const previousPage = content.dataset.pageInited;
+    if (currentPage && previousPage === currentPage && !content.dataset.htmxSwapped) {
+        console.log('[runPageInits] Página já inicializada, pulando...');
+        return;
+    }
+    
+    // Mark that we're processing an HTMX swap, and clear it after initialization
+    if (content.dataset.htmxSwapped) {
+        console.log('[runPageInits] Processando swap HTMX');
+        delete content.dataset.htmxSwapped;
+    }
+
+    if (hasHomeTable && typeof window.initHomeDashboard === 'function') {
+        console.log('[runPageInits] Inicializando Home Dashboard');
+        window.initHomeDashboard();
+    }
+
+    if (hasEntregasTable) {
+        console.log('[runPageInits] Inicializando Entregas');
+        if (typeof window.setupEntregasPaginationControls === 'function') {
+            window.setupEntregasPaginationControls();
+        }
+        if (typeof window.loadEntregas === 'function') {
+            window.loadEntregas({ pageOverride: 1, updateFilters: true });
+        }
+        if (typeof window.refreshDevolucaoCache === 'function') {
+            window.refreshDevolucaoCache(true);
+        }
+        if (typeof window.handlePendingDesignationPrefill === 'function') {
+            window.handlePendingDesignationPrefill();
+        }
+    }
+
+    if (hasLabsTable && typeof window.loadLabs === 'function') {
+        console.log('[runPageInits] Inicializando Labs');
+        console.log('[runPageInits] window.loadLabs existe?', typeof window.loadLabs);
+        window.loadLabs();
+    }
+
+    if (hasTiposTable && typeof window.loadTipos === 'function') {
+        console.log('[runPageInits] Inicializando Tipos');
+        console.log('[runPageInits] window.loadTipos existe?', typeof window.loadTipos);
+        window.loadTipos();
+    }
+
+    if (hasInstrumentosTable) {
+        console.log('[runPageInits] Inicializando Instrumentos');
+        if (typeof window.loadInstrumentos === 'function') {
+            window.loadInstrumentos();
+        }
+        if (typeof window.loadTiposInstrumento === 'function') {
+            window.loadTiposInstrumento();
+        }
+        if (typeof window.setupInstrumentoFilters === 'function') {
+            window.setupInstrumentoFilters();
+        }
+    }
+
+    if (hasFuncionariosTable) {
+        console.log('[runPageInits] Inicializando Funcionários');
+        console.log('[runPageInits] window.loadFuncionarios existe?', typeof window.loadFuncionarios);
+        console.log('[runPageInits] window.loadSetoresForSelect existe?', typeof window.loadSetoresForSelect);
+        if (typeof window.loadFuncionarios === 'function') {
+            console.log('[runPageInits] Chamando window.loadFuncionarios()...');
+            window.loadFuncionarios();
+        } else {
+            console.error('[runPageInits] window.loadFuncionarios NÃO É UMA FUNÇÃO!');
+        }
+        if (typeof window.loadSetoresForSelect === 'function') {
+            window.loadSetoresForSelect();
+        }
+    }
+
+    if (hasSetoresTable && typeof window.loadSetores === 'function') {
+        console.log('[runPageInits] Inicializando Setores');
+        window.loadSetores();
+    }
+
+    if (currentPage) {
+        content.dataset.pageInited = currentPage;
+    } else {
+        delete content.dataset.pageInited;
+    }
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    if (typeof Choices !== 'undefined') {
+        initChoicesForAll();
+    }
+    runPageInits();
+});
+
+document.body.addEventListener('htmx:afterSettle', (event) => {
+    if (!event.detail || !event.detail.target || event.detail.target.id !== 'appContent') return;
+    console.log('[HTMX] afterSettle disparado! (conteudo e scripts prontos)', event);
+    console.log('[HTMX] Target:', event.detail.target);
+    
+    // Mark the content as swapped by HTMX to force re-initialization
+    const content = document.getElementById('appContent');
+    if (content) {
+        console.log('[HTMX] Marcando content como swapped');
+        content.dataset.htmxSwapped = 'true';
+    } else {
+        console.warn('[HTMX] #appContent não encontrado no afterSettle!');
+    }
+    
+    if (typeof Choices !== 'undefined') {
+        initChoicesForAll();
+    }
+    runPageInits();
+});
@@ -0,0 +1,793 @@
+function getCSRF() {
+    const name = 'csrftoken';
+    const cookies = document.cookie.split(';').map(c=>c.trim());
+    for (const c of cookies) {
+        if (c.startsWith(name + '=')) return decodeURIComponent(c.split('=')[1]);
+    }
+    return '';
+}
+
+var ENTREGA_PREFILL_STORAGE_KEY = window.ENTREGA_PREFILL_STORAGE_KEY || 'calibracao_entrega_prefill';
+window.ENTREGA_PREFILL_STORAGE_KEY = ENTREGA_PREFILL_STORAGE_KEY;
+var ENTREGAS_PAGE_SIZE = 15;
+
+var entregasFilters = { search: '', status: 'all' };
+var entregasPagination = { page: 1, pages: 1, total: 0 };
+var entregasTableData = [];
+var entregasSearchTimeout = null;
+
+var designItems = [];
+var designInstrumentoChoices = null;
+var designFuncionarioChoices = null;
+var designFuncionarioSearchTimer = null;
+var designFuncionarioSearchSeq = 0;
+var DESIGN_FUNCIONARIO_MIN_CHARS = 2;
+
+async function openDesignationModal(prefillOptions) {
+    renderDesignTable();
+    const modal = document.getElementById('designationModal');
+    if (modal) {
+        modal.classList.remove('hidden');
+    }
+    try {
+        await Promise.all([loadDesignFuncionarios(), loadDesignInstrumentos()]);
+        if (prefillOptions) {
+            applyDesignationPrefill(prefillOptions);
+        }
+    } catch (error) {
+        console.error('Erro ao carregar dados para entrega:', error);
+    }
+}
+
+function closeDesignationModal() {
+    document.getElementById('designationModal').classList.add('hidden');
+}
+
+function setDesignFuncionarioStatus(message, isError) {
+    const status = document.getElementById('design_funcionario_status');
+    if (!status) return;
+    status.textContent = message || '';
+    status.classList.toggle('hidden', !message);
+    status.classList.toggle('text-red-600', !!message && !!isError);
+    status.classList.toggle('text-gray-500', !!message && !isError);
+}
+
+function destroyDesignFuncionarioChoices() {
+    if (designFuncionarioChoices) {
+        designFuncionarioChoices.destroy();
+        designFuncionarioChoices = null;
+    }
+}
+
+function renderDesignFuncionarios(funcionarios) {
+    const sel = document.getElementById('design_funcionario');
+    if (!sel) return;
+    destroyDesignFuncionarioChoices();
+    sel.disabled = false;
+    sel.innerHTML = '<option value="">Digite matrícula ou nome...</option>';
+    (funcionarios || []).forEach(f => {
+        const opt = document.createElement('option');
+        opt.value = f.id;
+        opt.textContent = `${f.matricula} - ${f.nome}`;
+        sel.appendChild(opt);
+    });
+    setDesignFuncionarioStatus('', false);
+    if (window.Choices) {
+        designFuncionarioChoices = new Choices('#design_funcionario', {
+            searchEnabled: true,
+            searchChoices: false,
+            shouldSort: false,
+            itemSelectText: '',
+            placeholder: true,
+            placeholderValue: 'Digite matrícula ou nome...',
+            noChoicesText: 'Digite ao menos 2 caracteres',
+            noResultsText: 'Nenhum funcionário encontrado'
+        });
+    }
+    if (sel.dataset.searchBound !== '1') {
+        sel.dataset.searchBound = '1';
+        // Choices dispara "search" no select original a cada tecla
+        sel.addEventListener('search', (event) => {
+            const term = ((event.detail && event.detail.value) || '').trim();
+            clearTimeout(designFuncionarioSearchTimer);
+            if (term.length < DESIGN_FUNCIONARIO_MIN_CHARS) return;
+            designFuncionarioSearchTimer = setTimeout(() => {
+                searchDesignFuncionarios(term).catch(error => {
+                    console.error('Erro ao buscar funcionários:', error);
+                    setDesignFuncionarioStatus('Erro ao buscar funcionários. Tente novamente.', true);
+                });
+            }, 250);
+        });
+    }
+}
+
+async function searchDesignFuncionarios(term) {
+    const seq = ++designFuncionarioSearchSeq;
+    const params = new URLSearchParams({ q: term, limit: '20' });
+    const resp = await fetch(`/cadastro/api/funcionarios/busca/?${params.toString()}`);
+    const data = await resp.json();
+    if (!resp.ok) {
+        throw new Error(data.message || 'Erro ao buscar funcionários.');
+    }
+    // descarta respostas de buscas anteriores que chegaram fora de ordem
+    if (seq !== designFuncionarioSearchSeq || !designFuncionarioChoices) return;
+    const choices = (data.funcionarios || []).map(f => ({ value: String(f.id), label: `${f.matricula} - ${f.nome}` }));
+    designFuncionarioChoices.setChoices(choices, 'value', 'label', true);
+    setDesignFuncionarioStatus('', false);
+}
+
+async function loadDesignFuncionarios() {
+    // A lista completa não é mais baixada: as opções vêm da busca conforme o usuário digita.
+    renderDesignFuncionarios([]);
+    return [];
+}
+
+async function loadDesignInstrumentos() {
+    try {
+        const allItems = [];
+        let page = 1;
+        let pages = 1;
+        const perPage = 200;
+        while (page <= pages) {
+            const resp = await fetch(`/instrumentos/api/disponiveis/?page=${page}&per_page=${perPage}`);
+            const data = await resp.json();
+            const itens = data.instrumentos || [];
+            allItems.push(...itens);
+            pages = (data.pagination && data.pagination.pages) ? data.pagination.pages : 1;
+            page += 1;
+        }
+        const sel = document.getElementById('design_instrumento');
+        sel.innerHTML = '<option value="">Selecione instrumento...</option>';
+        allItems.forEach(i => {
+            const opt = document.createElement('option');
+            opt.value = i.id;
+            opt.textContent = `${i.codigo} - ${i.descricao} - ${i.tipo}`;
+            sel.appendChild(opt);
+        });
+        if (designInstrumentoChoices) {
+            designInstrumentoChoices.destroy();
+            designInstrumentoChoices = null;
+        }
+        if (window.Choices) {
+            designInstrumentoChoices = new Choices('#design_instrumento', {
+                searchEnabled: true,
+                shouldSort: false,
+                itemSelectText: '',
+                placeholder: true,
+                placeholderValue: 'Selecione instrumento...'
+            });
+        }
+    } catch (e) { console.error(e); }
+}
+
+function setSelectWithChoices(selectEl, value, label, choicesInstance) {
+    if (!selectEl || value === undefined || value === null) return;
+    const stringValue = String(value);
+    let optionExists = Array.from(selectEl.options || []).some(opt => opt.value === stringValue);
+    if (!optionExists && label) {
+        const opt = document.createElement('option');
+        opt.value = stringValue;
+        opt.textContent = label;
+        selectEl.appendChild(opt);
+        optionExists = true;
+    }
+    if (choicesInstance) {
+        const result = choicesInstance.setChoiceByValue(stringValue);
+        const missing = !result || (Array.isArray(result) && !result.length);
+        if (missing && label) {
+            choicesInstance.setChoices([{ value: stringValue, label: label, selected: true }], 'value', 'label', false);
+        }
+        choicesInstance.setChoiceByValue(stringValue);
+    } else if (optionExists) {
+        selectEl.value = stringValue;
+    }
+}
+
+function applyDesignationPrefill(prefill) {
+    if (!prefill) return;
+    const funcSelect = document.getElementById('design_funcionario');
+    const instSelect = document.getElementById('design_instrumento');
+    const funcLabel = prefill.funcionario_matricula
+        ? `${prefill.funcionario_matricula} - ${prefill.funcionario_nome || ''}`.trim()
+        : (prefill.funcionario_nome || '');
+    const instLabel = prefill.instrumento_codigo
+        ? `${prefill.instrumento_codigo} - ${prefill.instrumento_descricao || ''}`.trim()
+        : (prefill.instrumento_descricao || '');
+    if (prefill.funcionario_id) {
+        setSelectWithChoices(funcSelect, prefill.funcionario_id, funcLabel, designFuncionarioChoices);
+    }
+    if (prefill.instrumento_id) {
+        setSelectWithChoices(instSelect, prefill.instrumento_id, instLabel, designInstrumentoChoices);
+    }
+}
+
+function addDesignItem() {
+    const funcId = document.getElementById('design_funcionario').value;
+    const instId = document.getElementById('design_instrumento').value;
+    if (!funcId || !instId) { alert('Selecione funcionário e instrumento'); return; }
+    if (designItems.find(it => it.instrumento_id == instId)) { alert('Instrumento jÃ¡ adicionado'); return; }
+    const funcText = document.getElementById('design_funcionario').selectedOptions[0].text;
+    const instText = document.getElementById('design_instrumento').selectedOptions[0].text;
+    designItems.push({ funcionario_id: funcId, instrumento_id: instId, funcionario_label: funcText, instrumento_label: instText });
+    renderDesignTable();
+}
+
+function renderDesignTable() {
+    const tbody = document.getElementById('designTableBody');
+    if (!designItems.length) {
+        tbody.innerHTML = '<tr><td colspan="4" class="px-4 py-3 text-center text-gray-500">Nenhum item adicionado.</td></tr>';
+        return;
+    }
+    tbody.innerHTML = designItems.map((it, idx) => `
+        <tr class="hover:bg-gray-50">
+            <td class="px-4 py-2 text-sm">${it.funcionario_label}</td>
+            <td class="px-4 py-2 text-sm">${it.instrumento_label}</td>
+            <td class="px-4 py-2 text-sm">${it.observacoes || ''}</td>
+            <td class="px-4 py-2 text-right text-sm"><button onclick="removeDesignItem(${idx})" class="text-red-600">Remover</button></td>
+        </tr>
+    `).join('');
+}
+
+function removeDesignItem(index) {
+    designItems.splice(index, 1);
+    renderDesignTable();
+}
+
+function openSignatureModal() {
+    if (!designItems.length) { alert('Adicione ao menos um item para assinar'); return; }
+    document.getElementById('signatureModal').classList.remove('hidden');
+    setupSignatureCanvas();
+}
+
+function closeSignatureModal() {
+    document.getElementById('signatureModal').classList.add('hidden');
+}
+
+window.sigCanvas = window.sigCanvas || null;
+window.sigCtx = window.sigCtx || null;
+window.sigDrawing = window.sigDrawing || false;
+window.sigPointerId = window.sigPointerId || null;
+
+function getSignaturePoint(event) {
+    const rect = window.sigCanvas.getBoundingClientRect();
+    const scaleX = window.sigCanvas.width / rect.width;
+    const scaleY = window.sigCanvas.height / rect.height;
+    return {
+        x: (event.clientX - rect.left) * scaleX,
+        y: (event.clientY - rect.top) * scaleY
+    };
+}
+
+function setupSignatureCanvas() {
+    window.sigCanvas = document.getElementById('signatureCanvas');
+    window.sigCtx = window.sigCanvas.getContext('2d');
+    window.sigCanvas.width = window.sigCanvas.clientWidth;
+    window.sigCanvas.height = 200;
+    window.sigCtx.fillStyle = '#fff';
+    window.sigCtx.fillRect(0,0,window.sigCanvas.width,window.sigCanvas.height);
+    window.sigCtx.strokeStyle = '#000';
+    window.sigCtx.lineWidth = 2;
+    window.sigCtx.lineCap = 'round';
+    window.sigCtx.lineJoin = 'round';
+
+    window.sigCanvas.onpointerdown = (e) => {
+        e.preventDefault();
+        const point = getSignaturePoint(e);
+        window.sigDrawing = true;
+        window.sigPointerId = e.pointerId;
+        if (window.sigCanvas.setPointerCapture) {
+            window.sigCanvas.setPointerCapture(e.pointerId);
+        }
+        window.sigCtx.beginPath();
+        window.sigCtx.moveTo(point.x, point.y);
+    };
+    window.sigCanvas.onpointermove = (e) => {
+        if (!window.sigDrawing || (window.sigPointerId !== null && e.pointerId !== window.sigPointerId)) return;
+        e.preventDefault();
+        const point = getSignaturePoint(e);
+        window.sigCtx.lineTo(point.x, point.y);
+        window.sigCtx.stroke();
+    };
+    window.sigCanvas.onpointerup = (e) => {
+        if (window.sigPointerId !== null && e.pointerId !== window.sigPointerId) return;
+        window.sigDrawing = false;
+        window.sigPointerId = null;
+    };
+    window.sigCanvas.onpointercancel = () => {
+        window.sigDrawing = false;
+        window.sigPointerId = null;
+    };
+    window.sigCanvas.onpointerleave = () => {
+        window.sigDrawing = false;
+        window.sigPointerId = null;
+    };
+}
+
+function clearSignature() {
+    if (window.sigCtx) {
+        window.sigCtx.clearRect(0,0,window.sigCanvas.width,window.sigCanvas.height);
+        window.sigCtx.fillStyle = '#fff';
+        window.sigCtx.fillRect(0,0,window.sigCanvas.width,window.sigCanvas.height);
+    }
+}
+
+async function submitDesignWithSignature() {
+    const submitBtn = document.getElementById('btnConfirmSignature');
+    const originalText = submitBtn ? submitBtn.textContent : '';
+    if (submitBtn) {
+        submitBtn.disabled = true;
+        submitBtn.classList.add('opacity-70');
+        submitBtn.textContent = 'Enviando...';
+    }
+    const dataUrl = window.sigCanvas.toDataURL('image/png');
+    const promises = designItems.map(item => {
+        return fetch('/instrumentos/api/designar/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCSRF()
+            },
+            body: JSON.stringify({
+                funcionario_id: item.funcionario_id,
+                instrumento_id: item.instrumento_id,
+                observacoes: item.observacoes || '',
+                assinatura: dataUrl
+            })
+        }).then(r => r.json());
+    });
+
+    try {
+        const results = await Promise.all(promises);
+        const errors = results.filter(r => !r.success);
+        if (errors.length) {
+            alert('Algumas designaÃ§Ãµes falharam');
+        } else {
+            alert('DesignaÃ§Ãµes realizadas com sucesso');
+            designItems = [];
+            renderDesignTable();
+            closeSignatureModal();
+            closeDesignationModal();
+        }
+    } catch (e) {
+        alert('Erro ao enviar designaÃ§Ãµes');
+    } finally {
+        if (submitBtn) {
+            submitBtn.disabled = false;
+            submitBtn.classList.remove('opacity-70');
+            submitBtn.textContent = originalText || 'Confirmar e Assinar';
+        }
+    }
+}
+
+let entregasCache = [];
+const devolucaoFuncionarioSelect = document.getElementById('devolucao_funcionario');
+const devolucaoInstrumentoSelect = document.getElementById('devolucao_instrumento');
+const devolucaoModalEl = document.getElementById('devolucaoModal');
+const devolucaoOpenBtn = document.getElementById('btnOpenDevolucao');
+const devolucaoOpenBtnLabel = document.getElementById('btnOpenDevolucaoLabel');
+let devolucaoFuncionarioChoices = null;
+
+function setDevolucaoOpenButtonLoading(isLoading) {
+    if (!devolucaoOpenBtn) return;
+    devolucaoOpenBtn.disabled = isLoading;
+    if (devolucaoOpenBtnLabel) {
+        devolucaoOpenBtnLabel.textContent = isLoading ? 'Carregando...' : 'Devolução';
+    }
+}
+
+function rebuildDevolucaoFuncionarioChoices() {
+    if (!devolucaoFuncionarioSelect) return;
+    if (devolucaoFuncionarioChoices) {
+        devolucaoFuncionarioChoices.destroy();
+        devolucaoFuncionarioChoices = null;
+    }
+    if (window.Choices) {
+        devolucaoFuncionarioChoices = new Choices('#devolucao_funcionario', {
+            searchEnabled: true,
+            shouldSort: false,
+            itemSelectText: '',
+            placeholder: true,
+            placeholderValue: 'Selecione funcionário...'
+        });
+    }
+}
+
+function getEntregaFiltersFromForm() {
+    const searchInput = document.getElementById('entregasSearch');
+    const statusSelect = document.getElementById('entregasStatus');
+    return {
+        search: searchInput ? searchInput.value.trim() : '',
+        status: statusSelect ? statusSelect.value : 'all'
+    };
+}
+
+window.loadEntregas = async function(options = {}) {
+    const { pageOverride = null, updateFilters = false } = options;
+    if (updateFilters) {
+        entregasFilters = getEntregaFiltersFromForm();
+    }
+    if (typeof pageOverride === 'number' && !Number.isNaN(pageOverride)) {
+        entregasPagination.page = Math.max(1, pageOverride);
+    }
+
+    const params = new URLSearchParams();
+    params.append('page', entregasPagination.page);
+    params.append('per_page', ENTREGAS_PAGE_SIZE);
+    if (entregasFilters.search) params.append('search', entregasFilters.search);
+    if (entregasFilters.status && entregasFilters.status !== 'all') params.append('status', entregasFilters.status);
+
+    try {
+        showEntregasTableLoading();
+        const res = await fetch(`/instrumentos/api/entregas/?${params.toString()}`);
+        const data = await res.json();
+        entregasTableData = data.entregas || [];
+        entregasPagination = data.pagination || { page: 1, pages: 1, total: entregasTableData.length, per_page: ENTREGAS_PAGE_SIZE };
+        if (!entregasPagination.page) entregasPagination.page = 1;
+        renderEntregas(entregasTableData);
+        renderEntregasPagination();
+        if (devolucaoModalEl && !devolucaoModalEl.classList.contains('hidden')) {
+            refreshDevolucaoCache(true);
+            populateDevolucaoFuncionarios();
+            populateDevolucaoInstrumentos();
+        }
+    } catch (error) {
+        console.error('Erro ao carregar entregas:', error);
+        entregasTableData = [];
+        entregasPagination = { page: 1, pages: 1, total: 0 };
+        renderEntregas([]);
+        renderEntregasPagination();
+    }
+}
+
+function showEntregasTableLoading() {
+    const tbody = document.getElementById('entregasBody');
+    if (!tbody) return;
+    tbody.innerHTML = `
+        <tr>
+            <td colspan="6" class="px-6 py-8 text-center">
+                <div class="flex flex-col items-center gap-3 text-gray-500">
+                    <svg class="h-6 w-6 animate-spin text-indigo-600" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" aria-hidden="true">
+                        <circle class="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" stroke-width="4"></circle>
+                        <path class="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8v4a4 4 0 00-4 4H4z"></path>
+                    </svg>
+                    <span class="text-sm">Carregando entregas...</span>
+                </div>
+            </td>
+        </tr>`;
+}
+
+function renderEntregasPagination() {
+    const info = document.getElementById('entregasPaginationInfo');
+    if (info) {
+        const page = entregasPagination?.page || 1;
+        const pages = entregasPagination?.pages || 1;
+        const total = entregasPagination?.total || 0;
+        info.textContent = total ? `PÃ¡gina ${page} de ${pages} â€” ${total} entrega(s)` : 'Nenhuma entrega encontrada';
+    }
+    const prevBtn = document.getElementById('entregasPrevPage');
+    if (prevBtn) {
+        prevBtn.disabled = !(entregasPagination && entregasPagination.page > 1);
+    }
+    const nextBtn = document.getElementById('entregasNextPage');
+    if (nextBtn) {
+        nextBtn.disabled = !(entregasPagination && entregasPagination.page < entregasPagination.pages);
+    }
+}
+
+window.setupEntregasPaginationControls = function() {
+    const prevBtn = document.getElementById('entregasPrevPage');
+    if (prevBtn) {
+        prevBtn.addEventListener('click', () => {
+            if (entregasPagination && entregasPagination.page > 1) {
+                loadEntregas({ pageOverride: entregasPagination.page - 1 });
+            }
+        });
+    }
+    const nextBtn = document.getElementById('entregasNextPage');
+    if (nextBtn) {
+        nextBtn.addEventListener('click', () => {
+            if (entregasPagination && entregasPagination.page < entregasPagination.pages) {
+                loadEntregas({ pageOverride: entregasPagination.page + 1 });
+            }
+        });
+    }
+}
+
+window.refreshDevolucaoCache = async function(force = false) {
+    if (!force && entregasCache.length) return;
+    try {
+        const allItems = [];
+        let page = 1;
+        let pages = 1;
+        const perPage = 200;
+
+        while (page <= pages) {
+            const params = new URLSearchParams();
+            params.append('status', 'ativo');
+            params.append('page', page);
+            params.append('per_page', perPage);
+            const res = await fetch(`/instrumentos/api/entregas/?${params.toString()}`);
+            const data = await res.json();
+            allItems.push(...(data.entregas || []));
+            pages = data.pagination?.pages || 1;
+            page += 1;
+        }
+
+        entregasCache = allItems;
+    } catch (error) {
+        console.error('Erro ao carregar entregas ativas para devoluÃ§Ã£o:', error);
+        entregasCache = [];
+    }
+}
+
+async function ensureDevolucaoCache() {
+    if (!entregasCache.length) {
+        await refreshDevolucaoCache(true);
+    }
+}
+
+async function openDevolucaoModal() {
+    setDevolucaoOpenButtonLoading(true);
+    try {
+        await ensureDevolucaoCache();
+        populateDevolucaoFuncionarios();
+        populateDevolucaoInstrumentos();
+        const obsField = document.getElementById('devolucao_observacoes');
+        const dateField = document.getElementById('devolucao_data');
+        if (obsField) obsField.value = '';
+        if (dateField) dateField.value = '';
+        if (devolucaoModalEl) {
+            devolucaoModalEl.classList.remove('hidden');
+        }
+    } finally {
+        setDevolucaoOpenButtonLoading(false);
+    }
+}
+
+function closeDevolucaoModal() {
+	if (devolucaoModalEl) {
+		devolucaoModalEl.classList.add('hidden');
+	}
+}
+
+function populateDevolucaoFuncionarios() {
+    if (!devolucaoFuncionarioSelect) return;
+    const ativos = (entregasCache || []).filter(item => item.ativo && item.funcionario_id);
+    const unique = [];
+    const seen = new Set();
+    ativos.forEach(item => {
+        if (!seen.has(item.funcionario_id)) {
+            seen.add(item.funcionario_id);
+            unique.push({
+                id: item.funcionario_id,
+                nome: item.funcionario || 'Sem nome',
+                matricula: item.funcionario_matricula || ''
+            });
+        }
+    });
+    devolucaoFuncionarioSelect.innerHTML = '<option value="">Selecione funcionrio...</option>';
+    unique.forEach(func => {
+        const labelMat = func.matricula ? func.matricula : 'Sem matrÃ­cula';
+        devolucaoFuncionarioSelect.innerHTML += `<option value="${func.id}">${labelMat} - ${func.nome}</option>`;
+    });
+
+    rebuildDevolucaoFuncionarioChoices();
+    devolucaoFuncionarioSelect.disabled = !unique.length;
+    if (devolucaoFuncionarioChoices) {
+        if (devolucaoFuncionarioSelect.disabled) {
+            devolucaoFuncionarioChoices.disable();
+        } else {
+            devolucaoFuncionarioChoices.enable();
+        }
+    }
+
+    if (!unique.length) {
+        if (devolucaoInstrumentoSelect) {
+            devolucaoInstrumentoSelect.innerHTML = '<option value="">Nenhum instrumento ativo</option>';
+            devolucaoInstrumentoSelect.disabled = true;
+        }
+    }
+}
+
+function populateDevolucaoInstrumentos() {
+    if (!devolucaoInstrumentoSelect) return;
+    const funcId = devolucaoFuncionarioSelect ? devolucaoFuncionarioSelect.value : '';
+    devolucaoInstrumentoSelect.innerHTML = '<option value="">Selecione instrumento...</option>';
+    if (!funcId) {
+        devolucaoInstrumentoSelect.disabled = true;
+        return;
+    }
+    const ativos = (entregasCache || []).filter(item => item.ativo && String(item.funcionario_id) === funcId);
+    if (!ativos.length) {
+        devolucaoInstrumentoSelect.innerHTML = '<option value="">Nenhum instrumento ativo</option>';
+        devolucaoInstrumentoSelect.disabled = true;
+        return;
+    }
+    ativos.forEach(item => {
+        const label = `${item.instrumento_codigo || '-'} - ${item.instrumento_descricao || ''}`;
+        devolucaoInstrumentoSelect.innerHTML += `<option value="${item.instrumento_id}">${label}</option>`;
+    });
+    devolucaoInstrumentoSelect.disabled = false;
+}
+
+async function submitDevolucao() {
+    const submitBtn = document.getElementById('btnSubmitDevolucao');
+    const originalText = submitBtn ? submitBtn.textContent : '';
+    const funcId = devolucaoFuncionarioSelect ? devolucaoFuncionarioSelect.value : '';
+    const instId = devolucaoInstrumentoSelect ? devolucaoInstrumentoSelect.value : '';
+    if (!funcId) { alert('Selecione o funcionário responsável pela devolução.'); return; }
+    if (!instId) { alert('Selecione o instrumento que será devolvido.'); return; }
+    const dateField = document.getElementById('devolucao_data');
+    const obsField = document.getElementById('devolucao_observacoes');
+    const payload = {
+        funcionario_id: funcId,
+        instrumento_id: instId,
+        observacoes: obsField ? obsField.value.trim() : ''
+    };
+    if (dateField && dateField.value) {
+        const parsed = new Date(dateField.value);
+        if (!isNaN(parsed.getTime())) {
+            payload.data_devolucao = parsed.toISOString();
+        }
+    }
+
+    if (submitBtn) {
+        submitBtn.disabled = true;
+        submitBtn.classList.add('opacity-70');
+        submitBtn.textContent = 'Registrando...';
+    }
+
+    try {
+        const resp = await fetch('/instrumentos/api/devolver/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCSRF()
+            },
+            body: JSON.stringify(payload)
+        });
+        const result = await resp.json();
+        if (!resp.ok || !result.success) {
+            throw new Error(result.message || 'Falha ao registrar devoluÃ§Ã£o');
+        }
+        alert('DevoluÃ§Ã£o registrada com sucesso');
+        closeDevolucaoModal();
+        await refreshDevolucaoCache(true);
+        await loadEntregas({ pageOverride: entregasPagination.page });
+    } catch (error) {
+        console.error(error);
+        alert(error.message || 'Erro ao registrar devoluÃ§Ã£o');
+    } finally {
+        if (submitBtn) {
+            submitBtn.disabled = false;
+            submitBtn.classList.remove('opacity-70');
+            submitBtn.textContent = originalText || 'Confirmar devoluÃ§Ã£o';
+        }
+    }
+}
+
+function renderEntregas(list) {
+    const tbody = document.getElementById('entregasBody');
+    if (!list.length) {
+        tbody.innerHTML = '<tr><td colspan="7" class="px-4 py-3 text-center text-gray-500">Nenhuma entrega encontrada.</td></tr>';
+        return;
+    }
+    tbody.innerHTML = list.map(e => `
+        <tr>
+            <td class="px-4 py-2 text-sm">${e.funcionario || '-'}</td>
+            <td class="px-4 py-2 text-sm">${e.funcionario_matricula || '-'}</td>
+            <td class="px-4 py-2 text-sm">${(e.instrumento_codigo || '-') + ' - ' + (e.instrumento_descricao || '')}</td>
+            <td class="px-4 py-2 text-sm">${e.data_inicio ? new Date(e.data_inicio).toLocaleString() : '-'}</td>
+            <td class="px-4 py-2 text-sm">${e.data_fim ? new Date(e.data_fim).toLocaleString() : '-'}</td>
+            <td class="px-4 py-2 text-sm">${e.ativo ? 'Ativo' : 'Finalizado'}</td>
+            <td class="px-4 py-2 text-sm">${e.observacoes || '-'}</td>
+        </tr>
+    `).join('');
+}
+
+function renderEntregasCsvErrors(errors = []) {
+    const box = document.getElementById('entregasCsvErrors');
+    if (!box) return;
+    if (!errors.length) {
+        box.textContent = '';
+        box.classList.add('hidden');
+        return;
+    }
+    const preview = errors.slice(0, 5).map(err => `Linha ${err.line}: ${err.error}`).join(' | ');
+    const suffix = errors.length > 5 ? ' ...' : '';
+    box.textContent = `${errors.length} linha(s) com erro. ${preview}${suffix}`;
+    box.classList.remove('hidden');
+}
+
+window.handlePendingDesignationPrefill = async function() {
+    let stored = null;
+    try {
+        stored = sessionStorage.getItem(ENTREGA_PREFILL_STORAGE_KEY);
+    } catch (error) {
+        console.warn('NÃ£o foi possÃ­vel ler dados de re-entrega:', error);
+        return;
+    }
+    if (!stored) return;
+    try {
+        sessionStorage.removeItem(ENTREGA_PREFILL_STORAGE_KEY);
+    } catch (error) {
+        console.warn('NÃ£o foi possÃ­vel limpar dados de re-entrega:', error);
+    }
+    let data = null;
+    try {
+        data = JSON.parse(stored);
+    } catch (error) {
+        console.warn('Dados de re-entrega invÃ¡lidos:', error);
+        return;
+    }
+    await openDesignationModal(data);
+}
+
+async function uploadEntregasCsv() {
+    const input = document.getElementById('entregasCsvInput');
+    if (!input || !input.files.length) {
+        alert('Selecione um arquivo CSV para enviar.');
+        return;
+    }
+    const formData = new FormData();
+    formData.append('file', input.files[0]);
+
+    try {
+        const resp = await fetch('/instrumentos/api/import-entregas/', {
+            method: 'POST',
+            headers: { 'X-CSRFToken': getCSRF() },
+            body: formData,
+        });
+        const result = await resp.json();
+        renderEntregasCsvErrors(result.errors || []);
+        if (!resp.ok || !result.success) {
+            throw new Error(result.message || 'Erro ao importar entregas.');
+        }
+        alert(result.message || 'ImportaÃ§Ã£o concluÃ­da.');
+        await loadEntregas({ pageOverride: 1, updateFilters: true });
+        await refreshDevolucaoCache(true);
+    } catch (error) {
+        alert(error.message || 'Falha inesperada durante a importaÃ§Ã£o.');
+    } finally {
+        input.value = '';
+    }
+}
+
+const entregasSearchInput = document.getElementById('entregasSearch');
+if (entregasSearchInput) {
+    entregasSearchInput.addEventListener('input', () => {
+        if (entregasSearchTimeout) {
+            clearTimeout(entregasSearchTimeout);
+        }
+        entregasSearchTimeout = setTimeout(() => {
+            loadEntregas({ pageOverride: 1, updateFilters: true });
+        }, 300);
+    });
+}
+
+const entregasStatusSelect = document.getElementById('entregasStatus');
+if (entregasStatusSelect) {
+    entregasStatusSelect.addEventListener('change', () => {
+        loadEntregas({ pageOverride: 1, updateFilters: true });
+    });
+}
+
+const entregasRefreshBtn = document.getElementById('entregasRefresh');
+if (entregasRefreshBtn) {
+    entregasRefreshBtn.addEventListener('click', () => {
+        loadEntregas({ pageOverride: 1, updateFilters: true });
+    });
+}
+if (devolucaoFuncionarioSelect) {
+    devolucaoFuncionarioSelect.addEventListener('change', populateDevolucaoInstrumentos);
+}
+if (devolucaoInstrumentoSelect) {
+    devolucaoInstrumentoSelect.innerHTML = '<option value="">Selecione instrumento...</option>';
+    devolucaoInstrumentoSelect.disabled = true;
+}
+window.addEventListener('DOMContentLoaded', () => {
+    if (typeof window.setupEntregasPaginationControls === 'function') window.setupEntregasPaginationControls();
+    if (typeof window.loadEntregas === 'function') window.loadEntregas({ pageOverride: 1, updateFilters: true });
+    if (typeof window.refreshDevolucaoCache === 'function') window.refreshDevolucaoCache(true);
+    if (typeof window.handlePendingDesignationPrefill === 'function') window.handlePendingDesignationPrefill();
+});
@@ -0,0 +1,1706 @@
+var HOME_PAGE_SIZE = 15;
+var ENTREGA_PREFILL_STORAGE_KEY = window.ENTREGA_PREFILL_STORAGE_KEY || 'calibracao_entrega_prefill';
+var HOME_COLUMN_PREFS_STORAGE_KEY = 'calimag.home.columnVisibility';
+var HOME_TABLE_COLUMNS = [
+    { key: 'codigo', label: 'Código' },
+    { key: 'info_adic', label: 'Info. adic.' },
+    { key: 'tipo', label: 'Tipo' },
+    { key: 'controlado', label: 'Instrumento controlado' },
+    { key: 'funcionario', label: 'Funcionário' },
+    { key: 'setor', label: 'Setor' },
+    { key: 'ultima_atualizacao', label: 'Última atualização' },
+    { key: 'status_calibracao', label: 'Status da calibração' },
+    { key: 'pontos_analisados', label: 'Pontos analisados' },
+    { key: 'ultima_calibracao', label: 'Última calibração' },
+    { key: 'valido_ate', label: 'Válido até' },
+    { key: 'ultimo_certificado', label: 'Último certificado' },
+    { key: 'acoes', label: 'Ações' }
+];
+var homeColumnVisibility = {};
+var homeInfoAdicChoices = null;
+var homeTipoChoices = null;
+var homeSetorChoices = null;
+window.ENTREGA_PREFILL_STORAGE_KEY = ENTREGA_PREFILL_STORAGE_KEY;
+function loadHomeColumnVisibility() {
+    const defaults = Object.fromEntries(HOME_TABLE_COLUMNS.map(col => [col.key, true]));
+    try {
+        const raw = localStorage.getItem(HOME_COLUMN_PREFS_STORAGE_KEY);
+        if (!raw) return defaults;
+        const parsed = JSON.parse(raw);
+        HOME_TABLE_COLUMNS.forEach(col => {
+            if (typeof parsed[col.key] !== 'boolean') {
+                parsed[col.key] = true;
+            }
+        });
+        return parsed;
+    } catch (error) {
+        console.error('Erro ao carregar preferências de colunas:', error);
+        return defaults;
+    }
+}
+
+function saveHomeColumnVisibility() {
+    localStorage.setItem(HOME_COLUMN_PREFS_STORAGE_KEY, JSON.stringify(homeColumnVisibility));
+}
+
+function getHomeVisibleColumnCount() {
+    const count = HOME_TABLE_COLUMNS.filter(col => homeColumnVisibility[col.key] !== false).length;
+    return Math.max(1, count);
+}
+
+function isHomeColumnVisible(columnKey) {
+    return homeColumnVisibility[columnKey] !== false;
+}
+
+function applyHomeColumnVisibility() {
+    document.querySelectorAll('[data-col]').forEach(node => {
+        const key = node.dataset.col;
+        node.classList.toggle('hidden', !isHomeColumnVisible(key));
+    });
+
+    document.querySelectorAll('[data-home-detail-colspan]').forEach(node => {
+        node.colSpan = getHomeVisibleColumnCount();
+    });
+}
+
+function renderHomeColumnVisibilityOptions() {
+    const container = document.getElementById('homeColumnVisibilityOptions');
+    if (!container) return;
+
+    container.innerHTML = HOME_TABLE_COLUMNS.map(col => `
+        <label class="flex items-center gap-2">
+            <input type="checkbox" class="rounded border-gray-300 text-indigo-600 focus:ring-indigo-500" data-column-toggle="${col.key}" ${isHomeColumnVisible(col.key) ? 'checked' : ''} />
+            <span>${col.label}</span>
+        </label>
+    `).join('');
+
+    container.querySelectorAll('[data-column-toggle]').forEach(input => {
+        input.addEventListener('change', (event) => {
+            const key = event.target.dataset.columnToggle;
+            const checked = event.target.checked;
+            const visibleCount = HOME_TABLE_COLUMNS.filter(col => col.key !== key && isHomeColumnVisible(col.key)).length;
+
+            if (!checked && visibleCount === 0) {
+                event.target.checked = true;
+                return;
+            }
+
+            homeColumnVisibility[key] = checked;
+            saveHomeColumnVisibility();
+            applyHomeColumnVisibility();
+        });
+    });
+}
+
+function setupHomeColumnVisibilityControl() {
+    const trigger = document.getElementById('homeColumnVisibilityBtn');
+    const menu = document.getElementById('homeColumnVisibilityMenu');
+    if (!trigger || !menu || trigger.dataset.bound === '1') return;
+
+    trigger.dataset.bound = '1';
+    renderHomeColumnVisibilityOptions();
+    applyHomeColumnVisibility();
+
+    trigger.addEventListener('click', (event) => {
+        event.stopPropagation();
+        menu.classList.toggle('hidden');
+    });
+
+    menu.addEventListener('click', (event) => {
+        event.stopPropagation();
+    });
+
+    document.addEventListener('click', () => {
+        menu.classList.add('hidden');
+    });
+}
+
+// Dados de referência + indicadores carregados em uma única requisição na abertura da página
+var homeBootstrap = null;
+
+async function loadHomeBootstrap() {
+    try {
+        const params = new URLSearchParams();
+        if (HOME_PMC_SCOPE) params.append('pmc_categoria', HOME_PMC_SCOPE);
+        const resp = await fetch(`/instrumentos/api/bootstrap/?${params.toString()}`);
+        if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+        homeBootstrap = await resp.json();
+    } catch (error) {
+        // sem bootstrap cada bloco volta a buscar a sua própria API
+        console.error('Erro ao carregar dados iniciais:', error);
+        homeBootstrap = null;
+    }
+}
+
+async function homeReferenceData(key, url) {
+    if (homeBootstrap && Array.isArray(homeBootstrap[key])) return homeBootstrap[key];
+    const resp = await fetch(url);
+    const data = await resp.json();
+    return data[key] || [];
+}
+
+async function loadIndicadoresDashboard() {
+    const pontosEl = document.getElementById('indicadorPontosPendentes');
+    const operacaoEl = document.getElementById('indicadorOperacao');
+    const calibracaoEl = document.getElementById('indicadorCalibracao');
+    const atrasoEl = document.getElementById('indicadorAtraso');
+    if (!pontosEl || !operacaoEl || !calibracaoEl || !atrasoEl) return;
+    try {
+        let data = homeBootstrap && homeBootstrap.indicadores;
+        if (!data) {
+            const params = new URLSearchParams();
+            if (HOME_PMC_SCOPE) params.append('pmc_categoria', HOME_PMC_SCOPE);
+            const resp = await fetch(`/instrumentos/api/indicadores/?${params.toString()}`);
+            data = await resp.json();
+        }
+        const formatNumber = (value) => {
+            if (typeof value !== 'number') return '--';
+            return value.toLocaleString('pt-BR');
+        };
+        pontosEl.textContent = formatNumber(data.pontos_pendentes);
+        operacaoEl.textContent = formatNumber(data.instrumentos_operacao);
+        calibracaoEl.textContent = formatNumber(data.instrumentos_calibracao);
+        atrasoEl.textContent = formatNumber(data.instrumentos_atraso);
+    } catch (error) {
+        console.error('Erro ao carregar indicadores:', error);
+        pontosEl.textContent = '—';
+        operacaoEl.textContent = '—';
+        calibracaoEl.textContent = '—';
+        atrasoEl.textContent = '—';
+    }
+}
+
+var isSentToLaboratorio = (status) => status && (status.startsWith('Enviado ao laboratório') || status.startsWith('Enviado ao laboratório'));
+var currentFilters = {};
+var homeCurrentPage = 1;
+var homePagination = { page: 1, pages: 1, total: 0 };
+
+function emphasizeStatusPrefix(text) {
+    if (!text) return '-';
+    const trimmed = text.trim();
+    if (!trimmed || trimmed === '-') return '-';
+    const match = trimmed.match(/^([A-Za-zÀ-ÖØ-öø-ÿ]+)/);
+    if (!match) return trimmed;
+    const prefix = match[1];
+    const remainder = trimmed.slice(prefix.length);
+    return `<span class="font-semibold text-indigo-600">${prefix}</span>${remainder}`;
+}
+
+function buildInstrumentRow(inst) {
+    const isSent = inst.status_obj && isSentToLaboratorio(inst.status_obj.tipo_status) && !inst.status_obj.data_devolucao;
+    const isReceivable = inst.status_obj && isSentToLaboratorio(inst.status_obj.tipo_status) && !inst.status_obj.data_recebimento;
+    const isAnalyzable = inst.status_obj && ((inst.status_obj.tipo_status && inst.status_obj.tipo_status.startsWith('Recebido')) || Boolean(inst.status_obj.data_recebimento));
+    const hasActiveFuncionario = Boolean(
+        inst.status_obj &&
+        inst.status_obj.funcionario &&
+        !inst.status_obj.data_devolucao &&
+        inst.status_obj.tipo_status &&
+        inst.status_obj.tipo_status.startsWith('Entregue ao funcionário')
+    );
+    const jaFoiEnviado = Boolean(inst.has_status_pontos || inst.data_ultimo_envio);
+    const primeiroEnvio = !jaFoiEnviado;
+    const semPendencias = inst.pontos_ultima_calibracao_analisados === true;
+    const podeMostrarEnviar =
+        !isSent &&
+        (
+            primeiroEnvio ||
+            (jaFoiEnviado && semPendencias)
+        );
+    const enviarDisabled = !podeMostrarEnviar;
+
+    const today = new Date();
+    today.setHours(0, 0, 0, 0);
+    const statusKey = inst.calibration_status || null;
+    let statusBadge = { text: 'Sem análise', cls: 'bg-gray-100 text-gray-700' };
+    if (statusKey === 'em_dia') {
+        statusBadge = { text: 'Em dia', cls: 'bg-emerald-100 text-emerald-800' };
+    } else if (statusKey === 'a_calibrar') {
+        statusBadge = { text: 'A calibrar', cls: 'bg-amber-100 text-amber-800' };
+    } else if (statusKey === 'atrasado') {
+        statusBadge = { text: 'Atrasado', cls: 'bg-red-100 text-red-800' };
+    } else if (statusKey === 'sem_analise') {
+        statusBadge = { text: 'Sem análise', cls: 'bg-gray-100 text-gray-700' };
+    } else if (inst.valid_until) {
+        const validDate = new Date(inst.valid_until);
+        if (!Number.isNaN(validDate.getTime())) {
+            const compareDate = new Date(validDate.getFullYear(), validDate.getMonth(), validDate.getDate());
+            const diffDays = Math.ceil((compareDate - today) / (1000 * 60 * 60 * 24));
+            if (diffDays >= 0 && diffDays <= 15) {
+                statusBadge = { text: 'A calibrar', cls: 'bg-amber-100 text-amber-800' };
+            } else if (diffDays > 15) {
+                statusBadge = { text: 'Em dia', cls: 'bg-emerald-100 text-emerald-800' };
+            } else {
+                statusBadge = { text: 'Atrasado', cls: 'bg-red-100 text-red-800' };
+            }
+        }
+    }
+
+    const hasPendingPoints = inst.pontos_ultima_calibracao_analisados === false;
+    const pontosBadge = hasPendingPoints
+        ? { text: 'Pendentes', cls: 'bg-amber-100 text-amber-800' }
+        : { text: 'OK', cls: 'bg-gray-100 text-gray-700' };
+    const controlBadge = inst.instrumento_controlado
+        ? { text: 'Sim', cls: 'bg-indigo-100 text-indigo-800' }
+        : { text: 'Não', cls: 'bg-gray-100 text-gray-700' };
+
+    const rawUpdateText = hasActiveFuncionario
+        ? `Entregue para: ${inst.status_obj.funcionario}`
+        : (inst.status || '-');
+    const formattedUpdateText = emphasizeStatusPrefix(rawUpdateText);
+    const funcionarioSetor = hasActiveFuncionario ? (inst.status_obj.funcionario_setor || '-') : '-';
+
+    return `
+        <tr class="hover:bg-gray-50" id="inst-row-${inst.id}">
+            <td data-col="codigo" class="px-6 py-4">${inst.codigo}</td>
+            <td data-col="info_adic" class="px-6 py-4">${inst.descricao || '-'}</td>
+            <td data-col="tipo" class="px-6 py-4">${inst.tipo || '-'}</td>
+            <td data-col="controlado" class="px-6 py-4">
+                <span class="px-2 py-1 text-xs font-semibold rounded-full ${controlBadge.cls}">${controlBadge.text}</span>
+            </td>
+            <td data-col="funcionario" class="px-6 py-4">${hasActiveFuncionario ? inst.status_obj.funcionario : '-'}</td>
+            <td data-col="setor" class="px-6 py-4">${funcionarioSetor}</td>
+            <td data-col="ultima_atualizacao" class="px-6 py-4">
+                ${formattedUpdateText}
+            </td>
+            <td data-col="status_calibracao" class="px-6 py-4">
+                <span class="px-2 py-1 text-xs font-semibold rounded-full ${statusBadge.cls}">${statusBadge.text}</span>
+            </td>
+            <td data-col="pontos_analisados" class="px-6 py-4">
+                <span class="px-2 py-1 text-xs font-semibold rounded-full ${pontosBadge.cls}">${pontosBadge.text}</span>
+            </td>
+            <td data-col="ultima_calibracao" class="px-6 py-4">${inst.ultima_calibracao ? new Date(inst.ultima_calibracao).toLocaleDateString() : '-'}</td>
+            <td data-col="valido_ate" class="px-6 py-4">${inst.valid_until ? new Date(inst.valid_until).toLocaleDateString() : '-'}</td>
+            <td data-col="ultimo_certificado" class="px-6 py-4">
+                ${inst.ultimo_certificado
+                    ? `<a class="text-indigo-600 hover:text-indigo-800 underline" href="${inst.ultimo_certificado}" target="_blank" rel="noopener noreferrer">Abrir certificado</a>`
+                    : '-'}
+            </td>
+            <td data-col="acoes" class="px-6 py-4 text-right">
+                <div class="inline-flex items-center gap-2">
+                    <button onclick="togglePontos(${inst.id})" class="inline-flex items-center justify-center rounded-md border border-gray-300 shadow-sm px-2 py-1 bg-white text-sm text-blue-600 hover:bg-gray-50">
+                        Faixas de calibração
+                    </button>
+                    <div class="relative inline-block text-left">
+                        <button type="button" class="inline-flex items-center justify-center rounded-md border border-gray-300 shadow-sm px-2 py-1 bg-white text-sm text-gray-700 hover:bg-gray-50" aria-expanded="false" aria-haspopup="true" data-menu-toggle="${inst.id}" aria-label="Abrir menu">
+                            <svg class="h-5 w-5" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor" aria-hidden="true">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 6h16M4 12h16M4 18h16" />
+                            </svg>
+                        </button>
+
+                        <div id="menu-${inst.id}" class="w-56 rounded-md shadow-lg bg-white ring-1 ring-black ring-opacity-5 hidden z-50" data-floating-menu>
+                            <div class="py-1" role="menu" aria-orientation="vertical" aria-labelledby="options-menu">
+                                <button
+                                    ${enviarDisabled ? 'disabled aria-disabled="true"' : ''}
+                                    class="w-full text-left px-4 py-2 text-sm ${
+                                        enviarDisabled
+                                            ? 'text-gray-400 cursor-not-allowed'
+                                            : 'text-gray-700 hover:bg-gray-100'
+                                    }"
+                                    data-action="enviar">Enviar p/ calibração
+                                </button>
+                                <button ${isReceivable ? '' : 'disabled'} class="${isReceivable ? 'w-full text-left px-4 py-2 text-sm text-gray-700 hover:bg-gray-100' : 'w-full text-left px-4 py-2 text-sm text-gray-400 cursor-not-allowed'}" data-action="receber">Receber da calibração</button>
+                                <button class="w-full text-left px-4 py-2 text-sm text-gray-700 hover:bg-gray-100" data-action="historico">Ver histórico</button>
+                            </div>
+                        </div>
+                    </div>
+                </div>
+            </td>
+        </tr>
+        <tr id="inst-pontos-${inst.id}" class="hidden">
+            <td colspan="${getHomeVisibleColumnCount()}" data-home-detail-colspan="1" class="px-6 py-4 bg-gray-50" id="inst-pontos-container-${inst.id}" data-analyzable="${isAnalyzable ? '1' : '0'}" data-last-envio="${inst.data_ultimo_envio || ''}"></td>
+        </tr>
+    `;
+}
+
+function showHomeTableLoading() {
+    const tbody = document.getElementById('homeInstrumentosTable');
+    if (!tbody) return;
+    tbody.innerHTML = `
+        <tr>
+            <td colspan="${getHomeVisibleColumnCount()}" data-home-detail-colspan="1" class="px-6 py-8 text-center">
+                <div class="flex flex-col items-center gap-3 text-gray-500">
+                    <svg class="h-6 w-6 animate-spin text-indigo-600" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" aria-hidden="true">
+                        <circle class="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" stroke-width="4"></circle>
+                        <path class="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8v4a4 4 0 00-4 4H4z"></path>
+                    </svg>
+                    <span class="text-sm">Aplicando filtros...</span>
+                </div>
+            </td>
+        </tr>`;
+}
+
+function formatHomeDate(value) {
+    if (!value) return '-';
+    const parsed = new Date(value);
+    if (Number.isNaN(parsed.getTime())) return '-';
+    return parsed.toLocaleDateString('pt-BR');
+}
+
+function getHomeCalibrationStatusLabel(inst) {
+    const today = new Date();
+    today.setHours(0, 0, 0, 0);
+    const statusKey = inst.calibration_status || null;
+    if (statusKey === 'em_dia') return 'Em dia';
+    if (statusKey === 'a_calibrar') return 'A calibrar';
+    if (statusKey === 'atrasado') return 'Atrasado';
+    if (statusKey === 'sem_analise') return 'Sem análise';
+    if (!inst.valid_until) return 'Sem análise';
+
+    const validDate = new Date(inst.valid_until);
+    if (Number.isNaN(validDate.getTime())) return 'Sem análise';
+    const compareDate = new Date(validDate.getFullYear(), validDate.getMonth(), validDate.getDate());
+    const diffDays = Math.ceil((compareDate - today) / (1000 * 60 * 60 * 24));
+    if (diffDays >= 0 && diffDays <= 15) return 'A calibrar';
+    if (diffDays > 15) return 'Em dia';
+    return 'Atrasado';
+}
+
+function getHomeLastUpdateText(inst) {
+    const hasActiveFuncionario = Boolean(
+        inst.status_obj &&
+        inst.status_obj.funcionario &&
+        !inst.status_obj.data_devolucao &&
+        inst.status_obj.tipo_status &&
+        inst.status_obj.tipo_status.startsWith('Entregue ao funcionário')
+    );
+    return hasActiveFuncionario
+        ? `Entregue para: ${inst.status_obj.funcionario}`
+        : (inst.status || '-');
+}
+
+function buildHomeCsvRows(instrumentos) {
+    const header = [
+        'Código',
+        'Info. adic.',
+        'Tipo',
+        'Instrumento controlado',
+        'Funcionário',
+        'Setor',
+        'Última atualização',
+        'Status da calibração',
+        'Pontos analisados',
+        'Última calibração',
+        'Válido até',
+        'Último certificado'
+    ];
+
+    const rows = instrumentos.map(inst => {
+        const hasActiveFuncionario = Boolean(
+            inst.status_obj &&
+            inst.status_obj.funcionario &&
+            !inst.status_obj.data_devolucao &&
+            inst.status_obj.tipo_status &&
+            inst.status_obj.tipo_status.startsWith('Entregue ao funcionário')
+        );
+        return [
+            inst.codigo || '',
+            inst.descricao || '-',
+            inst.tipo || '-',
+            inst.instrumento_controlado ? 'Sim' : 'Não',
+            hasActiveFuncionario ? (inst.status_obj.funcionario || '-') : '-',
+            hasActiveFuncionario ? (inst.status_obj.funcionario_setor || '-') : '-',
+            getHomeLastUpdateText(inst),
+            getHomeCalibrationStatusLabel(inst),
+            inst.pontos_ultima_calibracao_analisados === false ? 'Pendentes' : 'OK',
+            formatHomeDate(inst.ultima_calibracao),
+            formatHomeDate(inst.valid_until),
+            inst.ultimo_certificado || '-'
+        ];
+    });
+
+    return [header, ...rows];
+}
+
+function convertRowsToCsv(rows) {
+    return rows
+        .map(row => row.map(value => {
+            const normalized = String(value ?? '').replace(/\r?\n|\r/g, ' ').trim();
+            return `"${normalized.replace(/"/g, '""')}"`;
+        }).join(';'))
+        .join('\r\n');
+}
+
+// Somente os campos usados por buildHomeCsvRows (a API calcula só as anotações necessárias).
+const HOME_EXPORT_FIELDS = [
+    'codigo', 'descricao', 'tipo', 'instrumento_controlado', 'status', 'status_obj', 'calibration_status',
+    'pontos_ultima_calibracao_analisados', 'ultima_calibracao', 'valid_until', 'ultimo_certificado'
+].join(',');
+
+async function fetchAllHomeInstrumentosForExport() {
+    const exportPageSize = 200;
+    let page = 1;
+    let pages = 1;
+    const items = [];
+
+    while (page <= pages) {
+        const params = new URLSearchParams();
+        params.append('page', page);
+        params.append('per_page', exportPageSize);
+        params.append('fields', HOME_EXPORT_FIELDS);
+        if (HOME_PMC_SCOPE) params.append('pmc_categoria', HOME_PMC_SCOPE);
+        Object.entries(currentFilters).forEach(([key, value]) => {
+            if (value !== undefined && value !== null && value !== '') {
+                params.append(key, value);
+            }
+        });
+
+        const resp = await fetch(`/instrumentos/api/status/?${params.toString()}`);
+        if (!resp.ok) {
+            throw new Error(`Falha ao carregar página ${page} para exportação.`);
+        }
+
+        const data = await resp.json();
+        items.push(...(data.instrumentos || []));
+        pages = data.pagination?.pages || 1;
+        page += 1;
+    }
+
+    return items;
+}
+
+function downloadHomeCsvFile(content) {
+    const blob = new Blob(['\ufeff', content], { type: 'text/csv;charset=utf-8;' });
+    const url = URL.createObjectURL(blob);
+    const link = document.createElement('a');
+    const dateStamp = new Date().toISOString().slice(0, 10);
+    link.href = url;
+    link.download = `pmc-instrumentos-${dateStamp}.csv`;
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+    URL.revokeObjectURL(url);
+}
+
+function setupHomeExportButton() {
+    const exportBtn = document.getElementById('exportHomeCsvBtn');
+    if (!exportBtn || exportBtn.dataset.bound === '1') return;
+
+    exportBtn.dataset.bound = '1';
+    exportBtn.addEventListener('click', async () => {
+        exportBtn.disabled = true;
+        const originalTitle = exportBtn.title;
+        exportBtn.title = 'Exportando...';
+
+        try {
+            const instrumentos = await fetchAllHomeInstrumentosForExport();
+            const rows = buildHomeCsvRows(instrumentos);
+            const csv = convertRowsToCsv(rows);
+            downloadHomeCsvFile(csv);
+        } catch (error) {
+            console.error('Erro ao exportar CSV:', error);
+            alert('Não foi possível exportar o CSV da tabela atual.');
+        } finally {
+            exportBtn.disabled = false;
+            exportBtn.title = originalTitle;
+        }
+    });
+}
+
+async function loadHomeInstrumentos(passedFilters, pageOverride) {
+    try {
+        const filters = passedFilters ? { ...passedFilters } : { ...currentFilters };
+        currentFilters = { ...filters };
+        if (typeof pageOverride === 'number' && !Number.isNaN(pageOverride)) {
+            homeCurrentPage = Math.max(1, pageOverride);
+        }
+        const params = new URLSearchParams();
+        params.append('page', homeCurrentPage);
+        params.append('per_page', HOME_PAGE_SIZE);
+        if (HOME_PMC_SCOPE) params.append('pmc_categoria', HOME_PMC_SCOPE);
+        let hasActiveFilters = false;
+        Object.entries(filters).forEach(([key, value]) => {
+            if (value !== undefined && value !== null && value !== '') {
+                params.append(key, value);
+                hasActiveFilters = true;
+            }
+        });
+        const resp = await fetch(`/instrumentos/api/status/?${params.toString()}`);
+        const data = await resp.json();
+        const tbody = document.getElementById('homeInstrumentosTable');
+        if (!tbody) return;
+        homePagination = data.pagination || { page: homeCurrentPage, pages: 1, total: (data.instrumentos || []).length };
+        homeCurrentPage = homePagination.page || homeCurrentPage;
+        const instrumentos = data.instrumentos || [];
+        homeSync.seq = data.sync_seq ?? null;
+        homeSync.instrumentos = instrumentos;
+        if (!instrumentos.length) {
+            const emptyMessage = hasActiveFilters
+                ? 'Nenhum instrumento encontrado para os filtros selecionados.'
+                : 'Nenhum instrumento cadastrado.';
+            tbody.innerHTML = `<tr><td colspan="${getHomeVisibleColumnCount()}" data-home-detail-colspan="1" class="px-6 py-4 text-center text-gray-500">${emptyMessage}</td></tr>`;
+            renderHomePagination();
+            applyHomeColumnVisibility();
+            return;
+        }
+        tbody.innerHTML = instrumentos.map(buildInstrumentRow).join('');
+        applyHomeColumnVisibility();
+        renderHomePagination();
+        prefetchHomePontos(instrumentos.map(inst => inst.id));
+    } catch (e) {
+        console.error(e);
+    }
+}
+
+function renderHomePagination() {
+    const info = document.getElementById('homePaginationInfo');
+    if (info) {
+        const page = homePagination?.page || 1;
+        const pages = homePagination?.pages || 1;
+        const total = homePagination?.total || 0;
+        info.textContent = total
+            ? `Página ${page} de ${pages} — ${total} instrumento(s)`
+            : 'Nenhum instrumento encontrado';
+    }
+    const prevBtn = document.getElementById('homePrevPage');
+    if (prevBtn) {
+        prevBtn.disabled = !(homePagination && homePagination.page > 1);
+    }
+    const nextBtn = document.getElementById('homeNextPage');
+    if (nextBtn) {
+        nextBtn.disabled = !(homePagination && homePagination.page < homePagination.pages);
+    }
+}
+
+function setupHomePaginationControls() {
+    const prevBtn = document.getElementById('homePrevPage');
+    if (prevBtn) {
+        prevBtn.addEventListener('click', () => {
+            if (homePagination && homePagination.page > 1) {
+                showHomeTableLoading();
+                loadHomeInstrumentos(undefined, homePagination.page - 1);
+            }
+        });
+    }
+    const nextBtn = document.getElementById('homeNextPage');
+    if (nextBtn) {
+        nextBtn.addEventListener('click', () => {
+            if (homePagination && homePagination.page < homePagination.pages) {
+                showHomeTableLoading();
+                loadHomeInstrumentos(undefined, homePagination.page + 1);
+            }
+        });
+    }
+}
+
+async function populateTipoFilter() {
+    const select = document.getElementById('filterTipo');
+    if (!select) return;
+    try {
+        const tipos = await homeReferenceData('tipos', '/cadastro/api/tipos_instrumento/');
+        const selectedValue = currentFilters.tipo_id || select.value || '';
+        select.innerHTML = '<option value="">Todos os tipos</option>';
+        tipos.forEach(tipo => {
+            const opt = document.createElement('option');
+            opt.value = tipo.id;
+            opt.textContent = tipo.descricao;
+            select.appendChild(opt);
+        });
+        select.value = selectedValue;
+
+        if (homeTipoChoices && typeof homeTipoChoices.destroy === 'function') {
+            homeTipoChoices.destroy();
+        }
+
+        if (typeof Choices !== 'undefined') {
+            homeTipoChoices = new Choices(select, {
+                ...DEFAULT_CHOICES_OPTIONS,
+                placeholder: true,
+                placeholderValue: 'Todos os tipos',
+                searchPlaceholderValue: 'Digite para buscar tipo',
+                itemSelectText: '',
+                allowHTML: false,
+            });
+            if (selectedValue) {
+                homeTipoChoices.setChoiceByValue(selectedValue);
+            }
+        }
+    } catch (error) {
+        console.error('Erro ao carregar tipos de instrumento:', error);
+    }
+}
+
+async function populateInfoAdicFilter() {
+    const select = document.getElementById('filterInfoAdic');
+    if (!select) return;
+
+    try {
+        const params = new URLSearchParams();
+        if (HOME_PMC_SCOPE) params.append('pmc_categoria', HOME_PMC_SCOPE);
+        const descricoes = await homeReferenceData('descricoes', `/instrumentos/api/descricoes/?${params.toString()}`);
+        const selectedValue = currentFilters.info_adic || select.value || '';
+
+        select.innerHTML = '<option value="">Todas as descrições</option>';
+        descricoes.forEach(descricao => {
+            const opt = document.createElement('option');
+            opt.value = descricao;
+            opt.textContent = descricao;
+            select.appendChild(opt);
+        });
+        select.value = selectedValue;
+
+        if (homeInfoAdicChoices && typeof homeInfoAdicChoices.destroy === 'function') {
+            homeInfoAdicChoices.destroy();
+        }
+
+        if (typeof Choices !== 'undefined') {
+            homeInfoAdicChoices = new Choices(select, {
+                ...DEFAULT_CHOICES_OPTIONS,
+                placeholder: true,
+                placeholderValue: 'Todas as descrições',
+                searchPlaceholderValue: 'Digite para buscar descrição',
+                itemSelectText: '',
+                allowHTML: false,
+            });
+            if (selectedValue) {
+                homeInfoAdicChoices.setChoiceByValue(selectedValue);
+            }
+        }
+    } catch (error) {
+        console.error('Erro ao carregar descrições:', error);
+    }
+}
+
+async function populateSetorFilter() {
+    const select = document.getElementById('filterSetor');
+    if (!select) return;
+
+    try {
+        const setores = await homeReferenceData('setores', '/cadastro/api/setores/');
+        const selectedValue = currentFilters.setor || select.value || '';
+
+        select.innerHTML = '<option value="">Todos os setores</option>';
+        setores.forEach(setor => {
+            const opt = document.createElement('option');
+            opt.value = setor.nome;
+            opt.textContent = setor.nome;
+            select.appendChild(opt);
+        });
+        select.value = selectedValue;
+
+        if (homeSetorChoices && typeof homeSetorChoices.destroy === 'function') {
+            homeSetorChoices.destroy();
+        }
+
+        if (typeof Choices !== 'undefined') {
+            homeSetorChoices = new Choices(select, {
+                ...DEFAULT_CHOICES_OPTIONS,
+                placeholder: true,
+                placeholderValue: 'Todos os setores',
+                searchPlaceholderValue: 'Digite para buscar setor',
+                itemSelectText: '',
+                allowHTML: false,
+            });
+            if (selectedValue) {
+                homeSetorChoices.setChoiceByValue(selectedValue);
+            }
+        }
+    } catch (error) {
+        console.error('Erro ao carregar setores:', error);
+    }
+}
+
+function getFiltersFromForm() {
+    const filters = {};
+    const search = document.getElementById('filterSearch');
+    const infoAdic = document.getElementById('filterInfoAdic');
+    const situacao = document.getElementById('filterSituacao');
+    const statusCal = document.getElementById('filterStatusCalibracao');
+    const tipo = document.getElementById('filterTipo');
+    const controlado = document.getElementById('filterInstrumentoControlado');
+    const funcionario = document.getElementById('filterFuncionario');
+    const setor = document.getElementById('filterSetor');
+    const validadeInicio = document.getElementById('filterValidadeInicio');
+    const validadeFim = document.getElementById('filterValidadeFim');
+    const pontosPendentes = document.getElementById('filterPontosPendentes');
+
+    if (search && search.value.trim()) filters.search = search.value.trim();
+    if (infoAdic && infoAdic.value) filters.info_adic = infoAdic.value;
+    if (situacao && situacao.value) filters.situacao = situacao.value;
+    if (statusCal && statusCal.value) filters.status_calibracao = statusCal.value;
+    if (tipo && tipo.value) filters.tipo_id = tipo.value;
+    if (controlado && controlado.value !== '') filters.instrumento_controlado = controlado.value;
+    if (validadeInicio && validadeInicio.value) filters.validade_inicio = validadeInicio.value;
+    if (validadeFim && validadeFim.value) filters.validade_fim = validadeFim.value;
+    if (funcionario && funcionario.value.trim()) filters.funcionario = funcionario.value.trim();
+    if (setor && setor.value.trim()) filters.setor = setor.value.trim();
+    if (pontosPendentes && pontosPendentes.checked) filters.pendencias_pontos = '1';
+
+    return filters;
+}
+
+function attachFilterHandlers() {
+    const form = document.getElementById('instrumentoFilters');
+    if (form) {
+        form.addEventListener('submit', (event) => {
+            event.preventDefault();
+            currentFilters = getFiltersFromForm();
+            homeCurrentPage = 1;
+            loadHomeInstrumentos();
+        });
+    }
+
+    const applyBtn = document.getElementById('applyFiltersBtn');
+    if (applyBtn) {
+        applyBtn.addEventListener('click', (event) => {
+            event.preventDefault();
+            currentFilters = getFiltersFromForm();
+            homeCurrentPage = 1;
+            showHomeTableLoading();
+            loadHomeInstrumentos();
+        });
+    }
+
+    const clearBtn = document.getElementById('clearFiltersBtn');
+    if (clearBtn) {
+        clearBtn.addEventListener('click', (event) => {
+            event.preventDefault();
+            if (form) form.reset();
+            currentFilters = {};
+            homeCurrentPage = 1;
+            loadHomeInstrumentos();
+        });
+    }
+}
+
+window.initHomeDashboard = async function() {
+    homeColumnVisibility = loadHomeColumnVisibility();
+    await loadHomeBootstrap();
+    await populateInfoAdicFilter();
+    await populateTipoFilter();
+    await populateSetorFilter();
+    attachFilterHandlers();
+    setupHomePaginationControls();
+    setupHomeColumnVisibilityControl();
+    setupHomeExportButton();
+    loadIndicadoresDashboard();
+    await loadHomeInstrumentos();
+    setInterval(() => {
+        if (!homeLiveEvents) pollHomeAlteracoes();
+    }, HOME_SYNC_INTERVAL_MS);
+    document.addEventListener('visibilitychange', () => {
+        if (!document.hidden) pollHomeAlteracoes();
+    });
+    connectHomeEvents();
+}
+
+// Pontos da página atual buscados em lote; cada entrada é usada uma vez e depois
+// a abertura volta a consultar o instrumento, para refletir análises recém-registradas.
+var homePontosPrefetch = new Map();
+
+async function prefetchHomePontos(instIds) {
+    homePontosPrefetch = new Map();
+    if (!instIds || !instIds.length) return;
+    const pending = new Map(instIds.map(id => [String(id), null]));
+    homePontosPrefetch = pending;
+    const request = (async () => {
+        const params = new URLSearchParams({ ids: instIds.join(','), only_ativo: '1' });
+        const resp = await fetch(`/cadastro/api/pontos/lote/?${params.toString()}`);
+        if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+        const data = await resp.json();
+        return data.instrumentos || {};
+    })();
+    pending.request = request;
+    try {
+        await request;
+    } catch (error) {
+        console.error('Erro ao pré-carregar pontos:', error);
+        if (homePontosPrefetch === pending) homePontosPrefetch = new Map();
+    }
+}
+
+async function takePrefetchedPontos(instId) {
+    const key = String(instId);
+    const prefetch = homePontosPrefetch;
+    if (!prefetch.has(key) || !prefetch.request) return null;
+    prefetch.delete(key);
+    try {
+        const grouped = await prefetch.request;
+        return Array.isArray(grouped[key]) ? { pontos: grouped[key] } : null;
+    } catch (error) {
+        return null;
+    }
+}
+
+async function fillPontosTable(instId, container) {
+    try {
+        let data = await takePrefetchedPontos(instId);
+        if (!data) {
+            const resp = await fetch(`/cadastro/api/instrumentos/${instId}/pontos/only-ativo/`);
+            data = await resp.json();
+        }
+        if (!data.pontos || data.pontos.length === 0) {
+            container.innerHTML = '<div class="text-sm text-gray-600">Nenhum ponto cadastrado para este instrumento.</div>';
+            return;
+        }
+        const analyzable = container.dataset.analyzable === '1';
+        const lastEnvioISO = container.dataset.lastEnvio;
+        const lastEnvioDateRaw = lastEnvioISO ? new Date(lastEnvioISO) : null;
+        const lastEnvioValid = lastEnvioDateRaw && !Number.isNaN(lastEnvioDateRaw.getTime());
+        container.innerHTML = `
+            <table class="min-w-full">
+                <thead class="text-xs text-gray-500">
+                <tr>
+                    <th class="px-3 py-2 text-left">Seq</th>
+                    <th class="px-3 py-2 text-left">Descrição</th>
+                    <th class="px-3 py-2 text-left">Valor</th>
+                    <th class="px-3 py-2 text-left">Data Última Análise</th>
+                    <th class="px-3 py-2 text-left">Incerteza Última</th>
+                    <th class="px-3 py-2 text-left">Tendência Última</th>
+                    <th class="px-3 py-2 text-left">Resultado Última</th>
+                    <th class="px-3 py-2 text-right">Ações</th>
+                </tr>
+                </thead>
+                <tbody>
+                ${data.pontos.map(p => {
+                    const ultimaAnaliseDateRaw = p.ultima_data_analise ? new Date(p.ultima_data_analise) : null;
+                    const ultimaAnaliseValid = ultimaAnaliseDateRaw && !Number.isNaN(ultimaAnaliseDateRaw.getTime());
+                    const needsAnalysis = analyzable && (
+                        !ultimaAnaliseValid ||
+                        (lastEnvioValid && ultimaAnaliseDateRaw < lastEnvioDateRaw)
+                    );
+                    const resultadoBadge = (() => {
+                        if (!p.ultima_resultado) return '-';
+                        const normalized = String(p.ultima_resultado).toLowerCase();
+                        if (normalized === 'aprovado') {
+                            return '<span class="inline-flex items-center px-2 py-0.5 rounded-full text-xs font-semibold bg-emerald-100 text-emerald-800">Aprovado</span>';
+                        }
+                        if (normalized === 'reprovado') {
+                            return '<span class="inline-flex items-center px-2 py-0.5 rounded-full text-xs font-semibold bg-red-100 text-red-800">Reprovado</span>';
+                        }
+                        return `<span class="inline-flex items-center px-2 py-0.5 rounded-full text-xs font-semibold bg-gray-100 text-gray-700">${p.ultima_resultado}</span>`;
+                    })();
+                    return `
+                    <tr class="border-t">
+                        <td class="px-3 py-2">${p.sequencia}</td>
+                        <td class="px-3 py-2">${p.descricao}</td>
+                        <td class="px-3 py-2">${p.valor_nominal} ${p.unidade}</td>
+                        <td class="px-3 py-2">
+                            ${p.ultima_data_analise ? new Date(p.ultima_data_analise).toLocaleString() : '-'}
+                        </td>
+                        <td class="px-3 py-2">${p.ultima_incerteza || '-'}
+                        </td>
+                        <td class="px-3 py-2">${p.ultima_tendencia || '-'}</td>
+                        <td class="px-3 py-2">
+                            ${resultadoBadge}
+                        </td>
+                        <td class="px-3 py-2 text-right">
+                            ${needsAnalysis
+                                ? `<button class="px-2 py-1 text-sm text-blue-600 hover:underline analisarPontoBtn"
+                                    data-instrumento-id="${instId}" data-ponto-id="${p.id}"
+                                    data-valor-min="${p.valor_nominal_minimo ?? ''}" data-valor-max="${p.valor_nominal_maximo ?? ''}"
+                                    data-unidade="${p.unidade || ''}" data-tolerancia-mais="${p.tolerancia_mais || ''}" data-tolerancia-menos="${p.tolerancia_menos || ''}">
+                                    Analisar
+                                </button>`
+                                : ''}
+                        </td>
+                    </tr>
+                `; }).join('')}
+                </tbody>
+            </table>
+        `;
+    } catch (e) {
+        container.innerHTML = '<div class="text-sm text-red-600">Erro ao carregar pontos.</div>';
+        console.error(e);
+    }
+}
+
+async function togglePontos(instId) {
+    const row = document.getElementById(`inst-pontos-${instId}`);
+    const container = document.getElementById(`inst-pontos-container-${instId}`);
+    if (!row || !container) return;
+
+    const isVisible = !row.classList.contains('hidden');
+    document.querySelectorAll('tr[id^="inst-pontos-"]').forEach(other => {
+        if (other !== row) {
+            other.classList.add('hidden');
+        }
+    });
+
+    if (isVisible) {
+        row.classList.add('hidden');
+        return;
+    }
+
+    container.classList.remove('hidden');
+    container.innerHTML = '<div class="text-sm text-gray-500">Carregando pontos...</div>';
+    row.classList.remove('hidden');
+    try {
+        await fillPontosTable(instId, container);
+    } catch (error) {
+        console.error('Erro ao carregar pontos:', error);
+        container.innerHTML = '<div class="text-sm text-red-600">Erro ao carregar pontos.</div>';
+    }
+}
+
+async function refreshHomeInstrument(instId) {
+    try {
+        const params = new URLSearchParams();
+        params.append('instrumento_id', instId);
+        params.append('page', homeCurrentPage);
+        params.append('per_page', HOME_PAGE_SIZE);
+        if (HOME_PMC_SCOPE) params.append('pmc_categoria', HOME_PMC_SCOPE);
+        Object.entries(currentFilters).forEach(([key, value]) => {
+            if (value !== undefined && value !== null && value !== '') {
+                params.append(key, value);
+            }
+        });
+        const resp = await fetch(`/instrumentos/api/status/?${params.toString()}`);
+        const data = await resp.json();
+        const instList = data.instrumentos || [];
+        const inst = instList.find(item => String(item.id) === String(instId));
+        if (!inst) {
+            await loadHomeInstrumentos();
+            return;
+        }
+        await replaceHomeInstrumentRow(inst);
+    } catch (e) {
+        console.error('Erro ao atualizar instrumento:', e);
+    }
+}
+
+async function replaceHomeInstrumentRow(inst) {
+    const row = document.getElementById(`inst-row-${inst.id}`);
+    const pontosRow = document.getElementById(`inst-pontos-${inst.id}`);
+    if (!row || !pontosRow) return;
+
+    const wasOpen = !pontosRow.classList.contains('hidden');
+    const parent = row.parentElement;
+    const temp = document.createElement('tbody');
+    temp.innerHTML = buildInstrumentRow(inst);
+    const newRow = temp.querySelector(`#inst-row-${inst.id}`);
+    const newPontosRow = temp.querySelector(`#inst-pontos-${inst.id}`);
+    parent.insertBefore(newRow, row);
+    parent.insertBefore(newPontosRow, pontosRow);
+    row.remove();
+    pontosRow.remove();
+    applyHomeColumnVisibility();
+    homeSync.instrumentos = homeSync.instrumentos.map(item => String(item.id) === String(inst.id) ? inst : item);
+
+    if (wasOpen) {
+        const container = document.getElementById(`inst-pontos-container-${inst.id}`);
+        if (container) {
+            container.innerHTML = '<div class="text-sm text-gray-500">Atualizando pontos...</div>';
+            homePontosPrefetch.delete(String(inst.id));
+            await fillPontosTable(inst.id, container);
+            document.getElementById(`inst-pontos-${inst.id}`).classList.remove('hidden');
+        }
+    }
+}
+
+// Sincronização incremental: a página guarda o sync_seq da última carga e, com a
+// aba visível, pede ao feed só o que mudou desde então. Linhas da página são
+// trocadas no lugar; se algo entra, sai ou muda de posição, recarrega a página.
+var HOME_SYNC_INTERVAL_MS = 60000;
+var homeSync = { seq: null, dataReferencia: null, instrumentos: [], inFlight: false };
+
+function homeSortKey(inst) {
+    return inst.valid_until ? [0, new Date(inst.valid_until).getTime(), inst.codigo || ''] : [1, 0, inst.codigo || ''];
+}
+
+function compareHomeSortKeys(a, b) {
+    for (let i = 0; i < a.length; i += 1) {
+        if (a[i] < b[i]) return -1;
+        if (a[i] > b[i]) return 1;
+    }
+    return 0;
+}
+
+function homeChangeTouchesPage(inst) {
+    const rows = homeSync.instrumentos;
+    if (!rows.length || rows.length < (homePagination.per_page || HOME_PAGE_SIZE)) return true;
+    const key = homeSortKey(inst);
+    const afterFirst = homeCurrentPage === 1 || compareHomeSortKeys(key, homeSortKey(rows[0])) >= 0;
+    return afterFirst && compareHomeSortKeys(key, homeSortKey(rows[rows.length - 1])) <= 0;
+}
+
+async function pollHomeAlteracoes() {
+    if (homeSync.seq === null || homeSync.inFlight || document.hidden) return;
+    homeSync.inFlight = true;
+    try {
+        const params = new URLSearchParams();
+        params.append('desde', homeSync.seq);
+        if (HOME_PMC_SCOPE) params.append('pmc_categoria', HOME_PMC_SCOPE);
+        Object.entries(currentFilters).forEach(([key, value]) => {
+            if (value !== undefined && value !== null && value !== '') {
+                params.append(key, value);
+            }
+        });
+        const resp = await fetch(`/instrumentos/api/status/alteracoes/?${params.toString()}`);
+        if (!resp.ok) return;
+        const data = await resp.json();
+        const dayChanged = homeSync.dataReferencia !== null && homeSync.dataReferencia !== data.data_referencia;
+        homeSync.dataReferencia = data.data_referencia;
+        if (data.reset || dayChanged) {
+            await loadHomeInstrumentos();
+            return;
+        }
+
+        const onPage = new Map(homeSync.instrumentos.map(inst => [String(inst.id), inst]));
+        let reload = (data.removidos || []).some(id => onPage.has(String(id)));
+        const replacements = [];
+        (data.instrumentos || []).forEach(inst => {
+            const current = onPage.get(String(inst.id));
+            if (current) {
+                if (current.valid_until === inst.valid_until) replacements.push(inst);
+                else reload = true;
+            } else if (homeChangeTouchesPage(inst)) {
+                reload = true;
+            }
+        });
+        if (reload) {
+            await loadHomeInstrumentos();
+            return;
+        }
+        for (const inst of replacements) {
+            await replaceHomeInstrumentRow(inst);
+        }
+        homeSync.seq = data.sync_seq;
+    } catch (e) {
+        console.error('Erro ao sincronizar instrumentos:', e);
+    } finally {
+        homeSync.inFlight = false;
+    }
+}
+
+// Eventos ao vivo (SSE): com o servidor em ASGI, cada alteração confirmada chega
+// por /instrumentos/api/eventos/ e dispara o mesmo feed incremental, sem esperar o
+// intervalo. Sob WSGI o endpoint responde 204, o EventSource desiste e o polling segue.
+var HOME_EVENTS_DEBOUNCE_MS = 500;
+var homeLiveEvents = false;
+var homeEventsTimer = null;
+
+function scheduleHomeAlteracoes() {
+    clearTimeout(homeEventsTimer);
+    homeEventsTimer = setTimeout(pollHomeAlteracoes, HOME_EVENTS_DEBOUNCE_MS);
+}
+
+function homeEventTouchesPage(evento) {
+    if (evento.reset) return true;
+    const onPage = new Set(homeSync.instrumentos.map(inst => String(inst.id)));
+    if ((evento.removidos || []).some(id => onPage.has(String(id)))) return true;
+    return (evento.instrumentos || []).some(inst => onPage.has(String(inst.id)) || homeChangeTouchesPage(inst));
+}
+
+function connectHomeEvents() {
+    if (typeof EventSource === 'undefined') return;
+    const source = new EventSource('/instrumentos/api/eventos/');
+    source.addEventListener('open', () => {
+        homeLiveEvents = true;
+        // Cobre o que mudou enquanto a conexão esteve fechada.
+        pollHomeAlteracoes();
+    });
+    source.addEventListener('instrumentos', (event) => {
+        try {
+            if (homeEventTouchesPage(JSON.parse(event.data))) scheduleHomeAlteracoes();
+        } catch (e) {
+            console.error('Evento de instrumentos inválido:', e);
+        }
+    });
+    source.addEventListener('error', () => {
+        homeLiveEvents = false;
+    });
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    if (typeof window.initHomeDashboard === 'function') window.initHomeDashboard();
+});
+
+// Menu toggle behavior for per-row dropdowns
+document.addEventListener('click', function(e){
+    const toggle = e.target.closest('[data-menu-toggle]');
+    if (toggle){
+        const id = toggle.getAttribute('data-menu-toggle');
+        const menu = document.getElementById(`menu-${id}`);
+        if (!menu) return;
+
+        document.querySelectorAll('[id^="menu-"]').forEach(m => {
+            if (m.id !== `menu-${id}`) m.classList.add('hidden');
+        });
+
+        const rect = toggle.getBoundingClientRect();
+        const viewportWidth = window.innerWidth;
+        const viewportHeight = window.innerHeight;
+
+        const wasHidden = menu.classList.contains('hidden');
+        if (wasHidden) menu.classList.remove('hidden');
+        menu.style.visibility = 'hidden';
+        menu.style.position = 'fixed';
+        menu.style.zIndex = '1000';
+
+        const menuWidth = menu.offsetWidth || 224;
+        const menuHeight = menu.offsetHeight || 240;
+
+        let left = rect.left;
+        if (left + menuWidth > viewportWidth) left = Math.max(8, viewportWidth - menuWidth - 8);
+        if (left < 8) left = 8;
+
+        let top = rect.bottom + 6;
+        const bottomOverflow = top + menuHeight > viewportHeight;
+        if (bottomOverflow) {
+            top = rect.top - menuHeight - 6;
+        }
+        if (top < 8) top = 8;
+
+        menu.style.left = `${left}px`;
+        menu.style.top = `${top}px`;
+        menu.style.maxHeight = `${Math.max(120, viewportHeight - 16)}px`;
+        menu.style.overflowY = 'auto';
+        menu.style.visibility = '';
+
+        if (!wasHidden) {
+            menu.classList.add('hidden');
+            menu.style.visibility = '';
+            menu.style.overflowY = '';
+            menu.style.maxHeight = '';
+        }
+
+        return;
+    }
+
+    if (e.target.closest('[data-floating-menu] button')){
+        document.querySelectorAll('[id^="menu-"]').forEach(m => m.classList.add('hidden'));
+        return;
+    }
+
+    if (!e.target.closest('[data-floating-menu]')){
+        document.querySelectorAll('[id^="menu-"]').forEach(m => m.classList.add('hidden'));
+    }
+});
+
+// handler for the 'Analisar' quick button
+document.addEventListener('click', function(e){
+    const ab = e.target.closest('.analisarBtn');
+    if (!ab) return;
+    const id = ab.getAttribute('data-id');
+    if (!id) return;
+    const menu = document.getElementById(`menu-${id}`);
+    if (menu){
+        const certBtn = menu.querySelector('button[data-action="certificado"]');
+        if (certBtn){
+            certBtn.click();
+            return;
+        }
+    }
+    window.location.href = `/instrumentos/${id}/`;
+});
+
+var pendingReceberPayload = null;
+var pendingReentregaInfo = null;
+var isSubmittingReceber = false;
+
+function openReceberModalHome(instrumentoId){
+    document.getElementById('receberInstrumentoIdHome').value = instrumentoId;
+    document.getElementById('modalReceberHome').classList.remove('hidden');
+    const now = new Date();
+    now.setMinutes(now.getMinutes() - now.getTimezoneOffset());
+    document.getElementById('receberDataHome').value = now.toISOString().slice(0,16);
+}
+
+function closeReceberModalHome(){
+    const modal = document.getElementById('modalReceberHome');
+    if (modal) modal.classList.add('hidden');
+}
+
+function setReceberButtonLoading(state){
+    const btn = document.getElementById('btnConfirmReceberHome');
+    if (!btn) return;
+    btn.disabled = state;
+    btn.classList.toggle('opacity-70', state);
+}
+
+function resetReceberState(){
+    pendingReceberPayload = null;
+    pendingReentregaInfo = null;
+}
+
+function buildReceberPayload(){
+    const instrumentoField = document.getElementById('receberInstrumentoIdHome');
+    const linkField = document.getElementById('receberLinkHome');
+    const dataField = document.getElementById('receberDataHome');
+    const obsField = document.getElementById('receberObsHome');
+    if (!instrumentoField || !linkField) {
+        alert('Instrumento inválido para recebimento.');
+        return null;
+    }
+    const instrumentoId = instrumentoField.value;
+    if (!instrumentoId) {
+        alert('Instrumento inválido para recebimento.');
+        return null;
+    }
+    const linkValue = (linkField.value || '').trim();
+    if (!linkValue) {
+        alert('O campo Link do Certificado é obrigatório');
+        return null;
+    }
+    const payload = {
+        instrumento_id: instrumentoId,
+        link: linkValue,
+        observacoes: (obsField ? obsField.value : '') || ''
+    };
+    if (dataField && dataField.value) {
+        const parsed = new Date(dataField.value);
+        if (!Number.isNaN(parsed.getTime())) {
+            payload.data_recebimento = parsed.toISOString();
+        }
+    }
+    return payload;
+}
+
+async function fetchUltimoResponsavel(instrumentoId){
+    if (!instrumentoId) return null;
+    try {
+        const resp = await fetch(`/instrumentos/api/ultimo-responsavel/${instrumentoId}/`);
+        if (!resp.ok) return null;
+        const data = await resp.json();
+        return data.responsavel || null;
+    } catch (error) {
+        console.warn('Erro ao consultar último responsável:', error);
+        return null;
+    }
+}
+
+function buildReentregaMessage(info){
+    const message = document.getElementById('reentregaPromptMessage');
+    if (!message) return;
+    const funcionarioNome = info.funcionario_nome || 'o colaborador anterior';
+    const codigo = info.instrumento_codigo || '';
+    const descricao = info.instrumento_descricao || '';
+    const instrumentoLabel = codigo ? `${codigo}${descricao ? ' - ' + descricao : ''}` : 'o instrumento';
+    message.innerHTML = '';
+    const prefix = document.createElement('span');
+    prefix.textContent = `Atenção! O último usuário antes de enviar ${instrumentoLabel} ao laboratório era `;
+    const destaque = document.createElement('span');
+    destaque.className = 'font-semibold text-indigo-600';
+    destaque.textContent = funcionarioNome;
+    const suffix = document.createElement('span');
+    suffix.textContent = '. Você deseja reatribuir para ele?';
+    message.append(prefix, destaque, suffix);
+}
+
+// function openReentregaPrompt(info){
+//     buildReentregaMessage(info);
+//     const modal = document.getElementById('modalReentregaPrompt');
+//     if (modal) modal.classList.remove('hidden');
+// }
+
+// function closeReentregaPrompt(resetState = false){
+//     const modal = document.getElementById('modalReentregaPrompt');
+//     if (modal) modal.classList.add('hidden');
+//     if (resetState) {
+//         resetReceberState();
+//     }
+// }
+
+function redirectToEntregasWithPrefill(info){
+    if (!info) return;
+    const payload = {
+        instrumento_id: info.instrumento_id,
+        instrumento_codigo: info.instrumento_codigo || '',
+        instrumento_descricao: info.instrumento_descricao || '',
+        funcionario_id: info.funcionario_id,
+        funcionario_nome: info.funcionario_nome || '',
+        funcionario_matricula: info.funcionario_matricula || ''
+    };
+    try {
+        sessionStorage.setItem(ENTREGA_PREFILL_STORAGE_KEY, JSON.stringify(payload));
+    } catch (error) {
+        console.warn('Não foi possível armazenar o prefill de entregas.', error);
+    }
+    window.location.href = '/entregas/?from=recebimento';
+}
+
+async function submitReceber(payload, options = {}){
+    if (!payload || isSubmittingReceber) return;
+    const { shouldRedirect = false } = options;
+    isSubmittingReceber = true;
+    setReceberButtonLoading(true);
+    try {
+        const res = await fetch('/instrumentos/api/receber/', {
+            method: 'POST',
+            headers: {'Content-Type':'application/json','X-CSRFToken': getCSRF()},
+            body: JSON.stringify(payload)
+        });
+        const j = await res.json();
+        if (j.success) {
+            closeReceberModalHome();
+            if (shouldRedirect && pendingReentregaInfo) {
+                redirectToEntregasWithPrefill(pendingReentregaInfo);
+                return;
+            }
+            alert(j.message || 'Recebido');
+            await loadHomeInstrumentos();
+        } else {
+            alert(j.message || 'Erro ao receber');
+        }
+    } catch (error) {
+        console.error('Erro ao receber instrumento:', error);
+        alert('Erro ao receber instrumento.');
+    } finally {
+        setReceberButtonLoading(false);
+        isSubmittingReceber = false;
+        resetReceberState();
+    }
+}
+
+// open receive modal when menu action 'receber' is clicked
+document.addEventListener('click', function(e){
+    const btn = e.target.closest('button[data-action="receber"]');
+    if (!btn) return;
+    if (btn.disabled) return;
+    const menu = btn.closest('[id^="menu-"]');
+    if (!menu) return;
+    const parts = menu.id.split('-');
+    const instId = parts.length>1 ? parts[1] : null;
+    if (!instId) return;
+    openReceberModalHome(instId);
+});
+
+const confirmarReceberBtn = document.getElementById('btnConfirmReceberHome');
+if (confirmarReceberBtn) {
+    confirmarReceberBtn.addEventListener('click', async () => {
+        const payload = buildReceberPayload();
+        if (!payload) return;
+        pendingReceberPayload = payload;
+        // const info = await fetchUltimoResponsavel(payload.instrumento_id);
+        // if (info && info.funcionario_id) {
+        //     pendingReentregaInfo = info;
+        //     openReentregaPrompt(info);
+        //     return;
+        // }
+        await submitReceber(payload);
+    });
+}
+
+// const reentregaSkipBtn = document.getElementById('btnReentregaSkip');
+// if (reentregaSkipBtn) {
+//     reentregaSkipBtn.addEventListener('click', async () => {
+//         closeReentregaPrompt();
+//         if (pendingReceberPayload) {
+//             await submitReceber(pendingReceberPayload);
+//         }
+//     });
+// }
+
+// const reentregaConfirmBtn = document.getElementById('btnReentregaConfirm');
+// if (reentregaConfirmBtn) {
+//     reentregaConfirmBtn.addEventListener('click', async () => {
+//         closeReentregaPrompt();
+//         if (pendingReceberPayload) {
+//             await submitReceber(pendingReceberPayload, { shouldRedirect: true });
+//         }
+//     });
+// }
+
+// const reentregaCloseBtn = document.getElementById('btnReentregaClose');
+// if (reentregaCloseBtn) {
+//     reentregaCloseBtn.addEventListener('click', () => {
+//         closeReentregaPrompt(true);
+//     });
+// }
+
+// handler for per-point 'Analisar' buttons in home pontos table
+document.addEventListener('click', function(e){
+    const btn = e.target.closest('.analisarPontoBtn');
+    if (!btn) return;
+    const instrumentoId = btn.getAttribute('data-instrumento-id');
+    const pontoId = btn.getAttribute('data-ponto-id');
+    if (!instrumentoId) return;
+    const meta = {
+        valorMin: btn.getAttribute('data-valor-min') || '',
+        valorMax: btn.getAttribute('data-valor-max') || '',
+        unidade: btn.getAttribute('data-unidade') || '',
+        toleranciaMais: btn.getAttribute('data-tolerancia-mais') || '',
+        toleranciaMenos: btn.getAttribute('data-tolerancia-menos') || '',
+    };
+    openAnalisarModalHome(pontoId, instrumentoId, meta);
+});
+
+function openAnalisarModalHome(pontoId, instrumentoId, meta){
+    document.getElementById('analisarPontoIdHome').value = pontoId || '';
+    document.getElementById('analisarInstrumentoIdHome').value = instrumentoId || '';
+    document.getElementById('analisarCertezaHome').value = '';
+    document.getElementById('analisarTendenciaHome').value = '';
+    document.getElementById('analisarResultadoHome').value = '';
+    document.getElementById('analisarObsHome').value = '';
+    const nominalEl = document.getElementById('analisarValorNominalHome');
+    const tolMaisEl = document.getElementById('analisarToleranciaMaisHome');
+    const tolMenosEl = document.getElementById('analisarToleranciaMenosHome');
+    const safeMeta = meta || {};
+    const min = safeMeta.valorMin;
+    const max = safeMeta.valorMax;
+    const unidade = safeMeta.unidade;
+    const nominalText = (max || min)
+        ? `${min || '-'} ${unidade || ''}${max ? ' a ' + max : ''}`
+        : '-';
+    if (nominalEl) nominalEl.textContent = nominalText.trim();
+    if (tolMaisEl) {
+        tolMaisEl.textContent = safeMeta.toleranciaMais ? `${safeMeta.toleranciaMais} ${unidade || ''}`.trim() : '-';
+        tolMaisEl.dataset.value = safeMeta.toleranciaMais || '';
+    }
+    if (tolMenosEl) {
+        tolMenosEl.textContent = safeMeta.toleranciaMenos ? `${safeMeta.toleranciaMenos} ${unidade || ''}`.trim() : '-';
+        tolMenosEl.dataset.value = safeMeta.toleranciaMenos || '';
+    }
+    updateErroTotalHome();
+    document.getElementById('modalAnalisarPontoHome').classList.remove('hidden');
+}
+function closeAnalisarModalHome(){ document.getElementById('modalAnalisarPontoHome').classList.add('hidden'); }
+
+function updateErroTotalHome(){
+    const incEl = document.getElementById('analisarCertezaHome');
+    const tenEl = document.getElementById('analisarTendenciaHome');
+    const totalEl = document.getElementById('analisarErroTotalHome');
+    const tolEl = document.getElementById('analisarToleranciaMaisHome');
+    const resultadoEl = document.getElementById('analisarResultadoHome');
+    if (!incEl || !tenEl || !totalEl) return;
+
+    const parseNum = (val) => {
+        const n = parseFloat(val);
+        return Number.isFinite(n) ? n : null;
+    };
+
+    const inc = parseNum(incEl.value);
+    const ten = parseNum(tenEl.value);
+    if (inc === null || ten === null) {
+        totalEl.value = '';
+        return;
+    }
+
+    const total = Math.abs(inc) + Math.abs(ten);
+    totalEl.value = total.toFixed(4);
+
+    const tol = tolEl ? parseNum(tolEl.dataset.value) : null;
+    if (tol !== null && resultadoEl) {
+        resultadoEl.value = total <= tol ? 'aprovado' : 'reprovado';
+    }
+}
+
+['analisarCertezaHome', 'analisarTendenciaHome'].forEach(id => {
+    const el = document.getElementById(id);
+    if (el) {
+        el.addEventListener('input', updateErroTotalHome);
+        el.addEventListener('change', updateErroTotalHome);
+    }
+});
+
+var isSubmittingAnalisarHome = false;
+
+function setAnalisarButtonLoading(state){
+    const btn = document.getElementById('btnConfirmAnalisarHome');
+    if (!btn) return;
+    if (state && !btn.dataset.originalText) {
+        btn.dataset.originalText = btn.textContent || '';
+    }
+    btn.disabled = state;
+    btn.classList.toggle('opacity-70', state);
+    btn.textContent = state ? 'Salvando...' : (btn.dataset.originalText || 'Salvar Análise');
+}
+
+document.getElementById('btnConfirmAnalisarHome').addEventListener('click', async ()=>{
+    if (isSubmittingAnalisarHome) return;
+    const ponto_id = document.getElementById('analisarPontoIdHome').value;
+    const instrumento_id = document.getElementById('analisarInstrumentoIdHome').value;
+    const incerteza = document.getElementById('analisarCertezaHome').value || null;
+    const tendencia = document.getElementById('analisarTendenciaHome').value || '';
+    const resultado = document.getElementById('analisarResultadoHome').value || '';
+    const observacoes = document.getElementById('analisarObsHome').value || '';
+
+    if (!ponto_id){ alert('Ponto inválido'); return; }
+    if (!resultado){ if(!confirm('Você tem certeza que deseja salvar sem selecionar um resultado?')) return; }
+
+    let payload = { ponto_id: ponto_id };
+    if (incerteza) payload.incerteza = incerteza;
+    if (tendencia) payload.tendencia = tendencia;
+    if (resultado) payload.resultado = resultado;
+    if (observacoes) payload.observacoes = observacoes;
+
+    isSubmittingAnalisarHome = true;
+    setAnalisarButtonLoading(true);
+    try {
+        const res = await fetch('/instrumentos/api/status-ponto/', {
+            method: 'POST', headers: {'Content-Type':'application/json','X-CSRFToken': getCSRF()}, body: JSON.stringify(payload)
+        });
+        const j = await res.json();
+        if (j.success){
+            alert(j.message || 'Análise salva');
+            closeAnalisarModalHome();
+            if (instrumento_id) {
+                await refreshHomeInstrument(instrumento_id);
+            }
+        } else {
+            alert(j.message || 'Erro ao salvar análise');
+        }
+    } catch (error) {
+        console.error('Erro ao salvar análise:', error);
+        alert('Erro ao salvar análise');
+    } finally {
+        isSubmittingAnalisarHome = false;
+        setAnalisarButtonLoading(false);
+    }
+});
+
+function getCSRF() {
+    const name = 'csrftoken';
+    const cookies = document.cookie.split(';').map(c=>c.trim());
+    for (const c of cookies) {
+        if (c.startsWith(name + '=')) return decodeURIComponent(c.split('=')[1]);
+    }
+    return '';
+}
+
+function openEnviarModalHome(instrumentoId){
+    document.getElementById('enviarInstrumentoIdHome').value = instrumentoId;
+    document.getElementById('modalEnviarHome').classList.remove('hidden');
+    const now = new Date(); now.setMinutes(now.getMinutes() - now.getTimezoneOffset());
+    document.getElementById('enviarDataHome').value = now.toISOString().slice(0,16);
+    loadLabsHome();
+}
+function closeEnviarModalHome(){ document.getElementById('modalEnviarHome').classList.add('hidden'); }
+
+function setEnviarButtonLoading(state){
+    const btn = document.getElementById('btnConfirmEnviarHome');
+    if (!btn) return;
+    if (state && !btn.dataset.originalText) {
+        btn.dataset.originalText = btn.textContent || '';
+    }
+    btn.disabled = state;
+    btn.classList.toggle('opacity-70', state);
+    btn.textContent = state ? 'Enviando...' : (btn.dataset.originalText || 'Confirmar Envio');
+}
+
+async function loadLabsHome(){
+    try{
+        const laboratorios = await homeReferenceData('laboratorios', '/cadastro/api/laboratorios/');
+        const sel = document.getElementById('enviarLabHome'); sel.innerHTML = '<option value="">-- Selecione --</option>';
+        laboratorios.forEach(l=>{ const o = document.createElement('option'); o.value=l.id; o.text=l.nome; sel.appendChild(o); });
+    }catch(e){ console.error(e); }
+}
+
+// open modal when a menu item 'Enviar' is clicked
+document.addEventListener('click', function(e){
+    const btn = e.target.closest('button[data-action="enviar"]');
+    if (!btn) return;
+    if (btn.disabled) return;
+    // find parent menu id like 'menu-<id>'
+    const menu = btn.closest('[id^="menu-"]');
+    if (!menu) return;
+    const parts = menu.id.split('-');
+    const instId = parts.length>1 ? parts[1] : null;
+    if (!instId) return;
+    openEnviarModalHome(instId);
+});
+
+var isSubmittingEnviarHome = false;
+
+document.getElementById('btnConfirmEnviarHome').addEventListener('click', async ()=>{
+    if (isSubmittingEnviarHome) return;
+    const instrumento_id = document.getElementById('enviarInstrumentoIdHome').value;
+    const labVal = document.getElementById('enviarLabHome').value;
+    const obs = document.getElementById('enviarObsHome').value || '';
+    const dataEnv = document.getElementById('enviarDataHome').value;
+    let payload = { instrumento_id: instrumento_id, observacoes: obs };
+    if (labVal && labVal !== '__outro__') payload.laboratorio_id = labVal;
+    else if (labVal === '__outro__') payload.laboratorio_nome = '';
+    if (dataEnv) payload.data_entrega = new Date(dataEnv).toISOString();
+
+    isSubmittingEnviarHome = true;
+    setEnviarButtonLoading(true);
+    try {
+        const res = await fetch('/instrumentos/api/enviar/', {
+            method: 'POST', headers: {'Content-Type':'application/json','X-CSRFToken': getCSRF()}, body: JSON.stringify(payload)
+        });
+        const j = await res.json();
+        if (j.success){
+            alert(j.message || 'Enviado');
+            closeEnviarModalHome();
+            loadHomeInstrumentos();
+        } else {
+            alert(j.message || 'Erro ao enviar');
+        }
+    } catch (error) {
+        console.error('Erro ao enviar instrumento:', error);
+        alert('Erro ao enviar instrumento.');
+    } finally {
+        setEnviarButtonLoading(false);
+        isSubmittingEnviarHome = false;
+    }
+});
+
+let historicoHomeState = { instrumentoId: null, cursor: null };
+
+function escapeHistoricoHome(value){
+    const div = document.createElement('div');
+    div.textContent = value == null ? '' : String(value);
+    return div.innerHTML;
+}
+
+function renderHistoricoEventoHome(ev){
+    const detalhe = ev.tipo === 'certificado' && ev.detalhe
+        ? `<a href="${escapeHistoricoHome(ev.detalhe)}" target="_blank" rel="noopener" class="text-blue-600 hover:underline">Abrir certificado</a>`
+        : escapeHistoricoHome(ev.detalhe);
+    return `
+        <tr>
+            <td class="px-4 py-2 text-sm">${ev.data ? new Date(ev.data).toLocaleString() : '-'}</td>
+            <td class="px-4 py-2 text-sm">
+                <div>${escapeHistoricoHome(ev.titulo) || '-'}</div>
+                ${detalhe ? `<div class="text-xs text-gray-500">${detalhe}</div>` : ''}
+            </td>
+        </tr>
+    `;
+}
+
+function loadHistoricoPageHome(){
+    const tbody = document.getElementById('historicoTableBodyHome');
+    const maisBtn = document.getElementById('historicoCarregarMaisHome');
+    const { instrumentoId, cursor } = historicoHomeState;
+    const params = new URLSearchParams({ limit: '50' });
+    if (cursor) params.set('cursor', cursor);
+    maisBtn.disabled = true;
+
+    fetch(`/instrumentos/api/timeline/${instrumentoId}/?${params.toString()}`)
+        .then(resp => resp.json())
+        .then(data => {
+            if (historicoHomeState.instrumentoId !== instrumentoId) return;
+            const eventos = data.eventos || [];
+            if (!cursor) {
+                tbody.innerHTML = eventos.length
+                    ? ''
+                    : '<tr><td colspan="2" class="px-4 py-3 text-center text-gray-500">Nenhum historico encontrado.</td></tr>';
+            }
+            tbody.insertAdjacentHTML('beforeend', eventos.map(renderHistoricoEventoHome).join(''));
+            historicoHomeState.cursor = data.next_cursor || null;
+            maisBtn.classList.toggle('hidden', !historicoHomeState.cursor);
+            maisBtn.disabled = false;
+        })
+        .catch(() => {
+            maisBtn.disabled = false;
+            if (!cursor) {
+                tbody.innerHTML = '<tr><td colspan="2" class="px-4 py-3 text-center text-red-600">Erro ao carregar historico.</td></tr>';
+            }
+        });
+}
+
+function openHistoricoModalHome(instrumentoId){
+    const tbody = document.getElementById('historicoTableBodyHome');
+    tbody.innerHTML = '<tr><td colspan="2" class="px-4 py-3 text-center text-gray-500">Carregando...</td></tr>';
+    document.getElementById('historicoCarregarMaisHome').classList.add('hidden');
+    document.getElementById('modalHistoricoHome').classList.remove('hidden');
+    historicoHomeState = { instrumentoId, cursor: null };
+    loadHistoricoPageHome();
+}
+
+function closeHistoricoModalHome(){
+    document.getElementById('modalHistoricoHome').classList.add('hidden');
+}
+
+// open historico modal when menu action 'historico' is clicked
+document.addEventListener('click', function(e){
+    const btn = e.target.closest('button[data-action="historico"]');
+    if (!btn) return;
+    const menu = btn.closest('[id^="menu-"]');
+    if (!menu) return;
+    const parts = menu.id.split('-');
+    const instId = parts.length>1 ? parts[1] : null;
+    if (!instId) return;
+    openHistoricoModalHome(instId);
+});
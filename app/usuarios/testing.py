@@ -0,0 +1,10 @@
+from .models import Usuario
+
+
+class UsuarioLogadoMixin:
+    """Cria um operador comum (`self.user`) e autentica o cliente de teste com ele."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = Usuario.objects.create_user(matricula='1000', nome='Operador', password='senha123')
+        self.client.force_login(self.user)
@@ -1,4 +1,7 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
 from .models import Usuario
 
 
@@ -26,3 +29,42 @@ class UsuarioModelTest(TestCase):
         self.assertEqual(user.matricula, '99999')
         self.assertTrue(user.is_staff)
         self.assertTrue(user.is_superuser)
+
+
+# Configuração usada quando CACHE_URL aponta para um cache compartilhado; nos
+# testes o locmem é único para o processo, então vale como compartilhado.
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+    AUTHENTICATION_BACKENDS=[
+        'app.usuarios.backends.CachedModelBackend',
+        'django.contrib.auth.backends.ModelBackend',
+    ],
+)
+class UsuarioEmCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Usuario.objects.create_superuser(matricula='99999', nome='Admin', password='admin123')
+        self.client.force_login(self.user)
+
+    def test_requisicoes_seguintes_nao_consultam_sessao_nem_usuario(self):
+        self.client.get(reverse('metricas'))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('metricas')).status_code, 200)
+
+    def test_troca_de_senha_encerra_a_sessao(self):
+        self.client.get(reverse('metricas'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('nova-senha-123')
+            self.user.save()
+        self.assertEqual(self.client.get(reverse('metricas')).status_code, 302)
+
+    def test_usuario_desativado_perde_acesso(self):
+        self.client.get(reverse('metricas'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.client.get(reverse('metricas')).status_code, 302)
+
+    def test_sessao_aberta_pelo_model_backend_continua_valida(self):
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertEqual(self.client.get(reverse('metricas')).status_code, 200)
@@ -0,0 +1,110 @@
+"""Cache em dois níveis: LRU local do processo na frente do cache compartilhado.
+
+O nível compartilhado é o `CACHES['default']` do Django (memória local por
+padrão; Redis ou memcached via `CACHE_URL`). Cada entrada local guarda a
+versão dos dados com que foi montada e só volta a conferi-la depois de
+`local_ttl` segundos; até lá a leitura custa um acesso ao dicionário.
+Invalidações (sinais) descartam na hora as entradas locais dependentes.
+Dentro de uma transação o nível local é ignorado: o que se lê ali pode ainda
+não estar confirmado (ou ser desfeito) e não pode ficar no processo.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, TypeVar
+
+from django.core.cache import caches
+from django.db import connection
+
+T = TypeVar('T')
+_MISSING = object()
+
+
+class _LocalEntry:
+    __slots__ = ('value', 'version', 'groups', 'fresh_until')
+
+    def __init__(self, value, version: str, groups: frozenset, fresh_until: float):
+        self.value = value
+        self.version = version
+        self.groups = groups
+        self.fresh_until = fresh_until
+
+
+class TwoTierCache:
+    """LRU por processo com `maxsize` entradas sobre o cache `alias` do Django.
+
+    `version_func(groups)` devolve a versão atual dos dados de que a entrada
+    depende; ela entra na chave do nível compartilhado, então uma versão nova
+    nunca lê um valor antigo de outro processo.
+    """
+
+    def __init__(
+        self,
+        version_func: Callable[[Iterable[Hashable]], str],
+        *,
+        alias: str = 'default',
+        prefix: str = 'cache',
+        maxsize: int = 256,
+        local_ttl: float = 5.0,
+        timeout: int | None = 60 * 60,
+    ):
+        self.version_func = version_func
+        self.alias = alias
+        self.prefix = prefix
+        self.maxsize = maxsize
+        self.local_ttl = local_ttl
+        self.timeout = timeout
+        self._local: OrderedDict[str, _LocalEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def get_or_set(self, key: str, groups: Iterable[Hashable], builder: Callable[[], T]) -> T:
+        if connection.in_atomic_block:
+            return self._get_or_set_shared(key, self.version_func(sorted(groups, key=str)), builder)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and now < entry.fresh_until:
+                self._local.move_to_end(key)
+                return entry.value
+
+        groups = frozenset(groups)
+        version = self.version_func(sorted(groups, key=str))
+        if entry is not None and entry.version == version:
+            value = entry.value
+        else:
+            value = self._get_or_set_shared(key, version, builder)
+        self._store(key, _LocalEntry(value, version, groups, now + self.local_ttl))
+        return value
+
+    def _get_or_set_shared(self, key: str, version: str, builder: Callable[[], T]) -> T:
+        shared_key = f'{self.prefix}:{key}:{version}'
+        value = self.shared.get(shared_key, _MISSING)
+        if value is _MISSING:
+            value = builder()
+            self.shared.set(shared_key, value, self.timeout)
+        return value
+
+    def _store(self, key: str, entry: _LocalEntry) -> None:
+        with self._lock:
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def invalidate(self, *groups: Hashable) -> None:
+        """Descarta as entradas locais que dependem de algum dos grupos."""
+        alvo = set(groups)
+        with self._lock:
+            for key in [key for key, entry in self._local.items() if entry.groups & alvo]:
+                del self._local[key]
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
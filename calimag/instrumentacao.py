@@ -0,0 +1,149 @@
+"""Instrumentação por requisição: consultas SQL, tempo de banco, serialização e view.
+
+Uma fração das requisições (`INSTRUMENTACAO_AMOSTRA`) é medida em detalhe e,
+para a equipe ou com `DEBUG`, recebe o cabeçalho `Server-Timing`, que o
+DevTools mostra na aba de timing de cada requisição. Nas demais só o relógio total roda, então uma requisição
+lenta sempre aparece no log, mas as consultas mais lentas só vêm junto quando
+ela foi amostrada.
+
+A medição atual vive numa `ContextVar`: o wrapper de SQL, instalado em toda
+conexão aberta, e a serialização do `FastJsonResponse` a encontram mesmo nas
+threads de `sync_to_async` das views assíncronas.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+SQL_MAX_CARACTERES = 500
+
+_medicao: ContextVar[Medicao | None] = ContextVar('calimag_medicao', default=None)
+_rota: ContextVar[str | None] = ContextVar('calimag_rota', default=None)
+
+
+class Medicao:
+    """Acumuladores de uma requisição amostrada (tempos em milissegundos)."""
+
+    __slots__ = ('top_sql', 'consultas', 'banco_ms', 'serializacao_ms', '_lentas')
+
+    def __init__(self, top_sql: int):
+        self.top_sql = top_sql
+        self.consultas = 0
+        self.banco_ms = 0.0
+        self.serializacao_ms = 0.0
+        self._lentas: list[tuple[float, int, str]] = []
+
+    def registrar_consulta(self, sql: str, ms: float) -> None:
+        self.consultas += 1
+        self.banco_ms += ms
+        if self.top_sql <= 0:
+            return
+        # Heap mínimo com as N mais lentas; o contador desempata sem comparar o SQL.
+        item = (ms, self.consultas, sql)
+        if len(self._lentas) < self.top_sql:
+            heapq.heappush(self._lentas, item)
+        elif ms > self._lentas[0][0]:
+            heapq.heapreplace(self._lentas, item)
+
+    def sql_mais_lentas(self) -> list[dict]:
+        return [
+            {'ms': round(ms, 2), 'sql': sql[:SQL_MAX_CARACTERES]}
+            for ms, _, sql in sorted(self._lentas, reverse=True)
+        ]
+
+
+def _registrar_sql(execute, sql, params, many, context):
+    medicao = _medicao.get()
+    if medicao is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicao.registrar_consulta(sql, (time.perf_counter() - inicio) * 1000)
+
+
+def instalar(connection, **kwargs) -> None:
+    """Inclui o wrapper de SQL na conexão (idempotente; o pool reabre a mesma)."""
+    if _registrar_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_registrar_sql)
+
+
+connection_created.connect(instalar, dispatch_uid='calimag_instrumentacao')
+
+
+def iniciar(top_sql: int) -> Medicao:
+    # Conexões já abertas nesta thread antes do primeiro import não passaram pelo sinal.
+    for connection in connections.all(initialized_only=True):
+        instalar(connection)
+    medicao = Medicao(top_sql)
+    _medicao.set(medicao)
+    return medicao
+
+
+def encerrar() -> None:
+    _medicao.set(None)
+
+
+def definir_rota(rota: str | None) -> None:
+    _rota.set(rota)
+
+
+def rota_atual() -> str | None:
+    """`view_name` da requisição em andamento (toda requisição, amostrada ou não)."""
+    return _rota.get()
+
+
+@contextmanager
+def medir_serializacao():
+    """Soma à medição atual o tempo do bloco (usado na serialização JSON)."""
+    medicao = _medicao.get()
+    if medicao is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicao.serializacao_ms += (time.perf_counter() - inicio) * 1000
+
+
+def server_timing(medicao: Medicao, total_ms: float, view_ms: float | None) -> str:
+    partes = [f'total;dur={total_ms:.1f}']
+    if view_ms is not None:
+        partes.append(f'view;dur={view_ms:.1f}')
+    partes.append(f'db;dur={medicao.banco_ms:.1f};desc="SQL ({medicao.consultas})"')
+    partes.append(f'json;dur={medicao.serializacao_ms:.1f}')
+    return ', '.join(partes)
+
+
+def registrar_lenta(request, response, total_ms: float, view_ms: float | None, medicao: Medicao | None) -> None:
+    """Uma linha JSON por requisição acima de `INSTRUMENTACAO_LENTA_MS`."""
+    match = getattr(request, 'resolver_match', None)
+    dados = {
+        'evento': 'requisicao_lenta',
+        'metodo': request.method,
+        'caminho': request.path,
+        'rota': match.view_name if match else None,
+        'status': response.status_code,
+        'total_ms': round(total_ms, 1),
+        'view_ms': round(view_ms, 1) if view_ms is not None else None,
+        'amostrada': medicao is not None,
+    }
+    if medicao is not None:
+        dados.update({
+            'consultas': medicao.consultas,
+            'banco_ms': round(medicao.banco_ms, 1),
+            'serializacao_ms': round(medicao.serializacao_ms, 1),
+            'sql_mais_lentas': medicao.sql_mais_lentas(),
+        })
+    logger.warning(json.dumps(dados, ensure_ascii=False))
@@ -0,0 +1,70 @@
+"""Endpoint de instrumentação: métricas do processo que atendeu a requisição.
+
+Cada worker tem seus próprios pools e caches, então os números valem para o
+processo identificado em `pid`; um coletor deve consultar todos os workers
+ou agregar por `pid`.
+"""
+from __future__ import annotations
+
+import os
+
+from django.contrib.auth.decorators import login_required
+from django.db import connections
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+
+from app.cadastro.respostas import FastJsonResponse
+
+
+def _media(total: float, quantidade: int) -> float | None:
+    return round(total / quantidade, 2) if quantidade else None
+
+
+def metricas_pool(alias: str = 'default') -> dict:
+    """Ocupação, fila e latência de conexão do pool psycopg do banco `alias`."""
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is None:
+        return {'pool': False}
+    # Contadores do psycopg_pool só aparecem depois do primeiro incremento.
+    stats = pool.get_stats()
+    if pool.closed:
+        # O pool abre na primeira consulta do processo; antes disso não há conexões.
+        return {'pool': True, 'aberto': False, 'min': stats.get('pool_min', 0), 'max': stats.get('pool_max', 0)}
+    tamanho = stats.get('pool_size', 0)
+    disponiveis = stats.get('pool_available', 0)
+    return {
+        'pool': True,
+        'aberto': True,
+        'min': stats.get('pool_min', 0),
+        'max': stats.get('pool_max', 0),
+        'abertas': tamanho,
+        'em_uso': tamanho - disponiveis,
+        'disponiveis': disponiveis,
+        'aguardando': stats.get('requests_waiting', 0),
+        'requisicoes': stats.get('requests_num', 0),
+        'requisicoes_em_fila': stats.get('requests_queued', 0),
+        'espera_media_ms': _media(stats.get('requests_wait_ms', 0), stats.get('requests_queued', 0)),
+        'timeouts': stats.get('requests_errors', 0),
+        'conexoes_criadas': stats.get('connections_num', 0),
+        'conexao_media_ms': _media(stats.get('connections_ms', 0), stats.get('connections_num', 0)),
+        'erros_conexao': stats.get('connections_errors', 0),
+        'conexoes_perdidas': stats.get('connections_lost', 0),
+        'devolvidas_com_defeito': stats.get('returns_bad', 0),
+    }
+
+
+def coletar_metricas() -> dict:
+    return {
+        'pid': os.getpid(),
+        'bancos': {alias: metricas_pool(alias) for alias in connections},
+    }
+
+
+@never_cache
+@login_required
+@require_GET
+def metricas_api(request):
+    """Métricas do processo em JSON, apenas para a equipe (`is_staff`)."""
+    if not request.user.is_staff:
+        return FastJsonResponse({'success': False, 'message': 'Acesso restrito à equipe.'}, status=403)
+    return FastJsonResponse(coletar_metricas())
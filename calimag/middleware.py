@@ -0,0 +1,175 @@
+"""Middlewares do projeto."""
+from __future__ import annotations
+
+import gzip
+import random
+import secrets
+import time
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from . import instrumentacao
+from .replica import REPLICA_COOKIE, replica_configurada
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+COMPRESSIBLE_TYPES = frozenset({'application/json', 'text/html'})
+# Brotli não leva o enchimento aleatório do gzip (mitigação de BREACH); fica só
+# para o JSON, e o HTML, que carrega o token CSRF, segue em gzip.
+BROTLI_TYPES = frozenset({'application/json'})
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Codificações aceitas no `Accept-Encoding`, ignorando as marcadas com `q=0`."""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        qvalue = params.strip().lower()
+        if qvalue.startswith('q='):
+            try:
+                if float(qvalue[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    return accepted
+
+
+def gzip_content(content: bytes, level: int, max_random_bytes: int) -> bytes:
+    # Mesmo preenchimento aleatório do GZipMiddleware do Django (mitigação de BREACH),
+    # mas com o nível configurável.
+    data = gzip.compress(content, compresslevel=level, mtime=0)
+    if not max_random_bytes:
+        return data
+    header = bytearray(data[:10])
+    header[3] = gzip.FNAME
+    return bytes(header) + b'a' * secrets.randbelow(max_random_bytes) + b'\x00' + data[10:]
+
+
+def _equipe(request):
+    # Só o usuário que a requisição já carregou (request.user ou auser() das views
+    # assíncronas): o cabeçalho não pode custar uma consulta a mais.
+    user = getattr(request, '_cached_user', None) or getattr(request, '_acached_user', None)
+    return user is not None and user.is_staff
+
+
+class InstrumentacaoMiddleware(MiddlewareMixin):
+    """Tempos da requisição em `Server-Timing` e log das requisições lentas.
+
+    Fica antes da compressão e depois do WhiteNoise: estáticos não são
+    medidos e o total inclui sessão, autenticação e compressão. Só uma
+    fração `INSTRUMENTACAO_AMOSTRA` conta consultas e serialização; o log de
+    `INSTRUMENTACAO_LENTA_MS` vale para todas (ver `calimag.instrumentacao`).
+    O cabeçalho só vai para a equipe (ou com `DEBUG`): os tempos de banco
+    dizem a qualquer cliente quais filtros são caros.
+    """
+
+    def process_request(self, request):
+        request._instrumentacao_inicio = time.perf_counter()
+        request._instrumentacao_view = None
+        amostra = settings.INSTRUMENTACAO_AMOSTRA
+        if amostra > 0 and (amostra >= 1 or random.random() < amostra):
+            request._instrumentacao = instrumentacao.iniciar(settings.INSTRUMENTACAO_TOP_SQL)
+        else:
+            request._instrumentacao = None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._instrumentacao_view = time.perf_counter()
+        instrumentacao.definir_rota(request.resolver_match.view_name)
+
+    def process_response(self, request, response):
+        inicio = getattr(request, '_instrumentacao_inicio', None)
+        if inicio is None:
+            return response
+        fim = time.perf_counter()
+        instrumentacao.definir_rota(None)
+        medicao = request._instrumentacao
+        if medicao is not None:
+            instrumentacao.encerrar()
+        total_ms = (fim - inicio) * 1000
+        view_ms = (fim - request._instrumentacao_view) * 1000 if request._instrumentacao_view else None
+        if medicao is not None and (settings.DEBUG or _equipe(request)):
+            response.headers['Server-Timing'] = instrumentacao.server_timing(medicao, total_ms, view_ms)
+        if total_ms >= settings.INSTRUMENTACAO_LENTA_MS and not response.streaming:
+            instrumentacao.registrar_lenta(request, response, total_ms, view_ms, medicao)
+        return response
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Comprime respostas JSON e HTML acima de `COMPRESSION_MIN_SIZE`.
+
+    Usa brotli para JSON quando o cliente aceita e o módulo está instalado;
+    senão gzip, com enchimento aleatório contra BREACH.
+    Respostas em streaming (exportações) passam intactas, assim como as que
+    já têm `Content-Encoding` ou não ficariam menores.
+    """
+
+    max_random_bytes = 100
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        media_type = response.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        if media_type not in COMPRESSIBLE_TYPES:
+            return response
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and 'br' in accepted and media_type in BROTLI_TYPES:
+            encoding = 'br'
+            compressed = brotli.compress(response.content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+        elif 'gzip' in accepted:
+            encoding = 'gzip'
+            compressed = gzip_content(response.content, settings.COMPRESSION_GZIP_LEVEL, self.max_random_bytes)
+        else:
+            return response
+
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+
+        # ETag forte vira fraca (RFC 9110 8.8.1); o GET condicional compara de forma fraca.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+
+class LeituraPropriaMiddleware(MiddlewareMixin):
+    """Fixa no primário, por alguns segundos, as leituras de quem acabou de escrever.
+
+    Toda requisição não segura (POST, PUT, DELETE...) bem-sucedida renova o
+    cookie `REPLICA_COOKIE`; com ele presente `ler_da_replica` não desvia a
+    leitura para a réplica (ver `calimag.replica`).
+    """
+
+    def process_request(self, request):
+        request.ler_do_primario = REPLICA_COOKIE in request.COOKIES
+
+    def process_response(self, request, response):
+        if (
+            replica_configurada()
+            and request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                REPLICA_COOKIE,
+                '1',
+                max_age=settings.REPLICA_FIXACAO_SEGUNDOS,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,78 @@
+"""Leituras na réplica, preservando a leitura das próprias escritas.
+
+Só as views marcadas com `ler_da_replica` (APIs de leitura, listagens e
+exportações) consultam o banco `replica`; todo o resto, inclusive sessão,
+autenticação e escritas, fica no primário. Depois de uma requisição que
+escreve, o navegador recebe um cookie de curta duração
+(`REPLICA_FIXACAO_SEGUNDOS`) e, enquanto ele valer, suas leituras também vão
+ao primário: o usuário vê na hora o que acabou de gravar, mesmo com a réplica
+atrasada. Sem `DB_REPLICA_HOST` (ou com `REPLICA_LEITURA` desligado) nada muda.
+"""
+from __future__ import annotations
+
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+
+REPLICA = 'replica'
+REPLICA_COOKIE = 'calimag_primario'
+
+_usar_replica: ContextVar[bool] = ContextVar('calimag_usar_replica', default=False)
+
+
+def replica_configurada() -> bool:
+    return REPLICA in settings.DATABASES and settings.REPLICA_LEITURA
+
+
+def _pode_usar_replica(request) -> bool:
+    return replica_configurada() and not getattr(request, 'ler_do_primario', False)
+
+
+def ler_da_replica(view):
+    """Executa a view lendo da réplica, salvo se o usuário escreveu há pouco.
+
+    Deve ficar por fora de `reference_data`, para que a versão usada na ETag
+    venha do mesmo banco que o corpo da resposta.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if not _pode_usar_replica(request):
+                return await view(request, *args, **kwargs)
+            token = _usar_replica.set(True)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _usar_replica.reset(token)
+    else:
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if not _pode_usar_replica(request):
+                return view(request, *args, **kwargs)
+            token = _usar_replica.set(True)
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                _usar_replica.reset(token)
+    return inner
+
+
+def banco_de_leitura() -> str:
+    """Alias que as leituras do contexto atual usam (entra nas chaves de cache)."""
+    return REPLICA if _usar_replica.get() else 'default'
+
+
+class ReplicaRouter:
+    """Leituras dentro de `ler_da_replica` vão à réplica; escritas sempre ao primário."""
+
+    def db_for_read(self, model, **hints):
+        return REPLICA if _usar_replica.get() else None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica e primário têm os mesmos dados: relacionar objetos lidos de cada um é seguro.
+        return True
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import copy
 from pathlib import Path
 import environ
 import os
@@ -27,7 +28,8 @@ environ.Env.read_env(os.path.join(BASE_DIR, '.env'))
 SECRET_KEY = 'django-insecure-c(^&5umuz#to#6)v$8r^7269t8e!f^s1b!b9___)l0b2dt_xc!'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# Em produção use DEBUG=false: só assim os templates apontam para os estáticos com hash.
+DEBUG = env.bool('DEBUG', default=True)
 
 ALLOWED_HOSTS = ['calimag.onrender.com', '127.0.0.1']
 
@@ -41,24 +43,75 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'servestatic',
     'storages',
     
     # Apps locais
     'app.usuarios',
     'app.cadastro',
     'app.instrumento',
+    'app.diagnostico',
 ]
 
+# Estáticos: o WhiteNoise só roda síncrono e, sob ASGI, o Django o adaptaria
+# e prenderia uma thread por requisição. No modo padrão (ASGI, ver
+# gunicorn.conf.py) quem serve é o ServeStatic, fork assíncrono do WhiteNoise.
+SERVER_MODE = env('SERVER_MODE', default='asgi').lower()
+STATIC_MIDDLEWARE = (
+    'whitenoise.middleware.WhiteNoiseMiddleware' if SERVER_MODE == 'wsgi'
+    else 'servestatic.middleware.ServeStaticMiddleware'
+)
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    STATIC_MIDDLEWARE,
+    'calimag.middleware.InstrumentacaoMiddleware',
+    'calimag.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'calimag.middleware.LeituraPropriaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Instrumentação por requisição (calimag.middleware.InstrumentacaoMiddleware).
+# Uma fração INSTRUMENTACAO_AMOSTRA (0 a 1) das requisições conta SQL, tempo de
+# banco, serialização e view, e devolve tudo no cabeçalho Server-Timing. Toda
+# requisição acima de INSTRUMENTACAO_LENTA_MS gera uma linha JSON no log
+# 'calimag.instrumentacao'; as amostradas trazem as INSTRUMENTACAO_TOP_SQL consultas mais lentas.
+INSTRUMENTACAO_AMOSTRA = env.float('INSTRUMENTACAO_AMOSTRA', default=1.0 if DEBUG else 0.1)
+INSTRUMENTACAO_LENTA_MS = env.float('INSTRUMENTACAO_LENTA_MS', default=1000.0)
+INSTRUMENTACAO_TOP_SQL = env.int('INSTRUMENTACAO_TOP_SQL', default=5)
+
+# Registro de consultas lentas (app.diagnostico), desligado por padrão. Com
+# CONSULTAS_LENTAS_MS > 0 toda consulta acima do limite é gravada com SQL,
+# parâmetros e rota; SELECTs ganham EXPLAIN (ANALYZE, BUFFERS) rodado em segundo
+# plano. A tabela guarda as CONSULTAS_LENTAS_MAX mais recentes (tela em
+# /diagnostico/consultas-lentas/, só para a equipe).
+CONSULTAS_LENTAS_MS = env.float('CONSULTAS_LENTAS_MS', default=0.0)
+CONSULTAS_LENTAS_MAX = env.int('CONSULTAS_LENTAS_MAX', default=500)
+CONSULTAS_LENTAS_INTERVALO = env.float('CONSULTAS_LENTAS_INTERVALO', default=300.0)  # por SQL, em segundos
+CONSULTAS_LENTAS_EXPLAIN_TIMEOUT_MS = env.int('CONSULTAS_LENTAS_EXPLAIN_TIMEOUT_MS', default=30000)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'calimag': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
+# Compressão de JSON/HTML (calimag.middleware.CompressionMiddleware).
+# Brotli é usado quando o módulo está instalado e o cliente aceita; senão gzip.
+COMPRESSION_MIN_SIZE = env.int('COMPRESSION_MIN_SIZE', default=1024)
+COMPRESSION_GZIP_LEVEL = env.int('COMPRESSION_GZIP_LEVEL', default=6)
+COMPRESSION_BROTLI_QUALITY = env.int('COMPRESSION_BROTLI_QUALITY', default=5)
+
 ROOT_URLCONF = 'calimag.urls'
 
 TEMPLATES = [
@@ -97,6 +150,68 @@ DATABASES = {
     }
 }
 
+# Reaproveitamento de conexões. Com DB_POOL (padrão) cada processo mantém um pool
+# psycopg 3; o search_path acima é aplicado só quando o pool abre a conexão.
+# O teto por processo divide DB_MAX_CONNECTIONS pelos workers (WEB_CONCURRENCY),
+# para que todos juntos não passem do limite do banco; DB_POOL_MAX_SIZE sobrepõe.
+# Sem pool, a conexão fica aberta por DB_CONN_MAX_AGE segundos entre requisições.
+DB_POOL = env.bool('DB_POOL', default=True)
+WEB_CONCURRENCY = env.int('WEB_CONCURRENCY', default=2)  # mesmo padrão de workers do gunicorn.conf.py
+if DB_POOL:
+    from psycopg_pool import ConnectionPool
+
+    DB_POOL_MAX_SIZE = env.int(
+        'DB_POOL_MAX_SIZE', default=max(2, env.int('DB_MAX_CONNECTIONS', default=20) // max(1, WEB_CONCURRENCY))
+    )
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': min(env.int('DB_POOL_MIN_SIZE', default=2), DB_POOL_MAX_SIZE),
+        'max_size': DB_POOL_MAX_SIZE,
+        'timeout': env.float('DB_POOL_TIMEOUT', default=10.0),  # espera máxima por uma conexão livre
+        'max_lifetime': env.float('DB_POOL_MAX_LIFETIME', default=30 * 60.0),
+        'max_idle': env.float('DB_POOL_MAX_IDLE', default=10 * 60.0),
+        'check': ConnectionPool.check_connection,  # testa a conexão antes de entregá-la
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=60)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Réplica de leitura (opcional). Com DB_REPLICA_HOST, as views marcadas com
+# calimag.replica.ler_da_replica (APIs de leitura, listagens, exportações) leem
+# da réplica, com as mesmas opções de conexão/pool do primário. Quem escreveu
+# lê do primário por REPLICA_FIXACAO_SEGUNDOS (cookie), para ver o que gravou.
+# REPLICA_LEITURA=0 mantém o alias mas volta todas as leituras ao primário.
+# Testes: DB_REPLICA_HOST=localhost REPLICA_LEITURA=0 cria um segundo banco local
+# (test_<DB_REPLICA_NAME>_replica); só os testes da réplica ligam a leitura nele.
+DB_REPLICA_HOST = env('DB_REPLICA_HOST', default='')
+if DB_REPLICA_HOST:
+    DB_REPLICA_NAME = env('DB_REPLICA_NAME', default=DATABASES['default']['NAME'])
+    DATABASES['replica'] = {
+        **copy.deepcopy(DATABASES['default']),
+        'NAME': DB_REPLICA_NAME,
+        'USER': env('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': env('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'HOST': DB_REPLICA_HOST,
+        'PORT': env('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'NAME': f'test_{DB_REPLICA_NAME}_replica'},
+    }
+DATABASE_ROUTERS = ['calimag.replica.ReplicaRouter']
+REPLICA_LEITURA = env.bool('REPLICA_LEITURA', default=True)
+REPLICA_FIXACAO_SEGUNDOS = env.int('REPLICA_FIXACAO_SEGUNDOS', default=10)
+
+
+# Cache
+# Nível compartilhado: memória local do processo por padrão; em produção aponte
+# CACHE_URL para Redis (redis://host:6379/1) ou memcached (pymemcache://host:11211).
+# Na frente dele cada processo mantém um LRU (calimag.cache.TwoTierCache) para as
+# listas de referência, reconferido contra o banco a cada REFERENCIA_CACHE_LOCAL_TTL s.
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://calimag'),
+}
+REFERENCIA_CACHE_LOCAL_MAXSIZE = env.int('REFERENCIA_CACHE_LOCAL_MAXSIZE', default=256)
+REFERENCIA_CACHE_LOCAL_TTL = env.float('REFERENCIA_CACHE_LOCAL_TTL', default=5.0)
+REFERENCIA_CACHE_TIMEOUT = env.int('REFERENCIA_CACHE_TIMEOUT', default=60 * 60)
+
 
 # Modelo de usuário customizado
 AUTH_USER_MODEL = 'usuarios.Usuario'
@@ -150,11 +265,22 @@ if not AWS_S3_CUSTOM_DOMAIN and AWS_STORAGE_BUCKET_NAME:
 
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
+# O collectstatic gera nomes com hash do conteúdo e as versões .gz e .br de cada
+# arquivo; o ServeStatic (ou o WhiteNoise, sob WSGI) serve a versão comprimida
+# aceita pelo navegador, com Cache-Control immutable de um ano para os arquivos
+# com hash.
 STATICFILES_STORAGE = env(
     'STATICFILES_STORAGE',
-    default='django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+    default='whitenoise.storage.CompressedManifestStaticFilesStorage'
 )
 
+# STATICFILES_STORAGE deixou de ser lido no Django 5.1. A mídia continua no
+# FileSystemStorage padrão, como antes (DEFAULT_FILE_STORAGE também é ignorado).
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': STATICFILES_STORAGE},
+}
+
 # Media files
 # MEDIA_URL = 'media/'
 MEDIA_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/'
@@ -165,5 +291,26 @@ LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'home'
 LOGOUT_REDIRECT_URL = 'login'
 
+# Com cache compartilhado (Redis/memcached via CACHE_URL) a sessão fica no cache
+# com cópia no banco e o usuário da sessão também (app.usuarios.backends),
+# descartado ao salvar o usuário ou no logout. Com o cache em memória de cada
+# processo esse descarte só valeria no worker que o fez (logout e usuário
+# desativado continuariam valendo nos outros), então sessão e usuário vêm do banco.
+# O ModelBackend fica na lista para que sessões abertas por ele continuem válidas.
+CACHE_COMPARTILHADO = CACHES['default']['BACKEND'] not in {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+if CACHE_COMPARTILHADO:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    AUTHENTICATION_BACKENDS = [
+        'app.usuarios.backends.CachedModelBackend',
+        'django.contrib.auth.backends.ModelBackend',
+    ]
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
+AUTH_USUARIO_CACHE_TIMEOUT = env.int('AUTH_USUARIO_CACHE_TIMEOUT', default=60)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -0,0 +1,209 @@
+import gzip
+import json
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.db import router
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from app.cadastro.models import Setor
+from app.cadastro.respostas import FastJsonResponse
+from app.usuarios.models import Usuario
+from app.usuarios.testing import UsuarioLogadoMixin
+
+from . import replica
+from .cache import TwoTierCache
+from .middleware import CompressionMiddleware
+
+
+class CompressionMiddlewareTest(SimpleTestCase):
+    def _processar(self, response, accept_encoding):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda req: response)(request)
+
+    def test_gzip_acima_do_limite(self):
+        payload = {'instrumentos': [{'codigo': f'PAQ-{idx}', 'status': 'Recebido do laboratório'} for idx in range(200)]}
+        with self.settings(COMPRESSION_MIN_SIZE=1024, COMPRESSION_GZIP_LEVEL=6):
+            grande = self._processar(FastJsonResponse(payload), 'gzip, br;q=0')
+            pequena = self._processar(FastJsonResponse({'ok': True}), 'gzip')
+            recusada = self._processar(FastJsonResponse(payload), 'gzip;q=0')
+            streaming = self._processar(StreamingHttpResponse(iter([b'a' * 4096]), content_type='text/csv'), 'gzip')
+
+        self.assertEqual(grande['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', grande['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(grande.content)), payload)
+        self.assertFalse(pequena.has_header('Content-Encoding'))
+        self.assertFalse(recusada.has_header('Content-Encoding'))
+        self.assertFalse(streaming.has_header('Content-Encoding'))
+
+
+    def test_html_com_csrf_nao_usa_brotli(self):
+        request = RequestFactory().get('/')
+        html = f'<form><input name="csrfmiddlewaretoken" value="{get_token(request)}"></form>' + '<p>instrumento</p>' * 200
+        with self.settings(COMPRESSION_MIN_SIZE=1024, COMPRESSION_GZIP_LEVEL=6):
+            so_br = self._processar(HttpResponse(html), 'br')
+            br_ou_gzip = self._processar(HttpResponse(html), 'br, gzip')
+
+        self.assertFalse(so_br.has_header('Content-Encoding'))
+        self.assertEqual(br_ou_gzip['Content-Encoding'], 'gzip')
+        self.assertTrue(br_ou_gzip.content[3] & gzip.FNAME)
+        self.assertEqual(gzip.decompress(br_ou_gzip.content).decode(), html)
+
+
+class MiddlewareAsgiTest(SimpleTestCase):
+    @override_settings(DEBUG=True)
+    def test_cadeia_assincrona_sem_adaptacao(self):
+        if settings.SERVER_MODE == 'wsgi':
+            self.skipTest('SERVER_MODE=wsgi usa o WhiteNoise síncrono')
+        # Com DEBUG, o Django registra cada middleware que precisou adaptar.
+        with self.assertNoLogs('django.request', level='DEBUG'):
+            ASGIHandler().load_middleware(is_async=True)
+
+
+class TwoTierCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.versao = 'v1'
+        self.consultas_versao = 0
+        self.builds = 0
+        self.cache = TwoTierCache(self._versao, prefix='teste', maxsize=2, local_ttl=60)
+        self.cache.shared.clear()
+
+    def _versao(self, groups):
+        self.consultas_versao += 1
+        return self.versao
+
+    def _build(self):
+        self.builds += 1
+        return [self.versao, self.builds]
+
+    def test_leitura_local_nao_reconfere_versao(self):
+        primeiro = self.cache.get_or_set('tipos', ['tipo'], self._build)
+        for _ in range(3):
+            self.assertIs(self.cache.get_or_set('tipos', ['tipo'], self._build), primeiro)
+        self.assertEqual((self.consultas_versao, self.builds), (1, 1))
+
+    def test_invalidacao_reconfere_e_versao_nova_reconstroi(self):
+        self.cache.get_or_set('tipos', ['tipo'], self._build)
+        self.cache.invalidate('setor')
+        self.cache.get_or_set('tipos', ['tipo'], self._build)
+        self.assertEqual(self.consultas_versao, 1)
+
+        self.cache.invalidate('tipo')
+        self.cache.get_or_set('tipos', ['tipo'], self._build)
+        self.assertEqual((self.consultas_versao, self.builds), (2, 1))
+
+        self.versao = 'v2'
+        self.cache.invalidate('tipo')
+        self.assertEqual(self.cache.get_or_set('tipos', ['tipo'], self._build), ['v2', 2])
+
+    def test_outro_processo_reaproveita_o_nivel_compartilhado(self):
+        self.cache.get_or_set('tipos', ['tipo'], self._build)
+        self.cache.clear_local()
+        self.cache.get_or_set('tipos', ['tipo'], self._build)
+        self.assertEqual(self.builds, 1)
+
+    def test_lru_descarta_a_entrada_mais_antiga(self):
+        for chave in ('a', 'b', 'c'):
+            self.cache.get_or_set(chave, ['tipo'], self._build)
+        self.assertEqual(list(self.cache._local), ['b', 'c'])
+
+
+class MetricasApiTest(UsuarioLogadoMixin, TestCase):
+    def test_somente_equipe(self):
+        self.assertEqual(self.client.get(reverse('metricas')).status_code, 403)
+
+        self.client.force_login(Usuario.objects.create_superuser(matricula='1001', nome='Admin', password='senha123'))
+        response = self.client.get(reverse('metricas'))
+        self.assertEqual(response.status_code, 200)
+        # sqlite nos testes: sem pool, o banco aparece sem métricas de pool
+        self.assertEqual(response.json()['bancos']['default'], {'pool': False})
+
+
+class ReplicaRouterTest(SimpleTestCase):
+    def _banco_na_view(self, **atributos):
+        @replica.ler_da_replica
+        def view(request):
+            return router.db_for_read(Setor)
+
+        request = RequestFactory().get('/')
+        for nome, valor in atributos.items():
+            setattr(request, nome, valor)
+        return view(request)
+
+    def test_so_views_marcadas_leem_da_replica(self):
+        with mock.patch.object(replica, 'replica_configurada', return_value=True):
+            self.assertEqual(self._banco_na_view(), 'replica')
+            self.assertEqual(self._banco_na_view(ler_do_primario=True), 'default')
+            self.assertEqual(router.db_for_read(Setor), 'default')
+            self.assertEqual(router.db_for_write(Setor), 'default')
+        self.assertEqual(self._banco_na_view(), 'default')
+
+
+REPLICA_CONFIGURADA = replica.REPLICA in settings.DATABASES
+
+
+@skipUnless(REPLICA_CONFIGURADA, 'Sem banco de réplica configurado (DB_REPLICA_HOST).')
+@override_settings(REPLICA_LEITURA=True)
+class ReplicaLeituraTest(UsuarioLogadoMixin, TestCase):
+    """Usa o segundo banco de teste como réplica, com dados propositalmente diferentes do primário."""
+
+    # O runner reúne os bancos de todas as classes antes de aplicar o skip.
+    databases = {'default', replica.REPLICA} if REPLICA_CONFIGURADA else {'default'}
+
+    def setUp(self):
+        super().setUp()
+        Setor.objects.create(nome='Qualidade')
+        Setor.objects.using('replica').create(nome='Qualidade (réplica)')
+        self.url = reverse('cadastro:setores_api')
+
+    def test_api_de_leitura_consulta_a_replica(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual([s['nome'] for s in data['setores']], ['Qualidade (réplica)'])
+
+    def test_quem_escreveu_le_do_primario(self):
+        response = self.client.post(
+            reverse('cadastro:setores_create'), json.dumps({'nome': 'Produção'}), content_type='application/json'
+        )
+        self.assertIn(replica.REPLICA_COOKIE, response.cookies)
+        data = self.client.get(self.url).json()
+        self.assertEqual([s['nome'] for s in data['setores']], ['Produção', 'Qualidade'])
+
+
+class InstrumentacaoTest(UsuarioLogadoMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        Setor.objects.create(nome='Qualidade')
+        self.url = reverse('cadastro:setores_api')
+
+    @override_settings(INSTRUMENTACAO_AMOSTRA=1.0)
+    def test_server_timing_com_consultas_e_serializacao(self):
+        self.client.force_login(Usuario.objects.create_superuser(matricula='1001', nome='Admin', password='senha123'))
+        timing = self.client.get(self.url)['Server-Timing']
+        nomes = [parte.split(';', 1)[0] for parte in timing.split(', ')]
+        self.assertEqual(nomes, ['total', 'view', 'db', 'json'])
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="SQL \([1-9]\d*\)"')
+
+    @override_settings(INSTRUMENTACAO_AMOSTRA=1.0)
+    def test_sem_cabecalho_fora_da_equipe(self):
+        self.assertFalse(self.client.get(self.url).has_header('Server-Timing'))
+        with self.settings(DEBUG=True):
+            self.assertTrue(self.client.get(self.url).has_header('Server-Timing'))
+
+    @override_settings(INSTRUMENTACAO_AMOSTRA=0, DEBUG=True)
+    def test_fora_da_amostra_sem_cabecalho(self):
+        self.assertFalse(self.client.get(self.url).has_header('Server-Timing'))
+
+    @override_settings(INSTRUMENTACAO_AMOSTRA=1.0, INSTRUMENTACAO_LENTA_MS=0, INSTRUMENTACAO_TOP_SQL=1)
+    def test_requisicao_lenta_registra_consultas_mais_lentas(self):
+        with self.assertLogs('calimag.instrumentacao', 'WARNING') as logs:
+            self.client.get(self.url)
+        dados = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(dados['rota'], 'cadastro:setores_api')
+        self.assertTrue(dados['amostrada'])
+        self.assertGreaterEqual(dados['consultas'], 1)
+        self.assertEqual(len(dados['sql_mais_lentas']), 1)
+        self.assertIn('SELECT', dados['sql_mais_lentas'][0]['sql'])
@@ -19,11 +19,15 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .metricas import metricas_api
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/metricas/', metricas_api, name='metricas'),
     path('', include('app.usuarios.urls')),
     path('cadastro/', include('app.cadastro.urls')),
     path('instrumentos/', include('app.instrumento.urls')),
+    path('diagnostico/', include('app.diagnostico.urls')),
 ]
 
 # Servir arquivos de mídia em desenvolvimento
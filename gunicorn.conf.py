@@ -0,0 +1,29 @@
+"""Configuração do gunicorn (lida automaticamente quando executado na raiz do projeto).
+
+Por padrão serve `calimag.asgi` com workers uvicorn: as APIs de leitura são
+assíncronas, então um processo atende muitos clientes em polling ou em SSE
+sem uma thread presa por conexão. `SERVER_MODE=wsgi` volta ao worker síncrono
+de `calimag.wsgi` (útil para comparar com `rotinas/benchmark_concorrencia.py`).
+As settings leem a mesma variável para escolher quem serve os estáticos.
+
+    gunicorn                     # ASGI, WEB_CONCURRENCY workers
+    SERVER_MODE=wsgi gunicorn    # WSGI com o mesmo número de workers
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))  # mesmo padrão de calimag.settings
+keepalive = 5
+graceful_timeout = 30
+
+if os.environ.get('SERVER_MODE', 'asgi').lower() == 'wsgi':
+    wsgi_app = 'calimag.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.environ.get('GUNICORN_THREADS', '1'))
+    timeout = 60
+else:
+    wsgi_app = 'calimag.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    # No worker uvicorn o timeout só vigia o processo, não a requisição: o SSE
+    # (/instrumentos/api/eventos/) mantém conexões abertas indefinidamente.
+    timeout = 60
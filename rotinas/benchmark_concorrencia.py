@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Vazao de requisicoes concorrentes nas APIs JSON de leitura (WSGI x ASGI).
+
+Dispara `--clientes` conexoes simultaneas contra um servidor ja rodando e
+mede requisicoes por segundo e percentis de latencia. Para comparar os dois
+modos com o mesmo numero de workers:
+
+    WEB_CONCURRENCY=2 SERVER_MODE=wsgi gunicorn
+    python rotinas/benchmark_concorrencia.py --matricula 123 --clientes 64
+
+    WEB_CONCURRENCY=2 gunicorn                   # ASGI (padrao do gunicorn.conf.py)
+    python rotinas/benchmark_concorrencia.py --matricula 123 --clientes 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from pathlib import Path
+
+import django
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "calimag.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402  pylint: disable=wrong-import-position
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model  # noqa: E402  pylint: disable=wrong-import-position
+
+ENDPOINTS = [
+    "/instrumentos/api/status/?per_page=50",
+    "/instrumentos/api/status/alteracoes/?desde=0",
+    "/instrumentos/api/indicadores/",
+    "/instrumentos/api/descricoes/",
+    "/cadastro/api/setores/",
+    "/cadastro/api/laboratorios/",
+]
+
+
+def criar_sessao(matricula: str) -> str:
+    """Abre uma sessao autenticada no engine configurado, sem passar pelo login."""
+    usuario = get_user_model().objects.get(matricula=matricula)
+    sessao = import_module(settings.SESSION_ENGINE).SessionStore()
+    sessao[SESSION_KEY] = str(usuario.pk)
+    sessao[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    sessao[HASH_SESSION_KEY] = usuario.get_session_auth_hash()
+    sessao.create()
+    return sessao.session_key
+
+
+def percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+def rodar(url: str, caminhos: list[str], cookie: str, clientes: int, duracao: float) -> tuple[list[float], int]:
+    """Cada cliente repete as requisicoes em sequencia ate acabar o tempo."""
+    latencias: list[float] = []
+    erros = 0
+    trava = threading.Lock()
+    fim = time.monotonic() + duracao
+
+    def cliente(indice: int) -> None:
+        nonlocal erros
+        locais, falhas, passo = [], 0, indice
+        while time.monotonic() < fim:
+            pedido = urllib.request.Request(url + caminhos[passo % len(caminhos)], headers={"Cookie": cookie})
+            passo += 1
+            inicio = time.perf_counter()
+            try:
+                with urllib.request.urlopen(pedido, timeout=30) as resposta:
+                    resposta.read()
+            except (urllib.error.URLError, OSError):
+                falhas += 1
+                continue
+            locais.append((time.perf_counter() - inicio) * 1000)
+        with trava:
+            latencias.extend(locais)
+            erros += falhas
+
+    with ThreadPoolExecutor(max_workers=clientes) as executor:
+        list(executor.map(cliente, range(clientes)))
+    return latencias, erros
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Mede vazao concorrente das APIs de leitura.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Servidor alvo (padrao http://127.0.0.1:8000)")
+    parser.add_argument("--matricula", required=True, help="Matricula do usuario usado nas requisicoes")
+    parser.add_argument("--clientes", type=int, default=32, help="Conexoes simultaneas (padrao 32)")
+    parser.add_argument("--duracao", type=float, default=20.0, help="Segundos de carga (padrao 20)")
+    parser.add_argument("--caminho", action="append", help="Endpoint a exercitar (repetivel; padrao: APIs de leitura)")
+    return parser
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    cookie = f"{settings.SESSION_COOKIE_NAME}={criar_sessao(args.matricula)}"
+    caminhos = args.caminho or ENDPOINTS
+    url = args.url.rstrip("/")
+
+    # Aquecimento: abre o pool e popula os caches de referencia em cada worker.
+    rodar(url, caminhos, cookie, args.clientes, min(3.0, args.duracao))
+    latencias, erros = rodar(url, caminhos, cookie, args.clientes, args.duracao)
+    if not latencias:
+        raise SystemExit(f"Nenhuma requisicao concluida ({erros} erros). O servidor esta rodando em {url}?")
+
+    print(f"{url} | {args.clientes} clientes | {args.duracao:.0f} s | {len(caminhos)} endpoints")
+    print(f"Requisicoes: {len(latencias)} ok, {erros} erros")
+    print(f"Vazao:       {len(latencias) / args.duracao:8.1f} req/s")
+    print(
+        f"Latencia:    media {statistics.fmean(latencias):7.1f} ms | p50 {percentil(latencias, 50):7.1f} ms"
+        f" | p95 {percentil(latencias, 95):7.1f} ms | p99 {percentil(latencias, 99):7.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Micro-benchmark da serializacao JSON de uma pagina de instrumentos_status_api."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+import django
+from asgiref.sync import async_to_sync
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "calimag.settings")
+django.setup()
+
+from django.http import JsonResponse  # noqa: E402  pylint: disable=wrong-import-position
+from django.test import RequestFactory  # noqa: E402  pylint: disable=wrong-import-position
+
+from app.cadastro import respostas  # noqa: E402  pylint: disable=wrong-import-position
+from app.instrumento.views import instrumentos_status_payload  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def build_payload(linhas: int) -> dict:
+    """Busca uma pagina real da API; completa repetindo linhas se o banco tiver menos instrumentos."""
+    request = RequestFactory().get("/instrumentos/api/status/", {"per_page": min(linhas, 200)})
+    payload = async_to_sync(instrumentos_status_payload)(request)
+    items = payload["instrumentos"]
+    if not items:
+        raise SystemExit("Nenhum instrumento ativo no banco para montar a pagina.")
+    payload["instrumentos"] = [items[idx % len(items)] for idx in range(linhas)]
+    return payload
+
+
+def measure(label: str, func, number: int, repeat: int) -> float:
+    tempos = [total / number * 1000 for total in timeit.repeat(func, number=number, repeat=repeat)]
+    melhor, mediana = min(tempos), statistics.median(tempos)
+    print(f"{label:<40} melhor {melhor:8.3f} ms | mediana {mediana:8.3f} ms")
+    return mediana
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Compara JsonResponse do Django com FastJsonResponse.")
+    parser.add_argument("--linhas", type=int, default=200, help="Linhas na pagina serializada (padrao 200)")
+    parser.add_argument("--number", type=int, default=200, help="Serializacoes por medicao (padrao 200)")
+    parser.add_argument("--repeat", type=int, default=7, help="Quantidade de medicoes (padrao 7)")
+    return parser
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    payload = build_payload(args.linhas)
+    encoder = "orjson" if respostas.orjson is not None else "json (stdlib, orjson nao instalado)"
+    print(f"Pagina com {len(payload['instrumentos'])} instrumentos | encoder rapido: {encoder}")
+    print("")
+
+    base = measure("JsonResponse (json + DjangoJSONEncoder)", lambda: JsonResponse(payload), args.number, args.repeat)
+    rapido = measure("FastJsonResponse", lambda: respostas.FastJsonResponse(payload), args.number, args.repeat)
+    print("")
+    print(f"Tamanho: {len(JsonResponse(payload).content)} bytes (Django) | {len(respostas.dumps(payload))} bytes (rapido)")
+    print(f"Ganho: {base / rapido:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,14 @@ import argparse
 import csv
 import os
 import sys
+import time
 import unicodedata
 from datetime import datetime, date
 from pathlib import Path
 
 import django
 from django.db import transaction
+from django.utils import timezone
 
 # garante que o projeto esteja no sys.path antes de carregar o Django
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -22,8 +24,11 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'calimag.settings')
 django.setup()
 
 from app.cadastro.models import Instrumento, TipoInstrumento  # noqa: E402  pylint: disable=wrong-import-position
+from app.cadastro.referencias import invalidar_referencias  # noqa: E402  pylint: disable=wrong-import-position
+from app.instrumento.alteracoes import registrar_alteracao  # noqa: E402  pylint: disable=wrong-import-position
 
 VALID_STATUS = {choice[0]: choice[0] for choice in Instrumento.STATUS_CHOICES}
+BATCH_SIZE = 1000
 
 
 def strip_accents(text: str) -> str:
@@ -108,15 +113,33 @@ def clean_row(row: dict[str, str | None]) -> dict[str, str]:
     return cleaned
 
 
-def resolve_tipo(descricao: str | None) -> TipoInstrumento | None:
-    """Localiza ou cria o TipoInstrumento correspondente a descricao fornecida."""
+def load_tipo_cache(descricoes: set[str]) -> dict[str, TipoInstrumento]:
+    """Monta o cache de tipos citados no CSV, criando os ausentes em um unico lote."""
+    if not descricoes:
+        return {}
+    cache = {tipo.descricao: tipo for tipo in TipoInstrumento.objects.filter(descricao__in=descricoes)}
+    missing = descricoes - cache.keys()
+    if missing:
+        TipoInstrumento.objects.bulk_create(
+            [TipoInstrumento(descricao=descricao) for descricao in sorted(missing)],
+            ignore_conflicts=True,
+        )
+        invalidar_referencias(TipoInstrumento)
+        # ignore_conflicts nao devolve as pks; relemos apenas os tipos recem-criados
+        cache.update(
+            (tipo.descricao, tipo) for tipo in TipoInstrumento.objects.filter(descricao__in=missing)
+        )
+    return cache
+
+
+def resolve_tipo(descricao: str | None, cache: dict[str, TipoInstrumento]) -> TipoInstrumento | None:
+    """Localiza no cache o TipoInstrumento correspondente a descricao fornecida."""
     if not descricao:
         return None
-    tipo, _ = TipoInstrumento.objects.get_or_create(descricao=descricao)
-    return tipo
+    return cache.get(descricao)
 
 
-def process_csv(csv_path: Path) -> tuple[int, int, int, int]:
+def process_csv(csv_path: Path, batch_size: int = BATCH_SIZE) -> tuple[int, int, int, int]:
     """Processa o CSV e retorna (criadas, atualizadas, ignoradas, erros)."""
     created = updated = skipped = errors = 0
 
@@ -124,125 +147,169 @@ def process_csv(csv_path: Path) -> tuple[int, int, int, int]:
         reader = csv.DictReader(handle)
         if not reader.fieldnames:
             raise ValueError('CSV sem cabecalho encontrado.')
-
-        with transaction.atomic():
-            for idx, row in enumerate(reader, start=2):  # considera cabecalho na linha 1
-                try:
-                    normalized = clean_row(row)
-                    codigo = normalized.get('codigo')
-                    if not codigo:
-                        skipped += 1
-                        print(f'[linha {idx}] ignorada: campo requerido "codigo" vazio.')
-                        continue
-
-                    descricao_raw = normalized.get('descricao') if 'descricao' in normalized else None
-
-                    tipo_column_present = ('tipo' in normalized) or ('tipoinstrumento' in normalized) or ('tipo_instrumento' in normalized)
-                    tipo_desc = normalized.get('tipo') or normalized.get('tipo_instrumento') or normalized.get('tipoinstrumento')
-                    tipo = resolve_tipo(tipo_desc) if tipo_desc else None
-
-                    controlado_column_present = ('instrumento_controlado' in normalized) or ('controlado' in normalized)
-                    raw_controlado = normalized.get('instrumento_controlado')
-                    if raw_controlado is None:
-                        raw_controlado = normalized.get('controlado')
-                    if controlado_column_present:
-                        controlado_value = None if raw_controlado == '' or raw_controlado is None else parse_bool(raw_controlado, default=False)
-                    else:
-                        controlado_value = None
-
-                    fabricante_present = 'fabricante' in normalized
-                    fabricante_value = normalized.get('fabricante') if fabricante_present else None
-
-                    modelo_present = 'modelo' in normalized
-                    modelo_value = normalized.get('modelo') if modelo_present else None
-
-                    status_present = 'status' in normalized and normalized.get('status') not in {None, ''}
-                    status_value = parse_status(normalized.get('status')) if status_present else None
-
-                    observacoes_present = 'observacoes' in normalized
-                    observacoes_value = normalized.get('observacoes') if observacoes_present else None
-
-                    data_present = 'data_aquisicao' in normalized
-                    raw_data = normalized.get('data_aquisicao') if data_present else None
-                    data_value = parse_date(raw_data) if raw_data else None
-
-                    periodicidade_present = ('periodicidade' in normalized) or ('periodicidade_calibracao' in normalized)
-                    raw_periodicidade = normalized.get('periodicidade')
-                    if raw_periodicidade is None:
-                        raw_periodicidade = normalized.get('periodicidade_calibracao')
-                    periodicidade_value = parse_int(raw_periodicidade) if periodicidade_present else None
-
-                    finalidade = 'finalidade' in normalized
-                    finalidade_value = normalized.get('finalidade') if finalidade else None
-
-                    instrumento = Instrumento.objects.filter(codigo=codigo).select_related('tipo_instrumento').first()
-
-                    if instrumento is None:
-                        Instrumento.objects.create(
-                            codigo=codigo,
-                            descricao=descricao_raw or '',
-                            tipo_instrumento=tipo,
-                            instrumento_controlado=controlado_value if controlado_value is not None else False,
-                            fabricante=(fabricante_value or ''),
-                            modelo=(modelo_value or ''),
-                            status=status_value or parse_status(None),
-                            observacoes=(observacoes_value or ''),
-                            data_aquisicao=data_value,
-                            finalidade=finalidade_value,
-                            periodicidade_calibracao=periodicidade_value if periodicidade_value is not None else Instrumento._meta.get_field('periodicidade_calibracao').default,
-                        )
-                        created += 1
-                        continue
-
-                    update_data: dict[str, object] = {}
-
-                    if descricao_raw and descricao_raw != instrumento.descricao:
-                        update_data['descricao'] = descricao_raw
-
-                    if tipo_column_present:
-                        new_tipo_id = tipo.id if tipo else None
-                        if instrumento.tipo_instrumento_id != new_tipo_id:
-                            update_data['tipo_instrumento_id'] = new_tipo_id
-
-                    if controlado_value is not None and instrumento.instrumento_controlado != controlado_value:
-                        update_data['instrumento_controlado'] = controlado_value
-
-                    if fabricante_present:
-                        novo_fabricante = (fabricante_value or '')
-                        if (instrumento.fabricante or '') != novo_fabricante:
-                            update_data['fabricante'] = novo_fabricante
-
-                    if modelo_present:
-                        novo_modelo = (modelo_value or '')
-                        if (instrumento.modelo or '') != novo_modelo:
-                            update_data['modelo'] = novo_modelo
-
-                    if status_present and status_value is not None and instrumento.status != status_value:
-                        update_data['status'] = status_value
-
-                    if observacoes_present:
-                        novas_observacoes = (observacoes_value or '')
-                        if (instrumento.observacoes or '') != novas_observacoes:
-                            update_data['observacoes'] = novas_observacoes
-
-                    if data_present:
-                        new_date = data_value if raw_data else None
-                        if instrumento.data_aquisicao != new_date:
-                            update_data['data_aquisicao'] = new_date
-
-                    if periodicidade_present and periodicidade_value is not None:
-                        if instrumento.periodicidade_calibracao != periodicidade_value:
-                            update_data['periodicidade_calibracao'] = periodicidade_value
-
-                    if update_data:
-                        Instrumento.objects.filter(pk=instrumento.pk).update(**update_data)
-                        updated += 1
-                    else:
-                        skipped += 1
-                        print(f'[linha {idx}] ignorada: nenhuma alteracao para o codigo "{codigo}".')
-                except Exception as exc:  # pylint: disable=broad-except
-                    errors += 1
-                    print(f'[linha {idx}] erro inesperado: {exc}')
+        rows: list[tuple[int, dict[str, str]]] = []
+        for idx, row in enumerate(reader, start=2):  # considera cabecalho na linha 1
+            try:
+                rows.append((idx, clean_row(row)))
+            except Exception as exc:  # pylint: disable=broad-except
+                errors += 1
+                print(f'[linha {idx}] erro inesperado: {exc}')
+
+    codigos = {normalized['codigo'] for _, normalized in rows if normalized.get('codigo')}
+    tipo_descricoes = {
+        tipo_desc
+        for _, normalized in rows
+        if (tipo_desc := normalized.get('tipo') or normalized.get('tipo_instrumento') or normalized.get('tipoinstrumento'))
+    }
+
+    with transaction.atomic():
+        tipo_cache = load_tipo_cache(tipo_descricoes)
+        instrumentos = {
+            instrumento.codigo: instrumento
+            for instrumento in Instrumento.objects.filter(codigo__in=codigos)
+        }
+        default_periodicidade = Instrumento._meta.get_field('periodicidade_calibracao').default
+
+        to_create: dict[str, Instrumento] = {}
+        to_update: dict[int, Instrumento] = {}
+        update_fields: set[str] = set()
+
+        for idx, normalized in rows:
+            try:
+                codigo = normalized.get('codigo')
+                if not codigo:
+                    skipped += 1
+                    print(f'[linha {idx}] ignorada: campo requerido "codigo" vazio.')
+                    continue
+
+                descricao_raw = normalized.get('descricao') if 'descricao' in normalized else None
+
+                tipo_column_present = ('tipo' in normalized) or ('tipoinstrumento' in normalized) or ('tipo_instrumento' in normalized)
+                tipo_desc = normalized.get('tipo') or normalized.get('tipo_instrumento') or normalized.get('tipoinstrumento')
+                tipo = resolve_tipo(tipo_desc, tipo_cache) if tipo_desc else None
+
+                controlado_column_present = ('instrumento_controlado' in normalized) or ('controlado' in normalized)
+                raw_controlado = normalized.get('instrumento_controlado')
+                if raw_controlado is None:
+                    raw_controlado = normalized.get('controlado')
+                if controlado_column_present:
+                    controlado_value = None if raw_controlado == '' or raw_controlado is None else parse_bool(raw_controlado, default=False)
+                else:
+                    controlado_value = None
+
+                fabricante_present = 'fabricante' in normalized
+                fabricante_value = normalized.get('fabricante') if fabricante_present else None
+
+                modelo_present = 'modelo' in normalized
+                modelo_value = normalized.get('modelo') if modelo_present else None
+
+                status_present = 'status' in normalized and normalized.get('status') not in {None, ''}
+                status_value = parse_status(normalized.get('status')) if status_present else None
+
+                observacoes_present = 'observacoes' in normalized
+                observacoes_value = normalized.get('observacoes') if observacoes_present else None
+
+                data_present = 'data_aquisicao' in normalized
+                raw_data = normalized.get('data_aquisicao') if data_present else None
+                data_value = parse_date(raw_data) if raw_data else None
+
+                periodicidade_present = ('periodicidade' in normalized) or ('periodicidade_calibracao' in normalized)
+                raw_periodicidade = normalized.get('periodicidade')
+                if raw_periodicidade is None:
+                    raw_periodicidade = normalized.get('periodicidade_calibracao')
+                periodicidade_value = parse_int(raw_periodicidade) if periodicidade_present else None
+
+                finalidade = 'finalidade' in normalized
+                finalidade_value = normalized.get('finalidade') if finalidade else None
+
+                instrumento = instrumentos.get(codigo)
+
+                if instrumento is None:
+                    instrumento = Instrumento(
+                        codigo=codigo,
+                        descricao=descricao_raw or '',
+                        tipo_instrumento=tipo,
+                        instrumento_controlado=controlado_value if controlado_value is not None else False,
+                        fabricante=(fabricante_value or ''),
+                        modelo=(modelo_value or ''),
+                        status=status_value or parse_status(None),
+                        observacoes=(observacoes_value or ''),
+                        data_aquisicao=data_value,
+                        finalidade=(finalidade_value or ''),
+                        periodicidade_calibracao=periodicidade_value if periodicidade_value is not None else default_periodicidade,
+                    )
+                    instrumentos[codigo] = to_create[codigo] = instrumento
+                    created += 1
+                    continue
+
+                update_data: dict[str, object] = {}
+
+                if descricao_raw and descricao_raw != instrumento.descricao:
+                    update_data['descricao'] = descricao_raw
+
+                if tipo_column_present:
+                    new_tipo_id = tipo.id if tipo else None
+                    if instrumento.tipo_instrumento_id != new_tipo_id:
+                        update_data['tipo_instrumento_id'] = new_tipo_id
+
+                if controlado_value is not None and instrumento.instrumento_controlado != controlado_value:
+                    update_data['instrumento_controlado'] = controlado_value
+
+                if fabricante_present:
+                    novo_fabricante = (fabricante_value or '')
+                    if (instrumento.fabricante or '') != novo_fabricante:
+                        update_data['fabricante'] = novo_fabricante
+
+                if modelo_present:
+                    novo_modelo = (modelo_value or '')
+                    if (instrumento.modelo or '') != novo_modelo:
+                        update_data['modelo'] = novo_modelo
+
+                if status_present and status_value is not None and instrumento.status != status_value:
+                    update_data['status'] = status_value
+
+                if observacoes_present:
+                    novas_observacoes = (observacoes_value or '')
+                    if (instrumento.observacoes or '') != novas_observacoes:
+                        update_data['observacoes'] = novas_observacoes
+
+                if data_present:
+                    new_date = data_value if raw_data else None
+                    if instrumento.data_aquisicao != new_date:
+                        update_data['data_aquisicao'] = new_date
+
+                if periodicidade_present and periodicidade_value is not None:
+                    if instrumento.periodicidade_calibracao != periodicidade_value:
+                        update_data['periodicidade_calibracao'] = periodicidade_value
+
+                if update_data:
+                    for field, value in update_data.items():
+                        setattr(instrumento, field, value)
+                    # linhas repetidas de um codigo ainda nao gravado apenas ajustam o objeto pendente
+                    if codigo not in to_create:
+                        to_update[instrumento.pk] = instrumento
+                        update_fields.update(update_data)
+                    updated += 1
+                else:
+                    skipped += 1
+                    print(f'[linha {idx}] ignorada: nenhuma alteracao para o codigo "{codigo}".')
+            except Exception as exc:  # pylint: disable=broad-except
+                errors += 1
+                print(f'[linha {idx}] erro inesperado: {exc}')
+
+        if to_create:
+            Instrumento.objects.bulk_create(to_create.values(), batch_size=batch_size)
+        if to_update:
+            # bulk_update nao aplica auto_now; data_atualizacao versiona as APIs de referencia
+            agora = timezone.now()
+            for instrumento in to_update.values():
+                instrumento.data_atualizacao = agora
+            update_fields.add('data_atualizacao')
+            Instrumento.objects.bulk_update(to_update.values(), sorted(update_fields), batch_size=batch_size)
+        # bulk_create/bulk_update nao disparam sinais; alimenta o feed incremental da PMC
+        registrar_alteracao([instrumento.pk for instrumento in to_create.values()] + list(to_update))
+        if to_create or to_update:
+            invalidar_referencias(Instrumento)
 
     return created, updated, skipped, errors
 
@@ -257,18 +324,28 @@ def main() -> None:
         )
     )
     parser.add_argument('csv_path', help='Caminho para o arquivo CSV a ser processado.')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=BATCH_SIZE,
+        help=f'Quantidade de instrumentos gravados por comando (padrao {BATCH_SIZE}).',
+    )
     args = parser.parse_args()
 
     csv_file = Path(args.csv_path).expanduser().resolve()
     if not csv_file.exists():
         parser.error(f'Arquivo nao encontrado: {csv_file}')
 
-    created, updated, skipped, errors = process_csv(csv_file)
+    started = time.perf_counter()
+    created, updated, skipped, errors = process_csv(csv_file, max(1, args.batch_size))
+    elapsed = time.perf_counter() - started
+    total = created + updated + skipped + errors
     print('\nResumo:')
     print(f'  Criados : {created}')
     print(f'  Atualizados : {updated}')
     print(f'  Ignorados : {skipped}')
     print(f'  Erros : {errors}')
+    print(f'  Vazao : {total / elapsed if elapsed else total:.0f} linhas/s ({total} linhas em {elapsed:.2f}s)')
 
 
 if __name__ == '__main__':
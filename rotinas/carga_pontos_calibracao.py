@@ -21,6 +21,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'calimag.settings')
 django.setup()
 
 from app.cadastro.models import Instrumento, PontoCalibracao  # noqa: E402  pylint: disable=wrong-import-position
+from app.instrumento.alteracoes import registrar_alteracao  # noqa: E402  pylint: disable=wrong-import-position
 
 
 CSV_COLUMNS = {
@@ -35,6 +36,18 @@ CSV_COLUMNS = {
     'periodicidade': {'aliases': {'periodicidade', 'periodicidade_dias', 'periodo'}},
 }
 
+PAYLOAD_FIELDS = (
+    'descricao',
+    'valor_minimo',
+    'valor_maximo',
+    'valor_nominal',
+    'unidade',
+    'tolerancia_menos',
+    'tolerancia_mais',
+    'ativo',
+)
+BATCH_SIZE = 1000
+
 
 def strip_accents(text: str) -> str:
     return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
@@ -88,24 +101,36 @@ def calc_valor_nominal(min_value: Decimal | None, max_value: Decimal | None) ->
     return min_value or max_value
 
 
-def upsert_ponto(instrumento: Instrumento, sequencia: int, payload: dict[str, object]) -> tuple[bool, bool]:
-    ponto, created = PontoCalibracao.objects.get_or_create(
-        instrumento=instrumento,
-        sequencia=sequencia,
-        defaults=payload,
+def load_instrument_map(codigos: set[str]) -> dict[str, int]:
+    """Carrega de uma vez o id de todos os instrumentos citados no CSV."""
+    return dict(
+        Instrumento.objects.filter(codigo__in=codigos).values_list('codigo', 'id')
     )
-    if created:
-        return True, False
 
-    changed = False
-    for field, value in payload.items():
-        if getattr(ponto, field) != value:
-            setattr(ponto, field, value)
-            changed = True
 
-    if changed:
-        ponto.save(update_fields=list(payload.keys()))
-    return False, changed
+def load_existing_pontos(instrumento_ids: set[int]) -> dict[tuple[int, int], dict[str, object]]:
+    """Retorna os pontos ja cadastrados indexados por (instrumento_id, sequencia)."""
+    existing: dict[tuple[int, int], dict[str, object]] = {}
+    rows = PontoCalibracao.objects.filter(instrumento_id__in=instrumento_ids).values(
+        'instrumento_id', 'sequencia', *PAYLOAD_FIELDS
+    )
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        key = (row.pop('instrumento_id'), row.pop('sequencia'))
+        existing[key] = row
+    return existing
+
+
+def bulk_upsert_pontos(pontos: list[PontoCalibracao], batch_size: int = BATCH_SIZE) -> None:
+    """Grava inserts e updates em lotes com INSERT ... ON CONFLICT DO UPDATE."""
+    for start in range(0, len(pontos), batch_size):
+        PontoCalibracao.objects.bulk_create(
+            pontos[start:start + batch_size],
+            update_conflicts=True,
+            unique_fields=['instrumento', 'sequencia'],
+            update_fields=[*PAYLOAD_FIELDS, 'data_atualizacao'],
+        )
+    # bulk_create nao dispara sinais; alimenta o feed incremental da PMC
+    registrar_alteracao({ponto.instrumento_id for ponto in pontos})
 
 
 def detect_delimiter(first_line: str) -> str:
@@ -118,7 +143,7 @@ def detect_delimiter(first_line: str) -> str:
     return ','
 
 
-def process_csv(csv_path: Path) -> tuple[int, int, int, int]:
+def process_csv(csv_path: Path, batch_size: int = BATCH_SIZE) -> tuple[int, int, int, int]:
     created = updated = skipped = errors = 0
 
     with csv_path.open('r', encoding='utf-8-sig', newline='') as handle:
@@ -130,54 +155,67 @@ def process_csv(csv_path: Path) -> tuple[int, int, int, int]:
         if not reader.fieldnames:
             raise ValueError('CSV sem cabecalho encontrado.')
 
-        with transaction.atomic():
-            for idx, row in enumerate(reader, start=2):
-                try:
-                    normalized = clean_row(row)
-                    codigo = normalized.get('codigo')
-                    seq_val = parse_int(normalized.get('sequencia'))
-
-                    if not codigo or seq_val is None:
-                        skipped += 1
-                        print(f'[linha {idx}] ignorada: codigo ou sequencia ausentes.')
-                        continue
-
-                    instrumento = Instrumento.objects.filter(codigo=codigo).first()
-                    if instrumento is None:
-                        skipped += 1
-                        print(f'[linha {idx}] ignorada: instrumento "{codigo}" nao encontrado.')
-                        continue
-
-                    descricao = normalized.get('descricao') or ''
-                    valor_min = parse_decimal(normalized.get('nominal_min'))
-                    valor_max = parse_decimal(normalized.get('nominal_max'))
-                    unidade = normalized.get('unidade') or 'outro'
-                    tolerancia_menos = parse_decimal(normalized.get('tolerancia_min'))
-                    tolerancia_mais = parse_decimal(normalized.get('tolerancia_max'))
-
-                    valor_nominal = calc_valor_nominal(valor_min, valor_max)
-
-                    payload = {
-                        'descricao': descricao or f'Ponto {seq_val}',
-                        'valor_minimo': valor_min,
-                        'valor_maximo': valor_max,
-                        'valor_nominal': valor_nominal,
-                        'unidade': unidade,
-                        'tolerancia_menos': tolerancia_menos,
-                        'tolerancia_mais': tolerancia_mais,
-                        'ativo': True,
-                    }
-
-                    was_created, was_updated = upsert_ponto(instrumento, seq_val, payload)
-                    if was_created:
-                        created += 1
-                    elif was_updated:
-                        updated += 1
-                    else:
-                        skipped += 1
-                except Exception as exc:  # pylint: disable=broad-except
-                    errors += 1
-                    print(f'[linha {idx}] erro inesperado: {exc}')
+        # primeira passada: valida e monta o payload de cada linha sem tocar no banco
+        parsed: dict[tuple[str, int], tuple[int, dict[str, object]]] = {}
+        for idx, row in enumerate(reader, start=2):
+            try:
+                normalized = clean_row(row)
+                codigo = normalized.get('codigo')
+                seq_val = parse_int(normalized.get('sequencia'))
+
+                if not codigo or seq_val is None:
+                    skipped += 1
+                    print(f'[linha {idx}] ignorada: codigo ou sequencia ausentes.')
+                    continue
+
+                valor_min = parse_decimal(normalized.get('nominal_min'))
+                valor_max = parse_decimal(normalized.get('nominal_max'))
+
+                payload = {
+                    'descricao': normalized.get('descricao') or f'Ponto {seq_val}',
+                    'valor_minimo': valor_min,
+                    'valor_maximo': valor_max,
+                    'valor_nominal': calc_valor_nominal(valor_min, valor_max),
+                    'unidade': normalized.get('unidade') or 'outro',
+                    'tolerancia_menos': parse_decimal(normalized.get('tolerancia_min')),
+                    'tolerancia_mais': parse_decimal(normalized.get('tolerancia_max')),
+                    'ativo': True,
+                }
+
+                key = (codigo, seq_val)
+                if key in parsed:
+                    # a mesma chave nao pode aparecer duas vezes no mesmo ON CONFLICT
+                    skipped += 1
+                    print(f'[linha {parsed[key][0]}] ignorada: sobrescrita pela linha {idx}.')
+                parsed[key] = (idx, payload)
+            except Exception as exc:  # pylint: disable=broad-except
+                errors += 1
+                print(f'[linha {idx}] erro inesperado: {exc}')
+
+    instrument_map = load_instrument_map({codigo for codigo, _ in parsed})
+    existing = load_existing_pontos(set(instrument_map.values()))
+
+    to_write: list[PontoCalibracao] = []
+    for (codigo, seq_val), (idx, payload) in parsed.items():
+        instrumento_id = instrument_map.get(codigo)
+        if instrumento_id is None:
+            skipped += 1
+            print(f'[linha {idx}] ignorada: instrumento "{codigo}" nao encontrado.')
+            continue
+
+        current = existing.get((instrumento_id, seq_val))
+        if current is None:
+            created += 1
+        elif any(current[field] != value for field, value in payload.items()):
+            updated += 1
+        else:
+            skipped += 1
+            continue
+
+        to_write.append(PontoCalibracao(instrumento_id=instrumento_id, sequencia=seq_val, **payload))
+
+    with transaction.atomic():
+        bulk_upsert_pontos(to_write, batch_size)
 
     return created, updated, skipped, errors
 
@@ -192,13 +230,19 @@ def main() -> None:
         )
     )
     parser.add_argument('csv_path', help='Caminho para o arquivo CSV contendo os pontos.')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=BATCH_SIZE,
+        help=f'Quantidade de pontos gravados por comando (padrao {BATCH_SIZE}).',
+    )
     args = parser.parse_args()
 
     csv_file = Path(args.csv_path).expanduser().resolve()
     if not csv_file.exists():
         parser.error(f'Arquivo nao encontrado: {csv_file}')
 
-    created, updated, skipped, errors = process_csv(csv_file)
+    created, updated, skipped, errors = process_csv(csv_file, max(1, args.batch_size))
     print('\nResumo:')
     print(f'  Criados : {created}')
     print(f'  Atualizados : {updated}')
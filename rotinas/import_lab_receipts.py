@@ -10,6 +10,7 @@ import io
 import os
 import sys
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Iterable, List, Optional, Sequence
 
@@ -25,7 +26,22 @@ django.setup()
 from django.db import transaction  # noqa: E402  pylint: disable=wrong-import-position
 from django.utils import timezone  # noqa: E402  pylint: disable=wrong-import-position
 
-from app.cadastro.models import Instrumento  # noqa: E402  pylint: disable=wrong-import-position
+from app.cadastro.importacao import (  # noqa: E402  pylint: disable=wrong-import-position
+    LEDGER_CHUNK_SIZE,
+    PartitionResult,
+    ValidationReport,
+    apply_with_ledger,
+    check_duplicates,
+    file_fingerprint,
+    finish_ledger,
+    lookup_instrumentos,
+    normalize_lookup,
+    partition_records,
+    row_hash,
+    run_partitioned,
+    start_ledger,
+)
+from app.cadastro.models import ImportacaoArquivo, Instrumento  # noqa: E402  pylint: disable=wrong-import-position
 from app.instrumento.models import (  # noqa: E402  pylint: disable=wrong-import-position
     CertificadoCalibracao,
     StatusInstrumento,
@@ -49,6 +65,7 @@ OPTIONAL_ALIASES = {
     "laboratorio": {"laboratorio", "lab", "laboratory"},
     "observacoes": {"observacoes", "obs", "comentario"},
 }
+ROTINA = "import_lab_receipts"
 
 
 @dataclass
@@ -59,6 +76,8 @@ class CsvRecord:
     recebimento: timezone.datetime
     laboratorio: str
     observacoes: str
+    hash_conteudo: str = ""
+    data_csv: str = ""  # celula original; vazia quando a data aplicada e a da importacao
 
 
 def detect_delimiter(sample_line: str) -> str:
@@ -118,11 +137,13 @@ def iter_rows(reader: Iterable[Sequence[str]]) -> Iterable[tuple[int, List[str]]
         yield line_number, [cell.strip() for cell in row]
 
 
-def parse_csv(path: Path, delimiter: Optional[str]) -> List[CsvRecord]:
+def parse_csv(path: Path, delimiter: Optional[str], report: ValidationReport) -> List[CsvRecord]:
     text = load_text(path)
     sample_line = next((line for line in text.splitlines() if line.strip()), "")
     csv_delimiter = delimiter or detect_delimiter(sample_line)
     reader = csv.reader(io.StringIO(text), delimiter=csv_delimiter)
+    # Linha sem data recebe a hora da importacao: no ledger ela so vale para este arquivo.
+    fingerprint = file_fingerprint(path)
 
     records: List[CsvRecord] = []
     indexes = None
@@ -145,7 +166,7 @@ def parse_csv(path: Path, delimiter: Optional[str]) -> List[CsvRecord]:
         if link_idx is not None and len(row) > link_idx:
             link = row[link_idx]
         raw_date = row[indexes["data_recebimento"]] if len(row) > indexes["data_recebimento"] else ""
-        recebimento = parse_date(raw_date) or timezone.now()
+        recebimento = parse_date(raw_date)
         laboratorio = ""
         obs = ""
         lab_idx = indexes.get("laboratorio")
@@ -155,19 +176,42 @@ def parse_csv(path: Path, delimiter: Optional[str]) -> List[CsvRecord]:
         if obs_idx is not None and len(row) > obs_idx:
             obs = row[obs_idx]
         if not codigo:
-            raise ValueError(f"Linha {line_number}: codigo e obrigatorio")
-        records.append(CsvRecord(line=line_number, codigo=codigo, link=link, recebimento=recebimento, laboratorio=laboratorio, observacoes=obs))
+            report.add(line_number, "codigo e obrigatorio")
+        if raw_date and recebimento is None:
+            report.add(line_number, f"data de recebimento invalida ({raw_date})")
+        if report.has_error(line_number):
+            continue
+        records.append(
+            CsvRecord(
+                line=line_number,
+                codigo=codigo,
+                link=link,
+                recebimento=recebimento or timezone.now(),
+                laboratorio=laboratorio,
+                observacoes=obs,
+                hash_conteudo=row_hash([codigo.lower(), link, raw_date or fingerprint, laboratorio.lower(), obs]),
+                data_csv=raw_date.strip(),
+            )
+        )
     return records
 
 
-def register_receipt(record: CsvRecord, dry_run: bool) -> None:
-    instrumento = Instrumento.objects.filter(codigo__iexact=record.codigo.strip()).first()
-    if not instrumento:
-        raise ValueError(f"Instrumento '{record.codigo}' nao encontrado")
+def validate_records(records: List[CsvRecord], report: ValidationReport) -> dict:
+    """Valida o arquivo inteiro com uma consulta IN e devolve os instrumentos resolvidos."""
+    check_duplicates(
+        report,
+        ((record.line, (normalize_lookup(record.codigo), record.data_csv)) for record in records),
+        "recebimento repetido para o mesmo instrumento e data",
+    )
+    instrumentos = lookup_instrumentos(record.codigo for record in records)
+    for record in records:
+        if normalize_lookup(record.codigo) not in instrumentos:
+            report.add(record.line, f"Instrumento '{record.codigo}' nao encontrado")
+    return instrumentos
+
+
+def register_receipt(record: CsvRecord, instrumento: Instrumento) -> None:
     lab_name = record.laboratorio.strip() or "externo"
-    if dry_run:
-        print(f"[DRY-RUN] {instrumento.codigo} recebido em {record.recebimento.date()} (lab {lab_name})")
-        return
     with transaction.atomic():
         last_sent = (
             StatusInstrumento.objects.filter(
@@ -196,11 +240,51 @@ def register_receipt(record: CsvRecord, dry_run: bool) -> None:
     print(f"OK linha {record.line}: {instrumento.codigo} recebido ({lab_name})")
 
 
+def apply_partition(
+    records: List[CsvRecord],
+    *,
+    arquivo: ImportacaoArquivo,
+    instrumentos: dict,
+    chunk_size: int,
+    track_offset: bool = False,
+) -> PartitionResult:
+    """Aplica um grupo de linhas (todas de um mesmo conjunto de instrumentos) pelo ledger."""
+    failures: List[str] = []
+
+    def on_error(record: CsvRecord, exc: Exception) -> None:
+        failures.append(f"Linha {record.line}: {exc}")
+        print(f"ERRO linha {record.line}: {exc}")
+
+    applied, already = apply_with_ledger(
+        arquivo,
+        records,
+        lambda record: register_receipt(record, instrumentos[normalize_lookup(record.codigo)]),
+        line_of=lambda record: record.line,
+        hash_of=lambda record: record.hash_conteudo,
+        on_error=on_error,
+        chunk_size=chunk_size,
+        track_offset=track_offset,
+    )
+    return PartitionResult(applied=applied, already=already, failures=failures)
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Importa recebimentos de laboratório a partir de um CSV.")
     parser.add_argument("csv_path", type=Path, help="Arquivo CSV com colunas codigo, data_recebimento e link_certificado opcional")
     parser.add_argument("--delimiter", dest="delimiter", help="Delimitador (auto detect quando omitido)")
     parser.add_argument("--dry-run", action="store_true", help="Valida sem gravar no banco")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=LEDGER_CHUNK_SIZE,
+        help=f"Linhas confirmadas por transacao; uma carga interrompida retoma do ultimo lote (padrao {LEDGER_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos em paralelo; as linhas sao divididas por instrumento, mantendo a ordem de cada um (padrao 1)",
+    )
     return parser
 
 
@@ -210,23 +294,44 @@ def main() -> None:
     if not args.csv_path.exists():
         parser.error(f"Arquivo {args.csv_path} nao encontrado")
 
-    records = parse_csv(args.csv_path, args.delimiter)
-    if not records:
+    report = ValidationReport()
+    records = parse_csv(args.csv_path, args.delimiter, report)
+    if not records and not report:
         print("Nenhuma linha valida encontrada.")
         return
 
-    success = 0
-    failures: List[str] = []
-    for record in records:
-        try:
-            register_receipt(record, args.dry_run)
-            success += 1
-        except Exception as exc:  # pylint: disable=broad-except
-            failures.append(f"Linha {record.line}: {exc}")
-            print(f"ERRO linha {record.line}: {exc}")
+    total = len(records) + report.error_rows  # linhas descartadas na leitura nao viram registros
+    instrumentos = validate_records(records, report)
+    valid_records = [record for record in records if not report.has_error(record.line)]
+
+    if args.dry_run:
+        for record in valid_records:
+            lab_name = record.laboratorio.strip() or "externo"
+            print(f"[DRY-RUN] {record.codigo} recebido em {record.recebimento.date()} (lab {lab_name})")
+        print("")
+        print(f"Validadas: {total} | Validas: {len(valid_records)} | Com erro: {report.error_rows}")
+        for item in report.lines():
+            print(f" - {item}")
+        return
+
+    arquivo = start_ledger(ROTINA, args.csv_path, total)
+    if arquivo.ultima_linha:
+        print(f"Retomando importacao deste arquivo a partir da linha {arquivo.ultima_linha + 1}")
+
+    worker = partial(apply_partition, arquivo=arquivo, instrumentos=instrumentos, chunk_size=max(1, args.chunk_size))
+    if args.workers > 1:
+        partitions = partition_records(valid_records, lambda record: normalize_lookup(record.codigo), args.workers)
+        print(f"Aplicando {len(valid_records)} linhas em {len(partitions)} particoes ({args.workers} processos)")
+        result = run_partitioned(worker, partitions, args.workers)
+        finish_ledger(arquivo, valid_records, line_of=lambda record: record.line, failed=bool(result.failures))
+    else:
+        result = worker(valid_records, track_offset=True)
+
+    failures: List[str] = report.lines() + result.failures
+    success, already = result.applied, result.already
 
     print("")
-    print(f"Processadas: {len(records)} | Sucesso: {success} | Falhas: {len(failures)}")
+    print(f"Processadas: {total} | Sucesso: {success} | Ja aplicadas: {already} | Falhas: {len(failures)}")
     if failures:
         print("Falhas detalhadas:")
         for item in failures:
@@ -9,6 +9,7 @@ import io
 import os
 import sys
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Iterable, List, Optional, Sequence
 import datetime as dt
@@ -25,7 +26,23 @@ django.setup()
 from django.db import transaction  # noqa: E402  pylint: disable=wrong-import-position
 from django.utils import timezone  # noqa: E402  pylint: disable=wrong-import-position
 
-from app.cadastro.models import Instrumento, Laboratorio  # noqa: E402  pylint: disable=wrong-import-position
+from app.cadastro.importacao import (  # noqa: E402  pylint: disable=wrong-import-position
+    LEDGER_CHUNK_SIZE,
+    PartitionResult,
+    ValidationReport,
+    apply_with_ledger,
+    check_duplicates,
+    file_fingerprint,
+    finish_ledger,
+    lookup_instrumentos,
+    lookup_laboratorios,
+    normalize_lookup,
+    partition_records,
+    row_hash,
+    run_partitioned,
+    start_ledger,
+)
+from app.cadastro.models import ImportacaoArquivo, Instrumento, Laboratorio  # noqa: E402  pylint: disable=wrong-import-position
 from app.instrumento.models import (  # noqa: E402  pylint: disable=wrong-import-position
     FuncionarioInstrumento,
     StatusInstrumento,
@@ -44,6 +61,7 @@ MANDATORY_ALIASES = {
     "laboratorio": {"laboratorio", "lab", "laboratory"},
     "data_envio": {"dataenvio", "data", "envio", "dataentrega"},
 }
+ROTINA = "import_lab_shipments"
 
 
 @dataclass
@@ -52,6 +70,8 @@ class CsvRecord:
     instrumento: str
     laboratorio: str
     envio: timezone.datetime
+    hash_conteudo: str = ""
+    data_csv: str = ""  # celula original; vazia quando a data aplicada e --default-date ou a da importacao
 
 
 def detect_delimiter(sample_line: str) -> str:
@@ -111,11 +131,18 @@ def iter_rows(reader: Iterable[Sequence[str]]) -> Iterable[tuple[int, List[str]]
         yield line_number, [cell.strip() for cell in row]
 
 
-def parse_csv(path: Path, default_date: Optional[timezone.datetime], delimiter: Optional[str]) -> List[CsvRecord]:
+def parse_csv(
+    path: Path,
+    default_date: Optional[timezone.datetime],
+    delimiter: Optional[str],
+    report: ValidationReport,
+) -> List[CsvRecord]:
     text = load_text(path)
     sample_line = next((line for line in text.splitlines() if line.strip()), "")
     csv_delimiter = delimiter or detect_delimiter(sample_line)
     reader = csv.reader(io.StringIO(text), delimiter=csv_delimiter)
+    # Linha sem data usa --default-date ou a hora da importacao: no ledger ela so vale para este arquivo.
+    fingerprint = file_fingerprint(path)
 
     records: List[CsvRecord] = []
     indexes = None
@@ -133,16 +160,50 @@ def parse_csv(path: Path, default_date: Optional[timezone.datetime], delimiter:
         instrumento = row[indexes["instrumento"]] if len(row) > indexes["instrumento"] else ""
         laboratorio = row[indexes["laboratorio"]] if len(row) > indexes["laboratorio"] else ""
         raw_date = row[indexes["data_envio"]] if indexes.get("data_envio") is not None and len(row) > indexes["data_envio"] else ""
-        send_date = parse_date(raw_date) or default_date or timezone.now()
-        records.append(CsvRecord(line=line_number, instrumento=instrumento, laboratorio=laboratorio, envio=send_date))
+        if not instrumento:
+            report.add(line_number, "instrumento e obrigatorio")
+        parsed_date = parse_date(raw_date)
+        if raw_date and parsed_date is None:
+            report.add(line_number, f"data de envio invalida ({raw_date})")
+        if report.has_error(line_number):
+            continue
+        send_date = parsed_date or default_date or timezone.now()
+        records.append(
+            CsvRecord(
+                line=line_number,
+                instrumento=instrumento,
+                laboratorio=laboratorio,
+                envio=send_date,
+                hash_conteudo=row_hash([instrumento.lower(), laboratorio.lower(), raw_date or fingerprint]),
+                data_csv=raw_date.strip(),
+            )
+        )
     return records
 
 
-def ensure_laboratorio(name: str) -> Laboratorio:
-    lab = Laboratorio.objects.filter(nome__iexact=name.strip()).first()
-    if lab:
-        return lab
-    return Laboratorio.objects.create(nome=name.strip() or "externo")
+def validate_records(records: List[CsvRecord], report: ValidationReport) -> tuple[dict, dict]:
+    """Valida o arquivo inteiro com consultas IN e devolve (instrumentos, laboratorios) resolvidos."""
+    check_duplicates(
+        report,
+        ((record.line, (normalize_lookup(record.instrumento), record.data_csv)) for record in records),
+        "envio repetido para o mesmo instrumento e data",
+    )
+    instrumentos = lookup_instrumentos(record.instrumento for record in records)
+    laboratorios = lookup_laboratorios(record.laboratorio.strip() or "externo" for record in records)
+    for record in records:
+        if normalize_lookup(record.instrumento) not in instrumentos:
+            report.add(record.line, f"Instrumento '{record.instrumento}' nao encontrado")
+    return instrumentos, laboratorios
+
+
+def ensure_laboratorios(records: List[CsvRecord], laboratorios: dict) -> None:
+    """Cria de uma vez os laboratorios citados no arquivo que ainda nao existem."""
+    missing = {}
+    for record in records:
+        name = record.laboratorio.strip() or "externo"
+        missing.setdefault(normalize_lookup(name), name)
+    for key in set(missing) - set(laboratorios):
+        laboratorios[key] = Laboratorio.objects.create(nome=missing[key])
 
 
 def close_open_statuses(instrumento: Instrumento, timestamp: timezone.datetime) -> None:
@@ -158,14 +219,7 @@ def close_open_statuses(instrumento: Instrumento, timestamp: timezone.datetime)
         last_without_receb.save(update_fields=["data_recebimento"])
 
 
-def register_send(record: CsvRecord, dry_run: bool) -> None:
-    instrumento = Instrumento.objects.filter(codigo__iexact=record.instrumento.strip()).first()
-    if not instrumento:
-        raise ValueError(f"Instrumento '{record.instrumento}' nao encontrado")
-    lab = ensure_laboratorio(record.laboratorio)
-    if dry_run:
-        print(f"[DRY-RUN] {instrumento.codigo} -> {lab.nome} ({record.envio.isoformat()})")
-        return
+def register_send(record: CsvRecord, instrumento: Instrumento, lab: Laboratorio) -> None:
     with transaction.atomic():
         close_open_statuses(instrumento, record.envio)
         StatusInstrumento.objects.create(
@@ -180,6 +234,39 @@ def register_send(record: CsvRecord, dry_run: bool) -> None:
     print(f"OK linha {record.line}: {instrumento.codigo} enviado para {lab.nome} em {record.envio.date()}")
 
 
+def apply_partition(
+    records: List[CsvRecord],
+    *,
+    arquivo: ImportacaoArquivo,
+    instrumentos: dict,
+    laboratorios: dict,
+    chunk_size: int,
+    track_offset: bool = False,
+) -> PartitionResult:
+    """Aplica um grupo de linhas (todas de um mesmo conjunto de instrumentos) pelo ledger."""
+    failures: List[str] = []
+
+    def apply(record: CsvRecord) -> None:
+        lab = laboratorios[normalize_lookup(record.laboratorio.strip() or "externo")]
+        register_send(record, instrumentos[normalize_lookup(record.instrumento)], lab)
+
+    def on_error(record: CsvRecord, exc: Exception) -> None:
+        failures.append(f"Linha {record.line}: {exc}")
+        print(f"ERRO linha {record.line}: {exc}")
+
+    applied, already = apply_with_ledger(
+        arquivo,
+        records,
+        apply,
+        line_of=lambda record: record.line,
+        hash_of=lambda record: record.hash_conteudo,
+        on_error=on_error,
+        chunk_size=chunk_size,
+        track_offset=track_offset,
+    )
+    return PartitionResult(applied=applied, already=already, failures=failures)
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Importa envios para laboratorio a partir de um CSV.")
     parser.add_argument("csv_path", type=Path, help="Caminho do arquivo CSV com as colunas instrumento,laboratorio,data_envio")
@@ -190,6 +277,18 @@ def build_arg_parser() -> argparse.ArgumentParser:
         help="Data padrao (dd/mm/aaaa) usada quando a coluna data_envio estiver vazia",
     )
     parser.add_argument("--dry-run", action="store_true", help="Apenas valida o arquivo sem gravar no banco")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=LEDGER_CHUNK_SIZE,
+        help=f"Linhas confirmadas por transacao; uma carga interrompida retoma do ultimo lote (padrao {LEDGER_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos em paralelo; as linhas sao divididas por instrumento, mantendo a ordem de cada um (padrao 1)",
+    )
     return parser
 
 
@@ -203,23 +302,52 @@ def main() -> None:
     if args.default_date and default_date is None:
         parser.error("Nao foi possivel interpretar --default-date. Use formatos como 18/02/2025.")
 
-    records = parse_csv(args.csv_path, default_date, args.delimiter)
-    if not records:
+    report = ValidationReport()
+    records = parse_csv(args.csv_path, default_date, args.delimiter, report)
+    if not records and not report:
         print("Nenhuma linha valida encontrada.")
         return
 
-    success = 0
-    failures: List[str] = []
-    for record in records:
-        try:
-            register_send(record, args.dry_run)
-            success += 1
-        except Exception as exc:  # pylint: disable=broad-except
-            failures.append(f"Linha {record.line}: {exc}")
-            print(f"ERRO linha {record.line}: {exc}")
+    total = len(records) + report.error_rows  # linhas descartadas na leitura nao viram registros
+    instrumentos, laboratorios = validate_records(records, report)
+    valid_records = [record for record in records if not report.has_error(record.line)]
+
+    if args.dry_run:
+        for record in valid_records:
+            lab_name = record.laboratorio.strip() or "externo"
+            novo = "" if normalize_lookup(lab_name) in laboratorios else " (laboratorio sera criado)"
+            print(f"[DRY-RUN] {record.instrumento} -> {lab_name}{novo} ({record.envio.isoformat()})")
+        print("")
+        print(f"Validadas: {total} | Validas: {len(valid_records)} | Com erro: {report.error_rows}")
+        for item in report.lines():
+            print(f" - {item}")
+        return
+
+    ensure_laboratorios(valid_records, laboratorios)
+    arquivo = start_ledger(ROTINA, args.csv_path, total)
+    if arquivo.ultima_linha:
+        print(f"Retomando importacao deste arquivo a partir da linha {arquivo.ultima_linha + 1}")
+
+    worker = partial(
+        apply_partition,
+        arquivo=arquivo,
+        instrumentos=instrumentos,
+        laboratorios=laboratorios,
+        chunk_size=max(1, args.chunk_size),
+    )
+    if args.workers > 1:
+        partitions = partition_records(valid_records, lambda record: normalize_lookup(record.instrumento), args.workers)
+        print(f"Aplicando {len(valid_records)} linhas em {len(partitions)} particoes ({args.workers} processos)")
+        result = run_partitioned(worker, partitions, args.workers)
+        finish_ledger(arquivo, valid_records, line_of=lambda record: record.line, failed=bool(result.failures))
+    else:
+        result = worker(valid_records, track_offset=True)
+
+    failures: List[str] = report.lines() + result.failures
+    success, already = result.applied, result.already
 
     print("")
-    print(f"Processadas: {len(records)} | Sucesso: {success} | Falhas: {len(failures)}")
+    print(f"Processadas: {total} | Sucesso: {success} | Ja aplicadas: {already} | Falhas: {len(failures)}")
     if failures:
         print("Falhas detalhadas:")
         for item in failures:
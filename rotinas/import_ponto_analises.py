@@ -11,6 +11,7 @@ import os
 import sys
 from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
+from functools import partial
 from pathlib import Path
 from typing import Iterable, List, Optional, Sequence
 
@@ -24,8 +25,19 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "calimag.settings")
 django.setup()
 
 from django.db import transaction  # noqa: E402  pylint: disable=wrong-import-position
+from django.db.models import F  # noqa: E402  pylint: disable=wrong-import-position
 from django.utils import timezone  # noqa: E402  pylint: disable=wrong-import-position
 
+from app.cadastro.importacao import (  # noqa: E402  pylint: disable=wrong-import-position
+    PartitionResult,
+    ValidationReport,
+    check_duplicates,
+    lookup_instrumentos,
+    lookup_pontos,
+    normalize_lookup,
+    partition_records,
+    run_partitioned,
+)
 from app.cadastro.models import Instrumento  # noqa: E402  pylint: disable=wrong-import-position
 from app.instrumento.models import (  # noqa: E402  pylint: disable=wrong-import-position
     CertificadoCalibracao,
@@ -49,6 +61,7 @@ MANDATORY_ALIASES = {
     "data_analise": {"dataanalise", "data", "analise"},
     "resultado": {"resultado", "result"},
 }
+VALID_RESULTADOS = {choice[0] for choice in StatusPontoCalibracao.RESULTADO_CHOICES}
 OPTIONAL_ALIASES = {
     "observacoes": {"observacoes", "obs"},
 }
@@ -64,6 +77,7 @@ class CsvRecord:
     data_analise: timezone.datetime
     resultado: Optional[str]
     observacoes: Optional[str]
+    data_csv: str = ""  # celula original; vazia quando a data aplicada e a da importacao
 
 
 def detect_delimiter(sample_line: str) -> str:
@@ -136,7 +150,7 @@ def iter_rows(reader: Iterable[Sequence[str]]) -> Iterable[tuple[int, List[str]]
         yield line_number, [cell.strip() for cell in row]
 
 
-def parse_csv(path: Path, delimiter: Optional[str]) -> List[CsvRecord]:
+def parse_csv(path: Path, delimiter: Optional[str], report: ValidationReport) -> List[CsvRecord]:
     text = load_text(path)
     sample_line = next((line for line in text.splitlines() if line.strip()), "")
     csv_delimiter = delimiter or detect_delimiter(sample_line)
@@ -163,13 +177,23 @@ def parse_csv(path: Path, delimiter: Optional[str]) -> List[CsvRecord]:
             observacoes = row[obs_idx]
 
         if not codigo or not sequencia_raw:
-            raise ValueError(f"Linha {line_number}: codigo e sequencia sao obrigatorios")
+            report.add(line_number, "codigo e sequencia sao obrigatorios")
+            continue
         try:
             sequencia = int(sequencia_raw)
-        except ValueError as exc:
-            raise ValueError(f"Linha {line_number}: sequencia invalida ({sequencia_raw})") from exc
-        data_analise = parse_date(data_raw) or timezone.now()
+        except ValueError:
+            report.add(line_number, f"sequencia invalida ({sequencia_raw})")
+            continue
+        data_analise = parse_date(data_raw)
+        if data_raw and data_analise is None:
+            report.add(line_number, f"data de analise invalida ({data_raw})")
         incerteza = parse_decimal(incerteza_raw)
+        if incerteza_raw and incerteza is None:
+            report.add(line_number, f"incerteza invalida ({incerteza_raw})")
+        if resultado.strip() and resultado.strip().lower() not in VALID_RESULTADOS:
+            report.add(line_number, f"resultado invalido ({resultado})")
+        if report.has_error(line_number):
+            continue
         records.append(
             CsvRecord(
                 line=line_number,
@@ -177,27 +201,47 @@ def parse_csv(path: Path, delimiter: Optional[str]) -> List[CsvRecord]:
                 sequencia=sequencia,
                 tendencia=tendencia,
                 incerteza=incerteza,
-                data_analise=data_analise,
+                data_analise=data_analise or timezone.now(),
                 resultado=resultado.strip() or None,
                 observacoes=observacoes,
+                data_csv=data_raw.strip(),
             )
         )
     return records
 
 
-def register_analysis(record: CsvRecord, dry_run: bool) -> None:
-    instrumento = Instrumento.objects.filter(codigo__iexact=record.codigo.strip()).first()
-    if not instrumento:
-        raise ValueError(f"Instrumento '{record.codigo}' nao encontrado")
-    ponto = PontoCalibracao.objects.filter(instrumento=instrumento, sequencia=record.sequencia).first()
-    if not ponto:
-        raise ValueError(f"Ponto sequencia {record.sequencia} nao encontrado para instrumento {instrumento.codigo}")
-    last_cert = CertificadoCalibracao.objects.filter(status__instrumento=instrumento).order_by('-data_criacao').first()
-    if dry_run:
-        print(
-            f"[DRY-RUN] Ponto seq {record.sequencia} ({instrumento.codigo}) -> resultado {record.resultado or '-'}"
-        )
-        return
+def validate_records(records: List[CsvRecord], report: ValidationReport) -> tuple[dict, dict]:
+    """Valida o arquivo inteiro com consultas IN e devolve (instrumentos, pontos) resolvidos."""
+    check_duplicates(
+        report,
+        ((record.line, (normalize_lookup(record.codigo), record.sequencia, record.data_csv)) for record in records),
+        "analise repetida para o mesmo ponto e data",
+    )
+    instrumentos = lookup_instrumentos(record.codigo for record in records)
+    pontos = lookup_pontos(instrumento.id for instrumento in instrumentos.values())
+    for record in records:
+        instrumento = instrumentos.get(normalize_lookup(record.codigo))
+        if instrumento is None:
+            report.add(record.line, f"Instrumento '{record.codigo}' nao encontrado")
+        elif (instrumento.id, record.sequencia) not in pontos:
+            report.add(record.line, f"Ponto sequencia {record.sequencia} nao encontrado para instrumento {instrumento.codigo}")
+    return instrumentos, pontos
+
+
+def load_last_certificates(instrumento_ids: Iterable[int]) -> dict:
+    """Ultimo certificado de cada instrumento, carregado em uma unica consulta."""
+    certificados = {}
+    qs = (
+        CertificadoCalibracao.objects.filter(status__instrumento_id__in=set(instrumento_ids))
+        .annotate(instrumento_id=F("status__instrumento_id"))
+        .order_by("instrumento_id", "-data_criacao")
+    )
+    for cert in qs:
+        certificados.setdefault(cert.instrumento_id, cert)
+    return certificados
+
+
+def register_analysis(record: CsvRecord, instrumento: Instrumento, ponto: PontoCalibracao, last_cert: Optional[CertificadoCalibracao]) -> None:
     with transaction.atomic():
         status = StatusPontoCalibracao.objects.create(
             ponto_calibracao=ponto,
@@ -214,11 +258,32 @@ def register_analysis(record: CsvRecord, dry_run: bool) -> None:
     )
 
 
+def apply_partition(records: List[CsvRecord], *, instrumentos: dict, pontos: dict, certificados: dict) -> PartitionResult:
+    """Aplica as analises de um grupo de instrumentos, na ordem do arquivo."""
+    result = PartitionResult()
+    for record in records:
+        try:
+            instrumento = instrumentos[normalize_lookup(record.codigo)]
+            ponto = pontos[(instrumento.id, record.sequencia)]
+            register_analysis(record, instrumento, ponto, certificados.get(instrumento.id))
+            result.applied += 1
+        except Exception as exc:  # pylint: disable=broad-except
+            result.failures.append(f"Linha {record.line}: {exc}")
+            print(f"ERRO linha {record.line}: {exc}")
+    return result
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Importa análises de pontos de calibração a partir de um CSV.")
     parser.add_argument("csv_path", type=Path, help="Arquivo CSV com colunas sequencia,codigo,tendencia,incerteza,data_analise,resultado")
     parser.add_argument("--delimiter", dest="delimiter", help="Delimitador (auto detect quando omitido)")
     parser.add_argument("--dry-run", action="store_true", help="Valida sem gravar no banco")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos em paralelo; as linhas sao divididas por instrumento, mantendo a ordem de cada um (padrao 1)",
+    )
     return parser
 
 
@@ -228,23 +293,39 @@ def main() -> None:
     if not args.csv_path.exists():
         parser.error(f"Arquivo {args.csv_path} nao encontrado")
 
-    records = parse_csv(args.csv_path, args.delimiter)
-    if not records:
+    report = ValidationReport()
+    records = parse_csv(args.csv_path, args.delimiter, report)
+    if not records and not report:
         print("Nenhuma linha valida encontrada.")
         return
 
-    success = 0
-    failures: List[str] = []
-    for record in records:
-        try:
-            register_analysis(record, args.dry_run)
-            success += 1
-        except Exception as exc:  # pylint: disable=broad-except
-            failures.append(f"Linha {record.line}: {exc}")
-            print(f"ERRO linha {record.line}: {exc}")
+    total = len(records) + report.error_rows  # linhas descartadas na leitura nao viram registros
+    instrumentos, pontos = validate_records(records, report)
+    valid_records = [record for record in records if not report.has_error(record.line)]
+
+    if args.dry_run:
+        for record in valid_records:
+            print(f"[DRY-RUN] Ponto seq {record.sequencia} ({record.codigo}) -> resultado {record.resultado or '-'}")
+        print("")
+        print(f"Validadas: {total} | Validas: {len(valid_records)} | Com erro: {report.error_rows}")
+        for item in report.lines():
+            print(f" - {item}")
+        return
+
+    certificados = load_last_certificates(instrumento.id for instrumento in instrumentos.values())
+    worker = partial(apply_partition, instrumentos=instrumentos, pontos=pontos, certificados=certificados)
+    if args.workers > 1:
+        partitions = partition_records(valid_records, lambda record: normalize_lookup(record.codigo), args.workers)
+        print(f"Aplicando {len(valid_records)} linhas em {len(partitions)} particoes ({args.workers} processos)")
+        result = run_partitioned(worker, partitions, args.workers)
+    else:
+        result = worker(valid_records)
+
+    success = result.applied
+    failures: List[str] = report.lines() + result.failures
 
     print("")
-    print(f"Processadas: {len(records)} | Sucesso: {success} | Falhas: {len(failures)}")
+    print(f"Processadas: {total} | Sucesso: {success} | Falhas: {len(failures)}")
     if failures:
         print("Falhas detalhadas:")
         for item in failures:
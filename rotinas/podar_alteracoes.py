@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Poda a sequencia de alteracoes dos instrumentos (feed incremental da PMC).
+
+Cada escrita do ciclo de vida grava uma linha em AlteracaoInstrumento e nada
+mais as apaga. Rodar diariamente (cron) mantendo alguns dias: uma aba parada
+ha mais tempo que isso recebe `reset` no feed e recarrega a listagem.
+
+    python rotinas/podar_alteracoes.py --dias 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import django
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "calimag.settings")
+django.setup()
+
+from app.instrumento.alteracoes import ALTERACOES_RETENCAO_DIAS, podar_alteracoes  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Apaga alteracoes de instrumentos antigas, mantendo a ultima.")
+    parser.add_argument(
+        "--dias",
+        type=int,
+        default=ALTERACOES_RETENCAO_DIAS,
+        help=f"Dias de alteracoes mantidas (padrao {ALTERACOES_RETENCAO_DIAS})",
+    )
+    return parser
+
+
+def main() -> None:
+    parser = build_arg_parser()
+    args = parser.parse_args()
+    if args.dias < 1:
+        parser.error("--dias deve ser pelo menos 1")
+
+    apagadas = podar_alteracoes(args.dias)
+    print(f"Alteracoes apagadas: {apagadas}")
+
+
+if __name__ == "__main__":
+    main()
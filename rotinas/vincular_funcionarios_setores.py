@@ -11,6 +11,7 @@ from pathlib import Path
 
 import django
 from django.db import transaction
+from django.utils import timezone
 
 # garante que o projeto esteja no sys.path antes de carregar o Django
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -21,6 +22,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'calimag.settings')
 django.setup()
 
 from app.cadastro.models import Funcionario, Setor  # noqa: E402  pylint: disable=wrong-import-position
+from app.cadastro.referencias import invalidar_referencias  # noqa: E402  pylint: disable=wrong-import-position
 
 
 def strip_accents(text: str) -> str:
@@ -93,12 +95,16 @@ def process_csv(csv_path: Path) -> tuple[int, int, int, int]:
                     print(f'[linha {idx}] setor nao encontrado: "{setor_nome}".')
                     continue
 
-                rows = Funcionario.objects.filter(id=funcionario_id).exclude(setor_id=setor_id).update(setor_id=setor_id)
+                rows = Funcionario.objects.filter(id=funcionario_id).exclude(setor_id=setor_id).update(setor_id=setor_id, data_atualizacao=timezone.now())
                 if rows:
                     updated += 1
                 else:
                     unchanged += 1
 
+            # update() nao dispara sinais
+            if updated:
+                invalidar_referencias(Funcionario)
+
     return updated, unchanged, missing_funcionario, missing_setor
 
 